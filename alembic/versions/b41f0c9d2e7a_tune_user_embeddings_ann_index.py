@@ -0,0 +1,57 @@
+"""tune_user_embeddings_ann_index
+
+Rebuild the user_embeddings HNSW index with explicit build parameters
+(VECTOR_HNSW_M / VECTOR_HNSW_EF_CONSTRUCTION) and add the indexes used to
+pre-filter vector searches (user_id + embedding_type, metadata JSONB).
+
+Revision ID: b41f0c9d2e7a
+Revises: 2f09ee7825dd
+Create Date: 2026-10-17 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.memory.vector_index import (
+    FILTER_INDEX_NAME,
+    HNSW_INDEX_NAME,
+    METADATA_INDEX_NAME,
+    hnsw_index_ddl,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f0c9d2e7a'
+down_revision: Union[str, Sequence[str], None] = '2f09ee7825dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: pas de verrou d'écriture pendant la construction
+    with op.get_context().autocommit_block():
+        # Nouvel index construit avant la suppression de l'ancien (defaults m=16, ef_construction=64)
+        op.execute(hnsw_index_ddl(HNSW_INDEX_NAME))
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_user_embeddings_embedding')
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {FILTER_INDEX_NAME} '
+            'ON user_embeddings (user_id, embedding_type)'
+        )
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {METADATA_INDEX_NAME} '
+            'ON user_embeddings USING gin (metadata jsonb_path_ops)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_embeddings_embedding '
+            'ON user_embeddings USING hnsw (embedding vector_cosine_ops)'
+        )
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {METADATA_INDEX_NAME}')
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {FILTER_INDEX_NAME}')
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}')
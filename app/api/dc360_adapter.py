@@ -15,9 +15,13 @@ import uuid
 
 from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
 from app.core.integrations.redis_fs import RedisVirtualFileSystem
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.quota import QuotaManager, QuotaExceededException
 from app.api.v1.dependencies import get_orchestrator, get_redis_vfs, get_quota_manager
+from app.config.database import get_db
 from app.config.settings import settings
+from app.services.account_purge import purge_user_data
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -136,6 +140,17 @@ class DC360GenerateBriefResponse(BaseModel):
         }
 
 
+class DC360PurgeUserDataResponse(BaseModel):
+    """Response DC360 purge des données d'un compte"""
+    user_id: int = Field(..., description="ID utilisateur")
+    embeddings: int = Field(..., description="Embeddings supprimés")
+    sessions: int = Field(..., description="Sessions de brief supprimées")
+    sites: int = Field(..., description="Sessions coaching (et sites) supprimées")
+    keys: int = Field(..., description="Clés Redis supprimées")
+    cached_images: int = Field(..., description="Entrées du cache d'images supprimées")
+    images_released: int = Field(..., description="Images déréférencées (supprimées au prochain sweep)")
+
+
 # ============================================================================
 # AUTHENTIFICATION
 # ============================================================================
@@ -284,10 +299,16 @@ async def generate_brief_dc360(
         industry=request.business_info.industry
     )
     
+    # 1. Adapter payload DC360 → Genesis (réservation quota indexée par la session)
+    genesis_input = adapt_dc360_to_genesis(request)
+    
     try:
-        # 1. Vérifier quotas AVANT génération
+        # 2. Vérifier quotas AVANT génération
         try:
-            quota_status = await quota_manager.check_quota(request.user_id)
+            quota_status = await quota_manager.check_quota(
+                request.user_id,
+                session_id=genesis_input["coaching_session_id"]
+            )
             logger.info(
                 "Quota check passed",
                 user_id=request.user_id,
@@ -309,9 +330,6 @@ async def generate_brief_dc360(
                 }
             )
         
-        # 2. Adapter payload DC360 → Genesis
-        genesis_input = adapt_dc360_to_genesis(request)
-        
         # 3. Générer ID unique brief
         brief_id = f"brief_{uuid.uuid4().hex[:12]}"
         genesis_input["brief_id"] = brief_id
@@ -417,6 +435,7 @@ async def generate_brief_dc360(
             error=str(e),
             exc_info=True
         )
+        await quota_manager.release_reservation(request.user_id, genesis_input["coaching_session_id"])
         raise HTTPException(
             status_code=500,
             detail={
@@ -424,3 +443,38 @@ async def generate_brief_dc360(
                 "message": f"Brief generation failed: {str(e)}"
             }
         )
+
+
+@router.delete(
+    "/users/{user_id}/data",
+    response_model=DC360PurgeUserDataResponse,
+    summary="Purger les données d'un compte (suppression de compte DC360)",
+    responses={
+        200: {"description": "Données purgées"},
+        401: {"description": "X-Service-Secret manquant ou invalide"},
+        500: {"description": "Erreur purge (idempotente, à rejouer)"}
+    }
+)
+async def purge_user_data_dc360(
+    user_id: int,
+    _: bool = Depends(verify_service_secret),
+    db: AsyncSession = Depends(get_db),
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
+):
+    """
+    DELETE /api/genesis/users/{user_id}/data
+    
+    Supprime embeddings, sessions Redis et images en cache d'un utilisateur.
+    """
+    try:
+        stats = await purge_user_data(db, user_id, redis_fs)
+    except Exception as e:
+        logger.error("DC360 user data purge failed", user_id=user_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "PURGE_FAILED",
+                "message": f"User data purge failed: {str(e)}"
+            }
+        )
+    return DC360PurgeUserDataResponse(user_id=user_id, **stats)
@@ -1,11 +1,19 @@
 """Custom middleware for Genesis AI Service"""
 
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import secrets
 import time
 import structlog
 from prometheus_client import Counter, Histogram, generate_latest
 
+from app.config.settings import settings
+from app.core.quota.rate_limiter import RateLimiter, rate_limiter
+from app.core.security import decode_access_token
+
 logger = structlog.get_logger()
 
 # Prometheus metrics
@@ -80,3 +88,78 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
         ).observe(duration)
         
         return response
+
+class RateLimitMiddleware:
+    """
+    Limite les requêtes par minute selon le plan de l'utilisateur.
+
+    Middleware ASGI pur (pas de BaseHTTPMiddleware): une vérification GCRA
+    par requête limitée, en-têtes X-RateLimit-* ajoutés à la réponse. Seules
+    les méthodes d'écriture sous /api sont limitées; les appels DC360
+    (X-Service-Secret valide) ne le sont pas.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.methods = {method.upper() for method in settings.RATE_LIMIT_METHODS}
+        self.exempt_paths = tuple(settings.RATE_LIMIT_EXEMPT_PATHS)
+
+    def _is_limited(self, scope: Scope, headers: Headers) -> bool:
+        path = scope["path"]
+        if scope["method"] not in self.methods or not path.startswith("/api/") or path.startswith(self.exempt_paths):
+            return False
+        service_secret = headers.get("x-service-secret")
+        if service_secret and settings.GENESIS_SERVICE_SECRET and secrets.compare_digest(
+            service_secret, settings.GENESIS_SERVICE_SECRET
+        ):
+            return False
+        return self.limiter.is_enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not self._is_limited(scope, headers):
+            await self.app(scope, receive, send)
+            return
+
+        user_id = None
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            token_data = decode_access_token(token)
+            if token_data is not None:
+                user_id = token_data.user_id
+        client = scope.get("client")
+
+        decision = await self.limiter.check(user_id=user_id, client_ip=client[0] if client else None)
+        if not decision.allowed:
+            logger.warning(
+                "Rate limit exceeded",
+                user_id=user_id,
+                plan=decision.plan,
+                path=scope["path"],
+                retry_after=decision.retry_after
+            )
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": "rate_limit_exceeded",
+                    "message": f"Trop de requêtes pour le plan {decision.plan.upper()} "
+                               f"({decision.limit}/min). Réessayez dans {decision.headers()['Retry-After']} s.",
+                    "plan": decision.plan,
+                    "limit_per_minute": decision.limit
+                },
+                headers=decision.headers()
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(decision.headers())
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
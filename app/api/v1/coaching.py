@@ -1,7 +1,8 @@
 """Coaching endpoints for Genesis AI Service"""
 
-from typing import Dict, Any, List, Optional, Union
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update
 import structlog
@@ -10,7 +11,8 @@ import json
 import redis.asyncio as redis
 
 from app.config.database import get_db
-from app.api.v1.dependencies import get_redis_client
+from app.api.v1.dependencies import get_redis_client, get_redis_vfs
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.models.user import User
 from app.models.coaching import CoachingSession, CoachingStep, CoachingStepEnum, SessionStatusEnum
 from app.schemas.coaching import (
@@ -38,31 +40,17 @@ router = APIRouter()
 logger = structlog.get_logger()
 
 
-# GEN-WO-006: Helper pour préserver TOUJOURS l'onboarding lors des mises à jour Redis
-async def preserve_onboarding_on_save(session_id: str, session_data: Dict[str, Any], redis_client: redis.Redis, ttl: int = 7200):
-    """Sauvegarde session_data en Redis en préservant TOUJOURS les données d'onboarding"""
-    onboarding_data = None
+# GEN-WO-006: la session coaching est un hash Redis (un champ par clé de premier
+# niveau). Les étapes ne réécrivent que current_step/status: l'onboarding n'est
+# jamais écrasé et le document complet ne fait plus l'aller-retour.
+COACHING_SESSION_TTL = 7200  # 2h
 
-    current_json = await redis_client.get(f"session:{session_id}")
-    if current_json:
-        current_data = json.loads(current_json)
-        if "onboarding" in current_data:
-            onboarding_data = current_data["onboarding"]
-
-    # Fallback: clé dédiée onboarding:{session_id}
-    if onboarding_data is None:
-        onboarding_json = await redis_client.get(f"onboarding:{session_id}")
-        if onboarding_json:
-            onboarding_data = json.loads(onboarding_json)
-
-    if onboarding_data is not None:
-        session_data["onboarding"] = onboarding_data
-    
-    await redis_client.set(f"session:{session_id}", json.dumps(session_data), ex=ttl)
-    if onboarding_data is not None:
-        await redis_client.set(f"onboarding:{session_id}", json.dumps(onboarding_data), ex=ttl)
+# Champs lus par les handlers (l'onboarding alimente le contexte du brief)
+SESSION_CONTEXT_FIELDS = ["user_id", "session_id", "id", "current_step", "status", "onboarding"]
 
 
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
 
 
 # ========= Onboarding (Phase 2 - GEN-WO-006) =========
@@ -84,7 +72,8 @@ async def onboarding_coaching(
     request: OnboardingRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_client: redis.Redis = Depends(get_redis_client),
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ):
     """
     Étape 0 Onboarding (Phase 2 - GEN-WO-006)
@@ -124,25 +113,23 @@ async def onboarding_coaching(
     }
 
     payload = {**session_data, "onboarding": onboarding_data}
-    await redis_client.set(f"session:{new_session_id}", json.dumps(payload), ex=7200)
+    await redis_fs.write_session_hash(_session_key(new_session_id), payload, ttl=COACHING_SESSION_TTL)
     # Stockage redondant pour récupération robuste
-    await redis_client.set(f"onboarding:{new_session_id}", json.dumps(onboarding_data), ex=7200)
+    await redis_client.set(f"onboarding:{new_session_id}", json.dumps(onboarding_data), ex=COACHING_SESSION_TTL)
     logger.info("onboarding_saved", session_id=new_session_id, business_name=request.business_name, sector=sector_value)
 
     return OnboardingResponse(session_id=new_session_id, onboarding=onboarding_data)
 
 @router.post("/start", response_model=CoachingResponse)
-async def start_coaching_session(request: CoachingRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user), redis_client: redis.Redis = Depends(get_redis_client)):
+async def start_coaching_session(request: CoachingRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user), redis_client: redis.Redis = Depends(get_redis_client), redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)):
     """Starts or continues a coaching session."""
     session_id = request.session_id
 
     # Récupérer ou créer la session (GEN-WO-006: préserver onboarding)
-    session_data_json = await redis_client.get(f"session:{session_id}")
-    session_data = None
+    session_data = await redis_fs.read_session_fields(_session_key(session_id)) if session_id else None
+    in_redis = session_data is not None
     
-    if session_data_json:
-        session_data = json.loads(session_data_json)
-    elif session_id:
+    if not in_redis and session_id:
         # Fallback to DB if not in Redis
         result = await db.execute(select(CoachingSession).filter(CoachingSession.session_id == session_id, CoachingSession.user_id == current_user.id))
         session_db = result.scalars().first()
@@ -176,12 +163,18 @@ async def start_coaching_session(request: CoachingRequest, db: AsyncSession = De
         session_data["id"] = session_db.id # Add db id to session data
     
     # Recharger onboarding si présent en clé dédiée
-    onboarding_json = await redis_client.get(f"onboarding:{session_data['session_id']}")
-    if onboarding_json and "onboarding" not in session_data:
-        session_data["onboarding"] = json.loads(onboarding_json)
+    missing_fields = {}
+    if "onboarding" not in session_data:
+        onboarding_json = await redis_client.get(f"onboarding:{session_data['session_id']}")
+        if onboarding_json:
+            session_data["onboarding"] = missing_fields["onboarding"] = json.loads(onboarding_json)
 
-    # GEN-WO-006: Sauvegarder session_data avec onboarding préservé
-    await preserve_onboarding_on_save(session_data['session_id'], session_data, redis_client) # 2h TTL
+    key = _session_key(session_data["session_id"])
+    if in_redis:
+        # Session déjà en Redis: seuls les champs manquants sont écrits, TTL rafraîchi (2h)
+        await redis_fs.update_session_fields(key, missing_fields, ttl=COACHING_SESSION_TTL)
+    else:
+        await redis_fs.write_session_hash(key, session_data, ttl=COACHING_SESSION_TTL)
 
     # Load first step guidance (VISION)
     prompts_loader = PromptsLoader()
@@ -203,14 +196,12 @@ async def start_coaching_session(request: CoachingRequest, db: AsyncSession = De
     )
 
 @router.post("/step", response_model=Union[CoachingResponse, BriefCompletedResponse])
-async def process_coaching_step(request: CoachingStepRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user), redis_client: redis.Redis = Depends(get_redis_client)):
+async def process_coaching_step(request: CoachingStepRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user), redis_client: redis.Redis = Depends(get_redis_client), redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)):
     """Processes a single step of the coaching session."""
-    session_data_json = await redis_client.get(f"session:{request.session_id}")
-    if not session_data_json:
+    session_data = await redis_fs.read_session_fields(_session_key(request.session_id), SESSION_CONTEXT_FIELDS)
+    if not session_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coaching session not found or expired")
 
-    session_data = json.loads(session_data_json)
-
     if session_data["user_id"] != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this session")
 
@@ -282,8 +273,12 @@ async def process_coaching_step(request: CoachingStepRequest, db: AsyncSession =
         )
         await db.execute(stmt)
         await db.commit()
-        # GEN-WO-006: Préserver onboarding lors de la mise à jour Redis
-        await preserve_onboarding_on_save(session_data['session_id'], session_data, redis_client)
+        # GEN-WO-006: seul current_step est réécrit, l'onboarding reste intact
+        await redis_fs.update_session_fields(
+            _session_key(request.session_id),
+            {"current_step": session_data["current_step"]},
+            ttl=COACHING_SESSION_TTL
+        )
 
         # Générer guidage pour étape suivante (avec messages épurés)
         next_guidance = prompts_loader.get_step_prompt(
@@ -361,8 +356,12 @@ async def process_coaching_step(request: CoachingStepRequest, db: AsyncSession =
 
     logger.info("coaching_finished_brief_saved", session_id=request.session_id, brief_id=brief_db.id)
     
-    # 3. Mettre à jour Redis
-    await preserve_onboarding_on_save(session_data['session_id'], session_data, redis_client)
+    # 3. Mettre à jour Redis (statut seulement)
+    await redis_fs.update_session_fields(
+        _session_key(request.session_id),
+        {"status": session_data["status"]},
+        ttl=COACHING_SESSION_TTL
+    )
 
     # 4. Retourner la réponse de fin de coaching (Redirect vers thèmes)
     return BriefCompletedResponse(
@@ -450,14 +449,13 @@ async def get_coaching_help(
     request: CoachingRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_client: redis.Redis = Depends(get_redis_client),
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ):
     """Génère des questions socratiques pour débloquer l'utilisateur"""
-    session_data_json = await redis_client.get(f"session:{request.session_id}")
-    if not session_data_json:
+    session_data = await redis_fs.read_session_fields(_session_key(request.session_id), SESSION_CONTEXT_FIELDS)
+    if not session_data:
         raise HTTPException(status_code=404, detail="Session non trouvée")
-    
-    session_data = json.loads(session_data_json)
 
     if session_data["user_id"] != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this session")
@@ -503,19 +501,96 @@ async def reformulate_text(
     
     return result
 
+def _sse_event(event_type: str, data: Dict[str, Any]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _llm_event_stream(deltas: AsyncIterator[str], **done_fields) -> StreamingResponse:
+    """
+    Relaie les deltas LLM en Server-Sent Events.
+
+    Événements: `delta` {"text"} pour chaque fragment, puis `done` {"text": texte complet}
+    ou `error` {"detail"} si le provider échoue en cours de flux.
+    """
+    async def event_source():
+        chunks = []
+        try:
+            async for delta in deltas:
+                chunks.append(delta)
+                yield _sse_event("delta", {"text": delta})
+        except Exception as e:
+            logger.error("llm_stream_failed", error=str(e))
+            yield _sse_event("error", {"detail": "Génération interrompue, veuillez réessayer."})
+            return
+        yield _sse_event("done", {"text": "".join(chunks), **done_fields})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/help/stream")
+async def stream_coaching_help(
+    request: CoachingRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    redis_client: redis.Redis = Depends(get_redis_client),
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
+):
+    """Aide socratique streamée (SSE): les premiers mots s'affichent sans attendre la réponse complète"""
+    session_data = await redis_fs.read_session_fields(_session_key(request.session_id), SESSION_CONTEXT_FIELDS)
+    if not session_data:
+        raise HTTPException(status_code=404, detail="Session non trouvée")
+
+    if session_data["user_id"] != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this session")
+    
+    llm_service = CoachingLLMService()
+    brief = await _build_brief_from_coaching_steps(session_data["id"], request.session_id, db, session_data, redis_client)
+    
+    return _llm_event_stream(
+        llm_service.socratic_help_stream(
+            step=session_data["current_step"],
+            brief=brief,
+            sector=brief.get("industry_sector", "default")
+        ),
+        session_id=request.session_id,
+        current_step=session_data["current_step"]
+    )
+
+@router.post("/reformulate/stream")
+async def stream_reformulate_text(
+    request: ReformulateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Reformulation streamée (SSE) d'une réponse utilisateur"""
+    step = request.target_step.value if request.target_step else "vision"
+    
+    # OPTIMISATION (GEN-WO-002): Short-circuit si texte trop court
+    if len(request.text) < 30:
+        async def unchanged():
+            yield request.text
+        return _llm_event_stream(unchanged(), original_text=request.text, is_better=False)
+    
+    llm_service = CoachingLLMService()
+    return _llm_event_stream(
+        llm_service.reformulate_stream(text=request.text, step=step),
+        original_text=request.text
+    )
+
 @router.post("/generate-proposals", response_model=GenerateProposalsResponse)
 async def generate_proposals(
     request: CoachingRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_client: redis.Redis = Depends(get_redis_client),
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ):
     """Mode 'Je ne sais pas' : génère 3 propositions basées sur le contexte"""
-    session_data_json = await redis_client.get(f"session:{request.session_id}")
-    if not session_data_json:
+    session_data = await redis_fs.read_session_fields(_session_key(request.session_id), SESSION_CONTEXT_FIELDS)
+    if not session_data:
         raise HTTPException(status_code=404, detail="Session non trouvée")
-    
-    session_data = json.loads(session_data_json)
 
     if session_data["user_id"] != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this session")
@@ -542,28 +617,25 @@ async def generate_proposals(
 async def get_coaching_site(
     session_id: str,
     current_user: User = Depends(get_current_user),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ) -> Dict[str, Any]:
     """Retourne le SiteDefinition généré pour une session coaching."""
     # Vérifier que la session appartient à l'utilisateur
-    session_data_json = await redis_client.get(f"session:{session_id}")
-    if not session_data_json:
+    session_data = await redis_fs.read_session_fields(_session_key(session_id), ["user_id"])
+    site_data = await redis_fs.read_site(session_id)
+    if not session_data:
         # Session expirée mais on vérifie quand même si le site existe
         # pour des raisons de sécurité, on refuse l'accès si on ne peut pas vérifier l'ownership
-        site_exists = await redis_client.exists(f"site:{session_id}")
-        if not site_exists:
+        if not site_data:
             raise HTTPException(status_code=404, detail="Session expired and site not found")
         # Note: Si session expirée mais site existe, on permet l'accès car le user est authentifié
         # et a fourni un UUID valide qu'il ne peut connaître que s'il a fait le coaching
         logger.warning("Session expired but site exists", session_id=session_id, user_id=current_user.id)
     else:
-        session_data = json.loads(session_data_json)
         if session_data.get("user_id") != current_user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this session")
     
-    # Récupérer le site
-    site_data = await redis_client.get(f"site:{session_id}")
     if not site_data:
         raise HTTPException(status_code=404, detail="Site not found for this session")
     
-    return json.loads(site_data)
+    return site_data
@@ -1,14 +1,15 @@
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
-import json
 import structlog
 
 from app.config.database import get_db
-from app.api.v1.dependencies import get_redis_client
+from app.api.v1.dependencies import get_redis_client, get_redis_vfs
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.services.user_service import get_current_user
 from app.models.user import User
 from app.models.coaching import CoachingSession, BusinessBrief, SessionStatusEnum
@@ -24,7 +25,7 @@ logger = structlog.get_logger(__name__)
 async def list_user_sites(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ):
     """
     Liste tous les sites de l'utilisateur (Hybrid DB + Redis).
@@ -49,33 +50,26 @@ async def list_user_sites(
     if not rows:
         return []
 
+    # 2. Statut + résumé (thème, image hero) de tous les sites en un aller-retour Redis
+    summaries = await redis_fs.read_site_summaries([session.session_id for session, _ in rows])
+
     for session, brief in rows:
-        # 2. Vérifier Redis pour le statut du site
-        redis_key = f"site:{session.session_id}"
-        site_exists = await redis_client.exists(redis_key)
-        
-        # Tenter d'extraire theme_slug depuis Redis si dispo pour info
-        theme_slug = None
-        hero_image = None
-        
-        if site_exists:
-            try:
-                # On ne charge pas tout le JSON pour la liste, trop lourd. 
-                # Idealement on aurait un hash Redis, mais ici structure simple string.
-                # On assume 'ready' si valid key.
-                pass 
-            except Exception:
-                pass
+        summary = summaries.get(session.session_id)
+        updated_at = session.updated_at
+        if summary and summary.get("updated_at"):
+            # Date de la dernière (re)génération du site
+            updated_at = datetime.fromisoformat(summary["updated_at"])
         
         sites_list.append(SiteListItem(
             session_id=session.session_id,
             business_name=brief.business_name,
             sector=brief.sector,
-            theme_slug=None, # Difficile à avoir sans parser tout le JSON site, on laisse vide pour l'instant
+            theme_slug=summary.get("theme_slug") if summary else None,
             preview_url=f"/preview/{session.session_id}",
-            status="ready" if site_exists else "expired",
+            status="ready" if summary is not None else "expired",
             created_at=session.created_at,
-            updated_at=session.updated_at
+            updated_at=updated_at,
+            hero_image_url=summary.get("hero_image") if summary else None
         ))
         
     return sites_list
@@ -166,7 +160,7 @@ async def regenerate_site(
     session_id: str,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    redis_fs: RedisVirtualFileSystem = Depends(get_redis_vfs)
 ):
     """
     Régénère le site basé sur le brief actuel (db) et le thème précédent (si possible).
@@ -187,20 +181,18 @@ async def regenerate_site(
         raise HTTPException(status_code=404, detail="Brief not found")
     
     # 2. Récupérer l'ancien site de Redis pour garder le même theme si possible
-    redis_key = f"site:{session_id}"
-    old_site_json = await redis_client.get(redis_key)
+    old_site = await redis_fs.read_site(session_id)
     
     theme_obj = None
     
     # Essayer de trouver quel thème utiliser
-    if old_site_json:
+    if old_site:
         try:
-            old_site = json.loads(old_site_json)
             old_theme_slug = old_site.get("theme", {}).get("slug")
             if old_theme_slug:
                 theme_res = await db.execute(select(Theme).where(Theme.slug == old_theme_slug))
                 theme_obj = theme_res.scalars().first()
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (KeyError, TypeError, AttributeError) as e:
             logger.warning("Failed to parse old site theme", session_id=session_id, error=str(e))
             
     # Si pas de thème trouvé (site expiré), fallback sur Savor (défaut) ou logique plus complexe
@@ -235,11 +227,7 @@ async def regenerate_site(
     new_site_definition = transformer.transform(enriched_brief, theme=theme_obj)
     
     # 5. Save Redis & Refresh TTL (7 days)
-    await redis_client.set(
-        redis_key, 
-        json.dumps(new_site_definition), 
-        ex=604800 
-    )
+    await redis_fs.write_site(session_id, new_site_definition, ttl=604800)
     
     return {"status": "regenerated", "preview_url": f"/preview/{session_id}"}
 
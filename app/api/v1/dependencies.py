@@ -6,11 +6,12 @@ from app.models.user import User
 from app.config.database import get_db
 
 from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+from app.core.orchestration.container import agent_container
 from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.core.integrations.digitalcloud360 import DigitalCloud360APIClient
 from app.core.integrations.tavily import TavilyClient
 from app.core.quota import QuotaManager
-from app.config.settings import settings
+from app.config.redis import redis_pools
 import redis.asyncio as redis
 
 
@@ -36,12 +37,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
 def get_orchestrator() -> LangGraphOrchestrator:
     """
     Dependency function to get the LangGraphOrchestrator instance.
+    Returns the app-scoped singleton built at startup (see agent_container).
     This allows for easier mocking in tests.
     """
-    return LangGraphOrchestrator()
+    return agent_container.orchestrator
 
 def get_redis_vfs() -> RedisVirtualFileSystem:
-    """FastAPI dependency to get an instance of the RedisVirtualFileSystem."""
+    """FastAPI dependency to get an instance of the RedisVirtualFileSystem (shared Redis pool)."""
     return RedisVirtualFileSystem()
 
 def get_digitalcloud360_client() -> DigitalCloud360APIClient:
@@ -53,8 +55,8 @@ def get_tavily_client() -> TavilyClient:
     return TavilyClient()
 
 def get_redis_client() -> redis.Redis:
-    """Dependency function to get the Redis client instance."""
-    return redis.from_url(settings.REDIS_URL, decode_responses=True)
+    """Dependency function to get a Redis client backed by the app-scoped pool."""
+    return redis_pools.get_client(decode_responses=True)
 
 def get_quota_manager() -> QuotaManager:
     """FastAPI dependency to get an instance of the QuotaManager."""
@@ -141,9 +141,12 @@ async def generate_business_brief(
     )
     
     try:
-        # 1. Vérifier quotas AVANT génération (P0.5)
+        # 1. Générer ID unique brief (réservation quota indexée par ce brief)
+        brief_id = f"brief_{uuid.uuid4().hex[:12]}"
+        
+        # 2. Vérifier quotas AVANT génération (P0.5)
         try:
-            quota_status = await quota_manager.check_quota(request.user_id)
+            quota_status = await quota_manager.check_quota(request.user_id, session_id=brief_id)
             logger.info(
                 "Quota check passed",
                 user_id=request.user_id,
@@ -162,9 +165,6 @@ async def generate_business_brief(
                 detail=qe.details
             )
         
-        # 2. Générer ID unique brief
-        brief_id = f"brief_{uuid.uuid4().hex[:12]}"
-        
         # 3. Préparer payload orchestrateur
         orchestration_input = {
             "user_id": request.user_id,
@@ -247,6 +247,7 @@ async def generate_business_brief(
             user_id=request.user_id,
             business_name=request.brief_data.business_name
         )
+        await quota_manager.release_reservation(request.user_id, brief_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -23,6 +23,8 @@ class SimilarSearchRequest(BaseModel):
         description="Si True, recherche dans TOUS les briefs (pour recommandations anonymisées). "
                     "Par défaut False = recherche limitée à l'utilisateur courant."
     )
+    embedding_type: Optional[str] = Field(default=None, description="Filtre par type (brief, conversation, preference)")
+    metadata: Optional[dict] = Field(default=None, description="Filtre JSONB par inclusion, ex: {\"sector\": \"restaurant\"}")
     
     model_config = ConfigDict(extra="forbid")
 
@@ -63,7 +65,9 @@ async def search_similar(
             query_text=request.query,
             user_id=user_id,
             limit=request.limit,
-            threshold=request.threshold
+            threshold=request.threshold,
+            embedding_type=request.embedding_type,
+            metadata_filter=request.metadata
         )
         
         return SimilarSearchResponse(
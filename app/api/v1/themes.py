@@ -4,14 +4,14 @@ Themes endpoints for Genesis AI Service
 
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 import structlog
 import json
 
-from app.config.database import get_db
-from app.api.v1.dependencies import get_redis_client
-import redis.asyncio as redis
+from app.config.database import get_db, AsyncSessionLocal
+from app.config.settings import settings
 from app.models.user import User
 from app.models.theme import Theme
 from app.models.coaching import BusinessBrief, CoachingSession, SessionStatusEnum
@@ -26,7 +26,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 # For Recommendation and Generation
 from app.core.agents.theme_recommender import ThemeRecommendationAgent
-from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+from app.core.orchestration.container import agent_container
+from app.core.jobs import job_queue
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.services.transformer import BriefToSiteTransformer
 from app.schemas.business_brief_data import BusinessBriefData
 
@@ -111,15 +113,121 @@ async def recommend_themes(
         recommendations=formatted_recs
     )
 
+SITE_GENERATION_JOB = "theme_site_generation"
+
+
+async def run_site_generation_job(job: Dict[str, Any], report_progress) -> Dict[str, Any]:
+    """
+    Handler du job de génération de site (exécuté par un worker de la JobQueue).
+
+    Orchestration LangGraph (progression publiée par nœud), transformation en
+    SiteDefinition, sauvegarde Redis et passage de la session en COMPLETED.
+    """
+    payload = job["payload"]
+    session_id = payload["session_id"]
+
+    async with AsyncSessionLocal() as db:
+        brief = await db.get(BusinessBrief, payload["brief_id"])
+        theme = await db.get(Theme, payload["theme_id"])
+        coaching_session = await db.get(CoachingSession, payload["coaching_session_pk"])
+        if not brief or not theme or not coaching_session:
+            raise ValueError("Brief, theme or coaching session no longer exists")
+
+        # 3. Exécuter l'orchestrateur LangGraph (singleton applicatif)
+        orchestration_result = await agent_container.orchestrator.run({
+            "user_id": job["user_id"],
+            "brief_id": session_id,
+            "business_brief": payload["business_brief"],
+            "selected_theme_id": theme.id,
+            "selected_theme_slug": theme.slug
+        }, progress_callback=report_progress)
+        
+        # 4. Transformer en SiteDefinition avec injection du thème
+        transformer = BriefToSiteTransformer()
+        
+        # GEN-WO-SAVOR-V2: Priorité au secteur de la DB (onboarding) sur celui de l'orchestrateur
+        # L'orchestrateur peut échouer ou retourner un secteur par défaut, mais le secteur 
+        # validé lors de l'onboarding est stocké dans brief.sector et doit prévaloir.
+        resolved_sector = brief.sector or orchestration_result["business_brief"].get("industry_sector") or "default"
+        
+        logger.info("theme_generation_data", 
+                    brief_sector=brief.sector, 
+                    orchestrator_sector=orchestration_result["business_brief"].get("industry_sector"),
+                    resolved_sector=resolved_sector,
+                    theme_slug=theme.slug, 
+                    theme_features=theme.features)
+
+        enriched_brief = BusinessBriefData(
+            business_name=orchestration_result["business_brief"].get("business_name") or brief.business_name or "Projet Sans Nom",
+            sector=resolved_sector,
+            vision=brief.vision,
+            mission=brief.mission,
+            target_audience=brief.target_audience,
+            differentiation=brief.differentiation,
+            value_proposition=brief.value_proposition,
+            location=brief.location or {"country": "Sénégal", "city": "Dakar"},
+            content_generation=orchestration_result.get("content_generation", {}),
+            logo_creation=orchestration_result.get("logo_creation", {}),
+            seo_optimization=orchestration_result.get("seo_optimization", {})
+        )
+        
+        # Le transformateur s'occupe maintenant de configurer le thème proprement
+        site_definition = transformer.transform(enriched_brief, theme=theme)
+        await report_progress("transform", {})
+        
+        # 5. Sauvegarder en Redis pour le frontend
+        await RedisVirtualFileSystem().write_site(
+            session_id,
+            site_definition,
+            ttl=604800  # 7 days (Quick fix for persistence)
+        )
+        
+        # Mettre à jour le statut de la session
+        coaching_session.status = SessionStatusEnum.COMPLETED
+        await db.commit()
+
+    return {
+        "status": "GENERATION_COMPLETED",
+        "session_id": session_id,
+        "site_data": site_definition
+    }
+
+
+job_queue.register_handler(SITE_GENERATION_JOB, run_site_generation_job)
+
+
+def _job_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Vue publique d'un job (sans le payload interne)."""
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "current_node": job.get("current_node"),
+        "progress": job.get("progress", []),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at")
+    }
+
+
+async def _get_owned_job(job_id: str, current_user: User) -> Dict[str, Any]:
+    job = await job_queue.store.get(job_id)
+    if not job or job.get("user_id") != current_user.id or job.get("job_type") != SITE_GENERATION_JOB:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.post("/select", status_code=status.HTTP_202_ACCEPTED)
 async def select_theme_and_generate(
     request: ThemeSelectRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    redis_client: redis.Redis = Depends(get_redis_client)
+    current_user: User = Depends(get_current_user)
 ):
     """
-    Sélectionne un thème et lance la génération finale du site.
+    Sélectionne un thème et lance la génération finale du site en arrière-plan.
+
+    Retourne immédiatement un job_id: la progression est consultable via
+    GET /themes/jobs/{job_id} (polling) ou GET /themes/jobs/{job_id}/events (SSE).
     """
     logger.info("theme_selected_triggering_generation", brief_id=request.brief_id, theme_id=request.theme_id)
     
@@ -146,10 +254,6 @@ async def select_theme_and_generate(
     if not coaching_session:
         raise HTTPException(status_code=404, detail="Coaching session not found")
 
-    # On récupère les données de session depuis Redis car elles contiennent l'onboarding
-    session_data_json = await redis_client.get(f"session:{coaching_session.session_id}")
-    session_data = json.loads(session_data_json) if session_data_json else {}
-
     business_brief_dict = {
         "business_name": brief.business_name,
         "industry_sector": brief.sector,
@@ -161,61 +265,51 @@ async def select_theme_and_generate(
         "location": brief.location or {"country": "Sénégal", "city": "Dakar"}
     }
 
-    # 3. Exécuter l'orchestrateur LangGraph
-    orchestrator = LangGraphOrchestrator()
-    orchestration_result = await orchestrator.run({
-        "user_id": current_user.id,
-        "brief_id": coaching_session.session_id,
-        "business_brief": business_brief_dict,
-        "selected_theme_id": theme.id,
-        "selected_theme_slug": theme.slug
+    # 3. Soumettre la génération à la file de jobs
+    job = await job_queue.enqueue(SITE_GENERATION_JOB, current_user.id, {
+        "session_id": coaching_session.session_id,
+        "coaching_session_pk": coaching_session.id,
+        "brief_id": brief.id,
+        "theme_id": theme.id,
+        "business_brief": business_brief_dict
     })
-    
-    # 4. Transformer en SiteDefinition avec injection du thème
-    transformer = BriefToSiteTransformer()
-    
-    # GEN-WO-SAVOR-V2: Priorité au secteur de la DB (onboarding) sur celui de l'orchestrateur
-    # L'orchestrateur peut échouer ou retourner un secteur par défaut, mais le secteur 
-    # validé lors de l'onboarding est stocké dans brief.sector et doit prévaloir.
-    resolved_sector = brief.sector or orchestration_result["business_brief"].get("industry_sector") or "default"
-    
-    logger.info("theme_generation_data", 
-                brief_sector=brief.sector, 
-                orchestrator_sector=orchestration_result["business_brief"].get("industry_sector"),
-                resolved_sector=resolved_sector,
-                theme_slug=theme.slug, 
-                theme_features=theme.features)
-
-    enriched_brief = BusinessBriefData(
-        business_name=orchestration_result["business_brief"].get("business_name") or brief.business_name or "Projet Sans Nom",
-        sector=resolved_sector,
-        vision=brief.vision,
-        mission=brief.mission,
-        target_audience=brief.target_audience,
-        differentiation=brief.differentiation,
-        value_proposition=brief.value_proposition,
-        location=brief.location or {"country": "Sénégal", "city": "Dakar"},
-        content_generation=orchestration_result.get("content_generation", {}),
-        logo_creation=orchestration_result.get("logo_creation", {}),
-        seo_optimization=orchestration_result.get("seo_optimization", {})
-    )
-    
-    # Le transformateur s'occupe maintenant de configurer le thème proprement
-    site_definition = transformer.transform(enriched_brief, theme=theme)
-    
-    # 5. Sauvegarder en Redis pour le frontend
-    await redis_client.set(
-        f"site:{coaching_session.session_id}", 
-        json.dumps(site_definition), 
-        ex=604800  # 7 days (Quick fix for persistence)
-    )
-    
-    # Mettre à jour le statut de la session
-    coaching_session.status = SessionStatusEnum.COMPLETED
-    await db.commit()
 
     return {
-        "status": "GENERATION_COMPLETED",
+        "status": "GENERATION_QUEUED",
+        "job_id": job["job_id"],
         "session_id": coaching_session.session_id,
-        "site_data": site_definition
+        "status_url": f"{settings.API_V1_STR}/themes/jobs/{job['job_id']}",
+        "events_url": f"{settings.API_V1_STR}/themes/jobs/{job['job_id']}/events"
     }
+
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Statut et progression d'un job de génération (polling)."""
+    job = await _get_owned_job(job_id, current_user)
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Progression d'un job de génération en Server-Sent Events."""
+    await _get_owned_job(job_id, current_user)
+
+    async def event_source():
+        async for event in job_queue.store.stream(job_id):
+            event_type = event.get("event", "message")
+            if event_type == "snapshot":
+                event = _job_response(event)
+            yield f"event: {event_type}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
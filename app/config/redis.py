@@ -1,16 +1,88 @@
+"""Pool Redis asynchrone partagé à portée application"""
+
+from typing import Dict
+
 import redis.asyncio as redis
 import structlog
 from app.config.settings import settings
 
 logger = structlog.get_logger()
 
+
+class RedisPoolManager:
+    """
+    Pools de connexions Redis partagés par toute l'application.
+
+    Ouvert au démarrage (lifespan) et fermé à l'arrêt. Un pool par mode de
+    décodage: les routers manipulent des chaînes (decode_responses=True) alors
+    que le Redis VFS et les agents lisent des octets bruts. Les deux pools
+    partagent les mêmes limites (REDIS_MAX_CONNECTIONS, health check, keepalive).
+
+    Tant que le gestionnaire n'est pas ouvert (scripts, tests unitaires),
+    `get_client()` retombe sur un client autonome, comme auparavant.
+    """
+
+    def __init__(self):
+        self._pools: Dict[bool, redis.ConnectionPool] = {}
+        self._active = False
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    def open(self) -> None:
+        """Active les pools partagés (appelé dans le lifespan FastAPI)."""
+        self._active = True
+        logger.info(
+            "Redis pool opened",
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE
+        )
+
+    def _get_pool(self, decode_responses: bool) -> redis.ConnectionPool:
+        pool = self._pools.get(decode_responses)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+                decode_responses=decode_responses
+            )
+            self._pools[decode_responses] = pool
+        return pool
+
+    def get_client(self, decode_responses: bool = False) -> redis.Redis:
+        """
+        Retourne un client Redis adossé au pool partagé.
+
+        Args:
+            decode_responses: True pour recevoir des str, False pour des bytes
+
+        Returns:
+            Client Redis (léger, le pool de connexions est partagé)
+        """
+        if not self._active:
+            return redis.from_url(settings.REDIS_URL, decode_responses=decode_responses)
+        return redis.Redis(connection_pool=self._get_pool(decode_responses))
+
+    async def aclose(self) -> None:
+        """Déconnecte tous les pools (appelé à l'arrêt de l'application)."""
+        pools, self._pools = self._pools, {}
+        self._active = False
+        for pool in pools.values():
+            try:
+                await pool.disconnect()
+            except Exception as e:
+                logger.warning("Failed to close Redis pool", error=str(e))
+        logger.info("Redis pool closed", pools_closed=len(pools))
+
+
+# Instance globale pour l'application
+redis_pools = RedisPoolManager()
+
+
 async def get_redis_client():
-    """Returns a Redis client."""
-    try:
-        redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-        if await redis_client.ping():
-            logger.info("Successfully connected to Redis.")
-            return redis_client
-    except Exception as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-        return None
\ No newline at end of file
+    """Returns a Redis client backed by the shared pool."""
+    return redis_pools.get_client(decode_responses=True)
@@ -51,6 +51,25 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://redis:6379/0"
     REDIS_GENESIS_AI_DB: int = 0
     REDIS_SESSION_TTL: int = 7200  # 2 hours
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # secondes
+    REDIS_SOCKET_KEEPALIVE: bool = True
+    
+    # Codec des documents Redis VFS (sessions, état utilisateur)
+    VFS_CODEC_SERIALIZER: str = "orjson"  # json (format texte historique)|orjson|msgpack
+    VFS_CODEC_COMPRESSION: str = "zstd"  # none|zstd|lz4
+    VFS_CODEC_COMPRESSION_THRESHOLD: int = 1024  # octets, en dessous pas de compression
+    VFS_CODEC_COMPRESSION_LEVEL: int = 3
+    
+    # Cache L1 in-process des sessions/sites (invalidation Redis pub/sub entre workers)
+    SESSION_L1_CACHE_ENABLED: bool = True
+    SESSION_L1_CACHE_TTL: int = 30  # secondes, borne la fenêtre d'incohérence
+    SESSION_L1_CACHE_MAX_ENTRIES: int = 2048
+
+    # Async Jobs (génération de site en arrière-plan)
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_TTL: int = 86400  # 24 hours
+    JOB_SSE_HEARTBEAT_SECONDS: int = 15
     
     # DigitalCloud360 Integration
     # En développement local: DC360 tourne sur http://localhost:8000 (Docker)
@@ -88,6 +107,111 @@ class Settings(BaseSettings):
     KIMI_BASE_URL: str = "https://api.moonshot.cn"
     TAVILY_BASE_URL: str = "https://api.tavily.com"
     
+    # LLM Response Cache (LRU in-process + Redis)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400  # 24 hours
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3  # Au-delà (ex: 0.7, appels créatifs), les réponses ne sont pas mises en cache
+    
+    # LLM Failover (chaîne de providers + circuit breakers)
+    LLM_RETRY_MAX_ATTEMPTS: int = 2  # tentatives par provider avant de passer au suivant
+    LLM_RETRY_BASE_DELAY: float = 0.5  # secondes, backoff exponentiel avec jitter
+    LLM_RETRY_MAX_DELAY: float = 8.0  # au-delà (ex: Retry-After long), provider suivant
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_WINDOW_SECONDS: float = 60.0
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+    
+    # LLM Hedged Requests (opt-in): duplique un appel qui dépasse le percentile de latence
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGING_PERCENTILE: float = 0.95
+    LLM_HEDGING_MIN_SAMPLES: int = 20  # mesures requises avant d'utiliser le percentile
+    LLM_HEDGING_DEFAULT_DELAY: float = 15.0  # secondes, seuil tant que l'historique est insuffisant
+    LLM_HEDGING_MIN_DELAY: float = 1.0  # secondes, plancher du seuil
+    LLM_LATENCY_WINDOW: int = 200  # latences conservées par (provider, modèle)
+    
+    # Image Scheduler (token bucket RPM/IPM + file de priorité par provider d'images)
+    IMAGE_RATE_LIMIT_RPM: int = 7  # requêtes/min (quota DALL-E 3 du compte OpenAI)
+    IMAGE_RATE_LIMIT_IPM: int = 7  # images/min
+    IMAGE_RATE_LIMIT_REDIS: bool = False  # bucket partagé entre workers via Redis
+    IMAGE_RATE_LIMIT_RETRIES: int = 1  # remises en file après un 429
+    IMAGE_RATE_LIMIT_DEFAULT_PAUSE: float = 20.0  # secondes, pause sur 429 sans Retry-After
+    IMAGE_MAX_CONCURRENCY: int = 4  # générations simultanées par processus
+    IMAGE_DOWNLOAD_TIMEOUT: float = 30.0  # secondes, téléchargement d'une image générée
+    IMAGE_DOWNLOAD_CHUNK_SIZE: int = 65536  # octets lus/écrits par morceau
+    IMAGE_DOWNLOAD_MAX_BYTES: int = 20 * 1024 * 1024  # taille maximale d'une image téléchargée
+    
+    # Image Store (blobs adressés par SHA-256, dédupliqués, backend local ou S3-compatible)
+    IMAGE_STORE_BACKEND: str = "local"  # local | s3
+    IMAGE_STORE_LOCAL_PATH: str = "/app/app/static/images"
+    IMAGE_STORE_PUBLIC_URL: str = "/static/images"  # préfixe des URLs servies (backend local)
+    IMAGE_STORE_S3_BUCKET: str = ""
+    IMAGE_STORE_S3_PREFIX: str = "images/"
+    IMAGE_STORE_S3_ENDPOINT_URL: Optional[str] = None  # MinIO, R2, Spaces...
+    IMAGE_STORE_S3_REGION: Optional[str] = None
+    IMAGE_STORE_S3_PUBLIC_URL: Optional[str] = None  # CDN devant le bucket
+    IMAGE_STORE_GC_GRACE_SECONDS: int = 86400  # blobs récents jamais supprimés (génération en cours)
+    
+    # Image Derivatives (variantes responsive rendues dans un pool de processus, Pillow requis)
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_DERIVATIVE_WIDTHS: List[int] = [480, 960, 1440]
+    IMAGE_DERIVATIVE_FORMATS: List[str] = ["webp"]  # ajouter "avif" si Pillow le supporte
+    IMAGE_DERIVATIVE_QUALITY: int = 80
+    IMAGE_DERIVATIVE_WORKERS: int = 2  # processus de rendu
+    IMAGE_PLACEHOLDER_WIDTH: int = 16  # pixels, placeholder flouté inline
+    
+    # Embeddings (micro-batching des appels OpenAI + cache Redis float16)
+    EMBEDDING_BATCH_SIZE: int = 256  # textes max par appel embeddings
+    EMBEDDING_BATCH_WINDOW: float = 0.01  # secondes d'attente pour regrouper les appels concurrents
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_TTL: int = 2592000  # 30 jours
+    EMBEDDING_DELETE_CHUNK_SIZE: int = 5000  # lignes par DELETE ... RETURNING (purge de compte)
+    
+    # Quota Ledger (admission locale Redis, usage envoyé à DC360 en différé)
+    QUOTA_LEDGER_ENABLED: bool = True
+    QUOTA_PLAN_CACHE_TTL: int = 300  # secondes avant rechargement plan/usage depuis DC360
+    QUOTA_RESERVATION_TTL: int = 900  # place réservée par une génération en cours
+    QUOTA_COUNTED_TTL: int = 3024000  # 35 jours: session_id déjà comptés (idempotence)
+    QUOTA_SYNC_INTERVAL: float = 5.0  # secondes entre deux envois vers DC360
+    QUOTA_SYNC_BATCH_SIZE: int = 100  # usages envoyés par passage
+    QUOTA_SYNC_LOCK_TTL: float = 60.0  # verrou du flusher (un seul worker envoie à la fois)
+    QUOTA_PLAN_KEY_TTL: int = 86400  # plan conservé pour le rate limiter
+    
+    # Rate Limiting (requêtes/minute par plan, GCRA)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT_PLAN: str = "trial"  # utilisateurs au plan inconnu et requêtes anonymes
+    RATE_LIMIT_METHODS: List[str] = ["POST", "PUT", "PATCH", "DELETE"]
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/api/v1/auth/"]
+    RATE_LIMIT_LOCAL_MAX_ENTRIES: int = 10000  # repli en mémoire si Redis échoue
+    RATE_LIMIT_PLAN_RETRY_TTL: int = 60  # DC360 indisponible: plan de repli retenu avant nouvel essai
+    
+    # Vector Search (index HNSW pgvector sur user_embeddings)
+    VECTOR_HNSW_M: int = 16  # voisins par nœud (construction)
+    VECTOR_HNSW_EF_CONSTRUCTION: int = 128  # taille de la liste candidate à la construction
+    VECTOR_HNSW_EF_SEARCH: int = 64  # candidats explorés par requête (rappel vs latence)
+    VECTOR_HNSW_ITERATIVE_SCAN: str = ""  # "relaxed_order" avec pgvector >= 0.8 (recherches filtrées)
+    VECTOR_BACKEND: str = "pgvector"  # "numpy": recherche en mémoire (SQLite, petits déploiements)
+    VECTOR_NUMPY_PATH: str = "data/vector_index"  # fichiers .npy mappés en mémoire ("" = pas de persistance)
+    VECTOR_NUMPY_DTYPE: str = "float32"  # "float16" divise la mémoire par deux
+    VECTOR_NUMPY_OVERSAMPLE: int = 10  # candidats par résultat quand embedding_type/metadata filtrent
+    VECTOR_NUMPY_SYNC_LAG: int = 1000  # ids relus sous max_id à chaque sync (commits dans le désordre)
+    VECTOR_NUMPY_RECONCILE_INTERVAL: float = 300.0  # secondes entre deux comparaisons complètes des ids
+    
+    # Research Cache (recherches marché partagées par secteur/localisation)
+    RESEARCH_CACHE_ENABLED: bool = True
+    RESEARCH_CACHE_TTL: int = 604800  # 7 days, entrée fraîche
+    RESEARCH_CACHE_STALE_TTL: int = 604800  # 7 days supplémentaires servis en stale-while-revalidate
+    RESEARCH_CACHE_WARMUP_TOP_N: int = 20
+    RESEARCH_CACHE_WARMUP_ON_STARTUP: bool = False
+    
+    # HTTP Client Pool (clients httpx partagés par hôte)
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0  # secondes
+    HTTP_CLIENT_DEFAULT_TIMEOUT: float = 60.0  # secondes
+
     # Security & CORS
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
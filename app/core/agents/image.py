@@ -14,10 +14,14 @@ import hashlib
 import json
 import asyncio
 import os
-import httpx
+import tempfile
 from typing import Dict, Any, List, Optional
 from app.core.providers.dalle import DALLEImageProvider
+from app.core.providers.image_scheduler import image_schedulers, IMAGE_PRIORITIES
 from app.core.integrations.redis_fs import RedisVirtualFileSystem
+from app.core.integrations.http_pool import http_clients
+from app.core.integrations.image_store import image_store
+from app.core.integrations.image_derivatives import image_derivatives
 from app.config.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -33,7 +37,7 @@ class ImageAgent:
     - Images features/différenciateurs
     - Cache Redis (TTL 7 jours)
     - Fallback images stock Unsplash
-    - Persistance locale des images (évite expiration liens OpenAI)
+    - Persistance des images dans l'image store dédupliqué (évite expiration liens OpenAI)
     """
     
     # Images de fallback haute qualité (Unsplash)
@@ -51,9 +55,6 @@ class ImageAgent:
         "feature": "1024x1024",   # Carré pour features
         "gallery": "1024x1024"    # Carré pour galerie
     }
-
-    # Dossier de stockage local
-    LOCAL_STORAGE_PATH = "/app/app/static/images"
     
     def __init__(self):
         self.dalle_provider = DALLEImageProvider(
@@ -61,34 +62,85 @@ class ImageAgent:
             model="dall-e-3"
         )
         self.redis_fs = RedisVirtualFileSystem()
+        # Blobs adressés par SHA-256 (backend local ou S3-compatible)
+        self.image_store = image_store
         
-        # Ensure local storage exists
-        os.makedirs(self.LOCAL_STORAGE_PATH, exist_ok=True)
-        
-        logger.info("ImageAgent initialized with DALL-E 3 and local persistence")
+        logger.info("ImageAgent initialized with DALL-E 3 and content-addressed image store")
     
-    async def _download_and_save_image(self, url: str, filename: str) -> Optional[str]:
-        """Télécharge l'image depuis l'URL et la sauvegarde localement."""
+    async def _download_and_save_image(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Télécharge l'image depuis l'URL et la stocke dans l'image store.
+
+        Le corps est lu par morceaux et écrit dans un fichier temporaire via le
+        pool de threads (aucune écriture disque dans la boucle d'événements),
+        en calculant son SHA-256 au passage: la mémoire reste bornée à un
+        morceau et des octets déjà stockés ne sont pas dupliqués. Les dérivés
+        responsive (WebP/AVIF multi-largeurs) sont rendus depuis ce fichier
+        avant publication de l'original.
+
+        Returns:
+            {"image_url": URL stockée, "image_set": variantes ou None}, None si échec
+        """
+        tmp_file = None
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(url, timeout=30.0)
-                if response.status_code == 200:
-                    filepath = os.path.join(self.LOCAL_STORAGE_PATH, filename)
-                    
-                    # Write file synchronously (fast enough for images) to avoid aiofiles dependency
-                    with open(filepath, mode='wb') as f:
-                        f.write(response.content)
-                    
-                    # Retourne l'URL relative accessible via l'API
-                    # Assumant que /static est monté dans FastAPI
-                    return f"/static/images/{filename}"
-                else:
-                    logger.error("Failed to download image", status_code=response.status_code, url=url)
-                    return None
+            async with http_clients.client(url, timeout=settings.IMAGE_DOWNLOAD_TIMEOUT) as client:
+                async with client.stream("GET", url, follow_redirects=True) as response:
+                    if response.status_code != 200:
+                        logger.error("Failed to download image", status_code=response.status_code, url=url)
+                        return None
+
+                    content_type = response.headers.get("content-type", "image/png")
+                    tmp_file = await asyncio.to_thread(
+                        tempfile.NamedTemporaryFile,
+                        mode="wb",
+                        dir=self.image_store.staging_dir,
+                        prefix=".image.",
+                        suffix=".part",
+                        delete=False
+                    )
+                    digest = hashlib.sha256()
+                    size = 0
+                    async for chunk in response.aiter_bytes(settings.IMAGE_DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > settings.IMAGE_DOWNLOAD_MAX_BYTES:
+                            logger.error("Image download exceeds size limit", url=url, max_bytes=settings.IMAGE_DOWNLOAD_MAX_BYTES)
+                            await self._discard_partial(tmp_file)
+                            return None
+                        digest.update(chunk)
+                        await asyncio.to_thread(tmp_file.write, chunk)
+
+            await asyncio.to_thread(self._flush_file, tmp_file)
+            image_set = await image_derivatives.process(tmp_file.name, self.image_store)
+            stored_url = await self.image_store.put_file(tmp_file.name, digest.hexdigest(), content_type)
+            if image_set:
+                image_set = {"src": stored_url, **image_set}
+            logger.info("Image saved", url=stored_url, size_bytes=size, derivatives=bool(image_set))
+            return {"image_url": stored_url, "image_set": image_set}
         except Exception as e:
             logger.error("Error saving image locally", error=str(e), url=url)
+            if tmp_file is not None:
+                await self._discard_partial(tmp_file)
             return None
 
+    @staticmethod
+    def _flush_file(tmp_file) -> None:
+        """Flush + fsync du fichier temporaire avant publication (thread)."""
+        tmp_file.flush()
+        os.fsync(tmp_file.fileno())
+        tmp_file.close()
+
+    @staticmethod
+    async def _discard_partial(tmp_file) -> None:
+        """Supprime un fichier temporaire abandonné (erreur ou taille excessive)."""
+        def _discard():
+            tmp_file.close()
+            if os.path.exists(tmp_file.name):
+                os.unlink(tmp_file.name)
+        try:
+            await asyncio.to_thread(_discard)
+        except OSError as e:
+            logger.warning("Failed to remove partial image", path=tmp_file.name, error=str(e))
+
     async def run(
         self,
         business_name: str,
@@ -130,25 +182,30 @@ class ImageAgent:
                 style=style
             )
             
-            # 3. Générer via DALL-E
+            # 3. Générer via DALL-E (file de priorité + quota RPM/IPM)
             size = self.IMAGE_SIZES.get(image_type, "1024x1024")
             quality = "hd" if image_type == "hero" else "standard"
             
-            result = await self.dalle_provider.generate_image(
-                prompt=prompt,
-                size=size,
-                quality=quality
+            result = await image_schedulers.get("dalle").run(
+                lambda: self.dalle_provider.generate_image(
+                    prompt=prompt,
+                    size=size,
+                    quality=quality
+                ),
+                priority=IMAGE_PRIORITIES.get(image_type, IMAGE_PRIORITIES["gallery"])
             )
             
             # 4. Persistance Locale
             image_url = result.get("image_url")
             local_url = None
+            image_set = None
             
             if image_url:
-                # Générer un nom de fichier unique (sanitize colons for Windows compatibility)
-                safe_key = cache_key.replace(":", "_")
-                filename = f"{safe_key}_{hashlib.md5(image_url.encode()).hexdigest()[:8]}.png"
-                local_url = await self._download_and_save_image(image_url, filename)
+                # Nom = SHA-256 du contenu (dédupliqué entre clés de cache)
+                saved = await self._download_and_save_image(image_url)
+                if saved:
+                    local_url = saved["image_url"]
+                    image_set = saved["image_set"]
             
             # Si le téléchargement échoue, on garde l'URL DALL-E (qui expirera...)
             final_url = local_url if local_url else image_url
@@ -157,6 +214,7 @@ class ImageAgent:
             output = {
                 "image_url": final_url,
                 "original_url": image_url, # On garde l'original au cas où
+                "image_set": image_set,  # Variantes responsive (srcset + placeholder)
                 "metadata": {
                     **result.get("metadata", {}),
                     "agent": "ImageAgent",
@@ -212,6 +270,9 @@ class ImageAgent:
     ) -> Dict[str, Any]:
         """
         Génère toutes les images nécessaires pour un site en PARALLÈLE.
+        
+        Les appels DALL-E passent par le scheduler d'images: le hero part en
+        premier, les services puis les features suivent au rythme du quota.
         """
         
         logger.info(
@@ -258,8 +319,8 @@ class ImageAgent:
             ))
             
         # Execute all in parallel
-        # Note: Be mindful of rate limits. DALL-E has RPM limits.
-        # If rate limited, individual calls might fail and fallback to stock images, which is handled in run()
+        # Le scheduler d'images applique les limites RPM/IPM de DALL-E; un 429 remet
+        # la requête en file avant le fallback image stock géré dans run()
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Process results
@@ -293,6 +354,8 @@ class ImageAgent:
                 idx += 1
         
         # Update stats & images
+        # image_variants: URL -> imageSet, repris par le transformer (srcset)
+        images["image_variants"] = {}
         if hero_result:
             images["hero_image"] = hero_result["image_url"]
             self._update_stats(stats, hero_result)
@@ -306,6 +369,10 @@ class ImageAgent:
         for res in feature_results:
             images["feature_images"].append(res["image_url"])
             self._update_stats(stats, res)
+        
+        for res in [hero_result, *service_results, *feature_results]:
+            if res and res.get("image_set"):
+                images["image_variants"][res["image_url"]] = res["image_set"]
             
         images["generation_stats"] = stats
         
@@ -407,6 +474,7 @@ High-quality, suitable for portfolio or gallery section.
         try:
             cache_data = {
                 "image_url": data.get("image_url"),
+                "image_set": data.get("image_set"),
                 "metadata": data.get("metadata", {})
             }
             await self.redis_fs.write_file(
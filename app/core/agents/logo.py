@@ -3,6 +3,7 @@ import hashlib
 import json
 from typing import Optional, Dict, Any
 from app.core.providers.dalle import DALLEImageProvider
+from app.core.providers.image_scheduler import image_schedulers, IMAGE_PRIORITIES
 from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.config.settings import settings
 from app.utils.exceptions import AgentException
@@ -79,13 +80,16 @@ class LogoAgent:
                 style=adapted_style
             )
             
-            # 3. Générer logo via DALL-E 3
-            logo_result = await self.dalle_provider.generate_logo(
-                business_name=company_name,
-                industry=industry,
-                style=adapted_style,
-                quality="hd",
-                size="1024x1024"
+            # 3. Générer logo via DALL-E 3 (quota RPM/IPM partagé avec ImageAgent)
+            logo_result = await image_schedulers.get("dalle").run(
+                lambda: self.dalle_provider.generate_logo(
+                    business_name=company_name,
+                    industry=industry,
+                    style=adapted_style,
+                    quality="hd",
+                    size="1024x1024"
+                ),
+                priority=IMAGE_PRIORITIES["logo"]
             )
             
             # 4. Enrichir avec métadonnées agent
@@ -17,6 +17,7 @@ from datetime import datetime
 
 from app.core.providers.factory import ProviderFactory
 from app.core.providers.base import BaseSearchProvider, BaseLLMProvider
+from app.core.deep_agents.sub_agents.research_cache import get_research_cache
 from app.utils.exceptions import AgentException
 
 logger = structlog.get_logger(__name__)
@@ -51,6 +52,9 @@ class ResearchSubAgent:
             override_model="deepseek-chat"  # Use correct Deepseek model
         )
         
+        # Cache partagé des recherches (secteur/localisation), tous utilisateurs
+        self.research_cache = get_research_cache()
+        
         # Domaines africains prioritaires pour recherche
         self.african_domains = [
             "africanentrepreneur.com",
@@ -97,6 +101,8 @@ class ResearchSubAgent:
         )
         
         try:
+            await self.research_cache.record_request(business_context)
+            
             # Recherche parallèle sources multiples
             search_tasks = [
                 self._search_competitors(business_context),
@@ -150,6 +156,41 @@ class ResearchSubAgent:
             # Fallback gracieux
             return await self._fallback_analysis(business_context)
     
+    async def warm_research_cache(self, top_n: int, progress_callback=None) -> Dict[str, Any]:
+        """
+        Préchauffe le cache partagé pour les couples secteur/localisation les
+        plus demandés: les entrées absentes sont recherchées, les entrées
+        périmées rafraîchies.
+        
+        Args:
+            top_n: Nombre de couples à préchauffer
+            progress_callback: Callback (node, data) optionnel (JobQueue)
+            
+        Returns:
+            Dict avec le nombre de couples préchauffés
+        """
+        if not self.research_cache.is_active:
+            logger.warning("Research cache inactive, warm-up skipped")
+            return {'warmed_pairs': 0}
+        
+        contexts = await self.research_cache.top_pairs(top_n)
+        for context in contexts:
+            await asyncio.gather(
+                self._search_competitors(context),
+                self._search_market_trends(context),
+                self._search_pricing_data(context),
+                self._search_opportunities(context)
+            )
+            await self.research_cache.drain()
+            if progress_callback:
+                await progress_callback(
+                    f"{context['industry_sector']} / {context['location']['city']}",
+                    {'country': context['location']['country']}
+                )
+        
+        logger.info("Research cache warm-up completed", warmed_pairs=len(contexts))
+        return {'warmed_pairs': len(contexts)}
+    
     async def _search_competitors(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Recherche concurrents directs et indirects.
@@ -170,11 +211,15 @@ class ResearchSubAgent:
             
             logger.info("Searching competitors", query=query)
             
-            competitors_data = await self.search_provider.search(
-                query=query,
-                max_results=8,
-                search_depth="advanced",
-                include_domains=self.african_domains
+            competitors_data = await self.research_cache.get_or_fetch(
+                context,
+                "competitors",
+                lambda: self.search_provider.search(
+                    query=query,
+                    max_results=8,
+                    search_depth="advanced",
+                    include_domains=self.african_domains
+                )
             )
             
             return {
@@ -211,11 +256,15 @@ class ResearchSubAgent:
             
             logger.info("Searching market trends", query=query)
             
-            trends_data = await self.search_provider.search(
-                query=query,
-                max_results=5,
-                search_depth="basic",
-                include_domains=["statista.com", "mordorintelligence.com"] + self.african_domains
+            trends_data = await self.research_cache.get_or_fetch(
+                context,
+                "trends",
+                lambda: self.search_provider.search(
+                    query=query,
+                    max_results=5,
+                    search_depth="basic",
+                    include_domains=["statista.com", "mordorintelligence.com"] + self.african_domains
+                )
             )
             
             return {
@@ -252,11 +301,15 @@ class ResearchSubAgent:
             
             logger.info("Searching pricing data", query=query)
             
-            pricing_data = await self.search_provider.search(
-                query=query,
-                max_results=6,
-                search_depth="basic",
-                exclude_domains=["wikipedia.org", "pinterest.com"]
+            pricing_data = await self.research_cache.get_or_fetch(
+                context,
+                "pricing",
+                lambda: self.search_provider.search(
+                    query=query,
+                    max_results=6,
+                    search_depth="basic",
+                    exclude_domains=["wikipedia.org", "pinterest.com"]
+                )
             )
             
             return {
@@ -292,10 +345,14 @@ class ResearchSubAgent:
             
             logger.info("Searching opportunities", query=query)
             
-            opportunities_data = await self.search_provider.search(
-                query=query,
-                max_results=5,
-                search_depth="basic"
+            opportunities_data = await self.research_cache.get_or_fetch(
+                context,
+                "opportunities",
+                lambda: self.search_provider.search(
+                    query=query,
+                    max_results=5,
+                    search_depth="basic"
+                )
             )
             
             return {
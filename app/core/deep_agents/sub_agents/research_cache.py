@@ -0,0 +1,262 @@
+"""
+Research Cache - Cache partagé des recherches marché
+
+Les recherches web du ResearchSubAgent ne dépendent que du secteur et de la
+localisation: un même "restaurant / Dakar / Sénégal" est recherché une seule
+fois pour tous les utilisateurs.
+
+    - Clé: tuple normalisé (secteur, ville, pays, type de requête); les parties
+      qui n'entrent pas dans la requête d'un type sont neutralisées ("*")
+    - TTL configurable puis fenêtre stale-while-revalidate: une entrée périmée
+      est servie immédiatement pendant qu'un rafraîchissement part en tâche de fond
+    - Popularité des couples secteur/localisation (sorted set) pour le warm-up
+      des N plus demandés
+
+Actif quand le pool Redis applicatif est ouvert (lifespan); sinon chaque
+recherche est exécutée directement.
+"""
+
+import asyncio
+import json
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+RESEARCH_CACHE_REQUESTS = Counter(
+    'genesis_ai_research_cache_requests_total',
+    'Shared market research cache lookups',
+    ['query_type', 'result']
+)
+
+# Parties du contexte utilisées par chaque type de requête du ResearchSubAgent
+QUERY_SCOPES: Dict[str, Tuple[str, ...]] = {
+    "competitors": ("sector", "city", "country"),
+    "trends": ("sector", "country"),
+    "pricing": ("sector", "country"),
+    "opportunities": ("sector",),
+}
+
+
+def normalize_key_part(value: Optional[str]) -> str:
+    """Minuscules, sans accents, espaces réduits: "Sénégal " -> "senegal"."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def extract_location(context: Dict[str, Any]) -> Dict[str, str]:
+    """Secteur / ville / pays tels qu'utilisés par les requêtes de recherche."""
+    location = context.get("location") or {}
+    return {
+        "sector": context.get("industry_sector", "business") or "business",
+        "city": location.get("city", "") or "",
+        "country": location.get("country", "Afrique") or "Afrique",
+    }
+
+
+class ResearchCache:
+    """
+    Cache Redis partagé des résultats de recherche par secteur/localisation.
+
+    Usage:
+        data = await research_cache.get_or_fetch(
+            context, "competitors", lambda: search_provider.search(query=...)
+        )
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None
+    ):
+        self._redis = redis_client
+        self.ttl = ttl or settings.RESEARCH_CACHE_TTL
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.RESEARCH_CACHE_STALE_TTL
+        self.key_prefix = "genesis:research"
+        self.popularity_key = f"{self.key_prefix}:popularity"
+        self.pairs_key = f"{self.key_prefix}:pairs"
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        if redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    @property
+    def is_active(self) -> bool:
+        return settings.RESEARCH_CACHE_ENABLED and self._get_redis() is not None
+
+    def make_key(self, context: Dict[str, Any], query_type: str) -> str:
+        parts = extract_location(context)
+        scope = QUERY_SCOPES.get(query_type, ("sector", "city", "country"))
+        key_parts = [
+            normalize_key_part(parts[name]) if name in scope else "*"
+            for name in ("sector", "city", "country")
+        ]
+        return f"{self.key_prefix}:{':'.join(key_parts)}:{query_type}"
+
+    async def get_or_fetch(
+        self,
+        context: Dict[str, Any],
+        query_type: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Retourne le résultat en cache (frais ou périmé) ou exécute `fetch`.
+
+        Une entrée périmée est servie telle quelle et rafraîchie en tâche de
+        fond; un miss est exécuté une seule fois par processus (single-flight).
+        """
+        if not self.is_active:
+            return await fetch()
+
+        key = self.make_key(context, query_type)
+        entry = await self._read(key)
+
+        if entry is not None:
+            age = time.time() - entry.get("cached_at", 0)
+            if age < self.ttl:
+                RESEARCH_CACHE_REQUESTS.labels(query_type=query_type, result="hit").inc()
+                return entry["data"]
+
+            RESEARCH_CACHE_REQUESTS.labels(query_type=query_type, result="stale").inc()
+            self._schedule_refresh(key, query_type, fetch)
+            return entry["data"]
+
+        RESEARCH_CACHE_REQUESTS.labels(query_type=query_type, result="miss").inc()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def record_request(self, context: Dict[str, Any]) -> None:
+        """Incrémente la popularité du couple secteur/localisation (warm-up)."""
+        redis_client = self._get_redis()
+        if redis_client is None or not settings.RESEARCH_CACHE_ENABLED:
+            return
+
+        parts = extract_location(context)
+        member = ":".join(normalize_key_part(parts[name]) for name in ("sector", "city", "country"))
+        try:
+            await redis_client.zincrby(self.popularity_key, 1, member)
+            await redis_client.hsetnx(self.pairs_key, member, json.dumps(parts, ensure_ascii=False))
+        except Exception as e:
+            logger.warning("Research popularity update failed", error=str(e))
+
+    async def top_pairs(self, limit: int) -> List[Dict[str, str]]:
+        """Couples secteur/localisation les plus demandés (contextes de recherche)."""
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return []
+
+        members = await redis_client.zrevrange(self.popularity_key, 0, limit - 1)
+        if not members:
+            return []
+        raw_pairs = await redis_client.hmget(self.pairs_key, members)
+
+        contexts = []
+        for raw in raw_pairs:
+            if raw is None:
+                continue
+            parts = json.loads(raw)
+            contexts.append({
+                "industry_sector": parts["sector"],
+                "location": {"city": parts["city"], "country": parts["country"]},
+            })
+        return contexts
+
+    async def drain(self) -> None:
+        """Attend la fin des recherches et rafraîchissements en cours."""
+        while True:
+            pending = [task for task in self._inflight.values() if not task.done()]
+            if not pending:
+                return
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _schedule_refresh(self, key: str, query_type: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            # Verrou court: un seul worker rafraîchit une clé donnée
+            redis_client = self._get_redis()
+            try:
+                acquired = await redis_client.set(f"{key}:refresh", "1", nx=True, ex=60)
+            except Exception:
+                acquired = True
+            if not acquired:
+                return None
+            logger.info("Refreshing stale research cache entry", query_type=query_type, key=key)
+            try:
+                return await self._fetch_and_store(key, fetch)
+            except Exception as e:
+                # L'entrée périmée reste servie jusqu'au prochain essai
+                logger.warning("Research cache refresh failed", key=key, error=str(e))
+                return None
+
+        task = asyncio.create_task(refresh())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        data = await fetch()
+        if data:
+            await self._write(key, data)
+        return data
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._get_redis().get(key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning("Research cache read failed", key=key, error=str(e))
+            return None
+
+    async def _write(self, key: str, data: Dict[str, Any]) -> None:
+        try:
+            await self._get_redis().set(
+                key,
+                json.dumps({"cached_at": time.time(), "data": data}, ensure_ascii=False, default=str),
+                ex=self.ttl + self.stale_ttl
+            )
+        except Exception as e:
+            logger.warning("Research cache write failed", key=key, error=str(e))
+
+
+_research_cache: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> ResearchCache:
+    """Cache de recherche partagé par tous les ResearchSubAgent du processus."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache()
+    return _research_cache
+
+
+async def run_research_cache_warmup(job: Dict[str, Any], report_progress) -> Dict[str, Any]:
+    """
+    Handler JobQueue: préchauffe le cache pour les N couples secteur/localisation
+    les plus demandés (entrées absentes ou périmées).
+    """
+    from app.core.orchestration.container import agent_container
+
+    top_n = job["payload"].get("top_n") or settings.RESEARCH_CACHE_WARMUP_TOP_N
+    research_agent = agent_container.orchestrator.research_agent
+    return await research_agent.warm_research_cache(top_n, progress_callback=report_progress)
@@ -4,6 +4,7 @@ import httpx
 from typing import Dict, Any, Optional
 import structlog
 from app.config.settings import settings
+from .http_pool import http_clients
 
 logger = structlog.get_logger()
 
@@ -23,7 +24,7 @@ class DigitalCloud360APIClient:
     async def health_check(self) -> bool:
         """Vérifier connexion DigitalCloud360 API"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.get(
                     f"{self.base_url}/health",
                     headers=self.headers
@@ -41,7 +42,7 @@ class DigitalCloud360APIClient:
     async def get_user_profile(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Récupérer profil utilisateur DigitalCloud360"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/users/{user_id}/profile",
                     headers=self.headers
@@ -64,7 +65,7 @@ class DigitalCloud360APIClient:
     async def create_website(self, business_brief: Dict[str, Any]) -> Dict[str, Any]:
         """Créer site web depuis brief business"""
         try:
-            async with httpx.AsyncClient(timeout=60) as client:  # Timeout plus long pour création site
+            async with http_clients.client(self.base_url, timeout=60) as client:  # Timeout plus long pour création site
                 response = await client.post(
                     f"{self.base_url}/api/v1/websites",
                     headers=self.headers,
@@ -99,7 +100,7 @@ class DigitalCloud360APIClient:
     async def update_website(self, website_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Mettre à jour un site web existant"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.put(
                     f"{self.base_url}/api/v1/websites/{website_id}",
                     headers=self.headers,
@@ -131,7 +132,7 @@ class DigitalCloud360APIClient:
     async def get_website_status(self, website_id: str) -> Optional[Dict[str, Any]]:
         """Récupérer statut d'un site web"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/websites/{website_id}/status",
                     headers=self.headers
@@ -151,7 +152,7 @@ class DigitalCloud360APIClient:
     async def validate_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Valider JWT token DigitalCloud360"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/api/v1/auth/validate",
                     headers=self.headers,
@@ -182,7 +183,7 @@ class DigitalCloud360APIClient:
                 - subscription_status: str (active|cancelled|expired)
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.get(
                     f"{self.base_url}/api/v1/users/{user_id}/subscription",
                     headers=self.headers
@@ -231,7 +232,7 @@ class DigitalCloud360APIClient:
             Dict avec genesis_sessions_used mis à jour
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/api/v1/users/{user_id}/genesis-usage",
                     headers=self.headers,
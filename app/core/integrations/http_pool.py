@@ -0,0 +1,151 @@
+"""Registre partagé de clients HTTP poolés (httpx, HTTP/2, keep-alive)"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+import httpx
+import structlog
+
+from app.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+try:  # HTTP/2 nécessite le paquet h2 (extra httpx[http2])
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    HTTP2_AVAILABLE = False
+
+
+class PooledClientView:
+    """
+    Vue sur un client poolé qui applique un timeout par appel.
+
+    Le client sous-jacent est partagé entre plusieurs appelants aux timeouts
+    différents : on injecte le timeout à chaque requête plutôt que de modifier
+    le client.
+    """
+
+    _REQUEST_METHODS = ("request", "get", "post", "put", "patch", "delete", "head", "options", "stream")
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Optional[Union[float, httpx.Timeout]] = None):
+        self._client = client
+        self._timeout = timeout
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name in self._REQUEST_METHODS and self._timeout is not None:
+            def with_timeout(*args, **kwargs):
+                kwargs.setdefault("timeout", self._timeout)
+                return attr(*args, **kwargs)
+            return with_timeout
+        return attr
+
+
+class HTTPClientRegistry:
+    """
+    Registre de clients httpx.AsyncClient partagés, un pool par hôte.
+
+    Ouvert au démarrage de l'application (lifespan) et fermé à l'arrêt.
+    Tant que le registre n'est pas ouvert (scripts, tests unitaires), `client()`
+    retombe sur un client éphémère, comme avant l'introduction du pool.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._active = False
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    def open(self) -> None:
+        """Active le pooling (appelé dans le lifespan FastAPI)."""
+        self._active = True
+        logger.info(
+            "HTTP client registry opened",
+            http2=settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE,
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+        )
+
+    async def aclose(self) -> None:
+        """Ferme proprement tous les pools (appelé à l'arrêt de l'application)."""
+        clients, self._clients = self._clients, {}
+        self._active = False
+        for origin, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Failed to close pooled HTTP client", origin=origin, error=str(e))
+        logger.info("HTTP client registry closed", pools_closed=len(clients))
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        """Clé de pool: schéma + hôte + port."""
+        parsed = httpx.URL(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+
+    def _create_client(self, origin: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY
+        )
+        http2 = settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+        logger.info("Creating pooled HTTP client", origin=origin, http2=http2)
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=limits,
+            timeout=settings.HTTP_CLIENT_DEFAULT_TIMEOUT
+        )
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Retourne le client poolé associé à l'hôte de `url` (créé à la demande).
+
+        Args:
+            url: URL ou base URL du service distant
+
+        Returns:
+            Client httpx partagé pour cet hôte
+        """
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._create_client(origin)
+            self._clients[origin] = client
+        return client
+
+    @asynccontextmanager
+    async def client(
+        self,
+        url: str,
+        timeout: Optional[Union[float, httpx.Timeout]] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Fournit un client HTTP pour `url` sans le fermer en sortie.
+
+        Usage:
+            async with http_clients.client(self.base_url, timeout=30) as client:
+                response = await client.post(f"{self.base_url}/search", json=payload)
+        """
+        if not self._active:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                yield client
+            return
+
+        yield PooledClientView(self.get_client(url), timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques du registre (monitoring)."""
+        return {
+            "active": self._active,
+            "pools": sorted(self._clients.keys()),
+            "http2": settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+        }
+
+
+# Instance globale pour l'application
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,226 @@
+"""
+Image Derivatives - variantes responsive des images générées
+
+Les PNG DALL-E (1792x1024, 1024x1024) étaient servis en taille réelle, y
+compris sur mobile. Après téléchargement, chaque image est déclinée en
+WebP (et AVIF si activé et supporté) à plusieurs largeurs, plus un
+placeholder flouté minuscule (data URI) affiché pendant le chargement.
+
+Le rendu (Pillow, CPU) tourne dans un pool de processus pour ne bloquer ni
+la boucle d'événements ni le GIL; les fichiers produits sont ensuite publiés
+dans l'image store (adressés par SHA-256 comme l'original).
+
+Résultat (champ `imageSet` des blocs du SiteDefinition):
+    {
+        "src": "/static/images/<sha>.png",
+        "width": 1792, "height": 1024,
+        "placeholder": "data:image/webp;base64,...",
+        "sources": [{"type": "image/webp", "srcset": "<url> 480w, <url> 960w, ..."}]
+    }
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import structlog
+from prometheus_client import Histogram
+
+from app.config.settings import settings
+from app.core.integrations.image_store import _unlink_quietly
+
+logger = structlog.get_logger(__name__)
+
+try:  # rendu des dérivés (optionnel)
+    from PIL import Image, ImageFilter, features
+    PIL_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    PIL_AVAILABLE = False
+
+# Prometheus metrics
+IMAGE_DERIVATIVE_DURATION = Histogram(
+    'genesis_ai_image_derivatives_seconds',
+    'Time to render and store responsive image derivatives',
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+
+FORMAT_CONTENT_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+# Ordre des <source>: le navigateur prend le premier format supporté
+_FORMAT_PREFERENCE = ["avif", "webp"]
+
+
+def supported_formats(formats: List[str]) -> List[str]:
+    """Formats demandés que Pillow sait encoder dans ce processus."""
+    if not PIL_AVAILABLE:
+        return []
+    available = []
+    for fmt in formats:
+        if fmt not in FORMAT_CONTENT_TYPES:
+            continue
+        if fmt == "avif" and not features.check("avif"):
+            continue
+        available.append(fmt)
+    return available
+
+
+def render_derivatives(
+    source_path: str,
+    staging_dir: Optional[str],
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+    placeholder_width: int
+) -> Dict[str, Any]:
+    """
+    Rend les variantes d'une image (exécuté dans un processus du pool).
+
+    Les largeurs supérieures à l'original sont ignorées; l'original est
+    toujours décliné à sa propre largeur. Chaque variante est écrite dans
+    `staging_dir` et accompagnée de son SHA-256. En cas d'échec, les
+    fichiers déjà écrits sont supprimés (l'appelant ne les voit jamais).
+    """
+    variants = []
+    try:
+        with Image.open(source_path) as source:
+            source.load()
+            image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+
+        width, height = image.size
+        targets = sorted({w for w in widths if w < width} | {width})
+
+        for fmt in formats:
+            for target in targets:
+                resized = image if target == width else image.resize(
+                    (target, max(1, round(height * target / width))),
+                    Image.LANCZOS
+                )
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=quality)
+                data = buffer.getvalue()
+                with tempfile.NamedTemporaryFile(dir=staging_dir, prefix=".derivative.", suffix=".part", delete=False) as tmp:
+                    variants.append({
+                        "path": tmp.name,
+                        "format": fmt,
+                        "width": target,
+                        "digest": hashlib.sha256(data).hexdigest(),
+                    })
+                    tmp.write(data)
+
+        # Placeholder: quelques pixels flous, inline dans le SiteDefinition
+        tiny = image.resize(
+            (placeholder_width, max(1, round(height * placeholder_width / width))),
+            Image.BILINEAR
+        ).filter(ImageFilter.GaussianBlur(1))
+        buffer = io.BytesIO()
+        tiny.save(buffer, format="WEBP", quality=30)
+        placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+    except BaseException:
+        for variant in variants:
+            _unlink_quietly(variant["path"])
+        raise
+
+    return {"width": width, "height": height, "variants": variants, "placeholder": placeholder}
+
+
+class ImageDerivativePipeline:
+    """
+    Post-traitement des images: dérivés WebP/AVIF multi-largeurs + placeholder.
+
+    Le pool de processus est créé à la première image et fermé dans le
+    lifespan. Sans Pillow (ou si désactivé), `process()` retourne None et
+    les blocs gardent leur seule URL `image`.
+
+    Usage:
+        image_set = await image_derivatives.process(tmp_path, image_store)
+    """
+
+    def __init__(
+        self,
+        widths: Optional[List[int]] = None,
+        formats: Optional[List[str]] = None,
+        quality: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.enabled = settings.IMAGE_DERIVATIVES_ENABLED if enabled is None else enabled
+        self.widths = widths or settings.IMAGE_DERIVATIVE_WIDTHS
+        self.formats = supported_formats(formats or settings.IMAGE_DERIVATIVE_FORMATS)
+        self.quality = quality or settings.IMAGE_DERIVATIVE_QUALITY
+        self.max_workers = max_workers or settings.IMAGE_DERIVATIVE_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def is_available(self) -> bool:
+        return self.enabled and PIL_AVAILABLE and bool(self.formats)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info("Image derivative process pool started", workers=self.max_workers, formats=self.formats)
+        return self._executor
+
+    async def process(self, source_path: str, store: Any) -> Optional[Dict[str, Any]]:
+        """
+        Rend et publie les dérivés de `source_path` (le fichier source est conservé).
+
+        Returns:
+            imageSet sans `src` (ajouté par l'appelant), ou None si indisponible/échec
+        """
+        if not self.is_available:
+            return None
+
+        loop = asyncio.get_running_loop()
+        with IMAGE_DERIVATIVE_DURATION.time():
+            try:
+                rendered = await loop.run_in_executor(
+                    self._get_executor(),
+                    render_derivatives,
+                    source_path,
+                    store.staging_dir,
+                    self.widths,
+                    self.formats,
+                    self.quality,
+                    settings.IMAGE_PLACEHOLDER_WIDTH
+                )
+            except Exception as e:
+                logger.warning("Image derivative rendering failed", path=source_path, error=str(e))
+                return None
+
+            srcsets: Dict[str, List[str]] = {}
+            try:
+                for variant in rendered["variants"]:
+                    content_type = FORMAT_CONTENT_TYPES[variant["format"]]
+                    url = await store.put_file(variant["path"], variant["digest"], content_type)
+                    srcsets.setdefault(content_type, []).append(f"{url} {variant['width']}w")
+            except Exception as e:
+                logger.warning("Failed to store image derivatives", path=source_path, error=str(e))
+                for variant in rendered["variants"]:
+                    await asyncio.to_thread(_unlink_quietly, variant["path"])
+                return None
+
+        ordered = sorted(srcsets, key=lambda t: _FORMAT_PREFERENCE.index(t.split("/")[1]))
+        return {
+            "width": rendered["width"],
+            "height": rendered["height"],
+            "placeholder": rendered["placeholder"],
+            "sources": [{"type": content_type, "srcset": ", ".join(srcsets[content_type])} for content_type in ordered],
+        }
+
+    def shutdown(self) -> None:
+        """Ferme le pool de processus (appelé à l'arrêt de l'application)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Image derivative process pool stopped")
+
+
+# Instance globale pour l'application
+image_derivatives = ImageDerivativePipeline()
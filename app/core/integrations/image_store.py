@@ -0,0 +1,428 @@
+"""
+Image Store - blobs d'images adressés par contenu (SHA-256)
+
+Les images générées étaient nommées `{cache_key}_{md5(url)[:8]}.png`: des
+octets identiques produits pour deux clés étaient stockés deux fois et rien
+n'était jamais supprimé. Chaque image est désormais stockée une seule fois
+sous `{sha256}{ext}`, sur un backend interchangeable:
+
+    - LocalImageBackend: dossier local servi sous /static/images
+    - S3ImageBackend: bucket S3-compatible (AWS, MinIO, R2...) via boto3
+
+Références: le hash Redis `genesis:images:refs` compte, par blob, les
+références connues (incrémenté à chaque `put`, recalculé à chaque sweep).
+Le sweep (`collect_garbage`) marque les blobs cités par les documents vivants
+(définitions de site, cache ImageAgent) et supprime les autres, au-delà d'un
+délai de grâce qui protège les générations en cours.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import Counter as RefCounter
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
+
+import orjson
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+
+logger = structlog.get_logger(__name__)
+
+try:  # backend S3 (optionnel)
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    BOTO3_AVAILABLE = False
+
+# Prometheus metrics
+IMAGE_STORE_OPERATIONS = Counter(
+    'genesis_ai_image_store_operations_total',
+    'Content-addressed image store operations',
+    ['operation', 'result']
+)
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+}
+
+# Contenu immuable: la clé change avec les octets
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Un digest SHA-256 cité dans un document (URL locale, S3 ou CDN)
+_DIGEST_RE = re.compile(rb"(?<![0-9a-f])([0-9a-f]{64})(?![0-9a-f])")
+# Clés adressées par contenu ({sha256}.{ext}): seules candidates au sweep. Les
+# fichiers historiques (image_agent_<md5>_<hex>.png) partagent le répertoire
+# et restent cités par des sites sans digest: ils ne sont jamais supprimés.
+_BLOB_KEY_RE = re.compile(r"^[0-9a-f]{64}\.\w+$")
+
+
+def extension_for(content_type: Optional[str]) -> str:
+    """Extension de fichier pour un Content-Type d'image (PNG par défaut)."""
+    mime = (content_type or "").split(";")[0].strip().lower()
+    return CONTENT_TYPE_EXTENSIONS.get(mime, ".png")
+
+
+def content_type_for(key: str) -> str:
+    """Content-Type d'un blob d'après son extension."""
+    extension = os.path.splitext(key)[1].lower()
+    for content_type, known in CONTENT_TYPE_EXTENSIONS.items():
+        if known == extension:
+            return content_type
+    return "application/octet-stream"
+
+
+def referenced_digests(document: Any) -> List[str]:
+    """Digests de blobs cités par un document (site, entrée de cache...)."""
+    payload = document if isinstance(document, bytes) else orjson.dumps(document, default=str)
+    return [match.decode() for match in _DIGEST_RE.findall(payload)]
+
+
+class ImageBlobBackend(ABC):
+    """Stockage physique des blobs (clé = `{sha256}{ext}`)."""
+
+    # Dossier des fichiers temporaires de téléchargement (None = dossier système)
+    staging_dir: Optional[str] = None
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        """Stocke le fichier `path` sous `key` (le fichier source est consommé)."""
+
+    @abstractmethod
+    async def touch(self, key: str) -> None:
+        """Rafraîchit la date de modification (blob réutilisé: repart pour un délai de grâce)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def list_blobs(self) -> List[Tuple[str, float]]:
+        """Liste (clé, date de modification epoch) de tous les blobs."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        ...
+
+
+class LocalImageBackend(ImageBlobBackend):
+    """Blobs dans un dossier local; les téléchargements y sont préparés puis renommés."""
+
+    def __init__(self, root: Optional[str] = None, public_url: Optional[str] = None):
+        self.root = root or settings.IMAGE_STORE_LOCAL_PATH
+        self.public_url = (public_url or settings.IMAGE_STORE_PUBLIC_URL).rstrip("/")
+        self._root_ready = False
+
+    @property
+    def staging_dir(self) -> str:
+        # Même système de fichiers que les blobs: os.replace reste atomique
+        if not self._root_ready:
+            os.makedirs(self.root, exist_ok=True)
+            self._root_ready = True
+        return self.root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        await asyncio.to_thread(os.makedirs, self.root, exist_ok=True)
+        await asyncio.to_thread(os.replace, path, self._path(key))
+
+    async def touch(self, key: str) -> None:
+        await asyncio.to_thread(os.utime, self._path(key))
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.unlink, self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def list_blobs(self) -> List[Tuple[str, float]]:
+        def _scan() -> List[Tuple[str, float]]:
+            if not os.path.isdir(self.root):
+                return []
+            with os.scandir(self.root) as entries:
+                return [
+                    (entry.name, entry.stat().st_mtime)
+                    for entry in entries
+                    if entry.is_file() and not entry.name.startswith(".")
+                ]
+        return await asyncio.to_thread(_scan)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+
+class S3ImageBackend(ImageBlobBackend):
+    """
+    Blobs dans un bucket S3-compatible (AWS S3, MinIO, Cloudflare R2...).
+
+    Les appels boto3 (synchrones) passent par le pool de threads. Un client
+    compatible (même interface que boto3) peut être injecté, par exemple un
+    MinIO local ou un stand-in en mémoire pour les tests.
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[str] = None,
+        prefix: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        public_url: Optional[str] = None,
+        client: Optional[Any] = None
+    ):
+        self.bucket = bucket or settings.IMAGE_STORE_S3_BUCKET
+        self.prefix = settings.IMAGE_STORE_S3_PREFIX if prefix is None else prefix
+        self.endpoint_url = endpoint_url or settings.IMAGE_STORE_S3_ENDPOINT_URL
+        self.public_url = (public_url or settings.IMAGE_STORE_S3_PUBLIC_URL or "").rstrip("/")
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            if not BOTO3_AVAILABLE:
+                raise RuntimeError("boto3 is required for the S3 image store backend")
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                region_name=settings.IMAGE_STORE_S3_REGION
+            )
+        return self._client
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception as e:
+            code = str(getattr(e, "response", {}).get("Error", {}).get("Code", ""))
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        try:
+            await asyncio.to_thread(
+                self.client.upload_file,
+                path,
+                self.bucket,
+                self._object_key(key),
+                ExtraArgs={
+                    "ContentType": content_type,
+                    "CacheControl": IMMUTABLE_CACHE_CONTROL
+                }
+            )
+        finally:
+            await asyncio.to_thread(_unlink_quietly, path)
+
+    async def touch(self, key: str) -> None:
+        object_key = self._object_key(key)
+        await asyncio.to_thread(
+            self.client.copy_object,
+            Bucket=self.bucket,
+            Key=object_key,
+            CopySource={"Bucket": self.bucket, "Key": object_key},
+            # S3 refuse une copie sur soi-même sans remplacement des métadonnées
+            MetadataDirective="REPLACE",
+            ContentType=content_type_for(key),
+            CacheControl=IMMUTABLE_CACHE_CONTROL
+        )
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key))
+
+    async def list_blobs(self) -> List[Tuple[str, float]]:
+        def _scan() -> List[Tuple[str, float]]:
+            blobs = []
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+                for item in page.get("Contents", []):
+                    blobs.append((item["Key"][len(self.prefix):], item["LastModified"].timestamp()))
+            return blobs
+        return await asyncio.to_thread(_scan)
+
+    def url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        base = (self.endpoint_url or f"https://{self.bucket}.s3.amazonaws.com").rstrip("/")
+        if self.endpoint_url:
+            base = f"{base}/{self.bucket}"
+        return f"{base}/{self._object_key(key)}"
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class ImageStore:
+    """
+    Store d'images dédupliqué par SHA-256, avec comptage de références.
+
+    Usage:
+        digest = hashlib.sha256(); ...  # calculé pendant le téléchargement
+        url = await image_store.put_file(tmp_path, digest.hexdigest(), "image/png")
+        stats = await image_store.collect_garbage(documents)
+    """
+
+    def __init__(self, backend: Optional[ImageBlobBackend] = None, redis_client: Optional[Any] = None):
+        self._backend = backend
+        self._redis = redis_client
+        self.refs_key = "genesis:images:refs"
+
+    @property
+    def backend(self) -> ImageBlobBackend:
+        if self._backend is None:
+            if settings.IMAGE_STORE_BACKEND == "s3":
+                self._backend = S3ImageBackend()
+            else:
+                self._backend = LocalImageBackend()
+        return self._backend
+
+    def _get_redis(self):
+        if self._redis is None and redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    @property
+    def staging_dir(self) -> Optional[str]:
+        return self.backend.staging_dir
+
+    async def put_file(self, path: str, digest: str, content_type: str = "image/png") -> str:
+        """
+        Stocke un fichier dont le SHA-256 est `digest` et retourne son URL.
+
+        Si le blob existe déjà, le fichier est supprimé sans nouvel envoi.
+        """
+        key = f"{digest}{extension_for(content_type)}"
+        if await self.backend.exists(key):
+            await asyncio.to_thread(_unlink_quietly, path)
+            # Protège le blob réutilisé d'un sweep concurrent
+            await self.backend.touch(key)
+            IMAGE_STORE_OPERATIONS.labels(operation="put", result="deduplicated").inc()
+        else:
+            await self.backend.put_file(key, path, content_type)
+            IMAGE_STORE_OPERATIONS.labels(operation="put", result="stored").inc()
+
+        await self._incr_refs(digest, 1)
+        logger.info("Image stored", key=key, backend=type(self.backend).__name__)
+        return self.backend.url(key)
+
+    async def put_bytes(self, data: bytes, content_type: str = "image/png") -> str:
+        """Variante en mémoire de `put_file` (petites images, scripts)."""
+        digest = hashlib.sha256(data).hexdigest()
+
+        def _stage() -> str:
+            with tempfile.NamedTemporaryFile(dir=self.staging_dir, prefix=".", suffix=".part", delete=False) as tmp:
+                tmp.write(data)
+                return tmp.name
+
+        return await self.put_file(await asyncio.to_thread(_stage), digest, content_type)
+
+    async def reference_count(self, digest: str) -> int:
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return 0
+        return int(await redis_client.hget(self.refs_key, digest) or 0)
+
+    async def _incr_refs(self, digest: str, amount: int) -> None:
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.hincrby(self.refs_key, digest, amount)
+        except Exception as e:
+            logger.warning("Failed to update image reference count", digest=digest, error=str(e))
+
+    async def collect_garbage(
+        self,
+        documents: AsyncIterable[Any],
+        grace_seconds: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict[str, int]:
+        """
+        Sweep mark & sweep: supprime les blobs qu'aucun document vivant ne cite.
+
+        Seules les clés `{sha256}.{ext}` sont balayées; les autres fichiers du
+        répertoire (images historiques) sont ignorés. Une erreur pendant le
+        marquage (document illisible, Redis indisponible) annule le sweep:
+        aucune racine ne doit être ignorée.
+
+        Args:
+            documents: Documents vivants (définitions de site, cache ImageAgent...)
+            grace_seconds: Âge minimal d'un blob supprimable
+            dry_run: Compter sans supprimer
+
+        Returns:
+            Statistiques: blobs, referenced, deleted
+        """
+        grace = settings.IMAGE_STORE_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+
+        refs: RefCounter = RefCounter()
+        try:
+            async for document in documents:
+                refs.update(set(referenced_digests(document)))
+        except Exception as e:
+            IMAGE_STORE_OPERATIONS.labels(operation="gc_mark", result="error").inc()
+            logger.error("Image store garbage collection aborted during mark phase", error=str(e))
+            raise
+
+        cutoff = time.time() - grace
+        blobs = [(key, modified_at) for key, modified_at in await self.backend.list_blobs() if _BLOB_KEY_RE.match(key)]
+        deleted = 0
+        for key, modified_at in blobs:
+            digest = key[:64]
+            if refs.get(digest) or modified_at > cutoff:
+                continue
+            if not dry_run:
+                try:
+                    await self.backend.delete(key)
+                except Exception as e:
+                    logger.warning("Failed to delete image blob", key=key, error=str(e))
+                    continue
+            deleted += 1
+            IMAGE_STORE_OPERATIONS.labels(operation="gc_delete", result="dry_run" if dry_run else "deleted").inc()
+
+        if not dry_run:
+            await self._reconcile_refs(refs)
+
+        stats = {"blobs": len(blobs), "referenced": len(refs), "deleted": deleted}
+        logger.info("Image store garbage collection done", dry_run=dry_run, **stats)
+        return stats
+
+    async def _reconcile_refs(self, refs: Dict[str, int]) -> None:
+        """Remplace les compteurs par les références constatées au sweep."""
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.delete(self.refs_key)
+            if refs:
+                pipe.hset(self.refs_key, mapping=dict(refs))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to reconcile image reference counts", error=str(e))
+
+
+# Instance globale pour l'application
+image_store = ImageStore()
@@ -1,21 +1,152 @@
 """Redis Virtual File System pour sessions coaching persistantes"""
 
 import redis.asyncio as redis
-import json
-from typing import Dict, Any, Optional, List
+from redis.exceptions import ResponseError
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, AsyncIterator, Callable, Optional, List, Tuple
 import structlog
-from app.config.settings import settings
+from app.config.redis import redis_pools
+from app.core.integrations.vfs_codec import VFSCodec
+from app.core.integrations.session_cache import session_cache
 
 logger = structlog.get_logger()
 
+# Index secondaire des sessions par utilisateur: sorted set
+# genesis:user:{user_id}:sessions (membre = brief_id, score = updated_at en ms).
+# Les scripts Lua rendent écriture/suppression et mise à jour de l'index atomiques.
+# Note: les clés de session lues dans LIST_SESSIONS_SCRIPT sont construites dans
+# le script (Redis standalone, pas de contrainte de slot cluster).
+
+# KEYS: clé session, index | ARGV: payload, ttl, brief_id, updated_at_ms
+WRITE_SESSION_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[3])
+if redis.call('TTL', KEYS[2]) < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# KEYS: clé session, index | ARGV: brief_id
+DELETE_SESSION_SCRIPT = """
+local deleted = redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return deleted
+"""
+
+# KEYS: index | ARGV: offset, limit, préfixe clé session
+# Retourne les brief_ids vivants de la page; les entrées dont la session a
+# expiré sont retirées de l'index au passage (nettoyage paresseux).
+LIST_SESSIONS_SCRIPT = """
+local ids = redis.call('ZREVRANGE', KEYS[1], ARGV[1], tonumber(ARGV[1]) + tonumber(ARGV[2]) - 1)
+local live = {}
+for _, brief_id in ipairs(ids) do
+    if redis.call('EXISTS', ARGV[3] .. brief_id) == 1 then
+        table.insert(live, brief_id)
+    else
+        redis.call('ZREM', KEYS[1], brief_id)
+    end
+end
+return {live, #ids}
+"""
+
+# KEYS: clé session, index | ARGV: ttl
+EXTEND_SESSION_SCRIPT = """
+local extended = redis.call('EXPIRE', KEYS[1], ARGV[1])
+if extended == 1 and redis.call('TTL', KEYS[2]) < tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+return extended
+"""
+
+# Sessions coaching "layout hash": un champ par clé de premier niveau, chaque
+# valeur encodée séparément par le codec. Une étape ne réécrit que les champs
+# modifiés (current_step, status) au lieu du document complet.
+
+# KEYS: clé session | ARGV: ttl, champ1, valeur1, ...
+WRITE_HASH_SCRIPT = """
+redis.call('DEL', KEYS[1])
+if #ARGV > 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS: clé session | ARGV: ttl, champ1, valeur1, ...
+# Retourne 0 si la session n'existe pas (expirée): aucun hash partiel n'est créé.
+# Une ancienne session JSON (string) est convertie en hash au passage.
+UPDATE_HASH_FIELDS_SCRIPT = """
+local kind = redis.call('TYPE', KEYS[1])['ok']
+if kind == 'string' then
+    local doc = cjson.decode(redis.call('GET', KEYS[1]))
+    redis.call('DEL', KEYS[1])
+    for field, value in pairs(doc) do
+        redis.call('HSET', KEYS[1], field, cjson.encode(value))
+    end
+elseif kind ~= 'hash' then
+    return 0
+end
+if #ARGV > 1 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Sites: la définition complète (site:{id}) est accompagnée d'un petit hash
+# résumé (site:{id}:summary) lu par le dashboard sans désérialiser le site.
+SITE_SUMMARY_FIELDS = ["theme_slug", "hero_image", "updated_at"]
+
+# KEYS: site, résumé | ARGV: payload, ttl, champ1, valeur1, ...
+WRITE_SITE_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('DEL', KEYS[2])
+redis.call('HSET', KEYS[2], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# Clés par UNLINK lors des purges (suppression de compte, cache d'images)
+PURGE_CHUNK_SIZE = 500
+
+
+def _to_str(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
 class RedisVirtualFileSystem:
     """Virtual File System Redis pour sessions coaching persistantes"""
     
-    def __init__(self):
-        self.redis = redis.from_url(settings.REDIS_URL)
+    def __init__(self, redis_client: Optional[redis.Redis] = None, codec: Optional[VFSCodec] = None):
+        # Client adossé au pool partagé de l'application (voir app.config.redis)
+        self.redis = redis_client or redis_pools.get_client()
+        # Sérialisation binaire + compression; les anciennes clés JSON restent lisibles
+        self.codec = codec or VFSCodec()
         self.session_prefix = "genesis:session"
         self.user_prefix = "genesis:user"
     
+    def _session_key(self, user_id: int, brief_id: str) -> str:
+        return f"{self.session_prefix}:{user_id}:{brief_id}"
+    
+    def _session_index_key(self, user_id: int) -> str:
+        return f"{self.user_prefix}:{user_id}:sessions"
+    
+    def _coaching_session_key(self, session_id: str) -> str:
+        # Hash de session coaching (voir app.api.v1.coaching._session_key)
+        return f"session:{session_id}"
+    
+    def _site_key(self, session_id: str) -> str:
+        return f"site:{session_id}"
+    
+    def _site_summary_key(self, session_id: str) -> str:
+        return f"site:{session_id}:summary"
+    
+    async def _get_document(self, key: str) -> Optional[Any]:
+        data = await self.redis.get(key)
+        return self.codec.decode(data) if data else None
+    
     async def health_check(self) -> bool:
         """Vérifier connexion Redis"""
         try:
@@ -40,9 +171,20 @@ class RedisVirtualFileSystem:
             bool: True si succès, False sinon
         """
         try:
-            key = f"{self.session_prefix}:{user_id}:{brief_id}"
-            serialized_data = json.dumps(data, default=str)
-            await self.redis.set(key, serialized_data, ex=ttl)
+            key = self._session_key(user_id, brief_id)
+            serialized_data = self.codec.encode(data)
+            # SET + ZADD index + TTL index en un seul aller-retour atomique
+            await self.redis.eval(
+                WRITE_SESSION_SCRIPT,
+                2,
+                key,
+                self._session_index_key(user_id),
+                serialized_data,
+                ttl,
+                brief_id,
+                int(time.time() * 1000)
+            )
+            await session_cache.invalidate(key, value=data)
             logger.info(
                 "Session written to Redis",
                 user_id=user_id,
@@ -71,11 +213,8 @@ class RedisVirtualFileSystem:
             Dict des données session ou None si non trouvé
         """
         try:
-            key = f"{self.session_prefix}:{user_id}:{brief_id}"
-            data = await self.redis.get(key)
-            if data:
-                return json.loads(data)
-            return None
+            key = self._session_key(user_id, brief_id)
+            return await session_cache.get_or_load(key, lambda: self._get_document(key))
         except Exception as e:
             logger.error(
                 "Failed to read session from Redis",
@@ -87,7 +226,7 @@ class RedisVirtualFileSystem:
     
     async def list_user_sessions(self, user_id: int) -> List[str]:
         """
-        Lister sessions utilisateur
+        Lister sessions utilisateur (plus récemment mises à jour en premier)
         
         Args:
             user_id: ID utilisateur
@@ -96,20 +235,47 @@ class RedisVirtualFileSystem:
             Liste des brief_ids pour cet utilisateur
         """
         try:
-            pattern = f"{self.session_prefix}:{user_id}:*"
-            brief_ids = []
-            async for key in self.redis.scan_iter(match=pattern):
-                # Extraire brief_id depuis clé genesis:session:{user_id}:{brief_id}
-                key_parts = key.decode().split(":")
-                if len(key_parts) >= 4:
-                    brief_id = key_parts[3]
-                    brief_ids.append(brief_id)
+            brief_ids: List[str] = []
+            offset: Optional[int] = 0
+            while offset is not None:
+                page, offset = await self.list_user_sessions_page(user_id, offset=offset, limit=100)
+                brief_ids.extend(page)
             logger.info("User sessions listed", user_id=user_id, count=len(brief_ids))
             return brief_ids
         except Exception as e:
             logger.error("Failed to list user sessions", user_id=user_id, error=str(e))
             return []
     
+    async def list_user_sessions_page(
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[str], Optional[int]]:
+        """
+        Page de sessions depuis l'index utilisateur, en O(log n + k)
+        
+        Args:
+            user_id: ID utilisateur
+            offset: Position de départ (retournée par la page précédente)
+            limit: Taille de page
+            
+        Returns:
+            (brief_ids de la page, offset de la page suivante ou None si fin)
+        """
+        live, scanned = await self.redis.eval(
+            LIST_SESSIONS_SCRIPT,
+            1,
+            self._session_index_key(user_id),
+            offset,
+            limit,
+            f"{self.session_prefix}:{user_id}:"
+        )
+        brief_ids = [_to_str(brief_id) for brief_id in live]
+        # Les entrées expirées retirées décalent la suite de l'index vers le haut
+        next_offset = offset + len(brief_ids) if int(scanned) == limit else None
+        return brief_ids, next_offset
+    
     async def delete_session(self, user_id: int, brief_id: str) -> bool:
         """
         Supprimer session coaching
@@ -122,8 +288,15 @@ class RedisVirtualFileSystem:
             bool: True si supprimé, False sinon
         """
         try:
-            key = f"{self.session_prefix}:{user_id}:{brief_id}"
-            result = await self.redis.delete(key)
+            key = self._session_key(user_id, brief_id)
+            result = await self.redis.eval(
+                DELETE_SESSION_SCRIPT,
+                2,
+                key,
+                self._session_index_key(user_id),
+                brief_id
+            )
+            await session_cache.invalidate(key)
             logger.info(
                 "Session deleted from Redis",
                 user_id=user_id,
@@ -153,8 +326,15 @@ class RedisVirtualFileSystem:
             bool: True si TTL mis à jour, False sinon
         """
         try:
-            key = f"{self.session_prefix}:{user_id}:{brief_id}"
-            result = await self.redis.expire(key, ttl)
+            key = self._session_key(user_id, brief_id)
+            # L'index doit vivre au moins aussi longtemps que la session
+            result = await self.redis.eval(
+                EXTEND_SESSION_SCRIPT,
+                2,
+                key,
+                self._session_index_key(user_id),
+                ttl
+            )
             logger.info(
                 "Session TTL extended",
                 user_id=user_id,
@@ -171,11 +351,346 @@ class RedisVirtualFileSystem:
             )
             return False
     
+    async def rebuild_session_index(self) -> int:
+        """
+        Reconstruit les index utilisateur depuis les clés de session existantes
+        (migration one-shot des sessions écrites avant l'index, parcours SCAN)
+        
+        Returns:
+            Nombre de sessions indexées
+        """
+        indexed = 0
+        now_ms = int(time.time() * 1000)
+        async for raw_key in self.redis.scan_iter(match=f"{self.session_prefix}:*", count=1000):
+            key_parts = _to_str(raw_key).split(":")
+            if len(key_parts) != 4:
+                continue
+            user_id, brief_id = key_parts[2], key_parts[3]
+            ttl = await self.redis.ttl(raw_key)
+            if ttl is None or ttl <= 0:
+                continue
+            index_key = f"{self.user_prefix}:{user_id}:sessions"
+            await self.redis.zadd(index_key, {brief_id: now_ms}, nx=True)
+            if await self.redis.ttl(index_key) < ttl:
+                await self.redis.expire(index_key, ttl)
+            indexed += 1
+        logger.info("Session index rebuilt", indexed=indexed)
+        return indexed
+    
+    def _encode_fields(self, fields: Dict[str, Any]) -> List[Any]:
+        args: List[Any] = []
+        for field, value in fields.items():
+            args.extend((field, self.codec.encode(value)))
+        return args
+    
+    async def write_session_hash(self, key: str, data: Dict[str, Any], ttl: int = 7200) -> bool:
+        """
+        Écrire une session complète en layout hash (remplace l'existante)
+        
+        Args:
+            key: Clé Redis de la session (ex: session:{session_id})
+            data: Document session; chaque clé de premier niveau devient un champ
+            ttl: Time-to-live en secondes (default 2h)
+            
+        Returns:
+            bool: True si succès, False sinon
+        """
+        try:
+            await self.redis.eval(WRITE_HASH_SCRIPT, 1, key, ttl, *self._encode_fields(data))
+            await session_cache.invalidate(key, value=data)
+            logger.info("Session hash written to Redis", key=key, fields=len(data), ttl=ttl)
+            return True
+        except Exception as e:
+            logger.error("Failed to write session hash to Redis", key=key, error=str(e))
+            return False
+    
+    async def update_session_fields(self, key: str, fields: Dict[str, Any], ttl: int = 7200) -> bool:
+        """
+        Mettre à jour quelques champs d'une session hash et rafraîchir son TTL
+        (HSET + EXPIRE atomiques; sans champ, seul le TTL est rafraîchi)
+        
+        Args:
+            key: Clé Redis de la session
+            fields: Champs à écrire (ex: {"current_step": "mission"})
+            ttl: Nouveau time-to-live en secondes
+            
+        Returns:
+            bool: True si mis à jour, False si session absente ou erreur
+        """
+        try:
+            result = await self.redis.eval(UPDATE_HASH_FIELDS_SCRIPT, 1, key, ttl, *self._encode_fields(fields))
+            if fields:
+                await session_cache.invalidate(key, fields=fields if result else None)
+            logger.info("Session fields updated", key=key, fields=list(fields), updated=bool(result))
+            return bool(result)
+        except Exception as e:
+            logger.error("Failed to update session fields", key=key, error=str(e))
+            return False
+    
+    async def read_session_fields(self, key: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Lire une session hash, en entier ou champ par champ (HMGET)
+        
+        Avec le cache L1 actif, le document complet est mis en cache et les
+        champs demandés en sont extraits.
+        
+        Args:
+            key: Clé Redis de la session
+            fields: Champs à lire (None = tous)
+            
+        Returns:
+            Dict des champs présents ou None si session absente
+        """
+        try:
+            if not session_cache.is_active:
+                return await self._fetch_session_fields(key, fields)
+            document = await session_cache.get_or_load(key, lambda: self._fetch_session_fields(key))
+            if document is None or not fields:
+                return document
+            return {field: document[field] for field in fields if field in document} or None
+        except Exception as e:
+            logger.error("Failed to read session fields from Redis", key=key, error=str(e))
+            return None
+    
+    async def _fetch_session_fields(self, key: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        try:
+            if fields:
+                values = await self.redis.hmget(key, fields)
+                if all(value is None for value in values):
+                    return None
+                return {
+                    field: self.codec.decode(value)
+                    for field, value in zip(fields, values)
+                    if value is not None
+                }
+            raw = await self.redis.hgetall(key)
+            if not raw:
+                return None
+            return {_to_str(field): self.codec.decode(value) for field, value in raw.items()}
+        except ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+            # Ancienne session JSON (string) écrite avant le layout hash
+            document = await self._get_document(key)
+            if document is None or not fields:
+                return document
+            return {field: document[field] for field in fields if field in document} or None
+    
+    async def read_site(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lire la définition de site générée pour une session coaching
+        
+        Args:
+            session_id: UUID de la session coaching
+            
+        Returns:
+            SiteDefinition ou None si absente/expirée
+        """
+        key = self._site_key(session_id)
+        try:
+            return await session_cache.get_or_load(key, lambda: self._get_document(key))
+        except Exception as e:
+            logger.error("Failed to read site from Redis", key=key, error=str(e))
+            return None
+    
+    async def write_site(self, session_id: str, site: Dict[str, Any], ttl: int = 604800) -> bool:
+        """
+        Écrire la définition de site d'une session coaching (TTL 7 jours par défaut)
+        
+        Args:
+            session_id: UUID de la session coaching
+            site: SiteDefinition à persister
+            ttl: Time-to-live en secondes
+            
+        Returns:
+            bool: True si succès, False sinon
+        """
+        key = self._site_key(session_id)
+        try:
+            summary = self._site_summary(site)
+            # Site + résumé écrits ensemble (même TTL)
+            await self.redis.eval(
+                WRITE_SITE_SCRIPT,
+                2,
+                key,
+                self._site_summary_key(session_id),
+                self.codec.encode(site),
+                ttl,
+                *[item for field, value in summary.items() for item in (field, value)]
+            )
+            await session_cache.invalidate(key, value=site)
+            logger.info("Site written to Redis", key=key, ttl=ttl)
+            return True
+        except Exception as e:
+            logger.error("Failed to write site to Redis", key=key, error=str(e))
+            return False
+    
+    async def iter_documents(self, match: str, strict: bool = True) -> AsyncIterator[Any]:
+        """
+        Parcourt (SCAN) les documents dont la clé correspond à `match`
+        (sweeps de maintenance: GC des images, audits)
+        
+        Les résumés de site (`site:{id}:summary`, hashes) sont ignorés.
+        
+        Args:
+            match: Motif des clés parcourues (ex: "site:*")
+            strict: Propager les erreurs de lecture/décodage (racines du GC:
+                un document ignoré ferait supprimer ses images) plutôt que
+                d'ignorer le document
+        """
+        async for _, document in self._iter_keyed_documents(match, strict=strict):
+            yield document
+    
+    async def _iter_keyed_documents(self, match: str, strict: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        async for raw_key in self.redis.scan_iter(match=match, count=1000):
+            key = _to_str(raw_key)
+            if key.endswith(":summary"):
+                continue
+            try:
+                document = await self._get_document(key)
+            except Exception as e:
+                if strict:
+                    raise
+                logger.warning("Skipping unreadable document", key=key, error=str(e))
+                continue
+            if document is not None:
+                yield key, document
+    
+    async def purge_documents(self, match: str, predicate: Callable[[Any], bool]) -> int:
+        """
+        Supprime les documents (SCAN sur `match`) pour lesquels `predicate` est vrai
+        
+        Args:
+            match: Motif des clés parcourues (ex: "cache/image_agent:*")
+            predicate: Test appliqué au document décodé
+            
+        Returns:
+            Nombre de documents supprimés
+        """
+        keys = [key async for key, document in self._iter_keyed_documents(match) if predicate(document)]
+        for start in range(0, len(keys), PURGE_CHUNK_SIZE):
+            await self.redis.unlink(*keys[start:start + PURGE_CHUNK_SIZE])
+        logger.info("Documents purged", match=match, count=len(keys))
+        return len(keys)
+    
+    async def purge_user_sessions(self, user_id: int, session_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Supprime toutes les données Redis d'un utilisateur (suppression de compte)
+        
+        - sessions `genesis:session:{user_id}:*` (lues dans l'index) et l'index
+        - pour chaque session coaching de `session_ids`: hash `session:{id}`,
+          site `site:{id}` et son résumé
+        
+        UNLINK par lots (mémoire libérée en arrière-plan côté Redis). Les
+        erreurs Redis sont propagées: la purge est idempotente et doit être
+        rejouée si elle échoue.
+        
+        Args:
+            user_id: ID utilisateur propriétaire
+            session_ids: UUIDs de ses sessions coaching
+            
+        Returns:
+            {"sessions": sessions de brief, "sites": sessions coaching, "keys": clés supprimées}
+        """
+        session_ids = session_ids or []
+        index_key = self._session_index_key(user_id)
+        brief_ids = [_to_str(brief_id) for brief_id in await self.redis.zrange(index_key, 0, -1)]
+        
+        documents = [self._session_key(user_id, brief_id) for brief_id in brief_ids]
+        for session_id in session_ids:
+            documents.extend([self._coaching_session_key(session_id), self._site_key(session_id)])
+        keys = documents + [self._site_summary_key(session_id) for session_id in session_ids] + [index_key]
+        
+        deleted = 0
+        for start in range(0, len(keys), PURGE_CHUNK_SIZE):
+            deleted += await self.redis.unlink(*keys[start:start + PURGE_CHUNK_SIZE])
+        for key in documents:
+            await session_cache.invalidate(key)
+        
+        logger.info(
+            "User sessions purged",
+            user_id=user_id,
+            sessions=len(brief_ids),
+            sites=len(session_ids),
+            keys=deleted
+        )
+        return {"sessions": len(brief_ids), "sites": len(session_ids), "keys": int(deleted)}
+    
+    @staticmethod
+    def _site_summary(site: Dict[str, Any]) -> Dict[str, str]:
+        summary = {
+            "theme_slug": (site.get("theme") or {}).get("slug"),
+            "hero_image": (site.get("metadata") or {}).get("ogImage"),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return {field: str(value) for field, value in summary.items() if value}
+    
+    async def read_site_summaries(self, session_ids: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Statut et résumé de plusieurs sites en un seul aller-retour (pipeline EXISTS + HMGET)
+        
+        Les sites écrits avant l'introduction du résumé sont lus une fois en
+        entier pour créer leur résumé.
+        
+        Args:
+            session_ids: UUIDs des sessions coaching
+            
+        Returns:
+            {session_id: résumé (theme_slug, hero_image, updated_at) ou None si site absent/expiré}
+        """
+        if not session_ids:
+            return {}
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.exists(self._site_key(session_id))
+                pipe.hmget(self._site_summary_key(session_id), SITE_SUMMARY_FIELDS)
+            results = await pipe.execute()
+        
+        summaries: Dict[str, Optional[Dict[str, str]]] = {}
+        missing_summary: List[str] = []
+        for index, session_id in enumerate(session_ids):
+            exists, values = results[2 * index], results[2 * index + 1]
+            if not exists:
+                summaries[session_id] = None
+                continue
+            summary = {
+                field: _to_str(value)
+                for field, value in zip(SITE_SUMMARY_FIELDS, values)
+                if value is not None
+            }
+            summaries[session_id] = summary
+            if not summary:
+                missing_summary.append(session_id)
+        
+        for session_id in missing_summary:
+            summaries[session_id] = await self._backfill_site_summary(session_id)
+        return summaries
+    
+    async def _backfill_site_summary(self, session_id: str) -> Dict[str, str]:
+        site = await self.read_site(session_id)
+        if not site:
+            return {}
+        summary = self._site_summary(site)
+        # Date de dernière écriture inconnue pour un ancien site
+        summary.pop("updated_at", None)
+        if not summary:
+            return summary
+        try:
+            summary_key = self._site_summary_key(session_id)
+            await self.redis.hset(summary_key, mapping=summary)
+            ttl = await self.redis.ttl(self._site_key(session_id))
+            if ttl and ttl > 0:
+                await self.redis.expire(summary_key, ttl)
+        except Exception as e:
+            logger.warning("Failed to backfill site summary", session_id=session_id, error=str(e))
+        return summary
+    
     async def write_user_state(self, user_id: int, state: Dict[str, Any], ttl: int = 86400) -> bool:
         """Écrire état utilisateur (TTL 24h par défaut)"""
         try:
             key = f"{self.user_prefix}:{user_id}"
-            serialized_state = json.dumps(state, default=str)
+            serialized_state = self.codec.encode(state)
             await self.redis.set(key, serialized_state, ex=ttl)
             logger.info("User state written to Redis", user_id=user_id, ttl=ttl)
             return True
@@ -189,7 +704,7 @@ class RedisVirtualFileSystem:
             key = f"{self.user_prefix}:{user_id}"
             data = await self.redis.get(key)
             if data:
-                return json.loads(data)
+                return self.codec.decode(data)
             return None
         except Exception as e:
             logger.error("Failed to read user state from Redis", user_id=user_id, error=str(e))
@@ -0,0 +1,204 @@
+"""
+Session Cache - L1 in-process devant Redis pour les sessions et les sites
+
+Les documents de session (`session:{id}`, `genesis:session:*`) et de site
+(`site:{id}`) sont relus plusieurs fois par requête coaching (/start, /step,
+/help, /generate-proposals, /site). Chaque worker uvicorn en garde une copie
+récente (LRU borné + TTL court); Redis reste la source de vérité (L2).
+
+Cohérence entre workers: toute écriture passe par `invalidate()`, qui publie
+la clé sur le canal `genesis:cache:invalidate`; chaque worker abonné la retire
+de son L1. Le L1 n'est utilisé que pendant que l'abonnement est actif: pendant
+une coupure les lectures vont directement à Redis, et le L1 est vidé à la
+reconnexion (des invalidations ont pu être perdues).
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+from app.core.providers.cache import InMemoryLRUCache
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+SESSION_CACHE_REQUESTS = Counter(
+    'genesis_ai_session_cache_requests_total',
+    'In-process session/site cache lookups',
+    ['result']
+)
+SESSION_CACHE_INVALIDATIONS = Counter(
+    'genesis_ai_session_cache_invalidations_total',
+    'In-process session/site cache invalidations',
+    ['source']
+)
+
+# Même rendu que le codec VFS (datetime/dataclasses via str)
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class SessionCache:
+    """
+    Cache L1 (par processus) des documents session/site avec invalidation pub/sub.
+
+    Les valeurs sont conservées sérialisées (orjson): chaque lecture renvoie
+    une copie indépendante que l'appelant peut modifier.
+
+    Usage:
+        data = await session_cache.get_or_load(key, lambda: read_from_redis(key))
+        await session_cache.invalidate(key, value=new_data)  # après écriture Redis
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.enabled = settings.SESSION_L1_CACHE_ENABLED if enabled is None else enabled
+        self.ttl = ttl or settings.SESSION_L1_CACHE_TTL
+        self.l1 = InMemoryLRUCache(max_entries or settings.SESSION_L1_CACHE_MAX_ENTRIES, self.ttl)
+        self.channel = "genesis:cache:invalidate"
+        self.instance_id = uuid.uuid4().hex
+        self._redis = redis_client
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+        # Incrémenté à chaque invalidation: une lecture Redis concurrente n'est
+        # pas mise en cache (elle a pu lire la valeur d'avant l'écriture)
+        self._generation = 0
+
+    def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        if redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    @property
+    def is_active(self) -> bool:
+        return self.enabled and self._subscribed
+
+    async def start(self) -> None:
+        """Démarre l'écoute des invalidations (appelé dans le lifespan)."""
+        if not self.enabled or self._listener is not None or self._get_redis() is None:
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Arrête l'écoute et vide le L1 (appelé à l'arrêt de l'application)."""
+        task, self._listener = self._listener, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._subscribed = False
+        self.l1.clear()
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Retourne la copie L1 de `key` ou la charge depuis Redis via `loader`."""
+        if not self.is_active:
+            return await loader()
+
+        cached = self.l1.get(key)
+        if isinstance(cached, bytes):
+            SESSION_CACHE_REQUESTS.labels(result="hit").inc()
+            return orjson.loads(cached)
+
+        SESSION_CACHE_REQUESTS.labels(result="miss").inc()
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self._store(key, value)
+        return value
+
+    async def invalidate(
+        self,
+        key: str,
+        value: Any = None,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Invalide `key` dans tous les workers après une écriture Redis.
+
+        Args:
+            key: Clé Redis modifiée
+            value: Nouveau document complet (écriture directe dans le L1 local)
+            fields: Champs modifiés, fusionnés dans la copie locale si présente
+        """
+        if not self.enabled:
+            return
+
+        self._generation += 1
+        SESSION_CACHE_INVALIDATIONS.labels(source="local").inc()
+        if value is None and fields is not None:
+            cached = self.l1.get(key)
+            if isinstance(cached, bytes):
+                value = {**orjson.loads(cached), **fields}
+        if value is not None and self.is_active:
+            self._store(key, value)
+        else:
+            self.l1.delete(key)
+
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.publish(self.channel, json.dumps({"origin": self.instance_id, "key": key}))
+        except Exception as e:
+            logger.warning("Session cache invalidation publish failed", key=key, error=str(e))
+
+    def _store(self, key: str, value: Any) -> None:
+        try:
+            self.l1.set(key, orjson.dumps(value, default=str, option=_ORJSON_OPTIONS))
+        except TypeError:
+            self.l1.delete(key)
+
+    def _on_message(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.instance_id:
+            return
+        self._generation += 1
+        self.l1.delete(message.get("key"))
+        SESSION_CACHE_INVALIDATIONS.labels(source="remote").inc()
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self._get_redis().pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed = True
+                backoff = 1.0
+                logger.info("Session cache invalidation listener subscribed", channel=self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Session cache invalidation listener disconnected", error=str(e))
+            finally:
+                # Des invalidations ont pu être perdues: repartir d'un L1 vide
+                self._subscribed = False
+                self._generation += 1
+                self.l1.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+# Instance globale pour l'application
+session_cache = SessionCache()
@@ -1,9 +1,9 @@
 """Client Tavily pour recherche marché africain"""
 
-import httpx
 from typing import Dict, Any, List, Optional
 import structlog
 from app.config.settings import settings
+from .http_pool import http_clients
 
 logger = structlog.get_logger()
 
@@ -25,7 +25,7 @@ class TavilyClient:
                 logger.warning("Tavily API key not configured, using mock mode")
                 return True  # Mode mock pour développement
                 
-            async with httpx.AsyncClient(timeout=30) as client:
+            async with http_clients.client(self.base_url, timeout=30) as client:
                 # Test simple de recherche pour vérifier la connexion
                 response = await client.post(
                     f"{self.base_url}/search",
@@ -56,7 +56,7 @@ class TavilyClient:
             # Construire requête optimisée pour l'Afrique
             african_query = f"{query} {location} marché africain business opportunités"
             
-            async with httpx.AsyncClient(timeout=60) as client:
+            async with http_clients.client(self.base_url, timeout=60) as client:
                 response = await client.post(
                     f"{self.base_url}/search",
                     headers=self.headers,
@@ -94,7 +94,7 @@ class TavilyClient:
             
             query = f"concurrents {business_sector} {location} analyse marché compétition"
             
-            async with httpx.AsyncClient(timeout=60) as client:
+            async with http_clients.client(self.base_url, timeout=60) as client:
                 response = await client.post(
                     f"{self.base_url}/search",
                     headers=self.headers,
@@ -154,7 +154,7 @@ class TavilyClient:
             if self.api_key == "your-tavily-key":
                 return self._mock_trends_research(business_sector, location)
             
-            async with httpx.AsyncClient(timeout=60) as client:
+            async with http_clients.client(self.base_url, timeout=60) as client:
                 response = await client.post(
                     f"{self.base_url}/search",
                     headers=self.headers,
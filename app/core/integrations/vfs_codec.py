@@ -0,0 +1,151 @@
+"""Codec binaire des documents du Redis Virtual File System
+
+Format d'une valeur encodée:
+
+    [1 octet d'en-tête][payload sérialisé, compressé au-delà d'un seuil]
+
+En-tête = 0x80 | (compression << 3) | sérialiseur. Un document JSON texte ne
+commence jamais par un octet >= 0x80: toute valeur dont le premier octet est
+< 0x80 est une ancienne clé JSON (json.dumps) et reste lisible telle quelle.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+import orjson
+import structlog
+
+from app.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+try:  # msgpack via ormsgpack (optionnel)
+    import ormsgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    MSGPACK_AVAILABLE = False
+
+try:  # compression zstd (optionnelle)
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    ZSTD_AVAILABLE = False
+
+try:  # compression lz4 (optionnelle)
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    LZ4_AVAILABLE = False
+
+
+HEADER_FLAG = 0x80
+
+SERIALIZERS = {"orjson": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zstd": 1, "lz4": 2}
+
+_SERIALIZER_NAMES = {code: name for name, code in SERIALIZERS.items()}
+_COMPRESSION_NAMES = {code: name for name, code in COMPRESSIONS.items()}
+
+# Même rendu que json.dumps(default=str) pour les datetime/dataclasses
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class VFSCodec:
+    """
+    Sérialisation + compression des documents de session.
+
+    Args:
+        serializer: "json" (format texte historique, sans en-tête), "orjson" ou "msgpack"
+        compression: "none", "zstd" ou "lz4" (appliquée au-delà du seuil)
+        compression_threshold: Taille minimale (octets) avant compression
+        compression_level: Niveau zstd
+
+    Usage:
+        codec = VFSCodec("orjson", "zstd")
+        payload = codec.encode(session_data)
+        session_data = codec.decode(payload)
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
+        compression_level: Optional[int] = None
+    ):
+        self.serializer = serializer or settings.VFS_CODEC_SERIALIZER
+        self.compression = compression or settings.VFS_CODEC_COMPRESSION
+        self.compression_threshold = (
+            compression_threshold if compression_threshold is not None
+            else settings.VFS_CODEC_COMPRESSION_THRESHOLD
+        )
+        self.compression_level = compression_level or settings.VFS_CODEC_COMPRESSION_LEVEL
+
+        if self.serializer != "json" and self.serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown VFS serializer: {self.serializer}")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown VFS compression: {self.compression}")
+
+        if self.serializer == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("ormsgpack not installed, VFS codec falls back to orjson")
+            self.serializer = "orjson"
+        if (self.compression == "zstd" and not ZSTD_AVAILABLE) or (self.compression == "lz4" and not LZ4_AVAILABLE):
+            logger.warning("VFS compression library not installed, compression disabled", compression=self.compression)
+            self.compression = "none"
+
+        self._zstd_compressor = zstandard.ZstdCompressor(level=self.compression_level) if ZSTD_AVAILABLE else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+    def encode(self, data: Any) -> Union[bytes, str]:
+        """Encode un document (str JSON pour le format historique, bytes sinon)."""
+        if self.serializer == "json":
+            return json.dumps(data, default=str)
+
+        if self.serializer == "msgpack":
+            payload = ormsgpack.packb(data, default=str, option=ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_PASSTHROUGH_DATETIME)
+        else:
+            payload = orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+
+        compression = "none"
+        if self.compression != "none" and len(payload) >= self.compression_threshold:
+            compression = self.compression
+            payload = self._compress(payload, compression)
+
+        header = HEADER_FLAG | (COMPRESSIONS[compression] << 3) | SERIALIZERS[self.serializer]
+        return bytes([header]) + payload
+
+    def decode(self, payload: Union[bytes, str]) -> Any:
+        """Décode une valeur, quel que soit le codec qui l'a écrite."""
+        if isinstance(payload, str):
+            return json.loads(payload)
+        if not payload or payload[0] < HEADER_FLAG:
+            # Ancienne clé: JSON texte
+            return json.loads(payload)
+
+        header = payload[0]
+        serializer = _SERIALIZER_NAMES.get(header & 0x07)
+        compression = _COMPRESSION_NAMES.get((header >> 3) & 0x0F)
+        if serializer is None or compression is None:
+            raise ValueError(f"Unknown VFS codec header: {header:#x}")
+
+        body = payload[1:]
+        if compression != "none":
+            body = self._decompress(body, compression)
+
+        if serializer == "msgpack":
+            return ormsgpack.unpackb(body)
+        return orjson.loads(body)
+
+    def _compress(self, payload: bytes, compression: str) -> bytes:
+        if compression == "zstd":
+            return self._zstd_compressor.compress(payload)
+        return lz4.frame.compress(payload)
+
+    def _decompress(self, payload: bytes, compression: str) -> bytes:
+        if compression == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read this VFS value")
+            return self._zstd_decompressor.decompress(payload)
+        if not LZ4_AVAILABLE:
+            raise RuntimeError("lz4 is required to read this VFS value")
+        return lz4.frame.decompress(payload)
@@ -0,0 +1,12 @@
+"""Asynchronous job subsystem (queue, workers, Redis progress)"""
+
+from app.core.jobs.store import JobStore, JobStatus, TERMINAL_STATUSES
+from app.core.jobs.queue import JobQueue, job_queue
+
+__all__ = [
+    "JobStore",
+    "JobStatus",
+    "TERMINAL_STATUSES",
+    "JobQueue",
+    "job_queue"
+]
@@ -0,0 +1,131 @@
+"""File de jobs asynchrones avec pool de workers in-process"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from app.config.settings import settings
+from app.core.jobs.store import JobStatus, JobStore
+
+logger = structlog.get_logger(__name__)
+
+# Callback de progression passé aux handlers: (node, data) -> None
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+# Handler de job: (job, report_progress) -> résultat
+JobHandler = Callable[[Dict[str, Any], ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """
+    File de jobs consommée par un pool de workers asyncio.
+
+    L'état des jobs (statut, progression, résultat) vit dans Redis via JobStore;
+    seule la file d'IDs est en mémoire. Démarrée et arrêtée dans le lifespan,
+    elle démarre aussi à la première soumission si besoin (scripts, tests).
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, concurrency: Optional[int] = None):
+        self._store = store
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore()
+        return self._store
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    def register_handler(self, job_type: str, handler: JobHandler) -> None:
+        """Associe un handler à un type de job."""
+        self._handlers[job_type] = handler
+
+    async def start(self) -> None:
+        """Démarre le pool de workers (idempotent)."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"genesis-job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info("Job workers started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        """Arrête les workers; les jobs en cours sont annulés et marqués en échec."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+        if workers:
+            logger.info("Job workers stopped")
+
+    async def enqueue(self, job_type: str, user_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Crée un job et le place dans la file.
+
+        Args:
+            job_type: Type de job (doit avoir un handler enregistré)
+            user_id: Propriétaire du job
+            payload: Paramètres du handler (sérialisables JSON)
+
+        Returns:
+            Document du job (statut QUEUED)
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"No handler registered for job type: {job_type}")
+
+        await self.start()
+        job = await self.store.create(job_type, user_id, payload)
+        await self._queue.put(job["job_id"])
+        logger.info("Job enqueued", job_id=job["job_id"], job_type=job_type, user_id=user_id)
+        return job
+
+    async def join(self) -> None:
+        """Attend que tous les jobs en file soient traités."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job_id: str) -> None:
+        job = await self.store.get(job_id)
+        if job is None:
+            logger.warning("Job expired before execution", job_id=job_id)
+            return
+
+        handler = self._handlers[job["job_type"]]
+
+        async def report_progress(node: str, data: Optional[Dict[str, Any]] = None) -> None:
+            await self.store.report_progress(job_id, node, data)
+
+        await self.store.set_status(job_id, JobStatus.RUNNING)
+        try:
+            result = await handler(job, report_progress)
+        except asyncio.CancelledError:
+            await self.store.set_status(job_id, JobStatus.FAILED, error="Job cancelled (worker shutdown)")
+            raise
+        except Exception as e:
+            logger.error("Job failed", job_id=job_id, job_type=job["job_type"], error=str(e), exc_info=True)
+            await self.store.set_status(job_id, JobStatus.FAILED, error=str(e))
+            return
+
+        await self.store.set_status(job_id, JobStatus.COMPLETED, result=result)
+        logger.info("Job completed", job_id=job_id, job_type=job["job_type"])
+
+
+# Instance globale pour l'application
+job_queue = JobQueue()
@@ -0,0 +1,179 @@
+"""Stockage Redis des jobs asynchrones et diffusion de leur progression"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional
+
+import redis.asyncio as redis
+import structlog
+
+from app.config.redis import redis_pools
+from app.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Statuts possibles d'un job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """
+    Enregistrements de jobs dans Redis.
+
+    Clés:
+        genesis:job:{job_id}          -> document JSON du job (TTL JOB_TTL)
+        genesis:job:{job_id}:events   -> canal pub/sub des événements de progression
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, ttl: Optional[int] = None):
+        self.redis = redis_client or redis_pools.get_client(decode_responses=True)
+        self.ttl = ttl or settings.JOB_TTL
+        self.job_prefix = "genesis:job"
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.job_prefix}:{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.job_prefix}:{job_id}:events"
+
+    async def create(self, job_type: str, user_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Crée un job en statut QUEUED.
+
+        Args:
+            job_type: Type de job (handler enregistré dans la JobQueue)
+            user_id: Propriétaire du job
+            payload: Paramètres transmis au handler
+
+        Returns:
+            Document du job
+        """
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "job_type": job_type,
+            "user_id": user_id,
+            "status": JobStatus.QUEUED.value,
+            "payload": payload,
+            "progress": [],
+            "current_node": None,
+            "result": None,
+            "error": None,
+            "created_at": _now(),
+            "updated_at": _now()
+        }
+        await self._save(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Lit un job, None s'il n'existe pas (ou a expiré)."""
+        data = await self.redis.get(self._key(job_id))
+        return json.loads(data) if data else None
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = _now()
+        await self.redis.set(self._key(job["job_id"]), json.dumps(job, default=str), ex=self.ttl)
+
+    async def _publish(self, job: Dict[str, Any], event: str, **fields) -> None:
+        message = {
+            "event": event,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            **fields
+        }
+        await self.redis.publish(self._channel(job["job_id"]), json.dumps(message, default=str))
+
+    async def set_status(self, job_id: str, status: JobStatus, **fields) -> Optional[Dict[str, Any]]:
+        """
+        Met à jour le statut d'un job et publie l'événement correspondant.
+
+        Args:
+            job_id: ID du job
+            status: Nouveau statut
+            **fields: Champs additionnels (result, error)
+        """
+        job = await self.get(job_id)
+        if job is None:
+            logger.warning("Job not found for status update", job_id=job_id, status=status.value)
+            return None
+
+        job["status"] = status.value
+        job.update(fields)
+        await self._save(job)
+        await self._publish(job, "status", error=job.get("error"))
+        return job
+
+    async def report_progress(self, job_id: str, node: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Enregistre la fin d'un nœud d'orchestration et la diffuse.
+
+        Args:
+            job_id: ID du job
+            node: Nom du nœud terminé (research, content, logo...)
+            data: Résumé optionnel du nœud
+        """
+        job = await self.get(job_id)
+        if job is None:
+            return
+
+        entry = {"node": node, "at": _now(), **(data or {})}
+        job["progress"].append(entry)
+        job["current_node"] = node
+        await self._save(job)
+        await self._publish(job, "progress", node=node, completed_nodes=len(job["progress"]), **(data or {}))
+
+    async def stream(self, job_id: str, heartbeat: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Itère sur les événements d'un job jusqu'à un statut terminal.
+
+        Le premier événement est un instantané du job (abonnement effectué
+        avant la lecture pour ne perdre aucun événement). Sans message pendant
+        `heartbeat` secondes, le job est relu: un événement "heartbeat" est émis,
+        ou l'état final si le job s'est terminé sans événement reçu.
+        """
+        heartbeat = heartbeat or settings.JOB_SSE_HEARTBEAT_SECONDS
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            yield {"event": "snapshot", **job}
+            if job["status"] in TERMINAL_STATUSES:
+                return
+
+            loop = asyncio.get_running_loop()
+            last_event_at = loop.time()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    event = json.loads(message["data"])
+                    last_event_at = loop.time()
+                    yield event
+                    if event.get("status") in TERMINAL_STATUSES:
+                        return
+                elif loop.time() - last_event_at >= heartbeat:
+                    last_event_at = loop.time()
+                    job = await self.get(job_id)
+                    if job is None or job["status"] in TERMINAL_STATUSES:
+                        if job is not None:
+                            yield {"event": "snapshot", **job}
+                        return
+                    yield {"event": "heartbeat", "job_id": job_id, "status": job["status"]}
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
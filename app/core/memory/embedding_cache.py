@@ -0,0 +1,97 @@
+"""
+Embedding Cache - embeddings indexés par hash du contenu, dans Redis
+
+Les mêmes textes (vision/mission des briefs, requêtes récurrentes) étaient
+ré-embeddés à chaque `store_embedding` et `search_similar`. Les vecteurs sont
+mis en cache sous `genesis:embedding:{model}:{sha256(texte)}`, compactés en
+float16 (1536 dims = 3 Ko au lieu de ~30 Ko en JSON), précision largement
+suffisante pour une similarité cosinus.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+EMBEDDING_CACHE_REQUESTS = Counter(
+    'genesis_ai_embedding_cache_requests_total',
+    'Embedding cache lookups',
+    ['result']
+)
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    """Vecteur -> octets float16 little-endian."""
+    return np.asarray(vector, dtype="<f2").tobytes()
+
+
+def unpack_vector(payload: bytes) -> List[float]:
+    """Octets float16 -> liste de floats (float32)."""
+    return np.frombuffer(payload, dtype="<f2").astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """
+    Cache Redis des embeddings par (modèle, SHA-256 du texte).
+
+    Sans pool Redis actif (scripts, tests unitaires) ou en cas d'erreur
+    Redis, le cache est contourné: les embeddings sont simplement recalculés.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        redis_client: Optional[Any] = None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.model = model
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL
+        self.enabled = settings.EMBEDDING_CACHE_ENABLED if enabled is None else enabled
+        self._redis = redis_client
+
+    def _get_redis(self):
+        if self._redis is None and redis_pools.is_active:
+            self._redis = redis_pools.get_client()
+        return self._redis
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"genesis:embedding:{self.model}:{digest}"
+
+    async def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Embeddings en cache pour `texts` (un seul MGET), absents omis."""
+        redis_client = self._get_redis() if self.enabled else None
+        if redis_client is None or not texts:
+            return {}
+        try:
+            payloads = await redis_client.mget([self.key(text) for text in texts])
+        except Exception as e:
+            logger.warning("Embedding cache read failed", error=str(e))
+            return {}
+
+        found = {text: unpack_vector(payload) for text, payload in zip(texts, payloads) if payload}
+        EMBEDDING_CACHE_REQUESTS.labels(result="hit").inc(len(found))
+        EMBEDDING_CACHE_REQUESTS.labels(result="miss").inc(len(texts) - len(found))
+        return found
+
+    async def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """Met en cache des embeddings (un pipeline, même TTL)."""
+        redis_client = self._get_redis() if self.enabled else None
+        if redis_client is None or not embeddings:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for text, vector in embeddings.items():
+                pipe.set(self.key(text), pack_vector(vector), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache write failed", error=str(e))
@@ -0,0 +1,452 @@
+"""Vector search backends for VectorStore
+
+- PgVectorBackend: similarity search in PostgreSQL (pgvector HNSW index)
+- NumpyVectorBackend: in-process search over a contiguous NumPy matrix, for
+  SQLite (tests) and small deployments without the vector extension
+
+The user_embeddings table stays the source of truth in both cases: rows and
+vectors are always written there. The NumPy backend keeps a search index
+next to it (normalized vectors + row-id map), persisted as memory-mapped
+.npy files so a restart does not reload every vector from the database.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core.memory.vector_index import apply_search_params
+from app.models.embedding import UserEmbedding
+
+logger = structlog.get_logger()
+
+
+class PgVectorBackend:
+    """Similarity search with pgvector (ORDER BY distance LIMIT k on the HNSW index)."""
+
+    name = "pgvector"
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query_embedding: List[float],
+        user_id: Optional[int] = None,
+        limit: int = 5,
+        threshold: float = 0.7,
+        embedding_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        # Pre-filters (indexed: user_id + embedding_type, metadata GIN jsonb_path_ops)
+        filters = []
+        params: Dict[str, Any] = {
+            "query_embedding": json.dumps(query_embedding),
+            "threshold": threshold,
+            "limit": limit
+        }
+        if user_id:
+            filters.append("user_id = :user_id")
+            params["user_id"] = user_id
+        if embedding_type:
+            filters.append("embedding_type = :embedding_type")
+            params["embedding_type"] = embedding_type
+        if metadata_filter:
+            filters.append("metadata @> CAST(:metadata_filter AS jsonb)")
+            params["metadata_filter"] = json.dumps(metadata_filter)
+
+        # pgvector uses <=> for cosine distance (1 - similarity). The threshold
+        # must not appear in the inner WHERE, or the planner cannot walk the index.
+        query = text("""
+            SELECT id, user_id, brief_id, source_text, embedding_type, metadata, similarity
+            FROM (
+                SELECT
+                    id,
+                    user_id,
+                    brief_id,
+                    source_text,
+                    embedding_type,
+                    metadata,
+                    1 - (embedding <=> CAST(:query_embedding AS vector)) as similarity
+                FROM user_embeddings
+                {where}
+                ORDER BY embedding <=> CAST(:query_embedding AS vector)
+                LIMIT :limit
+            ) AS nearest
+            WHERE similarity >= :threshold
+            ORDER BY similarity DESC
+        """.format(
+            where=f"WHERE {' AND '.join(filters)}" if filters else ""
+        ))
+
+        await apply_search_params(db, max(limit, ef_search or settings.VECTOR_HNSW_EF_SEARCH))
+        result = await db.execute(query, params)
+
+        return [
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "brief_id": row.brief_id,
+                "source_text": row.source_text,
+                "embedding_type": row.embedding_type,
+                "metadata": row.metadata,
+                "similarity": float(row.similarity)
+            }
+            for row in result.fetchall()
+        ]
+
+    async def on_stored(self, embeddings: Iterable[UserEmbedding]) -> None:
+        """Rows are indexed by PostgreSQL itself."""
+
+    async def on_deleted(self, ids: Iterable[int]) -> None:
+        """Rows are unindexed by PostgreSQL itself."""
+
+    async def close(self) -> None:
+        pass
+
+
+class NumpyVectorIndex:
+    """
+    Contiguous matrix of L2-normalized vectors with a row-id map.
+
+    Cosine similarity = dot product of normalized vectors, computed for all
+    rows at once; top-k via argpartition. Deletions swap the last row into
+    the hole so the matrix stays contiguous. Not thread-safe on its own:
+    NumpyVectorBackend serializes access.
+    """
+
+    SCORE_BLOCK_ROWS = 8192
+
+    def __init__(self, dimensions: int, dtype: str = "float32"):
+        self.dimensions = dimensions
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.vectors = np.empty((0, dimensions), dtype=self.dtype)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+
+    @property
+    def max_id(self) -> int:
+        return int(self.ids[:self.count].max()) if self.count else 0
+
+    def __contains__(self, row_id: int) -> bool:
+        return int(row_id) in self._rows
+
+    def row_ids(self) -> Set[int]:
+        return set(self._rows)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.count + extra
+        if needed <= len(self.vectors) and self.vectors.flags.writeable:
+            return
+        capacity = max(needed, 2 * len(self.vectors), 1024)
+        # Copie en mémoire: aussi le passage d'un memmap lecture seule à un tableau modifiable
+        vectors = np.empty((capacity, self.dimensions), dtype=self.dtype)
+        ids = np.empty(capacity, dtype=np.int64)
+        user_ids = np.empty(capacity, dtype=np.int64)
+        vectors[:self.count] = self.vectors[:self.count]
+        ids[:self.count] = self.ids[:self.count]
+        user_ids[:self.count] = self.user_ids[:self.count]
+        self.vectors, self.ids, self.user_ids = vectors, ids, user_ids
+
+    def add(self, ids: List[int], user_ids: List[int], vectors: Any) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        new = [i for i, row_id in enumerate(ids) if row_id not in self._rows]
+        self._reserve(len(new))
+        for i in new:
+            row = self.count
+            self.vectors[row] = vectors[i]
+            self.ids[row] = ids[i]
+            self.user_ids[row] = user_ids[i]
+            self._rows[int(ids[i])] = row
+            self.count += 1
+
+    def remove(self, ids: Iterable[int]) -> int:
+        removed = 0
+        for row_id in ids:
+            row = self._rows.pop(int(row_id), None)
+            if row is None:
+                continue
+            if not self.vectors.flags.writeable:
+                self._reserve(0)
+            last = self.count - 1
+            if row != last:
+                self.vectors[row] = self.vectors[last]
+                self.ids[row] = self.ids[last]
+                self.user_ids[row] = self.user_ids[last]
+                self._rows[int(self.ids[row])] = row
+            self.count -= 1
+            removed += 1
+        return removed
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        if self.dtype == np.float32:
+            return self.vectors[:self.count] @ query
+        # float16: pas de BLAS, le produit est fait en float32 par blocs
+        scores = np.empty(self.count, dtype=np.float32)
+        for start in range(0, self.count, self.SCORE_BLOCK_ROWS):
+            end = min(start + self.SCORE_BLOCK_ROWS, self.count)
+            scores[start:end] = self.vectors[start:end].astype(np.float32) @ query
+        return scores
+
+    def search(self, query: Any, k: int, user_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Top-k (id, cosine similarity), best first."""
+        if not self.count or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+
+        scores = self._scores(query)
+        if user_id is not None:
+            scores = np.where(self.user_ids[:self.count] == user_id, scores, -np.inf)
+
+        k = min(k, self.count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def save(self, path: str) -> None:
+        """Writes vectors.npy / ids.npy / user_ids.npy atomically."""
+        os.makedirs(path, exist_ok=True)
+        for name, array in (("vectors", self.vectors), ("ids", self.ids), ("user_ids", self.user_ids)):
+            tmp_path = os.path.join(path, f".{name}.npy.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array[:self.count]))
+            os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+
+    def load(self, path: str) -> bool:
+        """Maps the persisted index read-only (copied on first write)."""
+        try:
+            vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+            ids = np.load(os.path.join(path, "ids.npy"))
+            user_ids = np.load(os.path.join(path, "user_ids.npy"))
+        except FileNotFoundError:
+            return False
+        if vectors.shape[1:] != (self.dimensions,) or vectors.dtype != self.dtype or len(ids) != len(vectors):
+            logger.warning("Persisted vector index ignored (shape/dtype mismatch)", path=path)
+            return False
+        self.vectors, self.ids, self.user_ids = vectors, ids, user_ids
+        self.count = len(ids)
+        self._rows = {int(row_id): row for row, row_id in enumerate(ids)}
+        return True
+
+
+class NumpyVectorBackend:
+    """
+    In-process similarity search over a NumpyVectorIndex.
+
+    Before each search the index catches up on rows inserted by other
+    workers (primary key scan of the ids above `max_id - sync_lag`: ids can
+    commit out of order, so a lower id may show up after a higher one). A
+    periodic full id-set reconciliation, also run on the first sync after a
+    restart, picks up older stragglers and rows deleted by other workers.
+    Deleted rows are dropped anyway when the top-k candidates are hydrated
+    from the table. Filters other than user_id are applied on an
+    oversampled candidate list.
+    """
+
+    name = "numpy"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dtype: Optional[str] = None,
+        dimensions: int = 1536,
+        oversample: Optional[int] = None,
+        sync_lag: Optional[int] = None,
+        reconcile_interval: Optional[float] = None
+    ):
+        self.path = path if path is not None else settings.VECTOR_NUMPY_PATH
+        self.index = NumpyVectorIndex(dimensions, dtype or settings.VECTOR_NUMPY_DTYPE)
+        self.oversample = oversample or settings.VECTOR_NUMPY_OVERSAMPLE
+        self.sync_lag = sync_lag if sync_lag is not None else settings.VECTOR_NUMPY_SYNC_LAG
+        self.reconcile_interval = (
+            reconcile_interval if reconcile_interval is not None else settings.VECTOR_NUMPY_RECONCILE_INTERVAL
+        )
+        self._next_reconcile = 0.0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded and self.path and self.index.load(self.path):
+                logger.info("Vector index mapped from disk", path=self.path, rows=self.index.count)
+            self._loaded = True
+
+    async def _sync(self, db: AsyncSession) -> None:
+        """Adds rows committed since the last sync (other workers, restarts)."""
+        await asyncio.to_thread(self._ensure_loaded)
+        full = time.monotonic() >= self._next_reconcile
+        query = select(UserEmbedding.id)
+        if not full:
+            query = query.where(UserEmbedding.id > self.index.max_id - self.sync_lag)
+        ids = set((await db.execute(query)).scalars().all())
+
+        missing = sorted(row_id for row_id in ids if row_id not in self.index)
+        if missing:
+            result = await db.execute(
+                select(UserEmbedding.id, UserEmbedding.user_id, UserEmbedding.embedding)
+                .where(UserEmbedding.id.in_(missing))
+            )
+            rows = result.all()
+            if rows:
+                await self._add([row.id for row in rows], [row.user_id for row in rows], [row.embedding for row in rows])
+
+        if full:
+            # Rows above the snapshot may have been added since (on_stored): only older ones are stale
+            ceiling = max(ids, default=0)
+
+            def _locked_row_ids():
+                with self._lock:
+                    return self.index.row_ids()
+            stale = [row_id for row_id in await asyncio.to_thread(_locked_row_ids) if row_id <= ceiling and row_id not in ids]
+            await self.on_deleted(stale)
+            self._next_reconcile = time.monotonic() + self.reconcile_interval
+            if missing or stale:
+                logger.info("Vector index reconciled", added=len(missing), removed=len(stale), rows=self.index.count)
+
+    async def _add(self, ids: List[int], user_ids: List[int], vectors: List[Any]) -> None:
+        def _locked_add():
+            with self._lock:
+                self.index.add(ids, user_ids, np.asarray(vectors, dtype=np.float32))
+        await asyncio.to_thread(_locked_add)
+        self._dirty = True
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query_embedding: List[float],
+        user_id: Optional[int] = None,
+        limit: int = 5,
+        threshold: float = 0.7,
+        embedding_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        await self._sync(db)
+
+        k = limit * self.oversample if (embedding_type or metadata_filter) else limit
+
+        def _locked_search():
+            with self._lock:
+                return self.index.search(query_embedding, k, user_id=user_id)
+        candidates = [(row_id, score) for row_id, score in await asyncio.to_thread(_locked_search) if score >= threshold]
+        if not candidates:
+            return []
+
+        query = select(
+            UserEmbedding.id,
+            UserEmbedding.user_id,
+            UserEmbedding.brief_id,
+            UserEmbedding.source_text,
+            UserEmbedding.embedding_type,
+            UserEmbedding.metadata_
+        ).where(UserEmbedding.id.in_([row_id for row_id, _ in candidates]))
+        if embedding_type:
+            query = query.where(UserEmbedding.embedding_type == embedding_type)
+        rows = {row.id: row for row in (await db.execute(query)).all()}
+
+        results = []
+        for row_id, score in candidates:
+            row = rows.get(row_id)
+            if row is None or (metadata_filter and not _contains(row.metadata_ or {}, metadata_filter)):
+                continue
+            results.append({
+                "id": row.id,
+                "user_id": row.user_id,
+                "brief_id": row.brief_id,
+                "source_text": row.source_text,
+                "embedding_type": row.embedding_type,
+                "metadata": row.metadata_,
+                "similarity": score
+            })
+            if len(results) == limit:
+                break
+        return results
+
+    async def on_stored(self, embeddings: Iterable[UserEmbedding]) -> None:
+        embeddings = list(embeddings)
+        if not embeddings:
+            return
+        await asyncio.to_thread(self._ensure_loaded)
+        await self._add([e.id for e in embeddings], [e.user_id for e in embeddings], [e.embedding for e in embeddings])
+
+    async def on_deleted(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        if not ids:
+            return
+        await asyncio.to_thread(self._ensure_loaded)
+
+        def _locked_remove():
+            with self._lock:
+                return self.index.remove(ids)
+        if await asyncio.to_thread(_locked_remove):
+            self._dirty = True
+
+    async def flush(self) -> None:
+        """Persists the index if it changed since the last flush."""
+        if not self._dirty or not self.path:
+            return
+
+        def _locked_save():
+            with self._lock:
+                self.index.save(self.path)
+        await asyncio.to_thread(_locked_save)
+        self._dirty = False
+        logger.info("Vector index persisted", path=self.path, rows=self.index.count)
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+def _contains(document: Any, subset: Any) -> bool:
+    """JSONB `@>` semantics for dicts (recursive) and scalars."""
+    if isinstance(subset, dict):
+        return isinstance(document, dict) and all(
+            key in document and _contains(document[key], value) for key, value in subset.items()
+        )
+    if isinstance(subset, list):
+        return isinstance(document, list) and all(any(_contains(item, value) for item in document) for value in subset)
+    return document == subset
+
+
+_backends: Dict[str, Any] = {}
+
+
+def get_vector_backend(name: Optional[str] = None):
+    """Shared backend instance selected by VECTOR_BACKEND (pgvector | numpy)."""
+    name = name or settings.VECTOR_BACKEND
+    if name not in _backends:
+        if name == "numpy":
+            _backends[name] = NumpyVectorBackend()
+        elif name == "pgvector":
+            _backends[name] = PgVectorBackend()
+        else:
+            raise ValueError(f"Unknown vector backend: {name}")
+        logger.info("Vector backend selected", backend=name)
+    return _backends[name]
+
+
+async def close_vector_backends() -> None:
+    """Flushes and releases backends (called at application shutdown)."""
+    backends = list(_backends.values())
+    _backends.clear()
+    for backend in backends:
+        try:
+            await backend.close()
+        except Exception as e:
+            logger.warning("Failed to close vector backend", backend=backend.name, error=str(e))
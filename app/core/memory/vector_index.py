@@ -0,0 +1,77 @@
+"""ANN index management for user_embeddings (pgvector HNSW)
+
+The HNSW graph quality is fixed at build time (`m`, `ef_construction`);
+recall/latency at query time is tuned per transaction with `hnsw.ef_search`.
+Rebuilds use CREATE INDEX CONCURRENTLY under a temporary name and then swap,
+so searches keep an index during the rebuild.
+"""
+
+from typing import Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config.settings import settings
+
+logger = structlog.get_logger()
+
+HNSW_INDEX_NAME = "ix_user_embeddings_embedding_hnsw"
+FILTER_INDEX_NAME = "ix_user_embeddings_user_id_embedding_type"
+METADATA_INDEX_NAME = "ix_user_embeddings_metadata"
+
+
+def hnsw_index_ddl(
+    name: str = HNSW_INDEX_NAME,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    concurrently: bool = True
+) -> str:
+    """CREATE INDEX statement for the cosine HNSW index."""
+    m = int(m or settings.VECTOR_HNSW_M)
+    ef_construction = int(ef_construction or settings.VECTOR_HNSW_EF_CONSTRUCTION)
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON user_embeddings USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {m}, ef_construction = {ef_construction})"
+    )
+
+
+async def apply_search_params(db: AsyncSession, ef_search: int) -> None:
+    """
+    Set HNSW query parameters for the current transaction only.
+
+    ef_search must be >= LIMIT to return k rows; iterative scans
+    (pgvector >= 0.8) keep scanning when filters discard candidates.
+    """
+    await db.execute(text("SELECT set_config('hnsw.ef_search', :ef_search, true)"), {"ef_search": str(int(ef_search))})
+    if settings.VECTOR_HNSW_ITERATIVE_SCAN:
+        await db.execute(
+            text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+            {"mode": settings.VECTOR_HNSW_ITERATIVE_SCAN}
+        )
+
+
+async def rebuild_hnsw_index(
+    engine: AsyncEngine,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None
+) -> None:
+    """
+    Rebuild the HNSW index with new build parameters, without downtime.
+
+    Builds `<name>_new` concurrently, drops the old index and renames.
+    """
+    new_name = f"{HNSW_INDEX_NAME}_new"
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}"))
+        await conn.execute(text(hnsw_index_ddl(new_name, m, ef_construction)))
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}"))
+        await conn.execute(text(f"ALTER INDEX {new_name} RENAME TO {HNSW_INDEX_NAME}"))
+    logger.info(
+        "HNSW index rebuilt",
+        index=HNSW_INDEX_NAME,
+        m=m or settings.VECTOR_HNSW_M,
+        ef_construction=ef_construction or settings.VECTOR_HNSW_EF_CONSTRUCTION
+    )
@@ -1,16 +1,83 @@
 """Vector Store Service for semantic memory operations"""
 
+import asyncio
 import structlog
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import delete, select
 from openai import AsyncOpenAI
+from prometheus_client import Histogram
 
 from app.config.settings import settings
+from app.core.memory.embedding_cache import EmbeddingCache
+from app.core.memory.vector_backends import get_vector_backend
 from app.models.embedding import UserEmbedding
 
 logger = structlog.get_logger()
 
+# Prometheus metrics
+EMBEDDING_BATCH_SIZE = Histogram(
+    'genesis_ai_embedding_batch_size',
+    'Texts sent per OpenAI embeddings request',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+)
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching of embedding requests.
+
+    Texts submitted concurrently within `window` seconds are grouped into a
+    single embeddings call (at most `max_batch` inputs); identical pending
+    texts share the same request.
+    """
+
+    def __init__(self, embed_many, max_batch: int, window: float):
+        self._embed_many = embed_many
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in texts:
+            future = self._pending.get(item)
+            if future is None or future.get_loop() is not loop:
+                future = loop.create_future()
+                self._pending[item] = future
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._schedule(loop, 0)
+        elif self._timer is None:
+            self._schedule(loop, self.window)
+        return list(await asyncio.gather(*futures))
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(delay, lambda: loop.create_task(self._flush()))
+
+    async def _flush(self) -> None:
+        self._timer = None
+        while self._pending:
+            batch: List[Tuple[str, asyncio.Future]] = list(self._pending.items())[:self.max_batch]
+            for item, _ in batch:
+                del self._pending[item]
+            EMBEDDING_BATCH_SIZE.observe(len(batch))
+            try:
+                vectors = await self._embed_many([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
 class VectorStore:
     """Service for storing and searching embeddings"""
     
@@ -18,6 +85,13 @@ class VectorStore:
         self.openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.embedding_model = "text-embedding-3-small"
         self.embedding_dimensions = 1536
+        self.cache = EmbeddingCache(self.embedding_model)
+        self.batcher = EmbeddingBatcher(
+            self._create_embeddings,
+            max_batch=settings.EMBEDDING_BATCH_SIZE,
+            window=settings.EMBEDDING_BATCH_WINDOW
+        )
+        self.backend = get_vector_backend()
     
     async def embed_text(self, text: str) -> List[float]:
         """
@@ -29,17 +103,47 @@ class VectorStore:
         Returns:
             List of floats representing the embedding vector
         """
-        try:
-            response = await self.openai.embeddings.create(
-                model=self.embedding_model,
-                input=text
-            )
-            embedding = response.data[0].embedding
-            logger.info("Text embedded successfully", text_length=len(text))
-            return embedding
-        except Exception as e:
-            logger.error("Failed to embed text", error=str(e))
-            raise
+        return (await self.embed_batch([text]))[0]
+    
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts.
+        
+        Cached vectors are read from Redis in one round trip; the misses are
+        micro-batched with concurrent callers into as few OpenAI requests as
+        possible, then cached.
+        
+        Args:
+            texts: Texts to embed (duplicates allowed)
+            
+        Returns:
+            Embedding vectors, in the same order as `texts`
+        """
+        unique = list(dict.fromkeys(texts))
+        embeddings = await self.cache.get_many(unique)
+        
+        missing = [item for item in unique if item not in embeddings]
+        if missing:
+            try:
+                vectors = await self.batcher.submit(missing)
+            except Exception as e:
+                logger.error("Failed to embed text", error=str(e), count=len(missing))
+                raise
+            computed = dict(zip(missing, vectors))
+            embeddings.update(computed)
+            await self.cache.set_many(computed)
+        
+        logger.info("Texts embedded", count=len(texts), computed=len(missing))
+        return [embeddings[item] for item in texts]
+    
+    async def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """One OpenAI embeddings request for up to EMBEDDING_BATCH_SIZE texts."""
+        response = await self.openai.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        # The API returns one item per input, in input order
+        return [item.embedding for item in response.data]
     
     async def store_embedding(
         self,
@@ -80,6 +184,7 @@ class VectorStore:
         db.add(user_embedding)
         await db.commit()
         await db.refresh(user_embedding)
+        await self.backend.on_stored([user_embedding])
         
         logger.info(
             "Embedding stored",
@@ -90,23 +195,73 @@ class VectorStore:
         
         return user_embedding
     
+    async def store_embeddings_bulk(
+        self,
+        db: AsyncSession,
+        items: List[Dict[str, Any]]
+    ) -> List[UserEmbedding]:
+        """
+        Embed and store many texts in a single transaction.
+        
+        Args:
+            db: Database session
+            items: Dicts with user_id, brief_id, text and optional
+                embedding_type (default "brief") and metadata
+            
+        Returns:
+            Created UserEmbedding objects, in input order
+        """
+        if not items:
+            return []
+        
+        vectors = await self.embed_batch([item["text"] for item in items])
+        user_embeddings = [
+            UserEmbedding(
+                user_id=item["user_id"],
+                brief_id=item["brief_id"],
+                embedding=vector,
+                source_text=item["text"],
+                embedding_type=item.get("embedding_type", "brief"),
+                metadata_=item.get("metadata") or {}
+            )
+            for item, vector in zip(items, vectors)
+        ]
+        
+        # One flush = batched multi-row INSERT ... RETURNING, one commit
+        db.add_all(user_embeddings)
+        await db.commit()
+        await self.backend.on_stored(user_embeddings)
+        
+        logger.info("Embeddings stored in bulk", count=len(user_embeddings))
+        return user_embeddings
+    
     async def search_similar(
         self,
         db: AsyncSession,
         query_text: str,
         user_id: Optional[int] = None,
         limit: int = 5,
-        threshold: float = 0.7
+        threshold: float = 0.7,
+        embedding_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar embeddings using cosine similarity.
         
+        The k nearest neighbours are fetched by the configured backend
+        (VECTOR_BACKEND); the similarity threshold is applied to those k
+        candidates afterwards.
+        
         Args:
             db: Database session
             query_text: Text to search for
             user_id: Optional user ID to filter results
             limit: Maximum number of results
             threshold: Minimum similarity score (0-1)
+            embedding_type: Optional embedding type filter (brief, conversation...)
+            metadata_filter: Optional JSONB containment filter, e.g. {"sector": "restaurant"}
+            ef_search: HNSW candidate list size for this query (pgvector only)
             
         Returns:
             List of similar embeddings with scores
@@ -114,50 +269,16 @@ class VectorStore:
         # Generate query embedding
         query_embedding = await self.embed_text(query_text)
         
-        # Build query with pgvector cosine distance
-        # Note: pgvector uses <=> for cosine distance (1 - similarity)
-        # So we convert to similarity: 1 - distance
-        
-        query = text("""
-            SELECT 
-                id,
-                user_id,
-                brief_id,
-                source_text,
-                embedding_type,
-                metadata,
-                1 - (embedding <=> :query_embedding) as similarity
-            FROM user_embeddings
-            WHERE 1 - (embedding <=> :query_embedding) >= :threshold
-            {user_filter}
-            ORDER BY embedding <=> :query_embedding
-            LIMIT :limit
-        """.format(
-            user_filter="AND user_id = :user_id" if user_id else ""
-        ))
-        
-        params = {
-            "query_embedding": json.dumps(query_embedding),
-            "threshold": threshold,
-            "limit": limit
-        }
-        if user_id:
-            params["user_id"] = user_id
-        
-        result = await db.execute(query, params)
-        rows = result.fetchall()
-        
-        similar_items = []
-        for row in rows:
-            similar_items.append({
-                "id": row.id,
-                "user_id": row.user_id,
-                "brief_id": row.brief_id,
-                "source_text": row.source_text,
-                "embedding_type": row.embedding_type,
-                "metadata": row.metadata,
-                "similarity": float(row.similarity)
-            })
+        similar_items = await self.backend.search(
+            db,
+            query_embedding,
+            user_id=user_id,
+            limit=limit,
+            threshold=threshold,
+            embedding_type=embedding_type,
+            metadata_filter=metadata_filter,
+            ef_search=ef_search
+        )
         
         logger.info(
             "Similar embeddings found",
@@ -171,31 +292,46 @@ class VectorStore:
         self,
         db: AsyncSession,
         user_id: int,
-        brief_id: Optional[str] = None
+        brief_id: Optional[str] = None,
+        chunk_size: Optional[int] = None
     ) -> int:
         """
         Delete embeddings for a user.
         
+        Set-based DELETE ... RETURNING id, without loading rows (or vectors)
+        into Python. Very large users are deleted in chunks of `chunk_size`
+        rows, one commit per chunk, to keep transactions and locks short.
+        
         Args:
             db: Database session
             user_id: User ID
             brief_id: Optional specific brief ID
+            chunk_size: Rows per DELETE (default EMBEDDING_DELETE_CHUNK_SIZE)
             
         Returns:
             Number of deleted records
         """
-        query = select(UserEmbedding).where(UserEmbedding.user_id == user_id)
-        if brief_id:
-            query = query.where(UserEmbedding.brief_id == brief_id)
-        
-        result = await db.execute(query)
-        embeddings = result.scalars().all()
+        chunk_size = chunk_size or settings.EMBEDDING_DELETE_CHUNK_SIZE
         
-        count = len(embeddings)
-        for embedding in embeddings:
-            await db.delete(embedding)
+        chunk = select(UserEmbedding.id).where(UserEmbedding.user_id == user_id)
+        if brief_id:
+            chunk = chunk.where(UserEmbedding.brief_id == brief_id)
+        statement = (
+            delete(UserEmbedding)
+            .where(UserEmbedding.id.in_(chunk.limit(chunk_size).scalar_subquery()))
+            .returning(UserEmbedding.id)
+            .execution_options(synchronize_session=False)
+        )
         
-        await db.commit()
+        count = 0
+        while True:
+            result = await db.execute(statement)
+            deleted_ids = list(result.scalars().all())
+            await db.commit()
+            await self.backend.on_deleted(deleted_ids)
+            count += len(deleted_ids)
+            if len(deleted_ids) < chunk_size:
+                break
         
-        logger.info("Embeddings deleted", user_id=user_id, count=count)
+        logger.info("Embeddings deleted", user_id=user_id, brief_id=brief_id, count=count)
         return count
@@ -0,0 +1,70 @@
+"""
+Conteneur d'agents à portée application.
+
+L'orchestrateur LangGraph et ses sub-agents (providers, clients Redis, graphe
+compilé) sont construits une seule fois au démarrage puis partagés par toutes
+les requêtes. Les agents sont sans état entre deux exécutions: tout l'état
+d'une génération vit dans l'AgentState du graphe.
+"""
+
+from typing import Optional
+
+import structlog
+
+from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+
+logger = structlog.get_logger(__name__)
+
+
+class AgentContainer:
+    """
+    Détient l'orchestrateur singleton et ses agents.
+
+    Usage:
+        await agent_container.startup()      # lifespan, démarrage
+        orchestrator = agent_container.orchestrator
+        await agent_container.shutdown()     # lifespan, arrêt
+    """
+
+    def __init__(self):
+        self._orchestrator: Optional[LangGraphOrchestrator] = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._orchestrator is not None
+
+    async def startup(self) -> None:
+        """Construit l'orchestrateur (agents + graphe compilé) une seule fois."""
+        if self._orchestrator is None:
+            self._orchestrator = LangGraphOrchestrator()
+            logger.info("Agent container started", execution_mode=self._orchestrator.execution_mode)
+
+    @property
+    def orchestrator(self) -> LangGraphOrchestrator:
+        """
+        Orchestrateur partagé.
+
+        Construit paresseusement si le conteneur n'a pas été démarré par le
+        lifespan (scripts, tests), puis réutilisé pour tous les appels suivants.
+        """
+        if self._orchestrator is None:
+            logger.warning("Agent container not started, building orchestrator lazily")
+            self._orchestrator = LangGraphOrchestrator()
+        return self._orchestrator
+
+    async def shutdown(self) -> None:
+        """Libère les ressources détenues par les agents."""
+        orchestrator, self._orchestrator = self._orchestrator, None
+        if orchestrator is None:
+            return
+
+        for agent in (orchestrator.logo_agent,):
+            redis_fs = getattr(agent, "redis_fs", None)
+            if redis_fs is not None:
+                await redis_fs.close()
+
+        logger.info("Agent container shut down")
+
+
+# Instance globale pour l'application
+agent_container = AgentContainer()
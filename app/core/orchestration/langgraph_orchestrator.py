@@ -1,6 +1,6 @@
 import structlog
-from langgraph.graph import StateGraph, END
-from typing import TypedDict, Annotated, List, Dict, Any, Optional
+from langgraph.graph import StateGraph, START, END
+from typing import TypedDict, Annotated, List, Dict, Any, Optional, Callable, Awaitable
 import operator
 
 # Nouveaux sub-agents Sprint 2
@@ -37,14 +37,52 @@ class AgentState(TypedDict):
     is_ready_for_website: bool
     error: Optional[str]
 
+# Dépendances entre nœuds du graphe (mode "parallel").
+# Un nœud sans dépendance démarre dès l'entrée du graphe ; les nœuds
+# terminaux convergent vers "finalize" qui attend toutes les branches.
+NODE_DEPENDENCIES: Dict[str, List[str]] = {
+    "research": [],
+    "content": ["research"],
+    "logo": [],
+    "seo": [],
+    "template": [],
+}
+
+# Ordre historique d'exécution (mode "sequential")
+SEQUENTIAL_ORDER: List[str] = ["research", "content", "logo", "seo", "template"]
+
+# Clés d'état produites par chaque sub-agent (utilisées pour la confiance globale)
+AGENT_RESULT_KEYS: List[str] = [
+    "market_research",
+    "content_generation",
+    "logo_creation",
+    "seo_optimization",
+    "template_selection",
+]
+
+EXECUTION_MODES = ("parallel", "sequential")
+
+
 class LangGraphOrchestrator:
     """
     Orchestrateur basé sur LangGraph pour coordonner les sub-agents.
     
     Sprint 2: Utilise les nouveaux sub-agents (ResearchSubAgent, ContentSubAgent)
     avec architecture multi-provider.
+    
+    Deux modes d'exécution:
+        - "parallel" (défaut): graphe piloté par NODE_DEPENDENCIES.
+          research -> content sur une branche, logo/seo/template en parallèle,
+          jointure sur "finalize" avant le calcul de overall_confidence.
+        - "sequential": chaîne historique research -> content -> logo -> seo -> template.
     """
-    def __init__(self):
+    def __init__(self, execution_mode: str = "parallel"):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"execution_mode invalide: {execution_mode} (attendu: {', '.join(EXECUTION_MODES)})"
+            )
+        self.execution_mode = execution_mode
+        
         # Nouveaux sub-agents Sprint 2 (multi-provider)
         self.research_agent = ResearchSubAgent()
         self.content_agent = ContentSubAgent()
@@ -55,10 +93,13 @@ class LangGraphOrchestrator:
         self.template_agent = TemplateAgent()
         
         self.graph = self._build_graph()
-        logger.info("LangGraphOrchestrator initialized with all agents.")
+        logger.info(
+            "LangGraphOrchestrator initialized with all agents.",
+            execution_mode=self.execution_mode
+        )
 
     def _build_graph(self):
-        """Construit le graphe d'exécution des agents."""
+        """Construit le graphe d'exécution des agents selon le mode choisi."""
         workflow = StateGraph(AgentState)
 
         # Add nodes for each agent
@@ -67,18 +108,59 @@ class LangGraphOrchestrator:
         workflow.add_node("logo", self.run_logo_agent)
         workflow.add_node("seo", self.run_seo_agent)
         workflow.add_node("template", self.run_template_agent)
+        workflow.add_node("finalize", self.finalize_results)
+
+        if self.execution_mode == "sequential":
+            # Chaîne séquentielle historique
+            workflow.add_edge(START, SEQUENTIAL_ORDER[0])
+            for previous, following in zip(SEQUENTIAL_ORDER, SEQUENTIAL_ORDER[1:]):
+                workflow.add_edge(previous, following)
+            workflow.add_edge(SEQUENTIAL_ORDER[-1], "finalize")
+        else:
+            # Fan-out piloté par les dépendances
+            dependents = {dep for deps in NODE_DEPENDENCIES.values() for dep in deps}
+            for node, deps in NODE_DEPENDENCIES.items():
+                if not deps:
+                    workflow.add_edge(START, node)
+                elif len(deps) == 1:
+                    workflow.add_edge(deps[0], node)
+                else:
+                    workflow.add_edge(deps, node)
 
-        # Define the execution flow: Sequential to ensure all agents execute
-        workflow.set_entry_point("research")
-        workflow.add_edge("research", "content")
-        workflow.add_edge("content", "logo")
-        workflow.add_edge("logo", "seo")
-        workflow.add_edge("seo", "template")
-        workflow.add_edge("template", END)
+            # Jointure: "finalize" attend toutes les branches terminales
+            leaves = [node for node in NODE_DEPENDENCIES if node not in dependents]
+            workflow.add_edge(leaves, "finalize")
+
+        workflow.add_edge("finalize", END)
 
         # Compile the graph
         return workflow.compile()
 
+    async def finalize_results(self, state: AgentState) -> AgentState:
+        """
+        Nœud de jointure: calcule la confiance globale une fois tous les sub-agents terminés.
+        """
+        agent_results = [state.get(key) or {} for key in AGENT_RESULT_KEYS]
+        
+        successful_agents = sum(
+            1 for result in agent_results 
+            if result and not result.get('error') and not result.get('fallback_mode')
+        )
+        total_agents = len(agent_results)
+        
+        overall_confidence = successful_agents / total_agents if total_agents > 0 else 0.0
+        
+        logger.info(
+            "Sub-agents joined",
+            successful_agents=f"{successful_agents}/{total_agents}",
+            execution_mode=self.execution_mode
+        )
+        
+        return {
+            "overall_confidence": overall_confidence,
+            "is_ready_for_website": successful_agents >= 3  # Au moins 3/5 agents réussis
+        }
+
     async def run_research_agent(self, state: AgentState) -> AgentState:
         """
         Exécute ResearchSubAgent avec nouveau format DC360.
@@ -238,7 +320,30 @@ class LangGraphOrchestrator:
                 }
             }
 
-    async def run(self, orchestration_input: Dict[str, Any]):
+    async def _run_with_progress(
+        self,
+        initial_state: Dict[str, Any],
+        progress_callback: Callable[[str, Dict[str, Any]], Awaitable[None]]
+    ) -> Dict[str, Any]:
+        """Exécute le graphe en streaming et notifie la fin de chaque nœud."""
+        final_state = dict(initial_state)
+        async for update in self.graph.astream(initial_state, stream_mode="updates"):
+            for node_name, node_output in update.items():
+                node_output = node_output or {}
+                final_state.update(node_output)
+                if node_name == "finalize":
+                    continue
+                node_result = next(iter(node_output.values()), {}) if node_output else {}
+                await progress_callback(node_name, {
+                    "fallback_mode": bool(isinstance(node_result, dict) and node_result.get('fallback_mode'))
+                })
+        return final_state
+
+    async def run(
+        self,
+        orchestration_input: Dict[str, Any],
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+    ):
         """
         Exécute le graphe d'orchestration.
         
@@ -248,6 +353,8 @@ class LangGraphOrchestrator:
                 - brief_id: ID brief généré
                 - business_brief: Brief business format DC360
                 - coaching_session_id: ID session coaching (optionnel)
+            progress_callback: Coroutine appelée à la fin de chaque nœud
+                avec (nom_du_nœud, {"fallback_mode": bool}) (optionnel)
                 
         Returns:
             État final avec résultats tous sub-agents
@@ -277,33 +384,18 @@ class LangGraphOrchestrator:
                 "error": None
             }
             
-            # Exécution workflow
-            final_state = await self.graph.ainvoke(initial_state)
-            
-            # Calcul confiance globale basé sur succès sub-agents
-            agent_results = [
-                final_state.get('market_research', {}),
-                final_state.get('content_generation', {}),
-                final_state.get('logo_creation', {}),
-                final_state.get('seo_optimization', {}),
-                final_state.get('template_selection', {})
-            ]
-            
-            successful_agents = sum(
-                1 for result in agent_results 
-                if result and not result.get('error') and not result.get('fallback_mode')
-            )
-            total_agents = len(agent_results)
-            
-            final_state['overall_confidence'] = successful_agents / total_agents if total_agents > 0 else 0.0
-            final_state['is_ready_for_website'] = successful_agents >= 3  # Au moins 3/5 agents réussis
+            # Exécution workflow (overall_confidence calculée par le nœud "finalize")
+            if progress_callback is None:
+                final_state = await self.graph.ainvoke(initial_state)
+            else:
+                final_state = await self._run_with_progress(initial_state, progress_callback)
             
             logger.info(
                 "LangGraph orchestration completed successfully",
                 brief_id=final_state.get('brief_id'),
                 confidence=final_state['overall_confidence'],
                 ready_for_website=final_state['is_ready_for_website'],
-                successful_agents=f"{successful_agents}/{total_agents}"
+                execution_mode=self.execution_mode
             )
             
             return final_state
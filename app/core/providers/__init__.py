@@ -11,6 +11,11 @@ from .config import ProviderConfig, PLAN_PROVIDER_MAPPING
 from .deepseek import DeepseekProvider
 from .kimi import KimiProvider
 from .dalle import DALLEImageProvider
+from .cache import CachedLLMProvider, LLMResponseCache
+from .errors import ProviderHTTPError, AllProvidersFailedError
+from .failover import FailoverLLMProvider, CircuitBreaker, circuit_breakers
+from .hedging import HedgedLLMProvider, LatencyTracker, latency_tracker
+from .image_scheduler import ImageRequestScheduler, TokenBucket, image_schedulers
 
 __all__ = [
     'BaseLLMProvider',
@@ -21,5 +26,18 @@ __all__ = [
     'PLAN_PROVIDER_MAPPING',
     'DeepseekProvider',
     'KimiProvider',
-    'DALLEImageProvider'
+    'DALLEImageProvider',
+    'CachedLLMProvider',
+    'LLMResponseCache',
+    'ProviderHTTPError',
+    'AllProvidersFailedError',
+    'FailoverLLMProvider',
+    'CircuitBreaker',
+    'circuit_breakers',
+    'HedgedLLMProvider',
+    'LatencyTracker',
+    'latency_tracker',
+    'ImageRequestScheduler',
+    'TokenBucket',
+    'image_schedulers'
 ]
@@ -5,7 +5,7 @@ Abstract base classes for LLM, Search, and Image generation providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from enum import Enum
 
 
@@ -76,6 +76,38 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse textuelle en streaming (deltas de texte)
+        
+        Implémentation par défaut: un seul fragment contenant la réponse
+        complète de generate(). Les providers supportant le streaming
+        natif la surchargent.
+        
+        Args:
+            prompt: Le prompt utilisateur
+            system_message: Message système optionnel
+            temperature: Température de génération
+            max_tokens: Nombre maximum de tokens
+            
+        Yields:
+            str: Fragments de texte dans l'ordre de génération
+        """
+        yield await self.generate(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+    
     @abstractmethod
     async def health_check(self) -> bool:
         """Vérifie la disponibilité du provider"""
@@ -0,0 +1,346 @@
+"""
+LLM Response Cache
+
+Cache adressé par contenu autour de BaseLLMProvider: une complétion identique
+(modèle, system message, prompt, température, max_tokens) n'est payée qu'une fois.
+
+Deux niveaux:
+    - L1: LRU in-process avec TTL (par worker)
+    - L2: Redis avec TTL (partagé entre workers), actif quand le pool Redis
+      applicatif est ouvert (lifespan)
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+from .base import BaseLLMProvider
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+LLM_CACHE_REQUESTS = Counter(
+    'genesis_ai_llm_cache_requests_total',
+    'LLM response cache lookups',
+    ['model', 'result', 'tier']
+)
+
+_MISSING = object()
+
+
+def make_cache_key(
+    model: str,
+    system_message: Optional[str],
+    prompt: str,
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    kind: str = "text",
+    response_schema: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Clé de cache: SHA-256 des paramètres qui déterminent la complétion.
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    material = json.dumps(
+        {
+            "kind": kind,
+            "model": model,
+            "system_message": system_message,
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_schema": response_schema
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class InMemoryLRUCache:
+    """LRU borné avec expiration par entrée (L1, par processus)"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMResponseCache:
+    """
+    Cache deux niveaux (LRU in-process + Redis) des réponses LLM.
+
+    Les erreurs Redis ne font jamais échouer un appel LLM: le cache se
+    comporte alors comme un miss.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        redis_client: Optional[Any] = None
+    ):
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.l1 = InMemoryLRUCache(max_entries or settings.LLM_CACHE_MAX_ENTRIES, self.ttl)
+        self._redis = redis_client
+        self.key_prefix = "genesis:llm_cache"
+        self.stats = {"hits": 0, "misses": 0, "l1_hits": 0, "redis_hits": 0}
+
+    def _get_redis(self):
+        if self._redis is not None:
+            return self._redis
+        if redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    async def get(self, key: str, model: str) -> Any:
+        """Retourne la valeur en cache ou None (miss)."""
+        value = self.l1.get(key)
+        if value is not _MISSING:
+            self._record(model, "hit", "l1")
+            return value
+
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                raw = await redis_client.get(f"{self.key_prefix}:{key}")
+                if raw is not None:
+                    value = json.loads(raw)
+                    self.l1.set(key, value)
+                    self._record(model, "hit", "redis")
+                    return value
+            except Exception as e:
+                logger.warning("LLM cache read failed", error=str(e))
+
+        self._record(model, "miss", "none")
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Enregistre une réponse dans les deux niveaux."""
+        self.l1.set(key, value)
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    f"{self.key_prefix}:{key}",
+                    json.dumps(value, ensure_ascii=False, default=str),
+                    ex=self.ttl
+                )
+            except Exception as e:
+                logger.warning("LLM cache write failed", error=str(e))
+
+    def _record(self, model: str, result: str, tier: str) -> None:
+        LLM_CACHE_REQUESTS.labels(model=model, result=result, tier=tier).inc()
+        if result == "hit":
+            self.stats["hits"] += 1
+            self.stats[f"{tier}_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+
+
+class CachedLLMProvider(BaseLLMProvider):
+    """
+    Décorateur de BaseLLMProvider ajoutant le cache de réponses.
+
+    Usage:
+        llm = CachedLLMProvider(DeepseekProvider(api_key=...))
+        await llm.generate(prompt, temperature=0.2)                   # caché
+        await llm.generate(prompt, temperature=0.2, use_cache=False)  # bypass
+    """
+
+    def __init__(self, provider: BaseLLMProvider, cache: Optional[LLMResponseCache] = None):
+        super().__init__(api_key=provider.api_key, model=provider.model, **provider.config)
+        self.provider = provider
+        self.cache = cache or get_llm_response_cache()
+
+    def __getattr__(self, name: str) -> Any:
+        # Attributs spécifiques du provider sous-jacent (base_url, timeout...)
+        return getattr(self.__dict__["provider"], name)
+
+    def _cacheable(self, temperature: Optional[float], use_cache: bool) -> bool:
+        if not use_cache:
+            return False
+        return temperature is None or temperature <= settings.LLM_CACHE_MAX_TEMPERATURE
+
+    async def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Génère une réponse textuelle, servie depuis le cache si possible.
+
+        Args:
+            use_cache: False pour forcer un appel au provider (bypass)
+        """
+        # kwargs additionnels (top_p, penalties...) non couverts par la clé: pas de cache
+        if not self._cacheable(temperature, use_cache) or kwargs:
+            return await self.provider.generate(
+                prompt=prompt,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+
+        key = make_cache_key(self.model, system_message, prompt, temperature, max_tokens)
+        cached = await self.cache.get(key, self.model)
+        if cached is not None:
+            logger.info("LLM cache hit", model=self.model, kind="text")
+            return cached
+
+        result = await self.provider.generate(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        await self.cache.set(key, result)
+        return result
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Génère une réponse structurée, servie depuis le cache si possible.
+
+        Args:
+            use_cache: False pour forcer un appel au provider (bypass)
+        """
+        temperature = kwargs.get("temperature")
+        # Comme generate(): kwargs hors temperature/max_tokens non couverts par la clé
+        if not self._cacheable(temperature, use_cache) or kwargs.keys() - {"temperature", "max_tokens"}:
+            return await self.provider.generate_structured(
+                prompt=prompt,
+                response_schema=response_schema,
+                system_message=system_message,
+                **kwargs
+            )
+
+        key = make_cache_key(
+            self.model,
+            system_message,
+            prompt,
+            temperature,
+            kwargs.get("max_tokens"),
+            kind="structured",
+            response_schema=response_schema
+        )
+        cached = await self.cache.get(key, self.model)
+        if cached is not None:
+            logger.info("LLM cache hit", model=self.model, kind="structured")
+            return cached
+
+        result = await self.provider.generate_structured(
+            prompt=prompt,
+            response_schema=response_schema,
+            system_message=system_message,
+            **kwargs
+        )
+        await self.cache.set(key, result)
+        return result
+
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streame une réponse; un hit est restitué en un seul fragment, un miss
+        est streamé depuis le provider puis mis en cache une fois complet.
+
+        Partage la clé de generate(): un texte streamé sert aussi generate().
+        """
+        if not self._cacheable(temperature, use_cache) or kwargs:
+            async for delta in self.provider.astream(
+                prompt=prompt,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            ):
+                yield delta
+            return
+
+        key = make_cache_key(self.model, system_message, prompt, temperature, max_tokens)
+        cached = await self.cache.get(key, self.model)
+        if cached is not None:
+            logger.info("LLM cache hit", model=self.model, kind="stream")
+            yield cached
+            return
+
+        chunks = []
+        async for delta in self.provider.astream(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ):
+            chunks.append(delta)
+            yield delta
+
+        # Flux interrompu (client déconnecté, erreur): rien n'est mis en cache
+        await self.cache.set(key, "".join(chunks))
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Cache de réponses LLM partagé par tous les providers du processus."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache()
+    return _llm_response_cache
@@ -5,7 +5,7 @@ Defines which AI providers are used for each subscription plan.
 Optimizes for cost/quality balance based on user tier.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from enum import Enum
 
 
@@ -57,6 +57,15 @@ class ProviderConfig:
         }
     }
     
+    # Chaînes de failover LLM: providers essayés, dans l'ordre, après le primaire
+    # (seuls ceux disposant d'une clé API sont retenus par la factory)
+    LLM_FALLBACK_CHAINS: Dict[str, List[Tuple[str, str]]] = {
+        "deepseek": [("kimi", "moonshot-v1-32k")],
+        "kimi": [("deepseek", "deepseek-chat")],
+        "openai": [("deepseek", "deepseek-chat"), ("kimi", "moonshot-v1-32k")],
+        "anthropic": [("openai", "gpt-4o-mini"), ("deepseek", "deepseek-chat")],
+    }
+    
     # Configuration détaillée par provider
     PROVIDER_CONFIGS: Dict[str, Dict[str, Any]] = {
         # LLM Providers
@@ -181,6 +190,24 @@ class ProviderConfig:
         """
         plan_config = cls.PLAN_PROVIDER_MAPPING.get(plan, cls.PLAN_PROVIDER_MAPPING[SubscriptionPlan.TRIAL])
         return plan_config.get("llm_model", "mock-gpt")
+    
+    @classmethod
+    def get_llm_provider_chain(cls, provider_name: str, model: str) -> List[Tuple[str, str]]:
+        """
+        Retourne la chaîne ordonnée (provider, modèle) pour un provider primaire
+        
+        Args:
+            provider_name: Provider LLM primaire
+            model: Modèle du provider primaire
+            
+        Returns:
+            Liste [(primaire, modèle), (fallback1, modèle1), ...] sans doublon
+        """
+        chain = [(provider_name, model)]
+        for fallback in cls.LLM_FALLBACK_CHAINS.get(provider_name, []):
+            if fallback[0] not in {name for name, _ in chain}:
+                chain.append(fallback)
+        return chain
 
 
 # Export pour faciliter l'import
@@ -9,6 +9,8 @@ import structlog
 from typing import Dict, Any, List, Optional
 
 from .base import BaseImageProvider
+from app.core.integrations.http_pool import http_clients
+from .errors import ProviderHTTPError, parse_retry_after
 
 logger = structlog.get_logger(__name__)
 
@@ -184,7 +186,7 @@ class DALLEImageProvider(BaseImageProvider):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/v1/images/generations",
                     headers=self.headers,
@@ -205,11 +207,19 @@ class DALLEImageProvider(BaseImageProvider):
                 
                 elif response.status_code == 429:
                     logger.error("DALL-E rate limit exceeded")
-                    raise Exception("DALL-E rate limit - retry later")
+                    raise ProviderHTTPError(
+                        "DALL-E rate limit - retry later",
+                        status_code=429,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code == 503:
                     logger.error("DALL-E service unavailable")
-                    raise Exception("DALL-E API unavailable - retry later")
+                    raise ProviderHTTPError(
+                        "DALL-E API unavailable - retry later",
+                        status_code=503,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code != 200:
                     logger.error(
@@ -284,7 +294,7 @@ class DALLEImageProvider(BaseImageProvider):
         
         try:
             # Vérifier API key via endpoint /models
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with http_clients.client(self.base_url, timeout=10) as client:
                 response = await client.get(
                     f"{self.base_url}/v1/models",
                     headers=self.headers
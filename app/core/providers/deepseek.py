@@ -6,9 +6,12 @@ Deepseek-V3 optimisé pour génération contenu et analyse
 import httpx
 import json
 import structlog
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 
 from .base import BaseLLMProvider
+from .errors import ProviderHTTPError, ProviderNetworkError, ProviderTimeoutError, parse_retry_after
+from .streaming import iter_chat_completion_deltas
+from app.core.integrations.http_pool import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -97,7 +100,7 @@ class DeepseekProvider(BaseLLMProvider):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/v1/chat/completions",
                     headers=self.headers,
@@ -107,11 +110,19 @@ class DeepseekProvider(BaseLLMProvider):
                 # Gestion erreurs HTTP
                 if response.status_code == 429:
                     logger.error("Deepseek rate limit exceeded")
-                    raise Exception("Deepseek API rate limit - retry later")
+                    raise ProviderHTTPError(
+                        "Deepseek API rate limit - retry later",
+                        status_code=429,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code == 503:
                     logger.error("Deepseek service unavailable")
-                    raise Exception("Deepseek API unavailable - use fallback")
+                    raise ProviderHTTPError(
+                        "Deepseek API unavailable - use fallback",
+                        status_code=503,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code != 200:
                     logger.error(
@@ -119,7 +130,10 @@ class DeepseekProvider(BaseLLMProvider):
                         status_code=response.status_code,
                         response=response.text
                     )
-                    raise Exception(f"Deepseek API error: {response.status_code}")
+                    raise ProviderHTTPError(
+                        f"Deepseek API error: {response.status_code}",
+                        status_code=response.status_code
+                    )
                 
                 # Parse réponse
                 result = response.json()
@@ -140,11 +154,11 @@ class DeepseekProvider(BaseLLMProvider):
                 
         except httpx.TimeoutException:
             logger.error("Deepseek request timeout", timeout=self.timeout)
-            raise Exception(f"Deepseek timeout after {self.timeout}s")
+            raise ProviderTimeoutError(f"Deepseek timeout after {self.timeout}s")
         
         except httpx.RequestError as e:
             logger.error("Deepseek network error", error=str(e))
-            raise Exception(f"Deepseek network error: {str(e)}")
+            raise ProviderNetworkError(f"Deepseek network error: {str(e)}")
     
     async def generate_structured(
         self,
@@ -220,6 +234,100 @@ IMPORTANT:
             )
             raise Exception(f"Invalid JSON in Deepseek response: {str(e)}")
     
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming via Deepseek API (SSE, "stream": true)
+        
+        Args:
+            prompt: Le prompt utilisateur
+            system_message: Message système optionnel
+            temperature: Température de génération
+            max_tokens: Nombre maximum de tokens
+            
+        Yields:
+            str: Deltas de texte au fil de la génération
+            
+        Raises:
+            Exception: Si erreur API (429, 503, timeout)
+        """
+        
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        payload.update(kwargs)
+        
+        logger.info(
+            "Deepseek stream request",
+            model=self.model,
+            prompt_length=len(prompt),
+            temperature=temperature
+        )
+        
+        try:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/v1/chat/completions",
+                    headers=self.headers,
+                    json=payload
+                ) as response:
+                    
+                    # Gestion erreurs HTTP
+                    if response.status_code == 429:
+                        logger.error("Deepseek rate limit exceeded")
+                        raise ProviderHTTPError(
+                            "Deepseek API rate limit - retry later",
+                            status_code=429,
+                            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    
+                    elif response.status_code == 503:
+                        logger.error("Deepseek service unavailable")
+                        raise ProviderHTTPError(
+                            "Deepseek API unavailable - use fallback",
+                            status_code=503,
+                            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    
+                    elif response.status_code != 200:
+                        await response.aread()
+                        logger.error(
+                            "Deepseek API error",
+                            status_code=response.status_code,
+                            response=response.text
+                        )
+                        raise ProviderHTTPError(
+                            f"Deepseek API error: {response.status_code}",
+                            status_code=response.status_code
+                        )
+                    
+                    async for delta in iter_chat_completion_deltas(response):
+                        yield delta
+                
+        except httpx.TimeoutException:
+            logger.error("Deepseek stream timeout", timeout=self.timeout)
+            raise ProviderTimeoutError(f"Deepseek timeout after {self.timeout}s")
+        
+        except httpx.RequestError as e:
+            logger.error("Deepseek network error", error=str(e))
+            raise ProviderNetworkError(f"Deepseek network error: {str(e)}")
+    
     async def health_check(self) -> bool:
         """
         Vérifie la disponibilité de Deepseek API
@@ -0,0 +1,63 @@
+"""
+Provider Errors
+
+Exceptions typées levées par les providers HTTP. Elles héritent de Exception
+et conservent les messages historiques: le code appelant existant (except
+Exception) est inchangé, le FailoverLLMProvider exploite status_code et
+retry_after.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class ProviderHTTPError(Exception):
+    """Réponse HTTP en erreur d'un provider (429, 503, 5xx...)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ProviderTimeoutError(Exception):
+    """Timeout d'un appel provider (transitoire: retry sur le même provider)"""
+
+
+class ProviderNetworkError(Exception):
+    """Erreur réseau d'un appel provider (connexion, DNS, reset...)"""
+
+
+class AllProvidersFailedError(Exception):
+    """Tous les providers de la chaîne de failover ont échoué ou sont ouverts"""
+
+    def __init__(self, errors: Dict[str, str]):
+        details = "; ".join(f"{name}: {error}" for name, error in errors.items()) or "no provider available"
+        super().__init__(f"All LLM providers failed - {details}")
+        self.errors = errors
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interprète un header Retry-After (secondes ou date HTTP).
+
+    Returns:
+        Délai en secondes (>= 0) ou None si absent/invalide
+    """
+    if not isinstance(value, str) or not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
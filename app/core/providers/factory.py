@@ -13,7 +13,12 @@ from .config import ProviderConfig, SubscriptionPlan
 from .mock import MockLLMProvider, MockSearchProvider, MockImageProvider
 from .deepseek import DeepseekProvider
 from .kimi import KimiProvider
+from .kimi_llm import KimiLLMProvider
 from .dalle import DALLEImageProvider
+from .cache import CachedLLMProvider
+from .failover import FailoverLLMProvider
+from .hedging import HedgedLLMProvider
+from app.config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
@@ -33,6 +38,7 @@ class ProviderFactory:
     _llm_providers: Dict[str, type] = {
         "mock": MockLLMProvider,
         "deepseek": DeepseekProvider,
+        "kimi": KimiLLMProvider,
         # Implémentations futures:
         # "openai": OpenAIProvider,
         # "anthropic": AnthropicProvider,
@@ -73,6 +79,9 @@ class ProviderFactory:
         plan: str = SubscriptionPlan.TRIAL,
         override_provider: Optional[str] = None,
         override_model: Optional[str] = None,
+        enable_cache: Optional[bool] = None,
+        enable_failover: Optional[bool] = None,
+        enable_hedging: Optional[bool] = None,
         **kwargs
     ) -> BaseLLMProvider:
         """
@@ -82,6 +91,9 @@ class ProviderFactory:
             plan: Plan d'abonnement
             override_provider: Provider spécifique à forcer (pour tests)
             override_model: Modèle spécifique à forcer
+            enable_cache: Envelopper dans le cache de réponses (défaut: LLM_CACHE_ENABLED)
+            enable_failover: Chaîne de failover avec circuit breakers (défaut: ENABLE_PROVIDER_FALLBACK)
+            enable_hedging: Requêtes de couverture sur la latence de queue (défaut: LLM_HEDGING_ENABLED)
             **kwargs: Arguments additionnels pour le provider
             
         Returns:
@@ -100,9 +112,6 @@ class ProviderFactory:
             provider_class = MockLLMProvider
             provider_name = "mock"
         
-        api_key = self.api_keys.get(provider_name, "mock-key")
-        provider_config = ProviderConfig.get_provider_config(provider_name)
-        
         logger.info(
             "Création LLM provider",
             provider=provider_name,
@@ -110,6 +119,58 @@ class ProviderFactory:
             plan=plan
         )
         
+        provider = self._instantiate_llm_provider(provider_name, model, **kwargs)
+        
+        if enable_failover is None:
+            enable_failover = settings.ENABLE_PROVIDER_FALLBACK
+        if enable_failover and provider_name != "mock":
+            chain = [(provider_name, provider)]
+            for fallback_name, fallback_model in ProviderConfig.get_llm_provider_chain(provider_name, model)[1:]:
+                # Fallback retenu seulement s'il est implémenté et configuré
+                if fallback_name in self._llm_providers and fallback_name in self.api_keys:
+                    chain.append((fallback_name, self._instantiate_llm_provider(fallback_name, fallback_model)))
+            if len(chain) > 1:
+                logger.info("LLM failover chain enabled", chain=[name for name, _ in chain])
+                provider = FailoverLLMProvider(chain)
+        
+        if enable_hedging is None:
+            enable_hedging = settings.LLM_HEDGING_ENABLED
+        if enable_hedging and provider_name != "mock":
+            provider = self._hedge_llm_provider(provider_name, provider)
+        
+        if enable_cache is None:
+            enable_cache = settings.LLM_CACHE_ENABLED
+        if enable_cache and provider_name != "mock":
+            provider = CachedLLMProvider(provider)
+        
+        return provider
+    
+    def _hedge_llm_provider(self, provider_name: str, provider: BaseLLMProvider) -> BaseLLMProvider:
+        """
+        Enveloppe dans HedgedLLMProvider: le hedge part vers le provider
+        secondaire de la chaîne de failover s'il existe, sinon vers le même.
+        """
+        if isinstance(provider, FailoverLLMProvider):
+            # Chaîne tournée (kimi, deepseek): mêmes circuit breakers partagés
+            rotated = provider.providers[1:] + provider.providers[:1]
+            hedge = (rotated[0][0], FailoverLLMProvider(rotated))
+        else:
+            hedge = (provider_name, provider)
+        
+        logger.info("LLM hedging enabled", provider=provider_name, hedge_provider=hedge[0])
+        return HedgedLLMProvider((provider_name, provider), hedge=hedge)
+    
+    def _instantiate_llm_provider(self, provider_name: str, model: str, **kwargs) -> BaseLLMProvider:
+        """Instancie un LLM provider enregistré avec sa clé API et sa configuration"""
+        provider_class = self._llm_providers[provider_name]
+        api_key = self.api_keys.get(provider_name, "mock-key")
+        # "model" de PROVIDER_CONFIGS (ex: kimi recherche) ne doit pas écraser le modèle LLM
+        provider_config = {
+            key: value
+            for key, value in ProviderConfig.get_provider_config(provider_name).items()
+            if key != "model"
+        }
+        
         return provider_class(
             api_key=api_key,
             model=model,
@@ -0,0 +1,373 @@
+"""
+LLM Failover Provider
+
+Chaîne ordonnée de providers LLM protégés chacun par un circuit breaker.
+
+    - Circuit breaker par provider: taux d'échec sur fenêtre glissante,
+      ouverture temporaire puis sonde half-open
+    - Retries avec backoff exponentiel + jitter, en respectant Retry-After
+    - Un provider ouvert est sauté immédiatement (pas d'attente du timeout)
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from .base import BaseLLMProvider
+from .errors import AllProvidersFailedError, ProviderHTTPError, ProviderNetworkError, ProviderTimeoutError
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+PROVIDER_CALLS = Counter(
+    'genesis_ai_llm_provider_calls_total',
+    'LLM provider calls through the failover chain',
+    ['provider', 'outcome']
+)
+CIRCUIT_TRANSITIONS = Counter(
+    'genesis_ai_circuit_breaker_transitions_total',
+    'Circuit breaker state transitions',
+    ['provider', 'state']
+)
+
+# 503 = "use fallback": on passe directement au provider suivant
+RETRYABLE_STATUS_CODES = {429, 500, 502, 504}
+
+
+class CircuitState(str, Enum):
+    """États du circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker à taux d'échec sur fenêtre glissante.
+
+    CLOSED -> OPEN quand, sur les `window_seconds` dernières secondes, au moins
+    `min_calls` appels ont eu lieu avec un taux d'échec >= `failure_rate_threshold`.
+    OPEN -> HALF_OPEN après `open_seconds` (ou Retry-After): `half_open_max_calls`
+    sondes sont autorisées; un succès referme le circuit, un échec le rouvre.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: Optional[float] = None,
+        window_seconds: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold or settings.CIRCUIT_BREAKER_FAILURE_RATE
+        self.window_seconds = window_seconds or settings.CIRCUIT_BREAKER_WINDOW_SECONDS
+        self.min_calls = min_calls or settings.CIRCUIT_BREAKER_MIN_CALLS
+        self.open_seconds = open_seconds or settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        self.half_open_max_calls = half_open_max_calls or settings.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS
+
+        self._state = CircuitState.CLOSED
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._open_until = 0.0
+        self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and time.monotonic() >= self._open_until:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        """True si un appel peut être tenté (réserve une sonde en half-open)."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+            self._half_open_in_flight += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            self._calls.clear()
+            self._transition(CircuitState.CLOSED)
+            return
+        self._record(True)
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            self.trip(retry_after)
+            return
+        self._record(False)
+        if self._should_open():
+            self.trip(retry_after)
+
+    def release(self) -> None:
+        """Libère une sonde half-open sans résultat (appel annulé)."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def trip(self, duration: Optional[float] = None) -> None:
+        """Ouvre le circuit pour `duration` secondes (défaut: open_seconds)."""
+        self._open_until = time.monotonic() + max(duration or 0.0, self.open_seconds)
+        self._calls.clear()
+        self._transition(CircuitState.OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        total, failures = self._window_counts()
+        return {
+            "state": self.state.value,
+            "calls": total,
+            "failures": failures,
+            "open_for_seconds": round(max(0.0, self._open_until - time.monotonic()), 3)
+        }
+
+    def _record(self, success: bool) -> None:
+        self._calls.append((time.monotonic(), success))
+        self._prune()
+
+    def _prune(self) -> None:
+        horizon = time.monotonic() - self.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def _window_counts(self) -> Tuple[int, int]:
+        self._prune()
+        failures = sum(1 for _, success in self._calls if not success)
+        return len(self._calls), failures
+
+    def _should_open(self) -> bool:
+        total, failures = self._window_counts()
+        return total >= self.min_calls and failures / total >= self.failure_rate_threshold
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        logger.warning("Circuit breaker transition", provider=self.name, old=self._state.value, new=state.value)
+        CIRCUIT_TRANSITIONS.labels(provider=self.name, state=state.value).inc()
+        self._state = state
+        if state != CircuitState.HALF_OPEN:
+            self._half_open_in_flight = 0
+
+
+class CircuitBreakerRegistry:
+    """Breakers partagés par processus: l'état survit aux instances de providers."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name)
+        return self._breakers[name]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Backoff exponentiel avec full jitter: uniform(0, min(max, base * 2^attempt))."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+# Timeouts et erreurs réseau: transitoires, retentés sur le même provider
+RETRYABLE_ERRORS = (ProviderTimeoutError, ProviderNetworkError, httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Erreurs transitoires (429, 5xx hors 503, timeout, réseau) => retry même provider.
+
+    Les autres erreurs (réponse invalide, bug...) passent directement au
+    provider suivant: les rejouer ne ferait que retarder le failover.
+    """
+    if isinstance(error, ProviderHTTPError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class FailoverLLMProvider(BaseLLMProvider):
+    """
+    Provider composite: essaie chaque provider de la chaîne dans l'ordre.
+
+    Usage:
+        llm = FailoverLLMProvider([("deepseek", deepseek), ("kimi", kimi)])
+        await llm.generate(prompt)  # Deepseek, puis Kimi si Deepseek est dégradé
+    """
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, BaseLLMProvider]],
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        if not providers:
+            raise ValueError("FailoverLLMProvider requires at least one provider")
+        primary = providers[0][1]
+        super().__init__(api_key=primary.api_key, model=primary.model, **primary.config)
+        self.providers = providers
+        self.breakers = breakers or circuit_breakers
+        self.max_attempts = max_attempts or settings.LLM_RETRY_MAX_ATTEMPTS
+        self.base_delay = base_delay if base_delay is not None else settings.LLM_RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else settings.LLM_RETRY_MAX_DELAY
+
+    @property
+    def provider_names(self) -> List[str]:
+        return [name for name, _ in self.providers]
+
+    async def _call(self, operation: Callable[[BaseLLMProvider], Awaitable[Any]]) -> Any:
+        errors: Dict[str, str] = {}
+
+        for name, provider in self.providers:
+            breaker = self.breakers.get(name)
+            if not breaker.allow_request():
+                PROVIDER_CALLS.labels(provider=name, outcome="skipped").inc()
+                errors[name] = "circuit open"
+                continue
+
+            for attempt in range(self.max_attempts):
+                try:
+                    result = await operation(provider)
+                except asyncio.CancelledError:
+                    breaker.release()
+                    raise
+                except Exception as e:
+                    retry_after = getattr(e, "retry_after", None)
+                    breaker.record_failure(retry_after)
+                    PROVIDER_CALLS.labels(provider=name, outcome="failure").inc()
+                    errors[name] = str(e)
+                    logger.warning("LLM provider call failed", provider=name, attempt=attempt + 1, error=str(e))
+
+                    if not is_retryable(e) or attempt + 1 >= self.max_attempts:
+                        break
+                    delay = retry_after if retry_after is not None else backoff_delay(attempt, self.base_delay, self.max_delay)
+                    if delay > self.max_delay:
+                        # Retry-After trop long: on ouvre le circuit pour cette durée
+                        breaker.trip(retry_after)
+                        break
+                    if not breaker.allow_request():
+                        break
+                    await asyncio.sleep(delay)
+                    continue
+
+                breaker.record_success()
+                PROVIDER_CALLS.labels(provider=name, outcome="success").inc()
+                if name != self.providers[0][0]:
+                    logger.info("LLM failover served by secondary provider", provider=name)
+                return result
+
+        raise AllProvidersFailedError(errors)
+
+    async def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> str:
+        return await self._call(
+            lambda provider: provider.generate(
+                prompt=prompt,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        )
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return await self._call(
+            lambda provider: provider.generate_structured(
+                prompt=prompt,
+                response_schema=response_schema,
+                system_message=system_message,
+                **kwargs
+            )
+        )
+
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming avec failover tant qu'aucun fragment n'a été émis; une
+        erreur en cours de flux est remontée telle quelle.
+        """
+        errors: Dict[str, str] = {}
+
+        for name, provider in self.providers:
+            breaker = self.breakers.get(name)
+            if not breaker.allow_request():
+                PROVIDER_CALLS.labels(provider=name, outcome="skipped").inc()
+                errors[name] = "circuit open"
+                continue
+
+            started = False
+            try:
+                async for delta in provider.astream(
+                    prompt=prompt,
+                    system_message=system_message,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs
+                ):
+                    started = True
+                    yield delta
+            except (GeneratorExit, asyncio.CancelledError):
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure(getattr(e, "retry_after", None))
+                PROVIDER_CALLS.labels(provider=name, outcome="failure").inc()
+                errors[name] = str(e)
+                if started:
+                    raise
+                logger.warning("LLM provider stream failed", provider=name, error=str(e))
+                continue
+
+            breaker.record_success()
+            PROVIDER_CALLS.labels(provider=name, outcome="success").inc()
+            return
+
+        raise AllProvidersFailedError(errors)
+
+    async def health_check(self) -> bool:
+        """Disponible si au moins un provider de la chaîne répond."""
+        for _, provider in self.providers:
+            try:
+                if await provider.health_check():
+                    return True
+            except Exception:
+                continue
+        return False
+
+
+# Breakers partagés par tous les FailoverLLMProvider du processus
+circuit_breakers = CircuitBreakerRegistry()
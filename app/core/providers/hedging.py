@@ -0,0 +1,227 @@
+"""
+LLM Hedged Requests
+
+Réduction de la latence de queue (p99) des appels LLM: si un appel dépasse
+un percentile de la latence récente du provider, une requête dupliquée part
+vers le même provider ou un provider secondaire. La première réponse gagne,
+l'autre est annulée.
+
+Les latences sont suivies par (provider, modèle): fenêtre glissante en
+mémoire pour le calcul du seuil + histogramme Prometheus.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+from app.config.settings import settings
+from .base import BaseLLMProvider
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+LLM_REQUEST_DURATION = Histogram(
+    'genesis_ai_llm_request_duration_seconds',
+    'LLM request latency per provider and model',
+    ['provider', 'model'],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90, 120)
+)
+LLM_HEDGED_REQUESTS = Counter(
+    'genesis_ai_llm_hedged_requests_total',
+    'Hedged LLM requests',
+    ['provider', 'outcome']
+)
+
+
+class LatencyTracker:
+    """Latences récentes (fenêtre bornée) par couple (provider, modèle)"""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or settings.LLM_LATENCY_WINDOW
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def observe(self, provider: str, model: str, seconds: float) -> None:
+        key = (provider, model)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window)
+        self._samples[key].append(seconds)
+        LLM_REQUEST_DURATION.labels(provider=provider, model=model).observe(seconds)
+
+    def count(self, provider: str, model: str) -> int:
+        return len(self._samples.get((provider, model), ()))
+
+    def percentile(self, provider: str, model: str, quantile: float) -> Optional[float]:
+        """Percentile (nearest-rank) des latences récentes, None sans échantillon."""
+        samples = self._samples.get((provider, model))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(0, math.ceil(quantile * len(ordered)) - 1)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            f"{provider}:{model}": {
+                "count": len(samples),
+                "p50": self.percentile(provider, model, 0.5),
+                "p95": self.percentile(provider, model, 0.95),
+                "p99": self.percentile(provider, model, 0.99)
+            }
+            for (provider, model), samples in self._samples.items()
+        }
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+
+class HedgedLLMProvider(BaseLLMProvider):
+    """
+    Décorateur de BaseLLMProvider envoyant une requête de couverture (hedge).
+
+    Le délai avant hedge est le percentile `quantile` des latences récentes du
+    provider primaire (LLM_HEDGING_DEFAULT_DELAY tant que moins de `min_samples`
+    mesures), borné par LLM_HEDGING_MIN_DELAY.
+
+    Usage:
+        llm = HedgedLLMProvider(("deepseek", deepseek), hedge=("kimi", kimi))
+    """
+
+    def __init__(
+        self,
+        primary: Tuple[str, BaseLLMProvider],
+        hedge: Optional[Tuple[str, BaseLLMProvider]] = None,
+        tracker: Optional[LatencyTracker] = None,
+        quantile: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        default_delay: Optional[float] = None,
+        min_delay: Optional[float] = None
+    ):
+        primary_provider = primary[1]
+        super().__init__(api_key=primary_provider.api_key, model=primary_provider.model, **primary_provider.config)
+        self.primary = primary
+        self.hedge = hedge or primary
+        self.tracker = tracker or latency_tracker
+        self.quantile = quantile or settings.LLM_HEDGING_PERCENTILE
+        self.min_samples = min_samples or settings.LLM_HEDGING_MIN_SAMPLES
+        self.default_delay = default_delay if default_delay is not None else settings.LLM_HEDGING_DEFAULT_DELAY
+        self.min_delay = min_delay if min_delay is not None else settings.LLM_HEDGING_MIN_DELAY
+
+    def __getattr__(self, name: str) -> Any:
+        # Attributs spécifiques du provider primaire (base_url, timeout...)
+        return getattr(self.__dict__["primary"][1], name)
+
+    def hedge_delay(self) -> float:
+        """Délai avant l'envoi de la requête de couverture."""
+        name, provider = self.primary
+        if self.tracker.count(name, provider.model) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, self.tracker.percentile(name, provider.model, self.quantile))
+
+    async def _timed(self, target: Tuple[str, BaseLLMProvider], operation: Callable[[BaseLLMProvider], Awaitable[Any]]) -> Any:
+        name, provider = target
+        start = time.perf_counter()
+        try:
+            return await operation(provider)
+        finally:
+            # Appels en échec ou annulés (perdants) compris: sinon seuls les
+            # appels rapides alimentent la fenêtre et le percentile dérive vers le bas
+            self.tracker.observe(name, provider.model, time.perf_counter() - start)
+
+    async def _call(self, operation: Callable[[BaseLLMProvider], Awaitable[Any]]) -> Any:
+        primary_name = self.primary[0]
+        primary_task = asyncio.create_task(self._timed(self.primary, operation))
+        tasks = {primary_task: primary_name}
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.hedge_delay())
+            if done:
+                # Réponse (ou échec) avant le seuil: pas de hedge
+                return primary_task.result()
+
+            hedge_name = self.hedge[0]
+            logger.info("LLM hedge request fired", provider=primary_name, hedge_provider=hedge_name)
+            LLM_HEDGED_REQUESTS.labels(provider=hedge_name, outcome="fired").inc()
+            tasks[asyncio.create_task(self._timed(self.hedge, operation))] = hedge_name
+
+            pending = set(tasks)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        outcome = "won_primary" if task is primary_task else "won_hedge"
+                        LLM_HEDGED_REQUESTS.labels(provider=tasks[task], outcome=outcome).inc()
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            # Annule la requête perdante (et tout en cas d'annulation de l'appelant)
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> str:
+        return await self._call(
+            lambda provider: provider.generate(
+                prompt=prompt,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        )
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        system_message: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return await self._call(
+            lambda provider: provider.generate_structured(
+                prompt=prompt,
+                response_schema=response_schema,
+                system_message=system_message,
+                **kwargs
+            )
+        )
+
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Pas de hedge en streaming: le premier fragment arrive déjà tôt."""
+        async for delta in self.primary[1].astream(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        ):
+            yield delta
+
+    async def health_check(self) -> bool:
+        return await self.primary[1].health_check()
+
+
+# Latences partagées par tous les HedgedLLMProvider du processus
+latency_tracker = LatencyTracker()
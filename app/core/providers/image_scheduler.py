@@ -0,0 +1,317 @@
+"""
+Image Request Scheduler
+
+Les générations d'images (DALL-E) d'un site partent toutes en même temps
+(hero + services + features) et celles de plusieurs utilisateurs s'ajoutent:
+au-delà des quotas du provider, les appels reçoivent des 429 et retombent sur
+des images stock.
+
+Le scheduler fait passer chaque appel par:
+    - un token bucket par provider respectant les limites RPM (requêtes/min)
+      et IPM (images/min), local au processus ou coordonné via Redis entre
+      workers (script Lua, horloge Redis)
+    - une file de priorité (hero avant services, services avant features)
+    - un plafond de requêtes simultanées par processus
+    - une pause du bucket sur 429 (Retry-After) puis un nouvel essai
+
+Métriques: profondeur de file et temps d'attente par provider.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+from .errors import ProviderHTTPError
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+IMAGE_QUEUE_DEPTH = Gauge(
+    'genesis_ai_image_queue_depth',
+    'Image generation requests waiting for a rate limit slot',
+    ['provider']
+)
+IMAGE_QUEUE_WAIT = Histogram(
+    'genesis_ai_image_queue_wait_seconds',
+    'Time spent waiting for a rate limit slot',
+    ['provider', 'priority'],
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+)
+IMAGE_RATE_LIMITED = Counter(
+    'genesis_ai_image_rate_limited_total',
+    'Image provider 429 responses handled by the scheduler',
+    ['provider', 'outcome']
+)
+
+# Priorités par type d'image (plus petit = servi en premier)
+IMAGE_PRIORITIES = {
+    "logo": 0,
+    "hero": 0,
+    "service": 1,
+    "feature": 2,
+    "gallery": 3,
+}
+
+# KEYS: bucket | ARGV: rpm, ipm, coût en images
+# Retourne l'attente en secondes (chaîne, "0" si les jetons ont été pris)
+RESERVE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rpm, ipm, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'images', 'ts', 'paused_until')
+local requests = tonumber(state[1]) or rpm
+local images = tonumber(state[2]) or ipm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+local paused_until = tonumber(state[4]) or 0
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+images = math.min(ipm, images + elapsed * ipm / 60)
+local wait = math.max(0, paused_until - now)
+if requests < 1 then wait = math.max(wait, (1 - requests) * 60 / rpm) end
+if images < cost then wait = math.max(wait, (cost - images) * 60 / ipm) end
+if wait == 0 then
+    requests = requests - 1
+    images = images - cost
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'images', images, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 300)
+return tostring(wait)
+"""
+
+# KEYS: bucket | ARGV: durée de pause (secondes)
+PAUSE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local paused_until = now + tonumber(ARGV[1])
+if paused_until > (tonumber(redis.call('HGET', KEYS[1], 'paused_until')) or 0) then
+    redis.call('HSET', KEYS[1], 'paused_until', paused_until)
+    redis.call('EXPIRE', KEYS[1], 300)
+end
+return 1
+"""
+
+
+class TokenBucket:
+    """
+    Double token bucket (requêtes + images par minute), capacité = une minute de quota.
+
+    Avec un client Redis, l'état est partagé entre workers; en cas d'erreur
+    Redis, le bucket local prend le relais.
+    """
+
+    def __init__(self, name: str, rpm: int, ipm: int, redis_client: Optional[Any] = None):
+        self.name = name
+        self.rpm = max(1, rpm)
+        self.ipm = max(1, ipm)
+        self.key = f"genesis:ratelimit:image:{name}"
+        self._redis = redis_client
+        self._requests = float(self.rpm)
+        self._images = float(self.ipm)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    async def reserve(self, images: int = 1) -> float:
+        """Prend les jetons si disponibles (retourne 0), sinon l'attente en secondes."""
+        images = min(images, self.ipm)
+        if self._redis is not None:
+            try:
+                return float(await self._redis.eval(RESERVE_SCRIPT, 1, self.key, self.rpm, self.ipm, images))
+            except Exception as e:
+                logger.warning("Redis rate limit unavailable, using local bucket", provider=self.name, error=str(e))
+        return self._reserve_local(images)
+
+    async def pause(self, seconds: float) -> None:
+        """Suspend le bucket (429 reçu): aucun jeton distribué avant `seconds`."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        if self._redis is not None:
+            try:
+                await self._redis.eval(PAUSE_SCRIPT, 1, self.key, seconds)
+            except Exception as e:
+                logger.warning("Failed to propagate rate limit pause", provider=self.name, error=str(e))
+
+    def _reserve_local(self, images: int) -> float:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._images = min(self.ipm, self._images + elapsed * self.ipm / 60)
+
+        wait = max(0.0, self._paused_until - now)
+        if self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+        if self._images < images:
+            wait = max(wait, (images - self._images) * 60 / self.ipm)
+        if wait == 0:
+            self._requests -= 1
+            self._images -= images
+        return wait
+
+
+class ImageRequestScheduler:
+    """
+    File de priorité + token bucket + plafond de concurrence pour un provider d'images.
+
+    Usage:
+        scheduler = image_schedulers.get("dalle")
+        result = await scheduler.run(
+            lambda: dalle.generate_image(prompt=...),
+            priority=IMAGE_PRIORITIES["hero"]
+        )
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bucket: TokenBucket,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        default_pause: Optional[float] = None
+    ):
+        self.name = name
+        self.bucket = bucket
+        self.max_concurrency = max_concurrency or settings.IMAGE_MAX_CONCURRENCY
+        self.max_retries = max_retries if max_retries is not None else settings.IMAGE_RATE_LIMIT_RETRIES
+        self.default_pause = default_pause or settings.IMAGE_RATE_LIMIT_DEFAULT_PAUSE
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._reserving = False  # une seule réservation de jeton en cours (tête de file)
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Condition liée à la boucle courante (une seule en production)
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        priority: int = 1,
+        images: int = 1
+    ) -> Any:
+        """
+        Exécute `fn` quand un créneau est disponible.
+
+        Un 429 suspend le bucket (Retry-After ou pause par défaut) et la
+        requête est remise en file, jusqu'à `max_retries` fois.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(priority, images)
+            try:
+                return await fn()
+            except ProviderHTTPError as e:
+                if e.status_code != 429:
+                    raise
+                if attempt >= self.max_retries:
+                    IMAGE_RATE_LIMITED.labels(provider=self.name, outcome="gave_up").inc()
+                    raise
+                attempt += 1
+                pause = e.retry_after or self.default_pause
+                IMAGE_RATE_LIMITED.labels(provider=self.name, outcome="requeued").inc()
+                logger.warning("Image provider rate limited, requeueing", provider=self.name, pause=pause, attempt=attempt)
+                await self.bucket.pause(pause)
+            finally:
+                await self.release()
+
+    async def acquire(self, priority: int = 1, images: int = 1) -> None:
+        """Attend son tour (priorité puis ordre d'arrivée), un jeton et un créneau de concurrence."""
+        entry = (priority, next(self._sequence))
+        started = time.monotonic()
+        condition = self._get_condition()
+        async with condition:
+            heapq.heappush(self._queue, entry)
+            IMAGE_QUEUE_DEPTH.labels(provider=self.name).set(len(self._queue))
+
+        admitted = False
+        try:
+            while True:
+                async with condition:
+                    while self._queue[0] != entry or self._active >= self.max_concurrency or self._reserving:
+                        await condition.wait()
+                    self._reserving = True
+
+                # Réservation (EVAL Redis) hors du verrou: les autres appels
+                # s'enfilent et libèrent leur créneau pendant l'aller-retour
+                wait = None
+                try:
+                    wait = await self.bucket.reserve(images)
+                finally:
+                    async with condition:
+                        self._reserving = False
+                        if wait is not None and wait <= 0:
+                            self._dequeue(entry)
+                            self._active += 1
+                            admitted = True
+                        # La tête de file réévalue jetons et concurrence
+                        condition.notify_all()
+                if admitted:
+                    break
+
+                async with condition:
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+        except BaseException:
+            if not admitted:
+                async with condition:
+                    self._dequeue(entry)
+                    condition.notify_all()
+            raise
+
+        IMAGE_QUEUE_WAIT.labels(provider=self.name, priority=str(priority)).observe(time.monotonic() - started)
+
+    def _dequeue(self, entry: Tuple[int, int]) -> None:
+        # Pas forcément en tête: une priorité supérieure a pu arriver pendant la réservation
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        IMAGE_QUEUE_DEPTH.labels(provider=self.name).set(len(self._queue))
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._active -= 1
+            condition.notify_all()
+
+
+class ImageSchedulerRegistry:
+    """Schedulers partagés par processus, un par provider d'images."""
+
+    def __init__(self):
+        self._schedulers: Dict[str, ImageRequestScheduler] = {}
+
+    def get(self, name: str) -> ImageRequestScheduler:
+        if name not in self._schedulers:
+            redis_client = None
+            if settings.IMAGE_RATE_LIMIT_REDIS and redis_pools.is_active:
+                redis_client = redis_pools.get_client(decode_responses=True)
+            bucket = TokenBucket(
+                name,
+                rpm=settings.IMAGE_RATE_LIMIT_RPM,
+                ipm=settings.IMAGE_RATE_LIMIT_IPM,
+                redis_client=redis_client
+            )
+            self._schedulers[name] = ImageRequestScheduler(name, bucket)
+        return self._schedulers[name]
+
+    def reset(self) -> None:
+        self._schedulers.clear()
+
+
+# Instance globale pour l'application
+image_schedulers = ImageSchedulerRegistry()
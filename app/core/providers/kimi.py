@@ -9,6 +9,7 @@ import structlog
 from typing import Dict, Any, List, Optional
 
 from .base import BaseSearchProvider
+from app.core.integrations.http_pool import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -126,7 +127,7 @@ class KimiProvider(BaseSearchProvider):
                 "tool_choice": "auto"
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/v1/chat/completions",
                     headers=self.headers,
@@ -282,7 +283,7 @@ FORMAT RÉPONSE (JSON):
                 "tool_choice": "auto"
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/v1/chat/completions",
                     headers=self.headers,
@@ -6,9 +6,12 @@ Moonshot AI (Kimi) pour génération contenu et analyse
 import httpx
 import json
 import structlog
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 
 from .base import BaseLLMProvider
+from .errors import ProviderHTTPError, ProviderNetworkError, ProviderTimeoutError, parse_retry_after
+from .streaming import iter_chat_completion_deltas
+from app.core.integrations.http_pool import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -98,7 +101,7 @@ class KimiLLMProvider(BaseLLMProvider):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.base_url}/v1/chat/completions",
                     headers=self.headers,
@@ -108,11 +111,19 @@ class KimiLLMProvider(BaseLLMProvider):
                 # Gestion erreurs HTTP
                 if response.status_code == 429:
                     logger.error("Kimi rate limit exceeded")
-                    raise Exception("Kimi API rate limit - retry later")
+                    raise ProviderHTTPError(
+                        "Kimi API rate limit - retry later",
+                        status_code=429,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code == 503:
                     logger.error("Kimi service unavailable")
-                    raise Exception("Kimi API unavailable - use fallback")
+                    raise ProviderHTTPError(
+                        "Kimi API unavailable - use fallback",
+                        status_code=503,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
                 
                 elif response.status_code != 200:
                     logger.error(
@@ -120,7 +131,10 @@ class KimiLLMProvider(BaseLLMProvider):
                         status_code=response.status_code,
                         response=response.text
                     )
-                    raise Exception(f"Kimi API error: {response.status_code}")
+                    raise ProviderHTTPError(
+                        f"Kimi API error: {response.status_code}",
+                        status_code=response.status_code
+                    )
                 
                 # Parse réponse
                 result = response.json()
@@ -141,11 +155,11 @@ class KimiLLMProvider(BaseLLMProvider):
                 
         except httpx.TimeoutException:
             logger.error("Kimi request timeout", timeout=self.timeout)
-            raise Exception(f"Kimi timeout after {self.timeout}s")
+            raise ProviderTimeoutError(f"Kimi timeout after {self.timeout}s")
         
         except httpx.RequestError as e:
             logger.error("Kimi network error", error=str(e))
-            raise Exception(f"Kimi network error: {str(e)}")
+            raise ProviderNetworkError(f"Kimi network error: {str(e)}")
     
     async def generate_structured(
         self,
@@ -217,6 +231,100 @@ IMPORTANT:
             )
             raise Exception(f"Invalid JSON in Kimi response: {str(e)}")
     
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Génère une réponse en streaming via Kimi API (SSE, "stream": true)
+        
+        Args:
+            prompt: Le prompt utilisateur
+            system_message: Message système optionnel
+            temperature: Température de génération
+            max_tokens: Nombre maximum de tokens
+            
+        Yields:
+            str: Deltas de texte au fil de la génération
+            
+        Raises:
+            Exception: Si erreur API (429, 503, timeout)
+        """
+        
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        payload.update(kwargs)
+        
+        logger.info(
+            "Kimi stream request",
+            model=self.model,
+            prompt_length=len(prompt),
+            temperature=temperature
+        )
+        
+        try:
+            async with http_clients.client(self.base_url, timeout=self.timeout) as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/v1/chat/completions",
+                    headers=self.headers,
+                    json=payload
+                ) as response:
+                    
+                    # Gestion erreurs HTTP
+                    if response.status_code == 429:
+                        logger.error("Kimi rate limit exceeded")
+                        raise ProviderHTTPError(
+                        "Kimi API rate limit - retry later",
+                        status_code=429,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                    
+                    elif response.status_code == 503:
+                        logger.error("Kimi service unavailable")
+                        raise ProviderHTTPError(
+                        "Kimi API unavailable - use fallback",
+                        status_code=503,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                    
+                    elif response.status_code != 200:
+                        await response.aread()
+                        logger.error(
+                            "Kimi API error",
+                            status_code=response.status_code,
+                            response=response.text
+                        )
+                        raise ProviderHTTPError(
+                        f"Kimi API error: {response.status_code}",
+                        status_code=response.status_code
+                    )
+                    
+                    async for delta in iter_chat_completion_deltas(response):
+                        yield delta
+                
+        except httpx.TimeoutException:
+            logger.error("Kimi stream timeout", timeout=self.timeout)
+            raise ProviderTimeoutError(f"Kimi timeout after {self.timeout}s")
+        
+        except httpx.RequestError as e:
+            logger.error("Kimi network error", error=str(e))
+            raise ProviderNetworkError(f"Kimi network error: {str(e)}")
+    
     async def health_check(self) -> bool:
         """
         Vérifie la disponibilité de Kimi API
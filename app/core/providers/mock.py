@@ -7,7 +7,7 @@ Utilisé pour Sprint 1 et tests automatisés.
 
 import asyncio
 import json
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime
 
 from .base import BaseLLMProvider, BaseSearchProvider, BaseImageProvider
@@ -69,6 +69,29 @@ En production, ce texte serait généré par {self.model}."""
         
         return mock_response
     
+    async def astream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Streame la réponse mockée mot par mot"""
+        text = await self.generate(
+            prompt=prompt,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            if self.config.get("simulate_latency", True):
+                await asyncio.sleep(self.config.get("stream_chunk_latency_ms", 20) / 1000)
+            yield word if index == len(words) - 1 else f"{word} "
+    
     async def health_check(self) -> bool:
         """Mock provider toujours disponible"""
         return True
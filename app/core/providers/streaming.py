@@ -0,0 +1,48 @@
+"""
+Streaming helpers
+
+Lecture des flux Server-Sent Events au format OpenAI chat completions
+(Deepseek, Kimi/Moonshot) et extraction des deltas de texte.
+"""
+
+import json
+from typing import AsyncIterator
+
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+async def iter_chat_completion_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Itère sur les deltas de contenu d'une réponse `stream: true`.
+
+    Args:
+        response: Réponse httpx ouverte en streaming (status 200)
+
+    Yields:
+        Fragments de texte dans l'ordre de génération
+    """
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line or not line.startswith("data:"):
+            continue
+
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            logger.warning("Invalid streaming chunk ignored", chunk=data[:200])
+            continue
+
+        choices = chunk.get("choices") or []
+        if not choices:
+            continue
+
+        delta = (choices[0].get("delta") or {}).get("content")
+        if delta:
+            yield delta
@@ -6,10 +6,13 @@ from app.core.quota.quota_manager import (
     SubscriptionPlan,
     QuotaLimits
 )
+from app.core.quota.ledger import QuotaLedger, quota_ledger
 
 __all__ = [
     "QuotaManager",
     "QuotaExceededException",
     "SubscriptionPlan",
-    "QuotaLimits"
+    "QuotaLimits",
+    "QuotaLedger",
+    "quota_ledger"
 ]
@@ -0,0 +1,330 @@
+"""
+Quota Ledger - comptabilité locale des quotas dans Redis, synchronisée vers DC360
+
+Chaque génération de brief interrogeait DigitalCloud360 (abonnement + usage)
+avant de démarrer, puis l'appelait de nouveau pour incrémenter l'usage. Le
+ledger garde par utilisateur, dans Redis:
+
+    genesis:quota:{user_id}             hash plan / limit / used / reset_date (TTL court)
+    genesis:quota:{user_id}:reserved    zset session_id -> expiration des réservations
+    genesis:quota:{user_id}:counted     set des session_id déjà comptés (idempotence)
+    genesis:quota:{user_id}:pending     set des session_id pas encore envoyés à DC360
+    genesis:quota:{user_id}:plan        plan seul (TTL long), lu par le rate limiter
+    genesis:quota:dirty                 set des user_id ayant des envois en attente
+    genesis:quota:flush_lock            verrou: un seul worker envoie à DC360 à la fois
+
+L'admission (script Lua: lecture du plan, vérification et réservation
+atomiques) ne fait qu'un aller-retour Redis; DC360 n'est appelé que lorsque
+le hash a expiré (`used` = usage DC360 + sessions en attente d'envoi). Les usages sont
+envoyés à DC360 par lots en arrière-plan, par un seul worker à la fois; un
+envoi échoué reste en attente et est rejoué. Tout est indexé par session_id: une session n'est comptée
+qu'une fois, et DC360 reçoit ce même session_id pour dédoublonner.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+QUOTA_ADMISSIONS = Counter(
+    'genesis_ai_quota_admissions_total',
+    'Quota admission decisions taken from the Redis ledger',
+    ['result']
+)
+QUOTA_SYNC = Counter(
+    'genesis_ai_quota_sync_total',
+    'Usage records pushed to DigitalCloud360',
+    ['result']
+)
+
+# Chargement plan + usage depuis DC360: user_id -> {plan, limit, used, reset_date}
+QuotaLoader = Callable[[int], Awaitable[Dict[str, Any]]]
+# Envoi d'un usage à DC360: (user_id, session_id) -> True si accepté
+UsageSync = Callable[[int, str], Awaitable[bool]]
+
+# KEYS: ledger, réservations, comptés | ARGV: now_ms, session_id ('' = sans réservation), ttl_ms
+# Retourne {décision, used, réservations, plan, limit, reset_date}; décision -1 = ledger absent (à charger)
+ADMIT_SCRIPT = """
+local ledger = redis.call('HMGET', KEYS[1], 'plan', 'limit', 'used', 'reset_date')
+if not ledger[1] then
+    return {-1}
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local limit = tonumber(ledger[2])
+local used = tonumber(ledger[3])
+local reserved = redis.call('ZCARD', KEYS[2])
+local decision = 1
+if ARGV[2] ~= '' and (redis.call('SISMEMBER', KEYS[3], ARGV[2]) == 1 or redis.call('ZSCORE', KEYS[2], ARGV[2])) then
+    decision = 1
+elseif limit >= 0 and used + reserved >= limit then
+    decision = 0
+elseif ARGV[2] ~= '' then
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[1]) + tonumber(ARGV[3]), ARGV[2])
+    redis.call('PEXPIRE', KEYS[2], ARGV[3])
+    reserved = reserved + 1
+end
+return {decision, used, reserved, ledger[1], ledger[2], ledger[4]}
+"""
+
+# KEYS: ledger, réservations, comptés, en attente, dirty | ARGV: session_id, user_id, ttl comptés
+# Retourne {compté (0 si déjà compté), used (-1 si ledger absent), limit}
+COMMIT_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+if redis.call('SADD', KEYS[3], ARGV[1]) == 0 then
+    return {0, tonumber(redis.call('HGET', KEYS[1], 'used') or '-1'), tonumber(redis.call('HGET', KEYS[1], 'limit') or '-1')}
+end
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+redis.call('SADD', KEYS[4], ARGV[1])
+redis.call('SADD', KEYS[5], ARGV[2])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {1, -1, -1}
+end
+return {1, redis.call('HINCRBY', KEYS[1], 'used', 1), tonumber(redis.call('HGET', KEYS[1], 'limit'))}
+"""
+
+# KEYS: en attente, dirty | ARGV: user_id
+# Retire l'utilisateur du set dirty si plus rien n'est en attente (atomique vs COMMIT)
+CLEAR_DIRTY_SCRIPT = """
+if redis.call('SCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# KEYS: verrou du flusher | ARGV: jeton du détenteur
+# Supprime le verrou seulement s'il appartient encore à ce flusher
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class QuotaLedger:
+    """
+    Ledger Redis des quotas: admission locale, envoi différé vers DC360.
+
+    Sans pool Redis actif (scripts, tests unitaires) ou si désactivé,
+    `is_available` est faux et QuotaManager interroge DC360 directement.
+
+    Usage:
+        status = await quota_ledger.admit(user_id, session_id, load_from_dc360)
+        await quota_ledger.commit(user_id, session_id)  # après génération réussie
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        plan_ttl: Optional[int] = None,
+        reservation_ttl: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.enabled = settings.QUOTA_LEDGER_ENABLED if enabled is None else enabled
+        self.plan_ttl = plan_ttl or settings.QUOTA_PLAN_CACHE_TTL
+        self.reservation_ttl = reservation_ttl or settings.QUOTA_RESERVATION_TTL
+        self.counted_ttl = settings.QUOTA_COUNTED_TTL
+        self.dirty_key = "genesis:quota:dirty"
+        self.flush_lock_key = "genesis:quota:flush_lock"
+        self._redis = redis_client
+        self._flusher: Optional[asyncio.Task] = None
+
+    def _get_redis(self):
+        if self._redis is None and redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    @property
+    def is_available(self) -> bool:
+        return self.enabled and self._get_redis() is not None
+
+    def _key(self, user_id: int, suffix: str = "") -> str:
+        return f"genesis:quota:{user_id}{':' + suffix if suffix else ''}"
+
+    async def admit(
+        self,
+        user_id: int,
+        session_id: Optional[str],
+        load: QuotaLoader
+    ) -> Dict[str, Any]:
+        """
+        Vérifie le quota et réserve une place pour `session_id` (atomique).
+
+        Une réservation expire après QUOTA_RESERVATION_TTL si la session n'est
+        ni comptée (`commit`) ni libérée (`release`). Sans session_id, simple
+        vérification.
+
+        Returns:
+            {allowed, plan, limit (None = illimité), used, reserved, reset_date}
+        """
+        redis_client = self._get_redis()
+        keys = [self._key(user_id), self._key(user_id, "reserved"), self._key(user_id, "counted")]
+        args = [int(time.time() * 1000), session_id or "", self.reservation_ttl * 1000]
+
+        result = await redis_client.eval(ADMIT_SCRIPT, len(keys), *keys, *args)
+        if int(result[0]) < 0:
+            await self.refresh(user_id, load)
+            QUOTA_ADMISSIONS.labels(result="refreshed").inc()
+            result = await redis_client.eval(ADMIT_SCRIPT, len(keys), *keys, *args)
+
+        decision, used, reserved, plan, limit, reset_date = result
+        allowed = int(decision) == 1
+        QUOTA_ADMISSIONS.labels(result="allowed" if allowed else "denied").inc()
+        return {
+            "allowed": allowed,
+            "plan": plan,
+            "limit": _limit_from_redis(limit),
+            "used": int(used),
+            "reserved": int(reserved),
+            "reset_date": reset_date or None
+        }
+
+    async def refresh(self, user_id: int, load: QuotaLoader) -> Dict[str, Any]:
+        """
+        Recharge plan et usage depuis DC360 (réconciliation).
+
+        L'usage DC360 n'inclut pas les sessions encore en attente d'envoi:
+        elles sont ajoutées pour ne pas être comptées deux fois ni oubliées.
+        """
+        redis_client = self._get_redis()
+        quota = await load(user_id)
+        pending = await redis_client.scard(self._key(user_id, "pending"))
+        limit = quota.get("limit")
+
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hset(self._key(user_id), mapping={
+            "plan": str(quota.get("plan") or "trial"),
+            "limit": -1 if limit is None else int(limit),
+            "used": int(quota.get("used") or 0) + int(pending),
+            "reset_date": quota.get("reset_date") or ""
+        })
+        pipe.expire(self._key(user_id), self.plan_ttl)
+        # Plan seul, plus durable: lu par le rate limiter à chaque requête
+        pipe.set(self._key(user_id, "plan"), str(quota.get("plan") or "trial"), ex=settings.QUOTA_PLAN_KEY_TTL)
+        await pipe.execute()
+        logger.info("Quota ledger refreshed", user_id=user_id, plan=quota.get("plan"), pending=pending)
+        return quota
+
+    async def commit(self, user_id: int, session_id: str) -> Dict[str, Any]:
+        """
+        Compte la session (une seule fois par session_id) et la met en attente d'envoi.
+
+        Returns:
+            {counted: False si déjà comptée, used (None si ledger expiré), limit}
+        """
+        keys = [
+            self._key(user_id),
+            self._key(user_id, "reserved"),
+            self._key(user_id, "counted"),
+            self._key(user_id, "pending"),
+            self.dirty_key
+        ]
+        counted, used, limit = await self._get_redis().eval(
+            COMMIT_SCRIPT, len(keys), *keys, session_id, user_id, self.counted_ttl
+        )
+        return {
+            "counted": bool(int(counted)),
+            "used": None if int(used) < 0 else int(used),
+            "limit": _limit_from_redis(limit)
+        }
+
+    async def release(self, user_id: int, session_id: str) -> None:
+        """Libère la réservation d'une session abandonnée (génération en échec)."""
+        await self._get_redis().zrem(self._key(user_id, "reserved"), session_id)
+
+    async def flush(self, sync: UsageSync, batch_size: Optional[int] = None) -> int:
+        """
+        Envoie à DC360 jusqu'à `batch_size` usages en attente.
+
+        Chaque worker démarre un flusher: un verrou Redis (SET NX PX) n'en
+        laisse passer qu'un à la fois, sans quoi plusieurs workers liraient
+        les mêmes usages en attente et les enverraient en double.
+
+        Returns:
+            Nombre d'usages acceptés par DC360 (0 si un autre worker envoie)
+        """
+        redis_client = self._get_redis()
+        token = uuid.uuid4().hex
+        if not await redis_client.set(self.flush_lock_key, token, nx=True, px=int(settings.QUOTA_SYNC_LOCK_TTL * 1000)):
+            return 0
+        try:
+            return await self._flush_locked(redis_client, sync, batch_size or settings.QUOTA_SYNC_BATCH_SIZE)
+        finally:
+            await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, self.flush_lock_key, token)
+
+    async def _flush_locked(self, redis_client: Any, sync: UsageSync, budget: int) -> int:
+        batch: List[tuple] = []
+        for user_id in await redis_client.smembers(self.dirty_key):
+            pending = await redis_client.smembers(self._key(user_id, "pending"))
+            batch.extend((int(user_id), session_id) for session_id in list(pending)[:budget - len(batch)])
+            if len(batch) >= budget:
+                break
+        if not batch:
+            return 0
+
+        async def _send(user_id: int, session_id: str) -> bool:
+            try:
+                accepted = await sync(user_id, session_id)
+            except Exception as e:
+                logger.warning("Quota usage sync failed", user_id=user_id, session_id=session_id, error=str(e))
+                accepted = False
+            QUOTA_SYNC.labels(result="synced" if accepted else "failed").inc()
+            if accepted:
+                await redis_client.srem(self._key(user_id, "pending"), session_id)
+            return accepted
+
+        results = await asyncio.gather(*(_send(user_id, session_id) for user_id, session_id in batch))
+        for user_id in {user_id for user_id, _ in batch}:
+            await redis_client.eval(
+                CLEAR_DIRTY_SCRIPT, 2, self._key(user_id, "pending"), self.dirty_key, user_id
+            )
+
+        synced = sum(results)
+        logger.info("Quota usage flushed to DC360", synced=synced, failed=len(batch) - synced)
+        return synced
+
+    async def start(self, sync: UsageSync) -> None:
+        """Démarre l'envoi périodique vers DC360 (appelé dans le lifespan)."""
+        if self._flusher is not None or not self.is_available:
+            return
+        self._flusher = asyncio.create_task(self._run(sync), name="genesis-quota-flusher")
+        logger.info("Quota ledger flusher started", interval=settings.QUOTA_SYNC_INTERVAL)
+
+    async def stop(self) -> None:
+        """Arrête l'envoi périodique (les usages en attente restent dans Redis)."""
+        task, self._flusher = self._flusher, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            logger.info("Quota ledger flusher stopped")
+
+    async def _run(self, sync: UsageSync) -> None:
+        while True:
+            await asyncio.sleep(settings.QUOTA_SYNC_INTERVAL)
+            try:
+                await self.flush(sync)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Quota ledger flush failed", error=str(e))
+
+
+def _limit_from_redis(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    limit = int(value)
+    return None if limit < 0 else limit
+
+
+# Instance globale pour l'application
+quota_ledger = QuotaLedger()
@@ -4,6 +4,9 @@ Gère les quotas de sessions coaching selon les plans tarifaires DigitalCloud360
 
 Source de vérité : DigitalCloud360 API
 Plans : Trial (3), Basic (10/mois), Pro (50/mois), Enterprise (illimité)
+
+Admission et comptage passent par le ledger Redis (app.core.quota.ledger),
+synchronisé vers DC360 en arrière-plan; sans Redis, DC360 est appelé directement.
 """
 
 from typing import Optional, Dict, Any
@@ -12,6 +15,7 @@ from enum import Enum
 import structlog
 
 from app.core.integrations.digitalcloud360 import DigitalCloud360APIClient
+from app.core.quota.ledger import QuotaLedger, quota_ledger
 from app.utils.exceptions import GenesisAIException
 
 
@@ -32,21 +36,25 @@ class QuotaLimits:
         SubscriptionPlan.TRIAL: {
             "max_sessions_per_month": 3,
             "max_sessions_total": 3,
+            "requests_per_minute": 5,
             "features": ["basic_coaching", "basic_brief"]
         },
         SubscriptionPlan.BASIC: {
             "max_sessions_per_month": 10,
             "max_sessions_total": None,  # Illimité
+            "requests_per_minute": 10,
             "features": ["coaching", "business_brief", "market_research"]
         },
         SubscriptionPlan.PRO: {
             "max_sessions_per_month": 50,
             "max_sessions_total": None,
+            "requests_per_minute": 20,
             "features": ["coaching", "business_brief", "market_research", "logo_generation", "seo_optimization"]
         },
         SubscriptionPlan.ENTERPRISE: {
             "max_sessions_per_month": None,  # Illimité
             "max_sessions_total": None,
+            "requests_per_minute": 50,
             "features": ["all"]
         }
     }
@@ -91,22 +99,57 @@ class QuotaManager:
     - Synchroniser avec DigitalCloud360 API
     """
     
-    def __init__(self, dc360_client: Optional[DigitalCloud360APIClient] = None):
+    def __init__(
+        self,
+        dc360_client: Optional[DigitalCloud360APIClient] = None,
+        ledger: Optional[QuotaLedger] = None
+    ):
         """
         Initialize QuotaManager.
         
         Args:
             dc360_client: Client DigitalCloud360 API (optionnel pour tests)
+            ledger: Ledger Redis des quotas (instance globale par défaut)
         """
         self.dc360_client = dc360_client or DigitalCloud360APIClient()
+        self.ledger = ledger or quota_ledger
         self.logger = logger.bind(service="QuotaManager")
     
-    async def check_quota(self, user_id: int) -> Dict[str, Any]:
+    async def _load_quota(self, user_id: int) -> Dict[str, Any]:
+        """Plan, limite et usage depuis DC360 (rechargement du ledger)."""
+        subscription_data = await self.dc360_client.get_user_subscription(user_id)
+        plan = subscription_data.get("plan", SubscriptionPlan.TRIAL)
+        return {
+            # Valeur brute ("trial"): stockée telle quelle dans le ledger Redis
+            "plan": plan.value if isinstance(plan, SubscriptionPlan) else plan,
+            "limit": QuotaLimits.get_limit(plan)["max_sessions_per_month"],
+            "used": subscription_data.get("genesis_sessions_used", 0),
+            "reset_date": subscription_data.get("quota_reset_date")
+        }
+    
+    async def load_plan(self, user_id: int) -> str:
+        """Plan de l'utilisateur (rate limiter); recharge aussi le ledger s'il est actif."""
+        if self.ledger.is_available:
+            quota = await self.ledger.refresh(user_id, self._load_quota)
+        else:
+            quota = await self._load_quota(user_id)
+        return str(quota.get("plan") or SubscriptionPlan.TRIAL.value)
+    
+    async def sync_usage(self, user_id: int, session_id: str) -> bool:
+        """Envoie un usage compté localement à DC360 (flusher du ledger)."""
+        result = await self.dc360_client.increment_genesis_usage(user_id, session_id)
+        return "error" not in result
+    
+    async def check_quota(self, user_id: int, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Vérifie si l'utilisateur peut démarrer une nouvelle session.
         
+        Avec le ledger Redis, la vérification est locale et réserve une place
+        pour `session_id` jusqu'à `increment_usage` (ou `release_reservation`).
+        
         Args:
             user_id: ID utilisateur DigitalCloud360
+            session_id: ID de la session/brief à réserver (optionnel)
             
         Returns:
             Dict contenant:
@@ -121,6 +164,14 @@ class QuotaManager:
         """
         self.logger.info("Checking quota", user_id=user_id)
         
+        if self.ledger.is_available:
+            try:
+                status = await self.ledger.admit(user_id, session_id, self._load_quota)
+            except Exception as e:
+                self.logger.warning("Quota ledger unavailable, checking DC360", user_id=user_id, error=str(e))
+            else:
+                return self._admission(user_id, status)
+        
         try:
             # 1. Récupérer abonnement + usage depuis DC360 API
             subscription_data = await self.dc360_client.get_user_subscription(user_id)
@@ -187,10 +238,59 @@ class QuotaManager:
                 "fallback_mode": True
             }
     
+    def _admission(self, user_id: int, status: Dict[str, Any]) -> Dict[str, Any]:
+        """Décision du ledger -> réponse check_quota (ou QuotaExceededException)."""
+        plan = status["plan"]
+        max_sessions = status["limit"]
+        current_usage = status["used"]
+        reset_date = status["reset_date"]
+        
+        if not status["allowed"]:
+            in_progress = status["reserved"]
+            self.logger.warning(
+                "Quota exceeded",
+                user_id=user_id,
+                plan=plan,
+                current_usage=current_usage,
+                in_progress=in_progress,
+                max_allowed=max_sessions
+            )
+            raise QuotaExceededException(
+                message=f"Quota mensuel dépassé pour le plan {plan.upper()}. "
+                        f"Vous avez utilisé {current_usage}/{max_sessions} sessions"
+                        f"{f' ({in_progress} en cours)' if in_progress else ''}. "
+                        f"Mettez à niveau votre plan ou attendez le {reset_date}.",
+                current_usage=current_usage,
+                max_allowed=max_sessions,
+                plan=plan,
+                reset_date=reset_date
+            )
+        
+        return {
+            "can_start_session": True,
+            "current_usage": current_usage,
+            "max_monthly_sessions": max_sessions,
+            "plan": plan,
+            "reset_date": reset_date,
+            "features_available": QuotaLimits.get_limit(plan)["features"]
+        }
+    
+    async def release_reservation(self, user_id: int, session_id: str) -> None:
+        """Libère la place réservée par check_quota si la génération échoue (best-effort)."""
+        if not self.ledger.is_available:
+            return
+        try:
+            await self.ledger.release(user_id, session_id)
+        except Exception as e:
+            self.logger.warning("Failed to release quota reservation", user_id=user_id, session_id=session_id, error=str(e))
+    
     async def increment_usage(self, user_id: int, session_id: str) -> Dict[str, Any]:
         """
         Incrémente le compteur d'usage après session réussie.
         
+        Avec le ledger Redis, l'usage est compté localement (une fois par
+        session_id) et envoyé à DC360 par le flusher en arrière-plan.
+        
         Args:
             user_id: ID utilisateur
             session_id: ID session coaching/brief généré
@@ -200,6 +300,19 @@ class QuotaManager:
         """
         self.logger.info("Incrementing usage", user_id=user_id, session_id=session_id)
         
+        if self.ledger.is_available:
+            try:
+                result = await self.ledger.commit(user_id, session_id)
+            except Exception as e:
+                self.logger.warning("Quota ledger unavailable, incrementing on DC360", user_id=user_id, error=str(e))
+            else:
+                return {
+                    "new_usage": result["used"],
+                    "max_allowed": result["limit"],
+                    "session_id": session_id,
+                    "already_counted": not result["counted"]
+                }
+        
         try:
             # Appeler DC360 API pour incrémenter
             result = await self.dc360_client.increment_genesis_usage(user_id, session_id)
@@ -248,6 +361,24 @@ class QuotaManager:
         """
         self.logger.info("Getting quota status", user_id=user_id)
         
+        if self.ledger.is_available:
+            try:
+                status = await self.ledger.admit(user_id, None, self._load_quota)
+            except Exception as e:
+                self.logger.warning("Quota ledger unavailable, reading DC360", user_id=user_id, error=str(e))
+            else:
+                max_sessions = status["limit"]
+                current_usage = status["used"]
+                return {
+                    "user_id": user_id,
+                    "plan": status["plan"],
+                    "current_usage": current_usage,
+                    "max_monthly_sessions": max_sessions,
+                    "remaining": max(max_sessions - current_usage, 0) if max_sessions is not None else None,
+                    "reset_date": status["reset_date"],
+                    "percentage_used": (current_usage / max_sessions * 100) if max_sessions else 0
+                }
+        
         try:
             subscription_data = await self.dc360_client.get_user_subscription(user_id)
             
@@ -0,0 +1,246 @@
+"""
+Rate Limiter - limite de requêtes par minute selon le plan (GCRA)
+
+Limites par plan dans QuotaLimits (`requests_per_minute`). L'algorithme
+GCRA ne stocke qu'un horodatage par identité (TAT: heure théorique
+d'arrivée) et autorise une rafale égale à la limite par minute.
+
+Un seul EVAL Redis par requête: le script lit le plan de l'utilisateur
+(`genesis:quota:{user_id}:plan`, écrit par le ledger des quotas au
+chargement depuis DC360), choisit la limite et met à jour le TAT. Plan
+absent (aucun appel quota récent): le plan est chargé une fois depuis DC360
+puis mémorisé, plutôt que d'appliquer la limite du plan Trial à un
+abonné payant. Si Redis échoue, le même calcul est fait en mémoire, par
+processus, avec le dernier plan connu de l'utilisateur.
+"""
+
+import asyncio
+import math
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from app.config.settings import settings
+from app.config.redis import redis_pools
+from app.core.providers.cache import InMemoryLRUCache, _MISSING
+from app.core.quota.quota_manager import QuotaLimits
+
+logger = structlog.get_logger(__name__)
+
+# Prometheus metrics
+RATE_LIMIT_DECISIONS = Counter(
+    'genesis_ai_rate_limit_decisions_total',
+    'Rate limiter decisions',
+    ['plan', 'result', 'backend']
+)
+
+PERIOD_MS = 60000
+
+# KEYS: plan de l'utilisateur, TAT
+# ARGV: now_ms, plan par défaut, période_ms, plan_ttl_ms, plan1, limite1, ...
+#   plan_ttl_ms < 0: plan absent => {-1} sans rien compter (chargement DC360)
+#   plan_ttl_ms = 0: plan absent => plan par défaut (requêtes anonymes)
+#   plan_ttl_ms > 0: plan absent => plan par défaut (chargé) mémorisé avec ce TTL
+# Retourne {autorisé, retry_after_ms | restantes, plan, limite}
+GCRA_SCRIPT = """
+local plan = redis.call('GET', KEYS[1])
+local plan_ttl = tonumber(ARGV[4])
+if not plan then
+    if plan_ttl < 0 then return {-1} end
+    plan = ARGV[2]
+    if plan_ttl > 0 then redis.call('SET', KEYS[1], plan, 'PX', plan_ttl) end
+end
+plan = (string.gsub(plan, '^genesis_', ''))
+local limit, default_limit
+for i = 5, #ARGV, 2 do
+    if ARGV[i] == plan then limit = tonumber(ARGV[i + 1]) end
+    if ARGV[i] == ARGV[2] then default_limit = tonumber(ARGV[i + 1]) end
+end
+if not limit then
+    plan = ARGV[2]
+    limit = default_limit
+end
+local now = tonumber(ARGV[1])
+local period = tonumber(ARGV[3])
+local interval = period / limit
+local tat = math.max(tonumber(redis.call('GET', KEYS[2]) or '0'), now)
+if tat - now > period - interval then
+    return {0, math.ceil(tat - now - (period - interval)), plan, limit}
+end
+tat = tat + interval
+redis.call('SET', KEYS[2], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+return {1, math.floor((period - (tat - now)) / interval), plan, limit}
+"""
+
+PlanLoader = Callable[[int], Awaitable[Any]]
+
+
+async def _load_plan_from_dc360(user_id: int) -> Any:
+    # Import local: QuotaManager crée un client DC360, inutile sans plan manquant
+    from app.core.quota.quota_manager import QuotaManager
+    return await QuotaManager().load_plan(user_id)
+
+
+class RateLimitDecision:
+    """Résultat d'une vérification: autorisé ou non, en-têtes à renvoyer."""
+
+    __slots__ = ("allowed", "limit", "remaining", "retry_after", "plan")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, retry_after: float, plan: str):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.retry_after = retry_after
+        self.plan = plan
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimiter:
+    """
+    Limiteur GCRA par utilisateur (ou IP pour les requêtes anonymes).
+
+    Sans pool Redis actif (scripts, tests unitaires) ou si désactivé,
+    `is_enabled` est faux et les requêtes ne sont pas limitées.
+
+    Usage:
+        decision = await rate_limiter.check(user_id=42)
+        if not decision.allowed: ...  # 429 + decision.headers()
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        enabled: Optional[bool] = None,
+        plan_loader: Optional[PlanLoader] = None
+    ):
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.default_plan = settings.RATE_LIMIT_DEFAULT_PLAN
+        self._redis = redis_client
+        self._plan_loader = plan_loader or _load_plan_from_dc360
+        # Un seul chargement DC360 par utilisateur, partagé par ses requêtes concurrentes
+        self._plan_loads: Dict[int, asyncio.Task] = {}
+        self._limits = {
+            plan.value: limits["requests_per_minute"] for plan, limits in QuotaLimits.LIMITS.items()
+        }
+        self._plan_args = [item for plan, limit in self._limits.items() for item in (plan, limit)]
+        # Repli en mémoire: TAT par identité, dernier plan connu par utilisateur
+        self._local_tat = InMemoryLRUCache(settings.RATE_LIMIT_LOCAL_MAX_ENTRIES, PERIOD_MS // 1000)
+        self._local_plans = InMemoryLRUCache(settings.RATE_LIMIT_LOCAL_MAX_ENTRIES, settings.QUOTA_PLAN_KEY_TTL)
+
+    def _get_redis(self):
+        if self._redis is None and redis_pools.is_active:
+            self._redis = redis_pools.get_client(decode_responses=True)
+        return self._redis
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.enabled and self._get_redis() is not None
+
+    def _identity(self, user_id: Optional[int], client_ip: Optional[str]) -> Tuple[str, str]:
+        if user_id is not None:
+            return f"genesis:quota:{user_id}:plan", f"genesis:ratelimit:user:{user_id}"
+        # Anonyme: aucun plan, limite du plan par défaut
+        return "genesis:ratelimit:anonymous:plan", f"genesis:ratelimit:ip:{client_ip or 'unknown'}"
+
+    async def check(self, user_id: Optional[int] = None, client_ip: Optional[str] = None) -> RateLimitDecision:
+        """Compte une requête et décide si elle passe."""
+        plan_key, tat_key = self._identity(user_id, client_ip)
+        now_ms = time.time() * 1000
+
+        try:
+            # Anonyme: plan par défaut; utilisateur: plan absent signalé (-1)
+            reply = await self._eval(plan_key, tat_key, now_ms, self.default_plan, 0 if user_id is None else -1)
+            if int(reply[0]) == -1:
+                plan, ttl = await self._load_plan(user_id)
+                reply = await self._eval(plan_key, tat_key, now_ms, plan, int(ttl * 1000))
+        except Exception as e:
+            logger.warning("Rate limiter falling back to in-process buckets", error=str(e))
+            decision = self._check_local(plan_key, tat_key, now_ms)
+            backend = "memory"
+        else:
+            allowed, value, plan, limit = reply
+            allowed, value, limit = int(allowed), int(value), int(limit)
+            if user_id is not None:
+                self._local_plans.set(plan_key, plan)
+            decision = RateLimitDecision(
+                allowed=bool(allowed),
+                limit=limit,
+                remaining=value if allowed else 0,
+                retry_after=0 if allowed else value / 1000,
+                plan=plan
+            )
+            backend = "redis"
+
+        RATE_LIMIT_DECISIONS.labels(
+            plan=decision.plan,
+            result="allowed" if decision.allowed else "limited",
+            backend=backend
+        ).inc()
+        return decision
+
+    async def _eval(self, plan_key: str, tat_key: str, now_ms: float, plan: str, plan_ttl_ms: int) -> List[Any]:
+        return await self._get_redis().eval(
+            GCRA_SCRIPT, 2, plan_key, tat_key,
+            int(now_ms), plan, PERIOD_MS, plan_ttl_ms, *self._plan_args
+        )
+
+    async def _load_plan(self, user_id: int) -> Tuple[str, float]:
+        """
+        Plan depuis DC360 et durée pendant laquelle le mémoriser.
+
+        En cas d'échec: dernier plan connu (ou plan par défaut), retenu peu
+        de temps pour réessayer sans appeler DC360 à chaque requête.
+        """
+        task = self._plan_loads.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._plan_loader(user_id))
+            self._plan_loads[user_id] = task
+            task.add_done_callback(lambda _: self._plan_loads.pop(user_id, None))
+        try:
+            plan = self._plan_name(await asyncio.shield(task))
+            ttl = settings.QUOTA_PLAN_KEY_TTL
+        except Exception as e:
+            plan = self._local_plans.get(f"genesis:quota:{user_id}:plan")
+            plan = self.default_plan if plan is _MISSING else plan
+            ttl = settings.RATE_LIMIT_PLAN_RETRY_TTL
+            logger.warning("Rate limiter could not load plan", user_id=user_id, fallback_plan=plan, error=str(e))
+        return plan, ttl
+
+    def _plan_name(self, plan: Any) -> str:
+        """Plan DC360 ("genesis_pro", SubscriptionPlan...) -> plan de QuotaLimits."""
+        name = plan.value if isinstance(plan, Enum) else str(plan or "")
+        if name.startswith("genesis_"):
+            name = name[len("genesis_"):]
+        return name if name in self._limits else self.default_plan
+
+    def _check_local(self, plan_key: str, tat_key: str, now_ms: float) -> RateLimitDecision:
+        """Même GCRA que le script Lua, en mémoire (par processus)."""
+        plan = self._local_plans.get(plan_key)
+        if plan is _MISSING or plan not in self._limits:
+            plan = self.default_plan
+        limit = self._limits[plan]
+        interval = PERIOD_MS / limit
+
+        tat = self._local_tat.get(tat_key)
+        tat = now_ms if tat is _MISSING else max(tat, now_ms)
+        if tat - now_ms > PERIOD_MS - interval:
+            retry_after = (tat - now_ms - (PERIOD_MS - interval)) / 1000
+            return RateLimitDecision(False, limit, 0, retry_after, plan)
+        tat += interval
+        self._local_tat.set(tat_key, tat)
+        return RateLimitDecision(True, limit, math.floor((PERIOD_MS - (tat - now_ms)) / interval), 0, plan)
+
+
+# Instance globale pour l'application
+rate_limiter = RateLimiter()
@@ -13,7 +13,7 @@ from contextlib import asynccontextmanager
 
 from app.config.settings import settings
 from app.config.database import engine, create_tables
-from app.api.middleware import PrometheusMiddleware, LoggingMiddleware
+from app.api.middleware import PrometheusMiddleware, LoggingMiddleware, RateLimitMiddleware
 from app.api.v1 import auth, coaching, business, users, integrations, genesis, modules, sites, themes, chat, memory, dashboard
 from app.api import dc360_adapter
 from app.utils.exceptions import GenesisAIException
@@ -21,6 +21,15 @@ from app.utils.logger import setup_logging
 from app.core.integrations.redis_fs import RedisVirtualFileSystem
 from app.core.integrations.digitalcloud360 import DigitalCloud360APIClient
 from app.core.integrations.tavily import TavilyClient
+from app.core.integrations.http_pool import http_clients
+from app.core.integrations.image_derivatives import image_derivatives
+from app.core.integrations.session_cache import session_cache
+from app.core.memory.vector_backends import close_vector_backends
+from app.config.redis import redis_pools
+from app.core.orchestration.container import agent_container
+from app.core.jobs import job_queue
+from app.core.quota import QuotaManager, quota_ledger
+from app.core.deep_agents.sub_agents.research_cache import run_research_cache_warmup
 
 # Setup structured logging
 logger = setup_logging()
@@ -47,10 +56,28 @@ async def lifespan(app: FastAPI):
                 raise e
             logger.warning("Database initialization skipped", error=str(e))
 
-    # Initialize Redis connection
+    # Initialize Redis connection (pool partagé par le VFS, les routers et les agents)
+    redis_pools.open()
     redis_fs = RedisVirtualFileSystem()
     await redis_fs.health_check()
     logger.info("Redis Virtual File System initialized")
+    # Cache L1 des sessions/sites, cohérent entre workers via pub/sub
+    await session_cache.start()
+    
+    # Pools HTTP partagés (providers LLM/recherche/image, Tavily, DC360)
+    http_clients.open()
+    
+    # Usages comptés dans le ledger Redis, envoyés à DC360 en arrière-plan
+    await quota_ledger.start(QuotaManager().sync_usage)
+    
+    # Orchestrateur + agents construits une seule fois (graphe compilé partagé)
+    await agent_container.startup()
+    
+    # Workers des jobs asynchrones (génération de site, warm-up cache recherche)
+    job_queue.register_handler("research_cache_warmup", run_research_cache_warmup)
+    await job_queue.start()
+    if settings.RESEARCH_CACHE_WARMUP_ON_STARTUP:
+        await job_queue.enqueue("research_cache_warmup", user_id=0, payload={})
     
     # Validate external API connections (skip for manual testing)
     skip_api_validation = os.getenv("SKIP_API_VALIDATION", "false").lower() == "true"
@@ -64,6 +91,14 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Genesis AI Service shutting down...")
+    await job_queue.stop()
+    await quota_ledger.stop()
+    await agent_container.shutdown()
+    await http_clients.aclose()
+    image_derivatives.shutdown()
+    await close_vector_backends()
+    await session_cache.stop()
+    await redis_pools.aclose()
 
 async def validate_external_apis():
     """Validate all external API connections on startup"""
@@ -174,6 +209,9 @@ app = FastAPI(
     }
 )
 
+# Rate Limiting (ajouté avant CORS: les réponses 429 portent les en-têtes CORS)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
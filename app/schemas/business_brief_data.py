@@ -11,6 +11,7 @@ from typing import Optional, List, Dict, Any
 class ContentGenerationData(BaseModel):
     """Données générées par le ContentSubAgent"""
     hero_image: Optional[str] = None
+    image_variants: Optional[Dict[str, Any]] = None  # URL image -> variantes responsive
     hero_title: Optional[str] = None
     hero_subtitle: Optional[str] = None
     about_text: Optional[str] = None
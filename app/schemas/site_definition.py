@@ -20,6 +20,20 @@ class BlockType(str, Enum):
     MENU = "menu"
 
 
+# ===== IMAGES RESPONSIVE =====
+class ImageSource(BaseModel):
+    type: str  # "image/avif", "image/webp"
+    srcset: str  # "<url> 480w, <url> 960w"
+
+
+class ResponsiveImage(BaseModel):
+    src: str  # Original (fallback <img src>)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None  # data URI flouté (blur-up)
+    sources: List[ImageSource] = []
+
+
 # ===== HEADER =====
 class NavItem(BaseModel):
     label: str
@@ -61,6 +75,7 @@ class HeroSectionContent(BaseModel):
     subtitle: Optional[str] = None  # Aligné sur HeroBlock.tsx
     description: Optional[str] = None
     image: Optional[str] = None  # Aligné sur HeroBlock.tsx (pas backgroundImage)
+    imageSet: Optional[ResponsiveImage] = None  # Variantes srcset de `image`
     backgroundVideo: Optional[str] = None
     cta: Optional[HeroCTA] = None  # Single object, aligné sur HeroBlock.tsx
     alignment: Optional[Literal["left", "center", "right"]] = "center"
@@ -106,6 +121,7 @@ class AboutSectionContent(BaseModel):
     mission: Optional[str] = None
     vision: Optional[str] = None
     image: Optional[str] = None
+    imageSet: Optional[ResponsiveImage] = None
     stats: Optional[List[AboutStat]] = None
     variant: Optional[Literal["simple", "enhanced"]] = "simple"
 
@@ -117,6 +133,7 @@ class ServiceItem(BaseModel):
     description: str
     icon: Optional[str] = None
     image: Optional[str] = None
+    imageSet: Optional[ResponsiveImage] = None
     price: Optional[str] = None
     href: Optional[str] = None
 
@@ -135,6 +152,7 @@ class FeatureItem(BaseModel):
     description: str
     icon: Optional[str] = None
     image: Optional[str] = None
+    imageSet: Optional[ResponsiveImage] = None
 
 
 class FeaturesSectionContent(BaseModel):
@@ -0,0 +1,38 @@
+"""
+Sweep de l'image store: supprime les blobs qu'aucun site vivant ne référence.
+
+Racines du marquage: définitions de site (`site:{id}`) et entrées du cache
+ImageAgent (`cache/image_agent:*`), qui peuvent resservir une image.
+
+    python -m app.scripts.gc_images            # suppression
+    python -m app.scripts.gc_images --dry-run  # comptage seul
+"""
+
+import asyncio
+import sys
+
+from app.config.redis import redis_pools
+from app.core.integrations.image_store import image_store
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
+
+
+async def gc_images(dry_run: bool = False):
+    # Pool partagé: le sweep recalcule aussi les compteurs de références
+    redis_pools.open()
+    redis_fs = RedisVirtualFileSystem()
+
+    async def live_documents():
+        async for site in redis_fs.iter_documents("site:*"):
+            yield site
+        async for cached in redis_fs.iter_documents("cache/image_agent:*"):
+            yield cached
+
+    try:
+        # Document illisible: le sweep est annulé (exception), rien n'est supprimé
+        stats = await image_store.collect_garbage(live_documents(), dry_run=dry_run)
+    finally:
+        await redis_pools.aclose()
+    print(f"BLOBS: {stats['blobs']} REFERENCED: {stats['referenced']} DELETED: {stats['deleted']}")
+
+if __name__ == "__main__":
+    asyncio.run(gc_images(dry_run="--dry-run" in sys.argv))
@@ -1,15 +1,15 @@
 import redis.asyncio as redis
 import asyncio
-import json
+
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
 
 async def inspect_site_images():
-    client = redis.from_url("redis://redis:6379/0", decode_responses=True)
+    redis_fs = RedisVirtualFileSystem(redis.from_url("redis://redis:6379/0"))
     # Session ID from previous context/logs
     session_id = "9dbd044e-d23c-4c0f-ad89-8f323077bc25"
     
-    site_json = await client.get(f"site:{session_id}")
-    if site_json:
-        site_data = json.loads(site_json)
+    site_data = await redis_fs.read_site(session_id)
+    if site_data:
         print("--- SITE IMAGES DATA ---")
         print(f"Hero Image: {site_data.get('hero_image')}")
         print(f"Service Images: {site_data.get('service_images')}")
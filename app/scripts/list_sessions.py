@@ -2,8 +2,11 @@ import redis.asyncio as redis
 import asyncio
 import json
 
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
+
 async def check_recent_sessions():
     client = redis.from_url("redis://redis:6379/0", decode_responses=True)
+    redis_fs = RedisVirtualFileSystem(redis.from_url("redis://redis:6379/0"))
     
     # Scan for all sessions
     cursor = 0
@@ -11,15 +14,13 @@ async def check_recent_sessions():
     while True:
         cursor, keys = await client.scan(cursor, match="session:*")
         for key in keys:
-            val = await client.get(key)
-            if val:
-                data = json.loads(val)
-                if data.get("user_id") == 2:
-                    sessions.append({
-                        "id": key.split(":")[1],
-                        "status": data.get("status"),
-                        "business": data.get("onboarding", {}).get("business_name")
-                    })
+            data = await redis_fs.read_session_fields(key, ["user_id", "status", "onboarding"])
+            if data and data.get("user_id") == 2:
+                sessions.append({
+                    "id": key.split(":")[1],
+                    "status": data.get("status"),
+                    "business": data.get("onboarding", {}).get("business_name")
+                })
         if cursor == 0:
             break
             
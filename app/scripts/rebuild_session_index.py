@@ -0,0 +1,20 @@
+"""
+Reconstruit l'index genesis:user:{user_id}:sessions depuis les sessions existantes.
+
+À exécuter une fois après déploiement de l'index secondaire:
+    python -m app.scripts.rebuild_session_index
+"""
+
+import asyncio
+
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
+
+
+async def rebuild_session_index():
+    redis_fs = RedisVirtualFileSystem()
+    indexed = await redis_fs.rebuild_session_index()
+    print(f"SESSIONS_INDEXED: {indexed}")
+    await redis_fs.close()
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_session_index())
@@ -0,0 +1,22 @@
+"""
+Reconstruit l'index HNSW de user_embeddings avec les paramètres courants
+(VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION), sans interruption des recherches.
+
+    python -m app.scripts.rebuild_vector_index [m] [ef_construction]
+"""
+
+import asyncio
+import sys
+
+from app.config.database import engine
+from app.core.memory.vector_index import rebuild_hnsw_index
+
+
+async def rebuild_vector_index(m=None, ef_construction=None):
+    await rebuild_hnsw_index(engine, m=m, ef_construction=ef_construction)
+    print("HNSW_INDEX_REBUILT")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(rebuild_vector_index(*args))
@@ -21,14 +21,12 @@ async def repair_images():
     # 1. Récupérer la session (Business Brief)
     # Note: Dans Redis, la clé est session:{id} ou genesis:session:{user_id}:{brief_id}
     
-    redis = redis_fs.redis
-    session_json = await redis.get(f"session:{SESSION_ID}")
+    session_data = await redis_fs.read_session_fields(f"session:{SESSION_ID}", ["onboarding"])
     
     business_name = "Chez Tante Awa"
     sector = "Restaurant Sénégalais"
     
-    if session_json:
-        session_data = json.loads(session_json)
+    if session_data:
         print("Session data loaded.")
         business_name = session_data.get("onboarding", {}).get("business_name", business_name)
         sector = session_data.get("onboarding", {}).get("sector", sector)
@@ -41,7 +39,7 @@ async def repair_images():
     features = ["Cuisine Authentique", "Produits Frais Locaux", "Ambiance Familiale"]
     
     print(f"Regenerating images for {business_name} ({sector})...")
-    print("This will download images locally to /app/app/static/images/")
+    print("This will download images into the content-addressed image store")
     
     # 2. Regénérer les images (force no cache pour être sûr d'avoir les versions locales)
     # On modifie temporairement ImageAgent pour forcer le téléchargement si nécessaire, 
@@ -70,11 +68,15 @@ async def repair_images():
     # Pour l'instant, je vais patcher ImageAgent ici ou juste appeler run() manuellement en boucle.
     
     images_result = {}
+    # URL -> imageSet (srcset WebP/AVIF + placeholder), reporté sur les blocs du site
+    image_variants = {}
     
     # Hero
     print("Generating Hero...")
     hero_res = await image_agent.run(business_name, sector, "hero", use_cache=False)
     images_result["hero_image"] = hero_res["image_url"]
+    if hero_res.get("image_set"):
+        image_variants[hero_res["image_url"]] = hero_res["image_set"]
     
     # Services
     print("Generating Services...")
@@ -82,6 +84,8 @@ async def repair_images():
     for svc in services:
         res = await image_agent.run(business_name, sector, "service", context=svc, use_cache=False)
         svc_images.append(res["image_url"])
+        if res.get("image_set"):
+            image_variants[res["image_url"]] = res["image_set"]
     images_result["service_images"] = svc_images
     
     # Features
@@ -90,6 +94,8 @@ async def repair_images():
     for feat in features:
         res = await image_agent.run(business_name, sector, "feature", context=feat, use_cache=False)
         feat_images.append(res["image_url"])
+        if res.get("image_set"):
+            image_variants[res["image_url"]] = res["image_set"]
     images_result["feature_images"] = feat_images
     
     print("Images generated:")
@@ -98,11 +104,9 @@ async def repair_images():
     # 3. Mettre à jour le Site Definition dans Redis
     # On doit charger le SiteDefinition actuel, updater les images, et resauvegarder.
     
-    site_key = f"site:{SESSION_ID}"
-    site_json = await redis.get(site_key)
+    site_def = await redis_fs.read_site(SESSION_ID)
     
-    if site_json:
-        site_def = json.loads(site_json)
+    if site_def:
         
         # Update Hero
         if "pages" in site_def:
@@ -121,12 +125,15 @@ async def repair_images():
                             for idx, feat_item in enumerate(section["content"].get("features", [])):
                                 if idx < len(images_result["feature_images"]):
                                     feat_item["image"] = images_result["feature_images"][idx]
+                    
+                    # Variantes responsive des nouvelles images (même règle que le transformer)
+                    transformer.apply_image_variants(page["sections"], image_variants)
                                     
         # Update Metadata OG Image
         site_def["metadata"]["ogImage"] = images_result["hero_image"]
         
         # Save back
-        await redis.set(site_key, json.dumps(site_def))
+        await redis_fs.write_site(SESSION_ID, site_def)
         print("Site definition updated in Redis.")
         
     else:
@@ -1,22 +1,22 @@
 import redis.asyncio as redis
 import asyncio
-import json
+
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
 
 async def verify_site_ownership():
     client = redis.from_url("redis://redis:6379/0", decode_responses=True)
     session_id = "a9fa5f04-8143-4521-aefd-27be89e02872"
     
     # Check session data
-    session_json = await client.get(f"session:{session_id}")
-    if session_json:
-        session_data = json.loads(session_json)
+    redis_fs = RedisVirtualFileSystem(redis.from_url("redis://redis:6379/0"))
+    session_data = await redis_fs.read_session_fields(f"session:{session_id}", ["user_id"])
+    if session_data:
         print(f"SESSION_USER_ID: {session_data.get('user_id')} (Type: {type(session_data.get('user_id'))})")
     else:
         print("SESSION_NOT_FOUND")
         
     # Check site data
-    site_json = await client.get(f"site:{session_id}")
-    if site_json:
+    if await client.exists(f"site:{session_id}"):
         print("SITE_DATA_FOUND: True")
     else:
         print("SITE_DATA_NOT_FOUND")
@@ -0,0 +1,76 @@
+"""Purge des données d'un compte (suppression de compte DC360)
+
+Supprime en une seule opération tout ce que Genesis conserve pour un
+utilisateur hors des tables métier:
+
+    - mémoire sémantique (user_embeddings, DELETE ... RETURNING par lots)
+    - sessions Redis (briefs, sessions coaching, sites générés)
+    - entrées du cache ImageAgent qui resservaient ses images
+
+Les blobs d'images eux-mêmes sont adressés par contenu et peuvent être
+partagés avec d'autres comptes: une fois leurs références retirées, ils sont
+supprimés par le prochain sweep de l'image store (app.scripts.gc_images).
+Chaque étape est idempotente; en cas d'erreur la purge peut être rejouée.
+"""
+
+from typing import Dict, Optional, Set
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.integrations.image_store import referenced_digests
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
+from app.core.memory.vector_store import VectorStore
+from app.models.coaching import CoachingSession
+
+logger = structlog.get_logger()
+
+
+async def purge_user_data(
+    db: AsyncSession,
+    user_id: int,
+    redis_fs: RedisVirtualFileSystem,
+    vector_store: Optional[VectorStore] = None
+) -> Dict[str, int]:
+    """
+    Purge embeddings, sessions Redis et images en cache d'un utilisateur.
+
+    Args:
+        db: Session base de données
+        user_id: ID utilisateur
+        redis_fs: Virtual File System Redis
+        vector_store: VectorStore à utiliser (nouveau par défaut)
+
+    Returns:
+        Compteurs: embeddings, sessions, sites, keys, cached_images, images_released
+    """
+    result = await db.execute(select(CoachingSession.session_id).where(CoachingSession.user_id == user_id))
+    session_ids = list(result.scalars().all())
+
+    # Images citées par ses sites, relevées avant leur suppression
+    digests: Set[str] = set()
+    for session_id in session_ids:
+        site = await redis_fs.read_site(session_id)
+        if site:
+            digests.update(referenced_digests(site))
+
+    sessions = await redis_fs.purge_user_sessions(user_id, session_ids)
+
+    cached_images = 0
+    if digests:
+        cached_images = await redis_fs.purge_documents(
+            "cache/image_agent:*",
+            lambda document: not digests.isdisjoint(referenced_digests(document))
+        )
+
+    embeddings = await (vector_store or VectorStore()).delete_user_embeddings(db, user_id)
+
+    stats = {
+        "embeddings": embeddings,
+        **sessions,
+        "cached_images": cached_images,
+        "images_released": len(digests),
+    }
+    logger.info("User data purged", user_id=user_id, **stats)
+    return stats
@@ -4,7 +4,7 @@ CoachingLLMService - Extraction et validation LLM des réponses coaching
 
 import json
 import structlog
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 from pydantic import BaseModel, Field, validator
 
 from app.core.providers.factory import ProviderFactory
@@ -271,6 +271,46 @@ FORMAT JSON:
             logger.error("reformulation_failed", error=str(e))
             return {"original_text": text, "reformulated_text": text, "is_better": False, "suggestions": []}
 
+    async def socratic_help_stream(self, step: str, brief: Dict[str, Any], sector: str) -> AsyncIterator[str]:
+        """Aide socratique en streaming (texte libre, affiché au fil de l'eau)"""
+        
+        prompt = f"""
+AIDE SOCRATIQUE COACHING - ÉTAPE {step.upper()}
+SECTEUR: {sector}
+BRIEF ACTUEL: {json.dumps(brief, ensure_ascii=False)}
+
+TÂCHE:
+Pose 2-3 questions socratiques pour aider l'entrepreneur à avancer sur cette étape,
+chacune suivie d'un court indice de contexte, puis termine par un conseil global.
+Réponds en texte simple, sans JSON ni markdown.
+"""
+        async for delta in self.llm_provider.astream(
+            prompt=prompt,
+            system_message="Tu es le Coach IA Genesis spécialisé en maïeutique socratique.",
+            temperature=0.7,
+            max_tokens=800
+        ):
+            yield delta
+
+    async def reformulate_stream(self, text: str, step: str) -> AsyncIterator[str]:
+        """Reformulation en streaming (seul le texte reformulé est produit)"""
+        
+        prompt = f"""
+REFORMULATION PROFESSIONNELLE - ÉTAPE {step.upper()}
+TEXTE ORIGINAL: "{text}"
+
+TÂCHE:
+Reformule ce texte pour le rendre plus percutant et professionnel (style Genesis AI).
+Réponds uniquement avec le texte reformulé, sans guillemets ni commentaire.
+"""
+        async for delta in self.llm_provider.astream(
+            prompt=prompt,
+            system_message="Tu es l'Expert Contenu de Genesis AI.",
+            temperature=0.5,
+            max_tokens=600
+        ):
+            yield delta
+
     async def generate_proposals(self, step: str, brief: Dict[str, Any], sector: str) -> Dict[str, Any]:
         """Génère 3 propositions de réponses pour l'étape en cours"""
         
@@ -146,6 +146,8 @@ class BriefToSiteTransformer:
                 if section:
                     sections.append(section)
         
+        self._attach_image_sets(sections, brief)
+        
         return {
             "id": "home",
             "slug": "/",
@@ -153,6 +155,31 @@ class BriefToSiteTransformer:
             "sections": sections
         }
     
+    def _attach_image_sets(self, sections: List[Dict[str, Any]], brief: Union[BusinessBrief, BusinessBriefData]) -> None:
+        """Ajoute `imageSet` (srcset WebP/AVIF + placeholder) aux images ayant des variantes responsive"""
+        variants = None
+        if brief.content_generation and isinstance(brief.content_generation, dict):
+            variants = brief.content_generation.get("image_variants")
+        if variants:
+            self.apply_image_variants(sections, variants)
+    
+    @staticmethod
+    def apply_image_variants(sections: List[Dict[str, Any]], variants: Dict[str, Any]) -> None:
+        """Pose `imageSet` sur chaque bloc (hero, services, features) dont l'image a des variantes (URL -> imageSet)"""
+        for section in sections:
+            content = section.get("content") or {}
+            blocks = [content]
+            for items_key in ("services", "features"):
+                if isinstance(content.get(items_key), list):
+                    blocks.extend(item for item in content[items_key] if isinstance(item, dict))
+            for block in blocks:
+                image_set = variants.get(block.get("image")) if block.get("image") else None
+                if image_set:
+                    block["imageSet"] = image_set
+                else:
+                    # Image remplacée sans variantes: l'ancien srcset ne correspond plus
+                    block.pop("imageSet", None)
+    
     def _map_hero_section(self, brief: Union[BusinessBrief, BusinessBriefData], sector_config: Dict) -> Dict[str, Any]:
         """Génère la section Hero en utilisant le contenu LLM généré s'il existe"""
         
@@ -1,6 +1,9 @@
 import { ThemeRecommendationList } from '@/types/theme';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
+const JOB_POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
 
 export const themesApi = {
     getRecommendations: async (token: string, briefId: number): Promise<ThemeRecommendationList> => {
@@ -36,6 +39,35 @@ export const themesApi = {
             throw new Error(error.detail || 'Failed to select theme');
         }
 
+        // 202: la génération tourne en arrière-plan, on suit le job jusqu'au résultat
+        const { job_id } = await response.json();
+        return themesApi.waitForGenerationJob(token, job_id);
+    },
+
+    getGenerationJob: async (token: string, jobId: string): Promise<any> => {
+        const response = await fetch(`${API_BASE_URL}/themes/jobs/${jobId}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to get generation job');
+        }
+
         return response.json();
+    },
+
+    waitForGenerationJob: async (token: string, jobId: string): Promise<any> => {
+        // result contient { status: 'GENERATION_COMPLETED', session_id: '...', site_data: {...} }
+        while (true) {
+            const job = await themesApi.getGenerationJob(token, jobId);
+            if (job.status === 'completed') {
+                return job.result;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'La génération a échoué');
+            }
+            await sleep(JOB_POLL_INTERVAL_MS);
+        }
     }
 };
@@ -0,0 +1,57 @@
+"""
+Benchmark: coût par requête de la résolution de l'orchestrateur.
+
+Avant: chaque requête construisait un LangGraphOrchestrator (5 agents,
+ProviderFactory, client Redis, compilation du StateGraph).
+Après: la dépendance renvoie le singleton du conteneur d'agents.
+
+Usage:
+    python scripts/benchmark_agent_container.py [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+from app.core.orchestration.container import AgentContainer
+
+
+def _measure(fn, iterations: int) -> list:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def _report(label: str, durations: list) -> None:
+    ordered = sorted(durations)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<32} mean={statistics.mean(durations):8.3f} ms  p95={p95:8.3f} ms")
+
+
+async def main(iterations: int) -> None:
+    print(f"Per-request orchestrator overhead ({iterations} iterations)\n")
+
+    before = _measure(LangGraphOrchestrator, iterations)
+    _report("before: LangGraphOrchestrator()", before)
+
+    container = AgentContainer()
+    await container.startup()
+    after = _measure(lambda: container.orchestrator, iterations)
+    _report("after: agent_container", after)
+    await container.shutdown()
+
+    speedup = statistics.mean(before) / max(statistics.mean(after), 1e-9)
+    print(f"\nSpeedup: x{speedup:,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
@@ -0,0 +1,129 @@
+"""
+Benchmark: backend NumPy en mémoire vs pgvector (HNSW), mêmes données.
+
+Mêmes vecteurs synthétiques que benchmark_vector_search.py. Mesure pour le
+NumpyVectorIndex: chargement, recherche globale et filtrée par user_id
+(float32 et float16), rechargement depuis les .npy mappés en mémoire; puis
+la même recherche sur pgvector si une base est disponible (DATABASE_URL).
+
+Usage:
+    python scripts/benchmark_vector_backends.py [--rows 20000] [--dim 1536] [--queries 50] [--k 10] [--skip-pgvector]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import numpy as np
+
+from benchmark_vector_search import _exact_top_k, _literal, _report, _run, _synthetic_vectors
+
+from app.config.settings import settings
+from app.core.memory.vector_backends import NumpyVectorIndex
+
+
+def _numpy_search(index: NumpyVectorIndex, queries, k: int, users=None) -> tuple:
+    latencies, results = [], []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        found = index.search(query, k, user_id=int(users[i]) if users is not None else None)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({row_id for row_id, _ in found})
+    return latencies, results
+
+
+def bench_numpy(args, vectors, user_ids, queries, query_users, truths, filtered_truths) -> None:
+    ids = list(range(1, args.rows + 1))  # mêmes ids que la table SERIAL
+    for dtype in ("float32", "float16"):
+        index = NumpyVectorIndex(args.dim, dtype)
+        start = time.perf_counter()
+        index.add(ids, user_ids.tolist(), vectors)
+        print(f"numpy {dtype}: load {time.perf_counter() - start:.2f} s, {index.vectors[:index.count].nbytes / 2**20:.0f} MiB")
+
+        _report(f"numpy {dtype}: exact top-k", *_numpy_search(index, queries, args.k), truths)
+        _report(f"numpy {dtype}: user_id mask", *_numpy_search(index, queries, args.k, query_users), filtered_truths)
+
+        with tempfile.TemporaryDirectory() as path:
+            index.save(path)
+            reloaded = NumpyVectorIndex(args.dim, dtype)
+            start = time.perf_counter()
+            reloaded.load(path)
+            print(f"numpy {dtype}: mmap reload {(time.perf_counter() - start) * 1000:.1f} ms")
+            _report(f"numpy {dtype}: top-k on memmap", *_numpy_search(reloaded, queries, args.k), truths)
+        print()
+
+
+async def bench_pgvector(args, vectors, user_ids, queries, query_users, truths, filtered_truths) -> None:
+    import asyncpg
+
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        await conn.execute(f"""
+            CREATE TEMP TABLE bench_embeddings (
+                id SERIAL PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                embedding vector({args.dim}) NOT NULL
+            )
+        """)
+        await conn.copy_records_to_table(
+            "bench_embeddings",
+            records=[(int(u), _literal(v)) for u, v in zip(user_ids, vectors)],
+            columns=["user_id", "embedding"]
+        )
+        await conn.execute("CREATE INDEX ON bench_embeddings (user_id)")
+        await conn.execute(
+            f"CREATE INDEX ON bench_embeddings USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {settings.VECTOR_HNSW_M}, ef_construction = {settings.VECTOR_HNSW_EF_CONSTRUCTION})"
+        )
+        await conn.execute("ANALYZE bench_embeddings")
+
+        literals = [_literal(q) for q in queries]
+        setup = f"SET LOCAL hnsw.ef_search = {max(settings.VECTOR_HNSW_EF_SEARCH, args.k)}"
+        sql = """
+            SELECT id FROM bench_embeddings
+            {where}
+            ORDER BY embedding <=> $1::vector
+            LIMIT $2
+        """
+        latencies, results = await _run(conn, sql.format(where=""), literals, lambda i, q: (q, args.k), setup=setup)
+        _report("pgvector HNSW: top-k", latencies, results, truths)
+        latencies, results = await _run(
+            conn, sql.format(where="WHERE user_id = $3"), literals,
+            lambda i, q: (q, args.k, int(query_users[i])), setup=setup
+        )
+        _report("pgvector HNSW: user_id pre-filter", latencies, results, filtered_truths)
+    finally:
+        await conn.close()
+
+
+async def main(args) -> None:
+    rng = np.random.default_rng(42)
+    vectors, user_ids = _synthetic_vectors(args.rows, args.dim, args.users, rng)
+    queries = vectors[rng.integers(0, args.rows, size=args.queries)] + 0.1 * rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    query_users = rng.integers(1, args.users + 1, size=args.queries)
+
+    truths = [_exact_top_k(vectors, q, args.k) for q in queries]
+    filtered_truths = [
+        _exact_top_k(vectors, q, min(args.k, int((user_ids == u).sum())), mask=user_ids == u)
+        for q, u in zip(queries, query_users)
+    ]
+
+    print(f"{args.rows:,d} vectors ({args.dim} dims), {args.queries} queries, k={args.k}\n")
+    bench_numpy(args, vectors, user_ids, queries, query_users, truths, filtered_truths)
+    if not args.skip_pgvector:
+        await bench_pgvector(args, vectors, user_ids, queries, query_users, truths, filtered_truths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--skip-pgvector", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,171 @@
+"""
+Benchmark: rappel et latence de la recherche vectorielle pgvector (HNSW).
+
+Vecteurs synthétiques (clusters + bruit, normalisés) chargés dans une table
+temporaire, vérité terrain calculée en NumPy (cosinus exact), puis:
+    - avant: seuil dans le WHERE, scan séquentiel (index désactivé)
+    - après: ORDER BY distance LIMIT k sur l'index HNSW, pour plusieurs ef_search
+    - après, pré-filtré sur user_id
+
+Nécessite un PostgreSQL avec l'extension vector (DATABASE_URL).
+
+Usage:
+    python scripts/benchmark_vector_search.py [--rows 20000] [--dim 1536] [--queries 50] [--k 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+
+from app.config.settings import settings
+
+
+def _synthetic_vectors(rows: int, dim: int, users: int, rng: np.random.Generator):
+    """Vecteurs groupés en clusters (proche des embeddings de briefs par secteur)."""
+    centers = rng.normal(size=(64, dim)).astype(np.float32)
+    assignment = rng.integers(0, len(centers), size=rows)
+    vectors = centers[assignment] + 0.35 * rng.normal(size=(rows, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    user_ids = rng.integers(1, users + 1, size=rows)
+    return vectors, user_ids
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+def _exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int, mask=None) -> set:
+    scores = vectors @ query
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    top = np.argpartition(-scores, k)[:k]
+    return {int(i) + 1 for i in top}  # ids SERIAL à partir de 1
+
+
+async def _run(conn, sql: str, queries, params_for, setup: str = "") -> tuple:
+    latencies, results = [], []
+    for index, query in enumerate(queries):
+        async with conn.transaction():
+            if setup:
+                await conn.execute(setup)
+            start = time.perf_counter()
+            rows = await conn.fetch(sql, *params_for(index, query))
+            latencies.append((time.perf_counter() - start) * 1000)
+        results.append({row["id"] for row in rows})
+    return latencies, results
+
+
+def _report(label: str, latencies, results, truths) -> None:
+    recall = statistics.mean(len(found & truth) / len(truth) for found, truth in zip(results, truths))
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<34} recall@k={recall:6.1%}  p50={statistics.median(latencies):8.2f} ms  p95={p95:8.2f} ms")
+
+
+async def main(args) -> None:
+    rng = np.random.default_rng(42)
+    vectors, user_ids = _synthetic_vectors(args.rows, args.dim, args.users, rng)
+    queries = vectors[rng.integers(0, args.rows, size=args.queries)] + 0.1 * rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    query_users = rng.integers(1, args.users + 1, size=args.queries)
+
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        await conn.execute(f"""
+            CREATE TEMP TABLE bench_embeddings (
+                id SERIAL PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                embedding vector({args.dim}) NOT NULL
+            )
+        """)
+        print(f"Loading {args.rows:,d} vectors ({args.dim} dims)...")
+        await conn.copy_records_to_table(
+            "bench_embeddings",
+            records=[(int(u), _literal(v)) for u, v in zip(user_ids, vectors)],
+            columns=["user_id", "embedding"]
+        )
+        await conn.execute("CREATE INDEX ON bench_embeddings (user_id)")
+
+        start = time.perf_counter()
+        await conn.execute(
+            f"CREATE INDEX ON bench_embeddings USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {args.m}, ef_construction = {args.ef_construction})"
+        )
+        print(f"HNSW build (m={args.m}, ef_construction={args.ef_construction}): {time.perf_counter() - start:.1f} s\n")
+        await conn.execute("ANALYZE bench_embeddings")
+
+        truths = [_exact_top_k(vectors, q, args.k) for q in queries]
+        literals = [_literal(q) for q in queries]
+
+        before_sql = """
+            SELECT id FROM bench_embeddings
+            WHERE 1 - (embedding <=> $1::vector) >= $2
+            ORDER BY embedding <=> $1::vector
+            LIMIT $3
+        """
+        latencies, results = await _run(
+            conn, before_sql, literals, lambda i, q: (q, -1.0, args.k),
+            setup="SET LOCAL enable_indexscan = off"
+        )
+        _report("before: threshold in WHERE, seqscan", latencies, results, truths)
+
+        after_sql = """
+            SELECT id FROM (
+                SELECT id, 1 - (embedding <=> $1::vector) AS similarity
+                FROM bench_embeddings
+                ORDER BY embedding <=> $1::vector
+                LIMIT $3
+            ) AS nearest
+            WHERE similarity >= $2
+        """
+        for ef_search in (16, 40, 64, 100, 200):
+            latencies, results = await _run(
+                conn, after_sql, literals, lambda i, q: (q, -1.0, args.k),
+                setup=f"SET LOCAL hnsw.ef_search = {max(ef_search, args.k)}"
+            )
+            _report(f"after: HNSW ef_search={ef_search}", latencies, results, truths)
+
+        filtered_sql = """
+            SELECT id FROM (
+                SELECT id, 1 - (embedding <=> $1::vector) AS similarity
+                FROM bench_embeddings
+                WHERE user_id = $4
+                ORDER BY embedding <=> $1::vector
+                LIMIT $3
+            ) AS nearest
+            WHERE similarity >= $2
+        """
+        filtered_truths = [
+            _exact_top_k(vectors, q, min(args.k, int((user_ids == u).sum())), mask=user_ids == u)
+            for q, u in zip(queries, query_users)
+        ]
+        latencies, results = await _run(
+            conn, filtered_sql, literals, lambda i, q: (q, -1.0, args.k, int(query_users[i])),
+            setup=f"SET LOCAL hnsw.ef_search = {settings.VECTOR_HNSW_EF_SEARCH}"
+        )
+        _report(f"after: user_id pre-filter ({args.users} users)", latencies, results, filtered_truths)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--m", type=int, default=settings.VECTOR_HNSW_M)
+    parser.add_argument("--ef-construction", type=int, default=settings.VECTOR_HNSW_EF_CONSTRUCTION)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Benchmark: taille et coût CPU des documents de session Redis VFS.
+
+Avant: json.dumps(default=str), texte non compressé.
+Après: VFSCodec (orjson/msgpack, compression zstd/lz4 au-delà d'un seuil).
+
+Usage:
+    python scripts/benchmark_vfs_codec.py [iterations]
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire racine au path pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.integrations.vfs_codec import LZ4_AVAILABLE, VFSCodec
+
+
+def _build_brief() -> dict:
+    """Brief complet: 4 pages x 3 langues + recherche marché."""
+    rng = random.Random(42)
+    words = (
+        "commerce quartier Dakar numérique client paiement mobile livraison boutique "
+        "service qualité confiance équipe projet solution marché croissance local"
+    ).split()
+
+    def paragraph(length: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(length)).capitalize() + "."
+
+    content = {
+        lang: {
+            page: {
+                f"section_{i}": {
+                    "title": paragraph(6),
+                    "body": paragraph(80),
+                    "cta": {"label": paragraph(2), "href": f"/{page}#{i}"},
+                }
+                for i in range(6)
+            }
+            for page in ("homepage", "about", "services", "contact")
+        }
+        for lang in ("fr", "en", "wo")
+    }
+    return {
+        "user_id": 42,
+        "brief_id": "brief_42_20250115",
+        "created_at": datetime(2025, 1, 15, 10, 30),
+        "business_brief": {
+            "business_name": "Teranga Digital",
+            "industry_sector": "Services numériques",
+            "location": {"city": "Dakar", "country": "Sénégal"},
+            "vision": "Rendre le numérique accessible à chaque commerce de quartier.",
+        },
+        "market_research": {
+            "competitors": [
+                {"name": f"Concurrent {i}", "url": f"https://example.sn/{i}", "summary": paragraph(40)}
+                for i in range(15)
+            ],
+            "trends": ["Mobile money", "Commerce sur WhatsApp", "Sites vitrines légers"] * 5,
+        },
+        "content": content,
+        "logo": {"url": "https://cdn.example.com/logo.png", "prompt": paragraph(30)},
+    }
+
+
+def _measure(fn, iterations: int) -> float:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(durations)
+
+
+def main(iterations: int) -> None:
+    brief = _build_brief()
+    print(f"Redis VFS session document ({iterations} iterations)\n")
+
+    codecs = [("before: json.dumps", VFSCodec("json", "none"))]
+    compressions = ["none", "zstd"] + (["lz4"] if LZ4_AVAILABLE else [])
+    for serializer in ("orjson", "msgpack"):
+        for compression in compressions:
+            codecs.append((f"{serializer} + {compression}", VFSCodec(serializer, compression)))
+
+    baseline = len(json.dumps(brief, default=str).encode())
+    for label, codec in codecs:
+        payload = codec.encode(brief)
+        size = len(payload.encode() if isinstance(payload, str) else payload)
+        encode_ms = _measure(lambda: codec.encode(brief), iterations)
+        decode_ms = _measure(lambda: codec.decode(payload), iterations)
+        print(
+            f"{label:<22} size={size:8,d} B ({size / baseline:6.1%})  "
+            f"encode={encode_ms:7.3f} ms  decode={decode_ms:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
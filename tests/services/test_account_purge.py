@@ -0,0 +1,64 @@
+"""Tests unitaires pour la purge des données d'un compte"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.account_purge import purge_user_data
+
+DIGEST = "a" * 64
+OTHER_DIGEST = "b" * 64
+
+
+class TestPurgeUserData:
+    """Tests pour purge_user_data"""
+
+    @pytest.fixture
+    def db(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["s1"]
+        db.execute.return_value = result
+        return db
+
+    @pytest.fixture
+    def redis_fs(self):
+        redis_fs = AsyncMock()
+        redis_fs.read_site.return_value = {"pages": [{"image": f"/static/images/{DIGEST}.png"}]}
+        redis_fs.purge_user_sessions.return_value = {"sessions": 2, "sites": 1, "keys": 6}
+        redis_fs.purge_documents.return_value = 1
+        return redis_fs
+
+    @pytest.mark.asyncio
+    async def test_purges_embeddings_sessions_and_cached_images(self, db, redis_fs):
+        vector_store = AsyncMock()
+        vector_store.delete_user_embeddings.return_value = 12
+
+        stats = await purge_user_data(db, 42, redis_fs, vector_store=vector_store)
+
+        assert stats == {
+            "embeddings": 12,
+            "sessions": 2,
+            "sites": 1,
+            "keys": 6,
+            "cached_images": 1,
+            "images_released": 1,
+        }
+        redis_fs.purge_user_sessions.assert_awaited_once_with(42, ["s1"])
+        vector_store.delete_user_embeddings.assert_awaited_once_with(db, 42)
+
+        # Seules les entrées du cache qui citent ses images sont purgées
+        match, predicate = redis_fs.purge_documents.await_args.args
+        assert match == "cache/image_agent:*"
+        assert predicate({"image_url": f"https://cdn.example.com/{DIGEST}.png"})
+        assert not predicate({"image_url": f"https://cdn.example.com/{OTHER_DIGEST}.png"})
+
+    @pytest.mark.asyncio
+    async def test_skips_image_cache_scan_without_sites(self, db, redis_fs):
+        redis_fs.read_site.return_value = None
+        vector_store = AsyncMock()
+        vector_store.delete_user_embeddings.return_value = 0
+
+        stats = await purge_user_data(db, 42, redis_fs, vector_store=vector_store)
+
+        assert stats["cached_images"] == 0
+        redis_fs.purge_documents.assert_not_awaited()
@@ -281,6 +281,42 @@ class TestBriefToSiteTransformer:
         site = SiteDefinition(**result)
         assert site.metadata.title == "Simple Business"
 
+    def test_hero_image_set_from_variants(self, transformer, sample_brief):
+        """Les variantes responsive de l'ImageAgent deviennent imageSet (srcset)"""
+        image_set = {
+            "src": "https://example.com/hero.jpg",
+            "width": 1792,
+            "height": 1024,
+            "placeholder": "data:image/webp;base64,AAAA",
+            "sources": [{"type": "image/webp", "srcset": "/static/images/a.webp 480w, /static/images/b.webp 960w"}]
+        }
+        sample_brief.content_generation["image_variants"] = {"https://example.com/hero.jpg": image_set}
+        
+        result = transformer.transform(sample_brief)
+        
+        sections = result["pages"][0]["sections"]
+        hero = next(s for s in sections if s["type"] == "hero")
+        assert hero["content"]["imageSet"] == image_set
+        services = next(s for s in sections if s["type"] == "services")
+        assert all("imageSet" not in item for item in services["content"]["services"])
+        site = SiteDefinition(**result)
+        assert site.metadata.title == "TechStartup Dakar"
+
+    def test_apply_image_variants_on_existing_site(self, transformer):
+        """Site déjà généré (repair_images): imageSet posé sur les nouvelles images, retiré des images remplacées"""
+        image_set = {"src": "/static/images/new.png", "sources": []}
+        sections = [
+            {"type": "hero", "content": {"image": "/static/images/new.png"}},
+            {"type": "services", "content": {"services": [
+                {"title": "A", "image": "/static/images/other.png", "imageSet": {"src": "/static/images/old.png"}}
+            ]}}
+        ]
+        
+        transformer.apply_image_variants(sections, {"/static/images/new.png": image_set})
+        
+        assert sections[0]["content"]["imageSet"] == image_set
+        assert "imageSet" not in sections[1]["content"]["services"][0]
+    
     # ===== TESTS SECTOR MAPPING =====
     
     def test_technology_sector_config(self, transformer, sample_brief):
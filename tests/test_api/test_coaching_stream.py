@@ -0,0 +1,158 @@
+"""
+Tests des endpoints coaching streamés (SSE)
+Routes: POST /coaching/help/stream, POST /coaching/reformulate/stream
+"""
+
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api.v1 import coaching
+from app.api.v1.dependencies import get_redis_client, get_redis_vfs
+from app.config.database import get_db
+from app.main import app
+from app.models.user import User
+from app.services.user_service import get_current_user
+
+pytestmark = pytest.mark.asyncio
+
+OWNER_ID = 7
+SESSION_ID = "session-abc"
+LONG_TEXT = "Je veux ouvrir un restaurant de cuisine sénégalaise à Dakar pour les familles"
+
+
+def _events(body: str):
+    """Trames SSE -> [(événement, données JSON)]"""
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+async def _deltas(*chunks, error=None):
+    for chunk in chunks:
+        yield chunk
+    if error:
+        raise error
+
+
+@pytest.fixture
+def redis_fs():
+    fs = AsyncMock()
+    fs.read_session_fields.return_value = {"user_id": OWNER_ID, "session_id": SESSION_ID, "id": 21, "current_step": "vision"}
+    return fs
+
+
+@pytest.fixture
+def llm_service():
+    service = MagicMock()
+    with patch.object(coaching, "CoachingLLMService", return_value=service), \
+         patch.object(coaching, "_build_brief_from_coaching_steps", AsyncMock(return_value={"industry_sector": "restaurant"})):
+        yield service
+
+
+@pytest.fixture
+async def api_client(redis_fs):
+    """Client HTTP sur l'app, utilisateur, DB et Redis remplacés"""
+    async def override_get_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=OWNER_ID, email="owner@example.com")
+    app.dependency_overrides[get_redis_client] = lambda: AsyncMock()
+    app.dependency_overrides[get_redis_vfs] = lambda: redis_fs
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    for dependency in (get_db, get_current_user, get_redis_client, get_redis_vfs):
+        app.dependency_overrides.pop(dependency, None)
+
+
+class TestCoachingHelpStream:
+    """POST /coaching/help/stream"""
+
+    async def test_deltas_then_done_event(self, api_client, llm_service):
+        llm_service.socratic_help_stream.return_value = _deltas("Qui sont ", "vos clients ?")
+
+        response = await api_client.post("/api/v1/coaching/help/stream", json={"session_id": SESSION_ID})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.endswith("\n\n")
+        events = _events(response.text)
+        assert events == [
+            ("delta", {"text": "Qui sont "}),
+            ("delta", {"text": "vos clients ?"}),
+            ("done", {"text": "Qui sont vos clients ?", "session_id": SESSION_ID, "current_step": "vision"})
+        ]
+        assert llm_service.socratic_help_stream.call_args.kwargs["sector"] == "restaurant"
+
+    async def test_session_not_found(self, api_client, llm_service, redis_fs):
+        redis_fs.read_session_fields.return_value = None
+
+        response = await api_client.post("/api/v1/coaching/help/stream", json={"session_id": "unknown"})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Session non trouvée"
+        llm_service.socratic_help_stream.assert_not_called()
+
+    async def test_session_of_other_user_forbidden(self, api_client, llm_service, redis_fs):
+        redis_fs.read_session_fields.return_value["user_id"] = OWNER_ID + 1
+
+        response = await api_client.post("/api/v1/coaching/help/stream", json={"session_id": SESSION_ID})
+
+        assert response.status_code == 403
+
+    async def test_provider_failure_mid_stream_ends_with_error_event(self, api_client, llm_service):
+        llm_service.socratic_help_stream.return_value = _deltas("Qui sont ", error=ConnectionError("provider reset"))
+
+        response = await api_client.post("/api/v1/coaching/help/stream", json={"session_id": SESSION_ID})
+
+        assert response.status_code == 200
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["delta", "error"]
+        assert "provider reset" not in events[-1][1]["detail"]
+
+
+class TestReformulateStream:
+    """POST /coaching/reformulate/stream"""
+
+    async def test_deltas_then_done_event(self, api_client, llm_service):
+        llm_service.reformulate_stream.return_value = _deltas("Un restaurant ", "familial à Dakar.")
+
+        response = await api_client.post(
+            "/api/v1/coaching/reformulate/stream",
+            json={"session_id": SESSION_ID, "text": LONG_TEXT, "target_step": "mission"}
+        )
+
+        assert response.status_code == 200
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["delta", "delta", "done"]
+        assert events[-1][1] == {"text": "Un restaurant familial à Dakar.", "original_text": LONG_TEXT}
+        llm_service.reformulate_stream.assert_called_once_with(text=LONG_TEXT, step="mission")
+
+    async def test_short_text_returned_unchanged_without_llm(self, api_client, llm_service):
+        response = await api_client.post("/api/v1/coaching/reformulate/stream", json={"session_id": SESSION_ID, "text": "Un resto"})
+
+        assert _events(response.text) == [
+            ("delta", {"text": "Un resto"}),
+            ("done", {"text": "Un resto", "original_text": "Un resto", "is_better": False})
+        ]
+        llm_service.reformulate_stream.assert_not_called()
+
+    async def test_provider_failure_mid_stream_ends_with_error_event(self, api_client, llm_service):
+        llm_service.reformulate_stream.return_value = _deltas("Un restaurant ", error=TimeoutError("timeout"))
+
+        response = await api_client.post(
+            "/api/v1/coaching/reformulate/stream",
+            json={"session_id": SESSION_ID, "text": LONG_TEXT}
+        )
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["delta", "error"]
+        assert events[-1][1] == {"detail": "Génération interrompue, veuillez réessayer."}
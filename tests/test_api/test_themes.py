@@ -0,0 +1,233 @@
+"""
+Tests des endpoints thèmes - génération de site asynchrone (JobQueue)
+Routes: POST /themes/select (202), GET /themes/jobs/{id}, GET /themes/jobs/{id}/events (SSE)
+"""
+
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api.v1 import themes
+from app.config.database import get_db
+from app.core.jobs import JobQueue, JobStatus, JobStore
+from app.main import app
+from app.models.coaching import BusinessBrief, CoachingSession, SessionStatusEnum
+from app.models.theme import Theme
+from app.models.user import User
+from app.services.user_service import get_current_user
+from tests.test_core.test_job_queue import FakeRedis
+
+pytestmark = pytest.mark.asyncio
+
+OWNER_ID = 7
+
+
+def _scalar_result(value):
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = value
+    return result
+
+
+@pytest.fixture
+def brief():
+    return BusinessBrief(
+        id=11,
+        coaching_session_id=21,
+        business_name="Chez Tante Awa",
+        vision="Le meilleur thiéboudienne de Dakar",
+        mission="Cuisine familiale",
+        target_audience="Familles dakaroises",
+        differentiation="Recettes de grand-mère",
+        value_proposition="Authentique et généreux",
+        sector="restaurant",
+        location={"country": "Sénégal", "city": "Dakar"}
+    )
+
+
+@pytest.fixture
+def theme():
+    return Theme(id=31, name="Savor Pro", slug="savor-pro", category="restaurant", features={"menu": True})
+
+
+@pytest.fixture
+def coaching_session():
+    return CoachingSession(id=21, user_id=OWNER_ID, session_id="session-abc", status=SessionStatusEnum.IN_PROGRESS)
+
+
+@pytest.fixture
+def db():
+    return AsyncMock()
+
+
+@pytest.fixture
+async def queue():
+    """File de jobs sur Redis en mémoire, handler factice (pas d'orchestration)"""
+    job_queue = JobQueue(store=JobStore(redis_client=FakeRedis(), ttl=60), concurrency=1)
+    job_queue.register_handler(themes.SITE_GENERATION_JOB, AsyncMock(return_value={"status": "GENERATION_COMPLETED"}))
+    with patch.object(themes, "job_queue", job_queue):
+        yield job_queue
+    await job_queue.stop()
+
+
+@pytest.fixture
+async def api_client(db, queue):
+    """Client HTTP sur l'app, utilisateur et session DB remplacés"""
+    async def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=OWNER_ID, email="owner@example.com")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+class TestThemeSelectEndpoint:
+    """POST /themes/select: job soumis, réponse immédiate"""
+
+    async def test_select_returns_202_with_job_urls(self, api_client, db, queue, brief, theme, coaching_session):
+        db.execute.side_effect = [_scalar_result(brief), _scalar_result(theme), _scalar_result(coaching_session)]
+
+        response = await api_client.post("/api/v1/themes/select", json={"brief_id": brief.id, "theme_id": theme.id})
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "GENERATION_QUEUED"
+        assert data["session_id"] == "session-abc"
+        assert data["status_url"] == f"/api/v1/themes/jobs/{data['job_id']}"
+        assert data["events_url"] == f"/api/v1/themes/jobs/{data['job_id']}/events"
+
+        job = await queue.store.get(data["job_id"])
+        assert job["user_id"] == OWNER_ID
+        assert job["payload"]["coaching_session_pk"] == coaching_session.id
+        assert job["payload"]["theme_id"] == theme.id
+        assert job["payload"]["business_brief"]["business_name"] == "Chez Tante Awa"
+
+    async def test_select_brief_of_other_user_is_404(self, api_client, db, queue, theme):
+        """Le brief est filtré par propriétaire: introuvable pour un autre utilisateur"""
+        db.execute.side_effect = [_scalar_result(None), _scalar_result(theme)]
+
+        response = await api_client.post("/api/v1/themes/select", json={"brief_id": 11, "theme_id": theme.id})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Brief or Theme not found"
+
+    async def test_select_without_coaching_session_is_404(self, api_client, db, queue, brief, theme):
+        db.execute.side_effect = [_scalar_result(brief), _scalar_result(theme), _scalar_result(None)]
+
+        response = await api_client.post("/api/v1/themes/select", json={"brief_id": brief.id, "theme_id": theme.id})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Coaching session not found"
+
+
+class TestGenerationJobEndpoints:
+    """GET /themes/jobs/{id} (polling) et /events (SSE), propriétaire uniquement"""
+
+    async def test_poll_job_hides_payload(self, api_client, queue):
+        job = await queue.store.create(themes.SITE_GENERATION_JOB, OWNER_ID, {"session_id": "session-abc"})
+        await queue.store.report_progress(job["job_id"], "research")
+
+        response = await api_client.get(f"/api/v1/themes/jobs/{job['job_id']}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "queued"
+        assert data["current_node"] == "research"
+        assert [entry["node"] for entry in data["progress"]] == ["research"]
+        assert "payload" not in data
+
+    @pytest.mark.parametrize("user_id, job_type", [(OWNER_ID + 1, themes.SITE_GENERATION_JOB), (OWNER_ID, "other_job")])
+    async def test_poll_job_of_other_user_or_type_is_404(self, api_client, queue, user_id, job_type):
+        job = await queue.store.create(job_type, user_id, {})
+
+        response = await api_client.get(f"/api/v1/themes/jobs/{job['job_id']}")
+
+        assert response.status_code == 404
+
+    async def test_poll_unknown_job_is_404(self, api_client, queue):
+        assert (await api_client.get("/api/v1/themes/jobs/unknown")).status_code == 404
+        assert (await api_client.get("/api/v1/themes/jobs/unknown/events")).status_code == 404
+
+    async def test_event_stream_until_terminal_status(self, api_client, queue):
+        job = await queue.store.create(themes.SITE_GENERATION_JOB, OWNER_ID, {"session_id": "session-abc"})
+
+        async def worker():
+            await asyncio.sleep(0.05)
+            await queue.store.report_progress(job["job_id"], "content", {"sections": 4})
+            await queue.store.set_status(job["job_id"], JobStatus.COMPLETED, result={"session_id": "session-abc"})
+
+        producer = asyncio.create_task(worker())
+        response = await api_client.get(f"/api/v1/themes/jobs/{job['job_id']}/events")
+        await producer
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.text.split("\n\n") if frame]
+        events = [(frame.split("\n")[0], json.loads(frame.split("\n")[1][len("data: "):])) for frame in frames]
+        assert [name for name, _ in events] == ["event: snapshot", "event: progress", "event: status"]
+        assert "payload" not in events[0][1]
+        assert events[1][1]["node"] == "content"
+        assert events[-1][1]["status"] == "completed"
+
+
+class TestRunSiteGenerationJob:
+    """Handler exécuté par le worker: orchestration, SiteDefinition, session terminée"""
+
+    def _session_factory(self, objects):
+        db = AsyncMock()
+        db.get.side_effect = lambda model, pk: objects.get(model)
+        factory = MagicMock()
+        factory.return_value.__aenter__.return_value = db
+        return factory, db
+
+    def _job(self):
+        return {
+            "user_id": OWNER_ID,
+            "payload": {
+                "session_id": "session-abc",
+                "coaching_session_pk": 21,
+                "brief_id": 11,
+                "theme_id": 31,
+                "business_brief": {"business_name": "Chez Tante Awa", "industry_sector": "restaurant"}
+            }
+        }
+
+    async def test_generates_and_saves_site(self, brief, theme, coaching_session):
+        factory, db = self._session_factory({BusinessBrief: brief, Theme: theme, CoachingSession: coaching_session})
+        orchestrator = AsyncMock()
+        orchestrator.run.return_value = {"business_brief": {"business_name": "Chez Tante Awa"}, "content_generation": {}}
+        redis_fs = AsyncMock()
+        report_progress = AsyncMock()
+
+        with patch.object(themes, "AsyncSessionLocal", factory), \
+             patch.object(themes, "agent_container", MagicMock(orchestrator=orchestrator)), \
+             patch.object(themes, "RedisVirtualFileSystem", return_value=redis_fs):
+            result = await themes.run_site_generation_job(self._job(), report_progress)
+
+        assert result["status"] == "GENERATION_COMPLETED"
+        assert result["site_data"]["metadata"]["title"] == "Chez Tante Awa"
+        assert orchestrator.run.await_args.kwargs["progress_callback"] is report_progress
+        assert orchestrator.run.await_args.args[0]["selected_theme_slug"] == "savor-pro"
+        report_progress.assert_awaited_with("transform", {})
+        redis_fs.write_site.assert_awaited_once()
+        assert redis_fs.write_site.await_args.args[0] == "session-abc"
+        assert coaching_session.status == SessionStatusEnum.COMPLETED
+        db.commit.assert_awaited_once()
+
+    async def test_missing_rows_fail_the_job(self, brief, theme):
+        """Brief, thème ou session supprimés entre la soumission et l'exécution"""
+        factory, db = self._session_factory({BusinessBrief: brief, Theme: theme})
+        orchestrator = AsyncMock()
+
+        with patch.object(themes, "AsyncSessionLocal", factory), \
+             patch.object(themes, "agent_container", MagicMock(orchestrator=orchestrator)):
+            with pytest.raises(ValueError, match="no longer exists"):
+                await themes.run_site_generation_job(self._job(), AsyncMock())
+
+        orchestrator.run.assert_not_awaited()
+        db.commit.assert_not_awaited()
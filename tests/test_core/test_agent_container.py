@@ -0,0 +1,59 @@
+"""
+Tests AgentContainer - orchestrateur singleton à portée application
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.orchestration.container import AgentContainer
+
+
+class TestAgentContainer:
+    """Validation du cycle de vie du conteneur d'agents"""
+
+    @patch("app.core.orchestration.container.LangGraphOrchestrator")
+    async def test_startup_builds_orchestrator_once(self, mock_orchestrator_cls):
+        """L'orchestrateur est construit une fois puis réutilisé"""
+        container = AgentContainer()
+
+        await container.startup()
+        await container.startup()
+        first = container.orchestrator
+        second = container.orchestrator
+
+        assert first is second
+        mock_orchestrator_cls.assert_called_once_with()
+
+    @patch("app.core.orchestration.container.LangGraphOrchestrator")
+    async def test_lazy_build_without_startup(self, mock_orchestrator_cls):
+        """Hors lifespan, l'orchestrateur est construit à la première demande"""
+        container = AgentContainer()
+
+        assert container.is_started is False
+        container.orchestrator
+        container.orchestrator
+
+        assert container.is_started is True
+        mock_orchestrator_cls.assert_called_once_with()
+
+    @patch("app.core.orchestration.container.LangGraphOrchestrator")
+    async def test_shutdown_releases_agent_resources(self, mock_orchestrator_cls):
+        """shutdown ferme les connexions Redis des agents et réinitialise le conteneur"""
+        orchestrator = MagicMock()
+        orchestrator.logo_agent.redis_fs.close = AsyncMock()
+        mock_orchestrator_cls.return_value = orchestrator
+        container = AgentContainer()
+        await container.startup()
+
+        await container.shutdown()
+
+        orchestrator.logo_agent.redis_fs.close.assert_awaited_once()
+        assert container.is_started is False
+
+    async def test_dependency_returns_shared_instance(self):
+        """get_orchestrator renvoie l'instance du conteneur global"""
+        from app.api.v1 import dependencies
+
+        sentinel = MagicMock()
+        with patch.object(dependencies.agent_container, "_orchestrator", sentinel):
+            assert dependencies.get_orchestrator() is sentinel
+            assert dependencies.get_orchestrator() is sentinel
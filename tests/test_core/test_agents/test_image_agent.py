@@ -0,0 +1,80 @@
+"""
+Tests ImageAgent - persistance des images (téléchargement en streaming, image store)
+"""
+
+import hashlib
+import os
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.core.agents.image import ImageAgent
+from app.core.integrations.image_store import ImageStore, LocalImageBackend
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _patch_transport(handler):
+    """Remplace le client httpx de repli par un client à transport simulé"""
+    def factory(*args, **kwargs):
+        return _RealAsyncClient(*args, transport=httpx.MockTransport(handler), **kwargs)
+    return patch("app.core.integrations.http_pool.httpx.AsyncClient", side_effect=factory)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    with patch("app.core.agents.image.DALLEImageProvider"), \
+            patch("app.core.agents.image.RedisVirtualFileSystem"):
+        agent = ImageAgent()
+    agent.image_store = ImageStore(LocalImageBackend(str(tmp_path), "/static/images"))
+    return agent
+
+
+class TestDownloadAndSaveImage:
+    """Écriture par morceaux, nom = SHA-256 du contenu, nettoyage des fichiers partiels"""
+
+    async def test_streams_to_content_addressed_file(self, agent, tmp_path):
+        body = os.urandom(300_000)
+        digest = hashlib.sha256(body).hexdigest()
+        with _patch_transport(lambda request: httpx.Response(200, content=body, headers={"content-type": "image/png"})):
+            saved = await agent._download_and_save_image("https://oaidalle.example.com/img.png")
+
+        assert saved["image_url"] == f"/static/images/{digest}.png"
+        assert (tmp_path / f"{digest}.png").read_bytes() == body
+        assert os.listdir(tmp_path) == [f"{digest}.png"]
+
+    async def test_identical_bytes_stored_once(self, agent, tmp_path):
+        body = os.urandom(10_000)
+        with _patch_transport(lambda request: httpx.Response(200, content=body)):
+            first = await agent._download_and_save_image("https://oaidalle.example.com/a.png")
+            second = await agent._download_and_save_image("https://oaidalle.example.com/b.png")
+
+        assert first["image_url"] == second["image_url"]
+        assert len(os.listdir(tmp_path)) == 1
+
+    async def test_error_status_writes_nothing(self, agent, tmp_path):
+        with _patch_transport(lambda request: httpx.Response(403)):
+            saved = await agent._download_and_save_image("https://oaidalle.example.com/img.png")
+
+        assert saved is None
+        assert os.listdir(tmp_path) == []
+
+    async def test_oversized_download_discarded(self, agent, tmp_path):
+        with _patch_transport(lambda request: httpx.Response(200, content=b"x" * 4096)), \
+                patch("app.core.agents.image.settings.IMAGE_DOWNLOAD_MAX_BYTES", 1024), \
+                patch("app.core.agents.image.settings.IMAGE_DOWNLOAD_CHUNK_SIZE", 512):
+            saved = await agent._download_and_save_image("https://oaidalle.example.com/img.png")
+
+        assert saved is None
+        assert os.listdir(tmp_path) == []
+
+    async def test_interrupted_download_leaves_no_partial(self, agent, tmp_path):
+        def handler(request):
+            raise httpx.ReadError("connection reset")
+
+        with _patch_transport(handler):
+            saved = await agent._download_and_save_image("https://oaidalle.example.com/img.png")
+
+        assert saved is None
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,150 @@
+"""
+Tests JobQueue / JobStore - génération asynchrone avec progression Redis
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.jobs import JobQueue, JobStatus, JobStore
+
+
+class FakePubSub:
+    """PubSub Redis minimal en mémoire"""
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.channels = set()
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+        self.redis.subscribers.setdefault(channel, []).append(self)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+        self.redis.subscribers.get(channel, []).remove(self)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    """Client Redis minimal en mémoire (get/set/publish/pubsub)"""
+
+    def __init__(self):
+        self.storage = {}
+        self.subscribers = {}
+
+    async def get(self, key):
+        return self.storage.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.storage[key] = value
+        return True
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers.get(channel, []):
+            subscriber.messages.put_nowait({"type": "message", "data": message})
+        return len(self.subscribers.get(channel, []))
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+@pytest.fixture
+async def queue():
+    """JobQueue avec worker local et Redis en mémoire"""
+    job_queue = JobQueue(store=JobStore(redis_client=FakeRedis(), ttl=60), concurrency=1)
+    yield job_queue
+    await job_queue.stop()
+
+
+class TestJobQueue:
+    """Cycle de vie des jobs exécutés par le worker local"""
+
+    async def test_job_completes_with_progress(self, queue):
+        """Le handler s'exécute, publie sa progression et stocke son résultat"""
+        async def handler(job, report_progress):
+            for node in ("research", "content", "logo"):
+                await report_progress(node, {"fallback_mode": False})
+            return {"site": job["payload"]["name"]}
+
+        queue.register_handler("site", handler)
+        job = await queue.enqueue("site", user_id=7, payload={"name": "Teranga"})
+        assert job["status"] == JobStatus.QUEUED.value
+
+        await queue.join()
+        stored = await queue.store.get(job["job_id"])
+
+        assert stored["status"] == JobStatus.COMPLETED.value
+        assert stored["result"] == {"site": "Teranga"}
+        assert [entry["node"] for entry in stored["progress"]] == ["research", "content", "logo"]
+        assert stored["current_node"] == "logo"
+        assert stored["user_id"] == 7
+
+    async def test_job_failure_is_recorded(self, queue):
+        """Une exception du handler passe le job en FAILED avec l'erreur"""
+        async def handler(job, report_progress):
+            raise RuntimeError("Orchestration impossible")
+
+        queue.register_handler("site", handler)
+        job = await queue.enqueue("site", user_id=7, payload={})
+        await queue.join()
+
+        stored = await queue.store.get(job["job_id"])
+        assert stored["status"] == JobStatus.FAILED.value
+        assert stored["error"] == "Orchestration impossible"
+
+    async def test_unknown_job_type_rejected(self, queue):
+        """Soumettre un type sans handler lève ValueError"""
+        with pytest.raises(ValueError):
+            await queue.enqueue("unknown", user_id=1, payload={})
+
+    async def test_stream_yields_snapshot_progress_and_terminal_status(self, queue):
+        """Le flux d'événements (SSE) suit le job jusqu'à son statut terminal"""
+        release = asyncio.Event()
+
+        async def handler(job, report_progress):
+            await release.wait()
+            await report_progress("research", {})
+            return {"ok": True}
+
+        queue.register_handler("site", handler)
+        job = await queue.enqueue("site", user_id=7, payload={})
+
+        events = []
+
+        async def consume():
+            async for event in queue.store.stream(job["job_id"], heartbeat=5):
+                events.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.wait_for(consumer, timeout=5)
+
+        assert events[0]["event"] == "snapshot"
+        progress = [e for e in events if e["event"] == "progress"]
+        assert progress[0]["node"] == "research"
+        assert events[-1]["status"] == JobStatus.COMPLETED.value
+
+    async def test_stream_of_finished_job_returns_snapshot_only(self, queue):
+        """Un job déjà terminé produit uniquement son instantané"""
+        async def handler(job, report_progress):
+            return {"ok": True}
+
+        queue.register_handler("site", handler)
+        job = await queue.enqueue("site", user_id=7, payload={})
+        await queue.join()
+
+        events = [event async for event in queue.store.stream(job["job_id"])]
+
+        assert len(events) == 1
+        assert events[0]["status"] == JobStatus.COMPLETED.value
@@ -0,0 +1,129 @@
+"""
+Tests LangGraphOrchestrator - modes d'exécution parallel / sequential
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
+
+
+BRIEF = {
+    "business_name": "Teranga Digital",
+    "industry_sector": "Technologie",
+    "location": {"city": "Dakar", "country": "Sénégal"},
+    "vision": "Digitaliser les PME",
+    "mission": "Sites web accessibles",
+}
+
+
+def _build_orchestrator(execution_mode: str, delay: float, calls: list) -> LangGraphOrchestrator:
+    """Construit un orchestrateur dont chaque agent dort `delay` secondes."""
+
+    def make_agent(name: str, result: dict):
+        async def _run(*args, **kwargs):
+            calls.append((name, "start", time.perf_counter()))
+            await asyncio.sleep(delay)
+            calls.append((name, "end", time.perf_counter()))
+            return result
+        return _run
+
+    with patch("app.core.orchestration.langgraph_orchestrator.ResearchSubAgent"), \
+         patch("app.core.orchestration.langgraph_orchestrator.ContentSubAgent"), \
+         patch("app.core.orchestration.langgraph_orchestrator.LogoAgent"), \
+         patch("app.core.orchestration.langgraph_orchestrator.SeoAgent"), \
+         patch("app.core.orchestration.langgraph_orchestrator.TemplateAgent"):
+        orchestrator = LangGraphOrchestrator(execution_mode=execution_mode)
+
+    orchestrator.research_agent = MagicMock(analyze_market=make_agent("research", {"main_competitors": []}))
+    orchestrator.content_agent = MagicMock(generate_website_content=make_agent("content", {"homepage": {}}))
+    orchestrator.logo_agent = MagicMock(run=make_agent("logo", {"logo_url": "https://x/logo.png"}))
+    orchestrator.seo_agent = MagicMock(run=make_agent("seo", {"primary_keywords": ["tech"]}))
+    orchestrator.template_agent = MagicMock(run=make_agent("template", {"template": "default"}))
+    return orchestrator
+
+
+class TestLangGraphOrchestratorModes:
+    """Validation du graphe à dépendances et de la jointure finale"""
+
+    async def test_parallel_mode_wall_time_is_longest_branch(self):
+        """En mode parallel, la durée totale ≈ branche research -> content (2 x delay)"""
+        calls = []
+        orchestrator = _build_orchestrator("parallel", delay=0.2, calls=calls)
+
+        start = time.perf_counter()
+        result = await orchestrator.run({"user_id": 1, "brief_id": "b1", "business_brief": BRIEF})
+        elapsed = time.perf_counter() - start
+
+        # Séquentiel = 5 x 0.2s ; parallèle = 2 x 0.2s (research puis content)
+        assert elapsed < 0.7
+        assert result["overall_confidence"] == 1.0
+        assert result["is_ready_for_website"] is True
+
+    async def test_parallel_mode_respects_research_content_dependency(self):
+        """content démarre uniquement après la fin de research"""
+        calls = []
+        orchestrator = _build_orchestrator("parallel", delay=0.05, calls=calls)
+
+        await orchestrator.run({"user_id": 1, "brief_id": "b1", "business_brief": BRIEF})
+
+        events = {(name, kind): ts for name, kind, ts in calls}
+        assert events[("content", "start")] >= events[("research", "end")]
+        # logo / seo / template démarrent avec research, sans l'attendre
+        for name in ("logo", "seo", "template"):
+            assert events[(name, "start")] < events[("research", "end")]
+
+    async def test_sequential_mode_preserves_legacy_order(self):
+        """Le mode sequential conserve la chaîne historique"""
+        calls = []
+        orchestrator = _build_orchestrator("sequential", delay=0.01, calls=calls)
+
+        result = await orchestrator.run({"user_id": 1, "brief_id": "b1", "business_brief": BRIEF})
+
+        started = [name for name, kind, _ in calls if kind == "start"]
+        assert started == ["research", "content", "logo", "seo", "template"]
+        assert result["overall_confidence"] == 1.0
+
+    async def test_confidence_computed_after_join_with_fallbacks(self):
+        """La confiance globale tient compte des branches en fallback"""
+        calls = []
+        orchestrator = _build_orchestrator("parallel", delay=0.01, calls=calls)
+
+        async def failing_logo(*args, **kwargs):
+            raise RuntimeError("DALL-E indisponible")
+
+        orchestrator.logo_agent = MagicMock(run=failing_logo)
+
+        result = await orchestrator.run({"user_id": 1, "brief_id": "b1", "business_brief": BRIEF})
+
+        assert result["logo_creation"]["fallback_mode"] is True
+        assert result["overall_confidence"] == pytest.approx(0.8)
+        assert result["is_ready_for_website"] is True
+
+    def test_invalid_execution_mode_rejected(self):
+        """Un mode inconnu lève ValueError"""
+        with pytest.raises(ValueError):
+            _build_orchestrator("fanout", delay=0, calls=[])
+
+    async def test_progress_callback_called_per_node(self):
+        """Chaque nœud terminé est notifié au callback de progression"""
+        calls = []
+        orchestrator = _build_orchestrator("parallel", delay=0.01, calls=calls)
+        notified = []
+
+        async def on_progress(node, data):
+            notified.append((node, data))
+
+        result = await orchestrator.run(
+            {"user_id": 1, "brief_id": "b1", "business_brief": BRIEF},
+            progress_callback=on_progress
+        )
+
+        assert sorted(node for node, _ in notified) == ["content", "logo", "research", "seo", "template"]
+        assert notified[-1][0] == "content"
+        assert all(data == {"fallback_mode": False} for _, data in notified)
+        assert result["overall_confidence"] == 1.0
+        assert result["content_generation"] == {"homepage": {}}
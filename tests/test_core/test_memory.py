@@ -1,9 +1,18 @@
 """Tests for Semantic Memory System"""
 
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.memory.vector_store import VectorStore
+from app.core.memory.embedding_cache import EmbeddingCache, pack_vector, unpack_vector
+from app.core.memory.vector_index import hnsw_index_ddl
+from app.core.memory.vector_backends import (
+    NumpyVectorBackend, NumpyVectorIndex, PgVectorBackend, get_vector_backend, _contains
+)
 from app.models.embedding import UserEmbedding
 from app.models.user import User
 
@@ -140,3 +149,215 @@ async def test_delete_user_embeddings(vector_store, db_session: AsyncSession):
         user_id=user.id
     )
     assert len(results) == 0
+
+@pytest.mark.asyncio
+async def test_embed_batch_groups_concurrent_calls(vector_store):
+    """Concurrent embed_text calls share one OpenAI request, duplicates included"""
+    def create(model, input):
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[float(len(item))] * 1536) for item in input]
+        return response
+    vector_store.openai.embeddings.create.side_effect = create
+    
+    results = await asyncio.gather(
+        vector_store.embed_text("vision"),
+        vector_store.embed_text("mission!"),
+        vector_store.embed_batch(["vision", "valeurs"])
+    )
+    
+    assert results[0][0] == 6.0
+    assert results[1][0] == 8.0
+    assert [vector[0] for vector in results[2]] == [6.0, 7.0]
+    vector_store.openai.embeddings.create.assert_called_once()
+    assert vector_store.openai.embeddings.create.call_args.kwargs["input"] == ["vision", "mission!", "valeurs"]
+
+class FakeRedis:
+    """Minimal binary Redis for the embedding cache"""
+    
+    def __init__(self):
+        self.values = {}
+    
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+    
+    def pipeline(self, transaction=False):
+        redis = self
+        
+        class Pipeline:
+            def set(self, key, value, ex=None):
+                redis.values[key] = value
+            
+            async def execute(self):
+                return []
+        
+        return Pipeline()
+
+@pytest.mark.asyncio
+async def test_embed_batch_uses_float16_cache(vector_store):
+    """Cached texts are not re-embedded; vectors are stored as float16"""
+    vector_store.cache = EmbeddingCache("text-embedding-3-small", redis_client=FakeRedis(), enabled=True)
+    
+    first = await vector_store.embed_batch(["Restaurant à Dakar"])
+    second = await vector_store.embed_batch(["Restaurant à Dakar"])
+    
+    vector_store.openai.embeddings.create.assert_called_once()
+    assert second[0] == pytest.approx(first[0], abs=1e-3)
+    [payload] = vector_store.cache._redis.values.values()
+    assert len(payload) == 1536 * 2
+
+def test_pack_vector_roundtrip():
+    vector = [0.0123, -0.5, 0.25, 1.0]
+    
+    assert unpack_vector(pack_vector(vector)) == pytest.approx(vector, abs=1e-3)
+
+@pytest.mark.asyncio
+async def test_store_embeddings_bulk(vector_store, db_session: AsyncSession):
+    """Test storing many embeddings in one transaction"""
+    def create(model, input):
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.1] * 1536) for _ in input]
+        return response
+    vector_store.openai.embeddings.create.side_effect = create
+    
+    user = User(
+        email="bulk@memory.com",
+        name="Bulk User",
+        hashed_password="hashed_password"
+    )
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    
+    embeddings = await vector_store.store_embeddings_bulk(db_session, [
+        {"user_id": user.id, "brief_id": "brief_1", "text": "Vision"},
+        {"user_id": user.id, "brief_id": "brief_1", "text": "Mission", "embedding_type": "conversation"},
+    ])
+    
+    assert [e.source_text for e in embeddings] == ["Vision", "Mission"]
+    assert all(e.id is not None for e in embeddings)
+    assert embeddings[1].embedding_type == "conversation"
+    vector_store.openai.embeddings.create.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_search_similar_uses_index_friendly_query(vector_store):
+    """ORDER BY distance LIMIT k inside, threshold applied on the k candidates"""
+    db = AsyncMock()
+    result = MagicMock()
+    result.fetchall.return_value = []
+    db.execute.return_value = result
+    
+    await vector_store.search_similar(
+        db=db,
+        query_text="restaurant à Dakar",
+        user_id=7,
+        limit=5,
+        threshold=0.8,
+        embedding_type="brief",
+        metadata_filter={"sector": "restaurant"},
+        ef_search=100
+    )
+    
+    set_config, search = db.execute.call_args_list
+    assert set_config.args[1] == {"ef_search": "100"}
+    sql, params = str(search.args[0]), search.args[1]
+    inner = sql.split(") AS nearest")[0]
+    assert "WHERE user_id = :user_id AND embedding_type = :embedding_type AND metadata @> CAST(:metadata_filter AS jsonb)" in inner
+    assert ":threshold" not in inner
+    assert "LIMIT :limit" in inner
+    assert params["metadata_filter"] == '{"sector": "restaurant"}'
+
+def test_hnsw_index_ddl():
+    ddl = hnsw_index_ddl("ix_test", m=24, ef_construction=200)
+    
+    assert ddl == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_test ON user_embeddings "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 24, ef_construction = 200)"
+    )
+
+def test_numpy_index_top_k_with_user_mask():
+    index = NumpyVectorIndex(dimensions=3)
+    index.add([1, 2, 3, 4], [10, 10, 20, 10], [[1, 0, 0], [0.9, 0.1, 0], [1, 0, 0], [0, 1, 0]])
+    
+    results = index.search([2, 0, 0], k=2, user_id=10)
+    
+    assert [row_id for row_id, _ in results] == [1, 2]
+    assert results[0][1] == pytest.approx(1.0)
+    assert [row_id for row_id, _ in index.search([1, 0, 0], k=10, user_id=20)] == [3]
+
+def test_numpy_index_remove_keeps_matrix_contiguous():
+    index = NumpyVectorIndex(dimensions=2)
+    index.add([1, 2, 3], [1, 1, 1], [[1, 0], [0, 1], [1, 1]])
+    
+    assert index.remove([1, 99]) == 1
+    
+    assert index.count == 2
+    assert sorted(index.ids[:index.count].tolist()) == [2, 3]
+    assert [row_id for row_id, _ in index.search([1, 0], k=5)] == [3, 2]
+
+def test_numpy_index_persists_as_memory_mapped_npy(tmp_path):
+    index = NumpyVectorIndex(dimensions=4, dtype="float16")
+    index.add([5, 6], [1, 2], [[1, 0, 0, 0], [0, 0, 1, 0]])
+    index.save(str(tmp_path))
+    
+    loaded = NumpyVectorIndex(dimensions=4, dtype="float16")
+    assert loaded.load(str(tmp_path))
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.max_id == 6
+    assert loaded.search([0, 0, 1, 0], k=1)[0][0] == 6
+    
+    # Première écriture: copie en mémoire, le fichier n'est pas modifié
+    loaded.add([7], [1], [[0, 1, 0, 0]])
+    assert not isinstance(loaded.vectors, np.memmap)
+    assert loaded.count == 3
+    assert NumpyVectorIndex(dimensions=8).load(str(tmp_path)) is False
+
+def _sync_db(ids, rows):
+    """Session factice: ids visibles puis lignes hydratées pour les ids manquants"""
+    id_result = MagicMock()
+    id_result.scalars.return_value.all.return_value = ids
+    row_result = MagicMock()
+    row_result.all.return_value = [SimpleNamespace(id=i, user_id=1, embedding=vector) for i, vector in rows]
+    db = AsyncMock()
+    db.execute.side_effect = [id_result, row_result]
+    return db
+
+@pytest.mark.asyncio
+async def test_numpy_sync_rescans_below_max_id():
+    """Id plus bas commité en retard: relu dans la fenêtre sous max_id"""
+    backend = NumpyVectorBackend(path="", dimensions=2, sync_lag=100, reconcile_interval=3600)
+    backend.index.add([1, 3], [1, 1], [[1, 0], [0, 1]])
+    backend._next_reconcile = float("inf")
+    db = _sync_db([1, 2, 3], [(2, [1, 1])])
+    
+    await backend._sync(db)
+    
+    assert 2 in backend.index
+    id_query = str(db.execute.call_args_list[0].args[0])
+    assert "user_embeddings.id >" in id_query
+    assert str(db.execute.call_args_list[1].args[0]).count("user_embeddings.embedding") == 1
+
+@pytest.mark.asyncio
+async def test_numpy_sync_full_reconcile_after_restart():
+    """Premier sync: ids comparés en entier, lignes supprimées ailleurs retirées"""
+    backend = NumpyVectorBackend(path="", dimensions=2, sync_lag=0, reconcile_interval=3600)
+    backend.index.add([1, 2, 5], [1, 1, 1], [[1, 0], [0, 1], [1, 1]])
+    db = _sync_db([1, 4, 5], [(4, [1, 0])])
+    
+    await backend._sync(db)
+    
+    assert sorted(backend.index.row_ids()) == [1, 4, 5]
+    assert "WHERE" not in str(db.execute.call_args_list[0].args[0])
+    assert backend._next_reconcile > 0
+
+def test_vector_backend_selected_from_settings(vector_store):
+    assert isinstance(vector_store.backend, PgVectorBackend)
+    assert get_vector_backend("numpy") is get_vector_backend("numpy")
+    with pytest.raises(ValueError):
+        get_vector_backend("faiss")
+
+def test_metadata_filter_containment():
+    document = {"sector": "restaurant", "tags": ["dakar", "bio"], "owner": {"plan": "pro"}}
+    
+    assert _contains(document, {"sector": "restaurant", "owner": {"plan": "pro"}})
+    assert _contains(document, {"tags": ["bio"]})
+    assert not _contains(document, {"sector": "hotel"})
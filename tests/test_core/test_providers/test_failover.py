@@ -0,0 +1,181 @@
+"""
+Tests FailoverLLMProvider / CircuitBreaker - chaîne de providers LLM
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.providers.errors import AllProvidersFailedError, ProviderHTTPError, ProviderTimeoutError, parse_retry_after
+from app.core.providers.factory import ProviderFactory
+from app.core.providers.failover import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+    FailoverLLMProvider,
+)
+from app.core.providers.mock import MockLLMProvider
+
+
+def _provider(model: str, side_effect=None, return_value="ok") -> MockLLMProvider:
+    provider = MockLLMProvider(api_key="mock-key", model=model, simulate_latency=False)
+    provider.generate = AsyncMock(side_effect=side_effect, return_value=return_value)
+    return provider
+
+
+class _Registry(CircuitBreakerRegistry):
+    """Breakers de test: seuils bas et ouverture courte"""
+
+    def get(self, name):
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(
+                name, failure_rate_threshold=0.5, window_seconds=60, min_calls=2, open_seconds=0.1
+            )
+        return self._breakers[name]
+
+
+def _failover(providers, max_attempts=1):
+    return FailoverLLMProvider(
+        providers, breakers=_Registry(), max_attempts=max_attempts, base_delay=0.01, max_delay=0.05
+    )
+
+
+class TestCircuitBreaker:
+    """Transitions CLOSED -> OPEN -> HALF_OPEN -> CLOSED"""
+
+    def test_opens_on_failure_rate_then_half_open_probe(self):
+        breaker = CircuitBreaker("deepseek", failure_rate_threshold=0.5, min_calls=4, open_seconds=0.05)
+
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED  # 3 appels < min_calls
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN  # 2/4 échecs
+        assert breaker.allow_request() is False
+
+        time.sleep(0.06)
+        assert breaker.allow_request() is True  # sonde half-open
+        assert breaker.allow_request() is False  # une seule sonde à la fois
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_retry_after_extends_open_duration(self):
+        breaker = CircuitBreaker("deepseek", open_seconds=0.01)
+        breaker.trip(duration=5)
+        time.sleep(0.02)
+        assert breaker.state == CircuitState.OPEN
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class TestFailoverLLMProvider:
+    """Ordre de la chaîne, retries et saut des providers ouverts"""
+
+    async def test_falls_back_to_secondary_on_unavailable(self):
+        primary = _provider("deepseek-chat", side_effect=ProviderHTTPError("unavailable", status_code=503))
+        secondary = _provider("moonshot-v1-32k", return_value="kimi")
+        llm = _failover([("deepseek", primary), ("kimi", secondary)], max_attempts=3)
+
+        assert await llm.generate("Prompt") == "kimi"
+        # 503 = passer au suivant sans retry
+        assert primary.generate.await_count == 1
+
+    async def test_retries_rate_limit_with_backoff(self):
+        primary = _provider(
+            "deepseek-chat",
+            side_effect=[ProviderHTTPError("rate limit", status_code=429, retry_after=0.01), "deepseek"]
+        )
+        llm = _failover([("deepseek", primary), ("kimi", _provider("kimi"))], max_attempts=2)
+
+        assert await llm.generate("Prompt") == "deepseek"
+        assert primary.generate.await_count == 2
+
+    async def test_retries_timeout_on_same_provider(self):
+        primary = _provider("deepseek-chat", side_effect=[ProviderTimeoutError("Deepseek timeout after 90s"), "deepseek"])
+        llm = _failover([("deepseek", primary), ("kimi", _provider("kimi"))], max_attempts=2)
+
+        assert await llm.generate("Prompt") == "deepseek"
+        assert primary.generate.await_count == 2
+
+    async def test_non_transient_error_fails_over_without_retry(self):
+        """Bug ou réponse invalide: pas de retry, provider suivant immédiatement"""
+        primary = _provider("deepseek-chat", side_effect=KeyError("choices"))
+        secondary = _provider("kimi", return_value="kimi")
+        llm = _failover([("deepseek", primary), ("kimi", secondary)], max_attempts=3)
+
+        assert await llm.generate("Prompt") == "kimi"
+        assert primary.generate.await_count == 1
+
+    async def test_long_retry_after_opens_circuit_and_skips(self):
+        primary = _provider("deepseek-chat", side_effect=ProviderHTTPError("rate limit", status_code=429, retry_after=60))
+        secondary = _provider("kimi", return_value="kimi")
+        llm = _failover([("deepseek", primary), ("kimi", secondary)], max_attempts=3)
+
+        assert await llm.generate("Prompt") == "kimi"
+        assert llm.breakers.get("deepseek").state == CircuitState.OPEN
+
+        # Appel suivant: deepseek sauté sans être appelé
+        assert await llm.generate("Prompt") == "kimi"
+        assert primary.generate.await_count == 1
+
+    async def test_open_circuit_skips_slow_provider(self):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            raise ProviderTimeoutError("Deepseek timeout after 30s")
+
+        primary = _provider("deepseek-chat", side_effect=slow)
+        llm = _failover([("deepseek", primary), ("kimi", _provider("kimi", return_value="kimi"))])
+
+        for _ in range(2):
+            await llm.generate("Prompt")
+        assert llm.breakers.get("deepseek").state == CircuitState.OPEN
+
+        start = time.perf_counter()
+        assert await llm.generate("Prompt") == "kimi"
+        assert time.perf_counter() - start < 0.02
+
+    async def test_all_providers_failed(self):
+        llm = _failover([
+            ("deepseek", _provider("deepseek-chat", side_effect=Exception("boom"))),
+            ("kimi", _provider("kimi", side_effect=Exception("boom"))),
+        ])
+        with pytest.raises(AllProvidersFailedError):
+            await llm.generate("Prompt")
+
+    async def test_stream_fails_over_before_first_delta(self):
+        class BrokenStream(MockLLMProvider):
+            async def astream(self, *args, **kwargs):
+                raise ProviderHTTPError("unavailable", status_code=503)
+                yield  # pragma: no cover
+
+        primary = BrokenStream(api_key="mock-key", model="deepseek-chat", simulate_latency=False)
+        secondary = MockLLMProvider(api_key="mock-key", model="kimi", simulate_latency=False)
+        llm = _failover([("deepseek", primary), ("kimi", secondary)])
+
+        text = "".join([delta async for delta in llm.astream("Prompt")])
+        assert text == await secondary.generate("Prompt")
+
+
+class TestFactoryFailoverChain:
+    """Construction de la chaîne depuis ProviderConfig"""
+
+    def test_chain_built_when_fallback_key_available(self):
+        factory = ProviderFactory(api_keys={"deepseek": "sk-test", "kimi": "sk-kimi"})
+        llm = factory.create_llm_provider(override_provider="deepseek", override_model="deepseek-chat", enable_cache=False)
+
+        assert isinstance(llm, FailoverLLMProvider)
+        assert llm.provider_names == ["deepseek", "kimi"]
+        assert llm.providers[1][1].model == "moonshot-v1-32k"
+
+    def test_single_provider_without_fallback_key(self):
+        factory = ProviderFactory(api_keys={"deepseek": "sk-test"})
+        llm = factory.create_llm_provider(override_provider="deepseek", override_model="deepseek-chat", enable_cache=False)
+
+        assert not isinstance(llm, FailoverLLMProvider)
@@ -0,0 +1,134 @@
+"""
+Tests HedgedLLMProvider / LatencyTracker - requêtes de couverture
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.providers.factory import ProviderFactory
+from app.core.providers.failover import FailoverLLMProvider
+from app.core.providers.hedging import HedgedLLMProvider, LatencyTracker
+from app.core.providers.mock import MockLLMProvider
+
+
+class SlowProvider(MockLLMProvider):
+    """Provider mock à latence programmable, annulations comptées"""
+
+    def __init__(self, model: str, delays, answer: str):
+        super().__init__(api_key="mock-key", model=model, simulate_latency=False)
+        self.delays = list(delays)
+        self.answer = answer
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt, **kwargs):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.answer
+
+
+def _hedged(primary, hedge=None, tracker=None):
+    return HedgedLLMProvider(
+        ("deepseek", primary),
+        hedge=("kimi", hedge) if hedge else None,
+        tracker=tracker or LatencyTracker(window=50),
+        quantile=0.9,
+        min_samples=5,
+        default_delay=0.05,
+        min_delay=0.01
+    )
+
+
+class TestLatencyTracker:
+    """Percentiles par (provider, modèle)"""
+
+    def test_percentile_per_provider_and_model(self):
+        tracker = LatencyTracker(window=100)
+        for value in range(1, 101):
+            tracker.observe("deepseek", "deepseek-chat", value / 100)
+        tracker.observe("kimi", "moonshot-v1-32k", 9.0)
+
+        assert tracker.percentile("deepseek", "deepseek-chat", 0.5) == pytest.approx(0.5)
+        assert tracker.percentile("deepseek", "deepseek-chat", 0.99) == pytest.approx(0.99)
+        assert tracker.percentile("kimi", "moonshot-v1-32k", 0.5) == 9.0
+        assert tracker.percentile("deepseek", "other", 0.5) is None
+
+
+class TestHedgedLLMProvider:
+    """Premier arrivé gagne, le perdant est annulé"""
+
+    async def test_fast_call_is_not_hedged(self):
+        primary = SlowProvider("deepseek-chat", [0.0], "deepseek")
+        secondary = SlowProvider("moonshot-v1-32k", [0.0], "kimi")
+
+        assert await _hedged(primary, secondary).generate("Prompt") == "deepseek"
+        assert secondary.calls == 0
+
+    async def test_slow_call_hedged_to_secondary_and_loser_cancelled(self):
+        primary = SlowProvider("deepseek-chat", [1.0], "deepseek")
+        secondary = SlowProvider("moonshot-v1-32k", [0.01], "kimi")
+
+        result = await asyncio.wait_for(_hedged(primary, secondary).generate("Prompt"), timeout=0.5)
+
+        assert result == "kimi"
+        assert secondary.calls == 1
+        assert primary.cancelled == 1
+
+    async def test_cancelled_loser_latency_is_recorded(self):
+        """Le primaire annulé compte (>= délai de hedge): pas de dérive vers les seuls appels rapides"""
+        tracker = LatencyTracker(window=50)
+        primary = SlowProvider("deepseek-chat", [1.0], "deepseek")
+        secondary = SlowProvider("moonshot-v1-32k", [0.01], "kimi")
+
+        await asyncio.wait_for(_hedged(primary, secondary, tracker=tracker).generate("Prompt"), timeout=0.5)
+
+        assert tracker.count("deepseek", "deepseek-chat") == 1
+        assert tracker.percentile("deepseek", "deepseek-chat", 0.5) >= 0.05
+        assert tracker.count("kimi", "moonshot-v1-32k") == 1
+
+    async def test_same_provider_hedge(self):
+        """Sans provider secondaire, le hedge rejoue le même provider"""
+        primary = SlowProvider("deepseek-chat", [1.0, 0.01], "deepseek")
+
+        result = await asyncio.wait_for(_hedged(primary).generate("Prompt"), timeout=0.5)
+
+        assert result == "deepseek"
+        assert primary.calls == 2
+        assert primary.cancelled == 1
+
+    async def test_threshold_follows_recent_percentile(self):
+        tracker = LatencyTracker(window=50)
+        for _ in range(10):
+            tracker.observe("deepseek", "deepseek-chat", 0.2)
+        llm = _hedged(SlowProvider("deepseek-chat", [0.0], "x"), tracker=tracker)
+
+        assert llm.hedge_delay() == pytest.approx(0.2)
+
+
+class TestFactoryHedging:
+    """Activation opt-in via la factory"""
+
+    def test_hedge_targets_secondary_of_failover_chain(self):
+        factory = ProviderFactory(api_keys={"deepseek": "sk-test", "kimi": "sk-kimi"})
+        llm = factory.create_llm_provider(
+            override_provider="deepseek",
+            override_model="deepseek-chat",
+            enable_cache=False,
+            enable_hedging=True
+        )
+
+        assert isinstance(llm, HedgedLLMProvider)
+        assert isinstance(llm.hedge[1], FailoverLLMProvider)
+        assert llm.hedge[1].provider_names == ["kimi", "deepseek"]
+
+    def test_disabled_by_default(self):
+        factory = ProviderFactory(api_keys={"deepseek": "sk-test"})
+        llm = factory.create_llm_provider(override_provider="deepseek", enable_cache=False)
+
+        assert not isinstance(llm, HedgedLLMProvider)
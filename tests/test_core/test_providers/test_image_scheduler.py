@@ -0,0 +1,151 @@
+"""
+Tests ImageRequestScheduler - token bucket RPM/IPM et file de priorité
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.providers.errors import ProviderHTTPError
+from app.core.providers.image_scheduler import ImageRequestScheduler, TokenBucket, IMAGE_PRIORITIES
+
+
+def _scheduler(rpm=600, ipm=600, max_concurrency=4, max_retries=1):
+    return ImageRequestScheduler(
+        "dalle",
+        TokenBucket("dalle", rpm=rpm, ipm=ipm),
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        default_pause=0.01
+    )
+
+
+class TestTokenBucket:
+    """Limites requêtes/min et images/min"""
+
+    async def test_burst_then_wait(self):
+        bucket = TokenBucket("dalle", rpm=2, ipm=10)
+
+        assert await bucket.reserve() == 0
+        assert await bucket.reserve() == 0
+        assert await bucket.reserve() == pytest.approx(30, rel=0.01)
+
+    async def test_images_per_minute_limit(self):
+        bucket = TokenBucket("dalle", rpm=100, ipm=3)
+
+        assert await bucket.reserve(images=3) == 0
+        assert await bucket.reserve(images=1) == pytest.approx(20, rel=0.01)
+
+    async def test_pause_blocks_tokens(self):
+        bucket = TokenBucket("dalle", rpm=100, ipm=100)
+        await bucket.pause(5)
+
+        assert await bucket.reserve() == pytest.approx(5, rel=0.01)
+
+
+class TestImageRequestScheduler:
+    """Ordre de priorité, 429, annulation"""
+
+    async def test_hero_served_first(self):
+        scheduler = _scheduler(max_concurrency=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        first = asyncio.create_task(scheduler.run(blocker, priority=IMAGE_PRIORITIES["feature"]))
+        await asyncio.sleep(0)
+
+        async def record(name):
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(scheduler.run(lambda name=name: record(name), priority=IMAGE_PRIORITIES[name]))
+            for name in ("feature", "service", "hero")
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.queue_depth == 3
+
+        gate.set()
+        await asyncio.gather(first, *tasks)
+
+        assert order == ["hero", "service", "feature"]
+        assert scheduler.queue_depth == 0
+
+    async def test_rate_limit_spaces_requests(self):
+        scheduler = _scheduler(rpm=1200, ipm=1200)
+        scheduler.bucket._requests = 0  # quota de la minute consommé: 1 jeton toutes les 50 ms
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        async def noop():
+            return None
+
+        await asyncio.gather(*[scheduler.run(noop) for _ in range(3)])
+
+        assert loop.time() - started >= 0.14
+
+    async def test_429_requeued_then_succeeds(self):
+        scheduler = _scheduler()
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ProviderHTTPError("DALL-E rate limit - retry later", status_code=429, retry_after=0.02)
+            return {"image_url": "https://example.com/hero.png"}
+
+        result = await scheduler.run(generate, priority=IMAGE_PRIORITIES["hero"])
+
+        assert result == {"image_url": "https://example.com/hero.png"}
+        assert len(calls) == 2
+
+    async def test_429_gives_up_after_retries(self):
+        scheduler = _scheduler(max_retries=0)
+
+        async def generate():
+            raise ProviderHTTPError("DALL-E rate limit - retry later", status_code=429)
+
+        with pytest.raises(ProviderHTTPError):
+            await scheduler.run(generate)
+        assert scheduler._active == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = _scheduler(max_concurrency=1)
+        gate = asyncio.Event()
+        holder = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(scheduler.run(gate.wait))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert scheduler.queue_depth == 0
+        gate.set()
+        await holder
+
+    async def test_token_reserved_outside_lock(self):
+        """Pendant l'aller-retour Redis de la tête de file, les autres appels s'enfilent"""
+        scheduler = _scheduler()
+        reserving = asyncio.Event()
+        redis_reply = asyncio.Event()
+
+        async def slow_reserve(images=1):
+            reserving.set()
+            await redis_reply.wait()
+            return 0
+
+        scheduler.bucket.reserve = slow_reserve
+        first = asyncio.create_task(scheduler.acquire())
+        await reserving.wait()
+
+        second = asyncio.create_task(scheduler.acquire(priority=IMAGE_PRIORITIES["hero"]))
+        await asyncio.sleep(0.01)
+        assert scheduler.queue_depth == 2
+
+        redis_reply.set()
+        await asyncio.gather(first, second)
+        assert scheduler.queue_depth == 0
+        assert scheduler._active == 2
@@ -0,0 +1,143 @@
+"""
+Tests cache de réponses LLM (CachedLLMProvider / LLMResponseCache)
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.providers.cache import CachedLLMProvider, LLMResponseCache, make_cache_key
+from app.core.providers.factory import ProviderFactory
+from app.core.providers.mock import MockLLMProvider
+
+
+class FakeRedis:
+    """Client Redis minimal en mémoire"""
+
+    def __init__(self):
+        self.storage = {}
+
+    async def get(self, key):
+        return self.storage.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.storage[key] = value
+        return True
+
+
+@pytest.fixture
+def inner_provider():
+    provider = MockLLMProvider(api_key="mock-key", model="deepseek-chat", simulate_latency=False)
+    provider.generate = AsyncMock(return_value="Réponse LLM")
+    provider.generate_structured = AsyncMock(return_value={"sector": "restaurant"})
+    return provider
+
+
+class TestCachedLLMProvider:
+    """Cache autour de BaseLLMProvider"""
+
+    async def test_identical_calls_hit_cache(self, inner_provider):
+        """Deux appels identiques => un seul appel au provider"""
+        cache = LLMResponseCache(ttl=60, max_entries=10)
+        llm = CachedLLMProvider(inner_provider, cache=cache)
+
+        first = await llm.generate("Prompt", system_message="Sys", temperature=0.2, max_tokens=100)
+        second = await llm.generate("Prompt", system_message="Sys", temperature=0.2, max_tokens=100)
+
+        assert first == second == "Réponse LLM"
+        inner_provider.generate.assert_awaited_once()
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    async def test_key_depends_on_generation_parameters(self, inner_provider):
+        """Température ou max_tokens différents => appels distincts"""
+        llm = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10))
+
+        await llm.generate("Prompt", temperature=0.2, max_tokens=100)
+        await llm.generate("Prompt", temperature=0.3, max_tokens=100)
+        await llm.generate("Prompt", temperature=0.2, max_tokens=200)
+
+        assert inner_provider.generate.await_count == 3
+
+    async def test_bypass_flag(self, inner_provider):
+        """use_cache=False force l'appel au provider"""
+        llm = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10))
+
+        await llm.generate("Prompt", temperature=0.2)
+        await llm.generate("Prompt", temperature=0.2, use_cache=False)
+
+        assert inner_provider.generate.await_count == 2
+
+    async def test_structured_responses_cached(self, inner_provider):
+        """generate_structured est mis en cache (schéma inclus dans la clé)"""
+        llm = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10))
+        schema = {"sector": "string"}
+
+        await llm.generate_structured("Prompt", response_schema=schema, temperature=0.1)
+        result = await llm.generate_structured("Prompt", response_schema=schema, temperature=0.1)
+        await llm.generate_structured("Prompt", response_schema={"other": "string"}, temperature=0.1)
+
+        assert result == {"sector": "restaurant"}
+        assert inner_provider.generate_structured.await_count == 2
+
+    async def test_creative_temperature_not_cached(self, inner_provider):
+        """Température par défaut (0.7, appels créatifs) => pas de cache"""
+        llm = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10))
+
+        await llm.generate("Prompt")
+        await llm.generate("Prompt")
+
+        assert inner_provider.generate.await_count == 2
+
+    async def test_structured_extra_kwargs_bypass_cache(self, inner_provider):
+        """kwargs absents de la clé (ex: top_p) => pas de cache pour generate_structured"""
+        llm = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10))
+        schema = {"sector": "string"}
+
+        await llm.generate_structured("Prompt", response_schema=schema, temperature=0.1, top_p=0.5)
+        await llm.generate_structured("Prompt", response_schema=schema, temperature=0.1, top_p=0.9)
+
+        assert inner_provider.generate_structured.await_count == 2
+        assert inner_provider.generate_structured.await_args.kwargs["top_p"] == 0.9
+
+    async def test_redis_tier_shared_between_processes(self, inner_provider):
+        """Un L1 vide est alimenté depuis Redis (autre worker)"""
+        redis_client = FakeRedis()
+        writer = CachedLLMProvider(inner_provider, cache=LLMResponseCache(ttl=60, max_entries=10, redis_client=redis_client))
+        await writer.generate("Prompt", temperature=0.2)
+
+        reader_cache = LLMResponseCache(ttl=60, max_entries=10, redis_client=redis_client)
+        reader = CachedLLMProvider(inner_provider, cache=reader_cache)
+        result = await reader.generate("Prompt", temperature=0.2)
+
+        assert result == "Réponse LLM"
+        inner_provider.generate.assert_awaited_once()
+        assert reader_cache.stats["redis_hits"] == 1
+        key = make_cache_key("deepseek-chat", None, "Prompt", 0.2, 2000)
+        assert json.loads(redis_client.storage[f"genesis:llm_cache:{key}"]) == "Réponse LLM"
+
+    async def test_lru_eviction(self, inner_provider):
+        """Le L1 est borné en nombre d'entrées"""
+        cache = LLMResponseCache(ttl=60, max_entries=2)
+        llm = CachedLLMProvider(inner_provider, cache=cache)
+
+        for prompt in ("a", "b", "c"):
+            await llm.generate(prompt, temperature=0.2)
+        await llm.generate("a", temperature=0.2)
+
+        assert len(cache.l1) == 2
+        assert inner_provider.generate.await_count == 4
+
+    def test_factory_wraps_real_providers_only(self):
+        """La factory enveloppe les providers réels, pas le mock"""
+        factory = ProviderFactory(api_keys={"deepseek": "sk-test"})
+
+        cached = factory.create_llm_provider(plan="genesis_basic", override_provider="deepseek")
+        mock = factory.create_llm_provider(plan="genesis_basic", override_provider="mock")
+        uncached = factory.create_llm_provider(plan="genesis_basic", override_provider="deepseek", enable_cache=False)
+
+        assert isinstance(cached, CachedLLMProvider)
+        assert cached.base_url == "https://api.deepseek.com"
+        assert isinstance(mock, MockLLMProvider)
+        assert not isinstance(uncached, CachedLLMProvider)
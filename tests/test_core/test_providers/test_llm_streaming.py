@@ -0,0 +1,86 @@
+"""
+Tests streaming LLM (astream) - Deepseek SSE, Mock provider, cache
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.core.providers.cache import CachedLLMProvider, LLMResponseCache
+from app.core.providers.deepseek import DeepseekProvider
+from app.core.providers.mock import MockLLMProvider
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _sse_body(deltas):
+    lines = [": keep-alive", ""]
+    for delta in deltas:
+        chunk = {"choices": [{"index": 0, "delta": {"content": delta}}]}
+        lines += [f"data: {json.dumps(chunk)}", ""]
+    lines += ["data: [DONE]", ""]
+    return "\n".join(lines).encode()
+
+
+def _patch_transport(handler):
+    """Remplace le client httpx de repli par un client à transport simulé"""
+    def factory(*args, **kwargs):
+        return _RealAsyncClient(*args, transport=httpx.MockTransport(handler), **kwargs)
+    return patch("app.core.integrations.http_pool.httpx.AsyncClient", side_effect=factory)
+
+
+class TestDeepseekStreaming:
+    """DeepseekProvider.astream sur flux SSE OpenAI-compatible"""
+
+    async def test_yields_deltas_in_order(self):
+        """Chaque chunk `data:` produit un delta, [DONE] termine le flux"""
+        payloads = []
+
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            return httpx.Response(200, content=_sse_body(["Bonjour", " Dakar", "!"]))
+
+        provider = DeepseekProvider(api_key="test-key")
+        with _patch_transport(handler):
+            deltas = [delta async for delta in provider.astream("Salut", system_message="Sys")]
+
+        assert deltas == ["Bonjour", " Dakar", "!"]
+        assert payloads[0]["stream"] is True
+        assert payloads[0]["messages"][0] == {"role": "system", "content": "Sys"}
+
+    async def test_rate_limit_raises(self):
+        """Un 429 est remonté comme pour generate()"""
+        provider = DeepseekProvider(api_key="test-key")
+        with _patch_transport(lambda request: httpx.Response(429)):
+            with pytest.raises(Exception, match="rate limit"):
+                async for _ in provider.astream("Salut"):
+                    pass
+
+
+class TestMockAndCachedStreaming:
+    """Streaming du provider mock et du décorateur de cache"""
+
+    async def test_mock_stream_reassembles_generate(self):
+        """La concaténation des deltas du mock égale generate()"""
+        provider = MockLLMProvider(api_key="mock", model="mock-model", simulate_latency=False)
+
+        deltas = [delta async for delta in provider.astream("Prompt")]
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == await provider.generate("Prompt")
+
+    async def test_cached_stream_served_after_first_stream(self):
+        """Un flux complet est mis en cache puis restitué en un fragment"""
+        provider = MockLLMProvider(api_key="mock", model="mock-model", simulate_latency=False)
+        cache = LLMResponseCache(ttl=60, max_entries=10)
+        llm = CachedLLMProvider(provider, cache=cache)
+
+        first = [delta async for delta in llm.astream("Prompt", temperature=0.2)]
+        second = [delta async for delta in llm.astream("Prompt", temperature=0.2)]
+
+        assert second == ["".join(first)]
+        assert cache.stats["hits"] == 1
+        # Même clé que generate(): la réponse streamée sert aussi les appels non streamés
+        assert await llm.generate("Prompt", temperature=0.2) == "".join(first)
@@ -3,6 +3,8 @@ Tests pour QuotaManager - P0.5
 Validation logique quotas cohérente selon plan tarifaire
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
@@ -11,8 +13,10 @@ from app.core.quota import (
     QuotaManager,
     QuotaExceededException,
     SubscriptionPlan,
-    QuotaLimits
+    QuotaLimits,
+    QuotaLedger
 )
+from app.core.quota.rate_limiter import RateLimiter, RateLimitDecision
 
 pytestmark = pytest.mark.asyncio
 
@@ -213,3 +217,335 @@ class TestQuotaManager:
         assert exc.details["plan"] == SubscriptionPlan.BASIC
         assert exc.details["reset_date"] == "2025-12-01T00:00:00Z"
         assert "upgrade_url" in exc.details
+
+
+def _ledger(admit=None, commit=None):
+    """Ledger Redis factice (disponible) pour QuotaManager"""
+    ledger = AsyncMock()
+    ledger.is_available = True
+    ledger.admit.return_value = admit
+    ledger.commit.return_value = commit
+    return ledger
+
+
+class TestQuotaManagerLedger:
+    """Tests QuotaManager avec le ledger Redis - admission locale, envoi différé"""
+    
+    async def test_check_quota_admitted_locally(self):
+        """Admission par le ledger: aucun appel DC360, place réservée pour la session"""
+        mock_dc360 = AsyncMock()
+        ledger = _ledger(admit={
+            "allowed": True, "plan": "basic", "limit": 10, "used": 4, "reserved": 1, "reset_date": None
+        })
+        
+        quota_manager = QuotaManager(dc360_client=mock_dc360, ledger=ledger)
+        result = await quota_manager.check_quota(user_id=456, session_id="brief_abc")
+        
+        assert result["can_start_session"] is True
+        assert result["current_usage"] == 4
+        assert result["max_monthly_sessions"] == 10
+        assert "market_research" in result["features_available"]
+        ledger.admit.assert_awaited_once_with(456, "brief_abc", quota_manager._load_quota)
+        mock_dc360.get_user_subscription.assert_not_called()
+    
+    async def test_check_quota_denied_by_ledger(self):
+        """Sessions en cours comprises: quota atteint -> QuotaExceededException"""
+        ledger = _ledger(admit={
+            "allowed": False, "plan": "trial", "limit": 3, "used": 2, "reserved": 1, "reset_date": "2025-12-01"
+        })
+        
+        quota_manager = QuotaManager(dc360_client=AsyncMock(), ledger=ledger)
+        
+        with pytest.raises(QuotaExceededException) as exc_info:
+            await quota_manager.check_quota(user_id=123, session_id="brief_x")
+        
+        assert exc_info.value.details["max_allowed"] == 3
+        assert "1 en cours" in exc_info.value.message
+    
+    async def test_check_quota_ledger_error_falls_back_to_dc360(self):
+        """Redis en panne: vérification directe sur DC360"""
+        mock_dc360 = AsyncMock()
+        mock_dc360.get_user_subscription.return_value = {"plan": SubscriptionPlan.BASIC, "genesis_sessions_used": 2}
+        ledger = _ledger()
+        ledger.admit.side_effect = ConnectionError("redis down")
+        
+        quota_manager = QuotaManager(dc360_client=mock_dc360, ledger=ledger)
+        result = await quota_manager.check_quota(user_id=456, session_id="brief_abc")
+        
+        assert result["current_usage"] == 2
+        mock_dc360.get_user_subscription.assert_awaited_once_with(456)
+    
+    async def test_increment_usage_counted_locally(self):
+        """Usage compté dans Redis, envoyé à DC360 par le flusher"""
+        mock_dc360 = AsyncMock()
+        ledger = _ledger(commit={"counted": True, "used": 5, "limit": 10})
+        
+        quota_manager = QuotaManager(dc360_client=mock_dc360, ledger=ledger)
+        result = await quota_manager.increment_usage(user_id=456, session_id="brief_abc")
+        
+        assert result == {"new_usage": 5, "max_allowed": 10, "session_id": "brief_abc", "already_counted": False}
+        mock_dc360.increment_genesis_usage.assert_not_called()
+    
+    async def test_load_quota_maps_dc360_subscription(self):
+        """Rechargement du ledger: limite du plan, usage DC360"""
+        mock_dc360 = AsyncMock()
+        mock_dc360.get_user_subscription.return_value = {
+            "plan": "enterprise", "genesis_sessions_used": 80, "quota_reset_date": "2025-12-01"
+        }
+        
+        quota = await QuotaManager(dc360_client=mock_dc360, ledger=_ledger())._load_quota(7)
+        
+        assert quota == {"plan": "enterprise", "limit": None, "used": 80, "reset_date": "2025-12-01"}
+
+
+class TestQuotaLedger:
+    """Tests QuotaLedger - scripts Lua exécutés par Redis (mocké)"""
+    
+    @pytest.fixture
+    def redis_client(self):
+        client = AsyncMock()
+        client.pipeline = MagicMock(return_value=AsyncMock())
+        return client
+    
+    async def test_admit_refreshes_missing_ledger_once(self, redis_client):
+        """Ledger absent (-1): chargement DC360 + sessions en attente, puis admission"""
+        redis_client.eval.side_effect = [[-1], [1, 6, 1, "basic", "10", ""]]
+        redis_client.scard.return_value = 2
+        load = AsyncMock(return_value={"plan": "basic", "limit": 10, "used": 4, "reset_date": None})
+        
+        ledger = QuotaLedger(redis_client=redis_client, enabled=True)
+        status = await ledger.admit(42, "brief_abc", load)
+        
+        assert status == {"allowed": True, "plan": "basic", "limit": 10, "used": 6, "reserved": 1, "reset_date": None}
+        load.assert_awaited_once_with(42)
+        pipe = redis_client.pipeline.return_value
+        pipe.hset.assert_called_once_with("genesis:quota:42", mapping={
+            "plan": "basic", "limit": 10, "used": 6, "reset_date": ""
+        })
+        pipe.set.assert_called_once_with("genesis:quota:42:plan", "basic", ex=86400)
+        keys = redis_client.eval.await_args.args[2:5]
+        assert keys == ("genesis:quota:42", "genesis:quota:42:reserved", "genesis:quota:42:counted")
+    
+    async def test_admit_cached_ledger_skips_dc360(self, redis_client):
+        redis_client.eval.return_value = [0, 3, 0, "trial", "3", "2025-12-01"]
+        load = AsyncMock()
+        
+        status = await QuotaLedger(redis_client=redis_client, enabled=True).admit(42, None, load)
+        
+        assert status["allowed"] is False
+        assert status["limit"] == 3
+        assert status["reset_date"] == "2025-12-01"
+        load.assert_not_awaited()
+        redis_client.eval.assert_awaited_once()
+    
+    async def test_commit_is_idempotent_per_session(self, redis_client):
+        redis_client.eval.return_value = [0, 5, -1]
+        
+        result = await QuotaLedger(redis_client=redis_client, enabled=True).commit(42, "brief_abc")
+        
+        assert result == {"counted": False, "used": 5, "limit": None}
+    
+    async def test_flush_keeps_failed_syncs_pending(self, redis_client):
+        """Envoi par lots: les usages refusés par DC360 restent en attente"""
+        redis_client.smembers.side_effect = [{"42"}, {"brief_ok", "brief_ko"}]
+        
+        async def sync(user_id, session_id):
+            return session_id == "brief_ok"
+        
+        synced = await QuotaLedger(redis_client=redis_client, enabled=True).flush(sync)
+        
+        assert synced == 1
+        redis_client.srem.assert_awaited_once_with("genesis:quota:42:pending", "brief_ok")
+        # Retrait du set dirty conditionné (atomique) à un set en attente vide, puis libération du verrou
+        clear_dirty, release_lock = redis_client.eval.await_args_list
+        assert clear_dirty.args[2:] == ("genesis:quota:42:pending", "genesis:quota:dirty", 42)
+        assert release_lock.args[2] == "genesis:quota:flush_lock"
+        assert release_lock.args[3] == redis_client.set.await_args.args[1]
+    
+    async def test_flush_skipped_while_another_worker_holds_lock(self, redis_client):
+        """Un seul flusher à la fois: pas de double envoi des mêmes usages"""
+        redis_client.set.return_value = None
+        sync = AsyncMock()
+        
+        synced = await QuotaLedger(redis_client=redis_client, enabled=True).flush(sync)
+        
+        assert synced == 0
+        assert redis_client.set.await_args.kwargs["nx"] is True
+        redis_client.smembers.assert_not_awaited()
+        sync.assert_not_awaited()
+        redis_client.eval.assert_not_awaited()
+
+
+class TestRateLimiter:
+    """Tests RateLimiter - GCRA par plan, repli en mémoire si Redis échoue"""
+    
+    @pytest.fixture
+    def failing_redis(self):
+        client = AsyncMock()
+        client.eval.side_effect = ConnectionError("redis down")
+        return client
+    
+    def test_requests_per_minute_per_plan(self):
+        limits = {plan: QuotaLimits.get_limit(plan)["requests_per_minute"] for plan in SubscriptionPlan}
+        assert limits == {
+            SubscriptionPlan.TRIAL: 5,
+            SubscriptionPlan.BASIC: 10,
+            SubscriptionPlan.PRO: 20,
+            SubscriptionPlan.ENTERPRISE: 50
+        }
+    
+    async def test_redis_decision_single_eval(self):
+        """Un seul EVAL: plan lu côté Redis, limite du plan renvoyée"""
+        redis_client = AsyncMock()
+        redis_client.eval.return_value = [0, 2500, "pro", 20]
+        
+        decision = await RateLimiter(redis_client=redis_client, enabled=True).check(user_id=42)
+        
+        assert decision.allowed is False
+        assert decision.plan == "pro"
+        assert decision.headers() == {"X-RateLimit-Limit": "20", "X-RateLimit-Remaining": "0", "Retry-After": "3"}
+        redis_client.eval.assert_awaited_once()
+        assert redis_client.eval.await_args.args[2:4] == ("genesis:quota:42:plan", "genesis:ratelimit:user:42")
+    
+    async def test_missing_plan_loaded_from_dc360_not_trial(self):
+        """Plan absent (aucun appel quota récent): chargé une fois, mémorisé, limite du plan payant"""
+        redis_client = AsyncMock()
+        redis_client.eval.side_effect = [[-1], [1, 19, "pro", 20]]
+        loader = AsyncMock(return_value="genesis_pro")
+        
+        decision = await RateLimiter(redis_client=redis_client, enabled=True, plan_loader=loader).check(user_id=42)
+        
+        assert (decision.allowed, decision.plan, decision.limit) == (True, "pro", 20)
+        loader.assert_awaited_once_with(42)
+        first, second = redis_client.eval.await_args_list
+        assert first.args[5:8] == ("trial", 60000, -1)
+        assert second.args[5:8] == ("pro", 60000, 86400000)
+    
+    async def test_plan_loader_failure_falls_back_briefly(self):
+        redis_client = AsyncMock()
+        redis_client.eval.side_effect = [[-1], [1, 4, "trial", 5]]
+        loader = AsyncMock(side_effect=ConnectionError("dc360 down"))
+        
+        decision = await RateLimiter(redis_client=redis_client, enabled=True, plan_loader=loader).check(user_id=42)
+        
+        assert decision.allowed is True
+        assert redis_client.eval.await_args.args[5:8] == ("trial", 60000, 60000)
+    
+    async def test_concurrent_requests_share_one_plan_load(self):
+        redis_client = AsyncMock()
+        redis_client.eval.side_effect = [[-1], [-1], [1, 9, "basic", 10], [1, 8, "basic", 10]]
+        loaded = asyncio.Event()
+        
+        async def loader(user_id):
+            await loaded.wait()
+            return "basic"
+        loader_mock = AsyncMock(side_effect=loader)
+        limiter = RateLimiter(redis_client=redis_client, enabled=True, plan_loader=loader_mock)
+        
+        checks = asyncio.gather(limiter.check(user_id=42), limiter.check(user_id=42))
+        await asyncio.sleep(0)
+        loaded.set()
+        decisions = await checks
+        
+        assert [d.plan for d in decisions] == ["basic", "basic"]
+        loader_mock.assert_awaited_once_with(42)
+    
+    async def test_anonymous_requests_use_default_plan(self):
+        redis_client = AsyncMock()
+        redis_client.eval.return_value = [1, 4, "trial", 5]
+        loader = AsyncMock()
+        
+        await RateLimiter(redis_client=redis_client, enabled=True, plan_loader=loader).check(client_ip="10.0.0.1")
+        
+        assert redis_client.eval.await_args.args[7] == 0
+        loader.assert_not_awaited()
+    
+    async def test_load_plan_refreshes_ledger(self):
+        ledger = _ledger()
+        ledger.refresh.return_value = {"plan": "pro", "limit": 50, "used": 3, "reset_date": None}
+        quota_manager = QuotaManager(dc360_client=AsyncMock(), ledger=ledger)
+        
+        assert await quota_manager.load_plan(42) == "pro"
+        assert ledger.refresh.await_args.args == (42, quota_manager._load_quota)
+    
+    async def test_memory_fallback_allows_burst_then_limits(self, failing_redis):
+        """Redis indisponible: plan par défaut (trial, 5/min), rafale de 5 puis 429"""
+        limiter = RateLimiter(redis_client=failing_redis, enabled=True)
+        
+        decisions = [await limiter.check(client_ip="10.0.0.1") for _ in range(6)]
+        
+        assert [d.allowed for d in decisions] == [True] * 5 + [False]
+        assert decisions[0].remaining == 4
+        assert 0 < decisions[-1].retry_after <= 12
+        # Autre identité: compteur indépendant
+        assert (await limiter.check(client_ip="10.0.0.2")).allowed is True
+    
+    async def test_memory_fallback_uses_last_known_plan(self, failing_redis):
+        redis_client = AsyncMock()
+        redis_client.eval.return_value = [1, 19, "pro", 20]
+        limiter = RateLimiter(redis_client=redis_client, enabled=True)
+        await limiter.check(user_id=42)
+        
+        limiter._redis = failing_redis
+        decision = await limiter.check(user_id=42)
+        
+        assert decision.allowed is True
+        assert (decision.plan, decision.limit) == ("pro", 20)
+
+
+class TestRateLimitMiddleware:
+    """Tests RateLimitMiddleware - 429 + Retry-After, méthodes et chemins limités"""
+    
+    @pytest.fixture
+    def limiter(self):
+        limiter = MagicMock()
+        limiter.is_enabled = True
+        limiter.check = AsyncMock(return_value=RateLimitDecision(True, 10, 7, 0, "basic"))
+        return limiter
+    
+    @pytest.fixture
+    def client(self, limiter):
+        from fastapi import FastAPI
+        from httpx import ASGITransport, AsyncClient
+        from app.api.middleware import RateLimitMiddleware
+        
+        app = FastAPI()
+        
+        @app.post("/api/v1/genesis/business-brief/")
+        async def brief():
+            return {"ok": True}
+        
+        @app.get("/api/v1/themes/")
+        async def themes():
+            return []
+        
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    
+    async def test_allowed_request_gets_rate_limit_headers(self, client, limiter):
+        from app.core.security import create_access_token
+        
+        token = create_access_token(data={"sub": "42"})
+        response = await client.post("/api/v1/genesis/business-brief/", headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "10"
+        assert response.headers["X-RateLimit-Remaining"] == "7"
+        assert limiter.check.await_args.kwargs["user_id"] == 42
+    
+    async def test_limited_request_returns_429_with_retry_after(self, client, limiter):
+        limiter.check.return_value = RateLimitDecision(False, 5, 0, 7.2, "trial")
+        
+        response = await client.post("/api/v1/genesis/business-brief/")
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "8"
+        assert response.json()["error"] == "rate_limit_exceeded"
+        assert limiter.check.await_args.kwargs["user_id"] is None
+    
+    async def test_reads_are_not_limited(self, client, limiter):
+        response = await client.get("/api/v1/themes/")
+        
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+        limiter.check.assert_not_awaited()
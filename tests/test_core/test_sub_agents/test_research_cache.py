@@ -0,0 +1,120 @@
+"""
+Tests ResearchCache - cache partagé des recherches marché
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.deep_agents.sub_agents.research_cache import ResearchCache, normalize_key_part
+
+
+class FakeRedis:
+    """Client Redis minimal en mémoire (strings, sorted set, hash)"""
+
+    def __init__(self):
+        self.storage = {}
+        self.zsets = {}
+        self.hashes = {}
+
+    async def get(self, key):
+        return self.storage.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.storage:
+            return None
+        self.storage[key] = value
+        return True
+
+    async def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + amount
+        return zset[member]
+
+    async def zrevrange(self, key, start, end):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda item: -item[1])
+        return [member for member, _ in ranked[start:end + 1]]
+
+    async def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = value
+        return 1
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+
+def _context(sector="Restaurant", city="Dakar", country="Sénégal"):
+    return {"industry_sector": sector, "location": {"city": city, "country": country}, "business_name": "X"}
+
+
+@pytest.fixture
+def cache():
+    return ResearchCache(redis_client=FakeRedis(), ttl=60, stale_ttl=60)
+
+
+class TestResearchCache:
+    """Clés normalisées, hits, stale-while-revalidate"""
+
+    def test_key_normalized_and_scoped(self, cache):
+        assert normalize_key_part("  Sénégal ") == "senegal"
+        assert cache.make_key(_context(), "competitors") == cache.make_key(
+            _context(sector="restaurant ", city="DAKAR", country="senegal"), "competitors"
+        )
+        # Les tendances ne dépendent pas de la ville
+        assert cache.make_key(_context(city="Thiès"), "trends") == cache.make_key(_context(), "trends")
+        assert cache.make_key(_context(city="Thiès"), "competitors") != cache.make_key(_context(), "competitors")
+
+    async def test_second_user_served_from_cache(self, cache):
+        fetch = AsyncMock(return_value={"results": [{"title": "Chez Loutcha"}]})
+
+        first = await cache.get_or_fetch(_context(), "competitors", fetch)
+        second = await cache.get_or_fetch(_context(city="dakar"), "competitors", fetch)
+
+        assert first == second
+        fetch.assert_awaited_once()
+
+    async def test_concurrent_misses_single_flight(self, cache):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"results": []}
+
+        await asyncio.gather(*[cache.get_or_fetch(_context(), "pricing", fetch) for _ in range(5)])
+        assert len(calls) == 1
+
+    async def test_stale_entry_served_then_refreshed(self, cache):
+        key = cache.make_key(_context(), "trends")
+        await cache._redis.set(key, json.dumps({"cached_at": time.time() - 120, "data": {"v": "old"}}))
+        fetch = AsyncMock(return_value={"v": "new"})
+
+        assert await cache.get_or_fetch(_context(), "trends", fetch) == {"v": "old"}
+        await cache.drain()
+
+        fetch.assert_awaited_once()
+        assert await cache.get_or_fetch(_context(), "trends", fetch) == {"v": "new"}
+
+    async def test_inactive_cache_fetches_directly(self):
+        cache = ResearchCache(ttl=60)
+        fetch = AsyncMock(return_value={"results": []})
+
+        await cache.get_or_fetch(_context(), "competitors", fetch)
+        await cache.get_or_fetch(_context(), "competitors", fetch)
+
+        assert fetch.await_count == 2
+
+    async def test_top_pairs_by_popularity(self, cache):
+        for _ in range(3):
+            await cache.record_request(_context())
+        await cache.record_request(_context(sector="Coiffure", city="Abidjan", country="Côte d'Ivoire"))
+
+        pairs = await cache.top_pairs(1)
+
+        assert pairs == [{"industry_sector": "Restaurant", "location": {"city": "Dakar", "country": "Sénégal"}}]
@@ -211,7 +211,7 @@ class TestDC360AdapterEndpoint:
         
         # Mock Quota Manager
         class MockQuotaManager:
-            async def check_quota(self, user_id):
+            async def check_quota(self, user_id, session_id=None):
                 return {
                     "plan": "genesis_pro",
                     "current_usage": 10,
@@ -256,8 +256,8 @@ class TestBusinessBriefE2E:
         
         # === 4. VÉRIFICATIONS MOCKS APPELÉS ===
         
-        # Quota vérifié avant génération
-        mock_check_quota.assert_called_once_with(test_user.id)
+        # Quota vérifié (et place réservée pour ce brief) avant génération
+        mock_check_quota.assert_called_once_with(test_user.id, session_id=brief_id)
         
         # Orchestrateur exécuté
         mock_orchestrator_run.assert_called_once()
@@ -682,8 +682,8 @@ class TestBusinessBriefE2E:
         
         # === 4. VÉRIFICATIONS MOCKS APPELÉS ===
         
-        # Quota vérifié avant génération
-        mock_check_quota.assert_called_once_with(test_user.id)
+        # Quota vérifié (et place réservée pour ce brief) avant génération
+        mock_check_quota.assert_called_once_with(test_user.id, session_id=brief_id)
         
         # Orchestrateur exécuté
         mock_orchestrator_run.assert_called_once()
@@ -9,11 +9,36 @@ from datetime import datetime
 import uuid
 
 from app.core.orchestration.langgraph_orchestrator import LangGraphOrchestrator
-from app.core.integrations.redis_fs import RedisVirtualFileSystem
+from app.core.integrations.redis_fs import (
+    RedisVirtualFileSystem,
+    WRITE_SESSION_SCRIPT,
+    DELETE_SESSION_SCRIPT,
+    LIST_SESSIONS_SCRIPT,
+)
 
 pytestmark = pytest.mark.asyncio
 
 
+def mock_session_scripts(redis_storage, indexes):
+    """Émule les scripts Lua de session (écriture/suppression/liste + index)"""
+    async def mock_eval(script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == WRITE_SESSION_SCRIPT:
+            redis_storage[keys[0]] = {'value': argv[0], 'ttl': argv[1]}
+            indexes.setdefault(keys[1], {})[argv[2]] = argv[3]
+            return 1
+        if script == DELETE_SESSION_SCRIPT:
+            indexes.get(keys[1], {}).pop(argv[0], None)
+            return 1 if redis_storage.pop(keys[0], None) else 0
+        if script == LIST_SESSIONS_SCRIPT:
+            offset, limit, prefix = argv
+            ranked = sorted(indexes.get(keys[0], {}).items(), key=lambda item: -item[1])
+            ids = [brief_id for brief_id, _ in ranked[offset:offset + limit]]
+            return [[brief_id for brief_id in ids if prefix + brief_id in redis_storage], len(ids)]
+        raise AssertionError("Script Lua inattendu")
+    return mock_eval
+
+
 class TestSprint2OrchestratorRedisE2E:
     """
     Test E2E Sprint 2 - Validation correction S2.3 Redis FS
@@ -81,6 +106,9 @@ class TestSprint2OrchestratorRedisE2E:
             return 0
         mock_redis_client.delete = mock_delete
         
+        # Mock eval (scripts session + index utilisateur)
+        mock_redis_client.eval = mock_session_scripts(redis_storage, {})
+        
         # Mock ping (health_check)
         mock_redis_client.ping = AsyncMock(return_value=True)
         
@@ -333,7 +361,7 @@ class TestSprint2OrchestratorRedisE2E:
         2. Créer 2 briefs pour user_id=2
         3. list_user_sessions(1) devrait retourner 3 briefs
         4. list_user_sessions(2) devrait retourner 2 briefs
-        5. Validation pattern scan Redis optimisé
+        5. Validation index utilisateur (sans SCAN du keyspace)
         """
         
         # Mock Redis avec stockage en mémoire
@@ -354,18 +382,9 @@ class TestSprint2OrchestratorRedisE2E:
             return None
         mock_redis_client.get = mock_get
         
-        # Mock scan_iter pour list_user_sessions
-        async def mock_scan_iter(match=None):
-            for key in redis_storage.keys():
-                if match:
-                    # Simple pattern matching (genesis:session:{user_id}:*)
-                    import fnmatch
-                    if fnmatch.fnmatch(key, match.replace('*', '*')):
-                        yield key.encode()
-                else:
-                    yield key.encode()
-        
-        mock_redis_client.scan_iter = mock_scan_iter
+        # Mock eval pour write_session / list_user_sessions (index par utilisateur)
+        mock_redis_client.eval = mock_session_scripts(redis_storage, {})
+        
         mock_redis_client.ping = AsyncMock(return_value=True)
         
         mock_redis_from_url.return_value = mock_redis_client
@@ -405,4 +424,4 @@ class TestSprint2OrchestratorRedisE2E:
         print("\n✅ Test list_user_sessions S2.3 - SUCCÈS")
         print(f"   - User 1: {len(user1_sessions)} sessions ✅")
         print(f"   - User 2: {len(user2_sessions)} sessions ✅")
-        print(f"   - Pattern scan optimisé genesis:session:{{user_id}}:* ✅")
+        print(f"   - Index genesis:user:{{user_id}}:sessions ✅")
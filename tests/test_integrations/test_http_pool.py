@@ -0,0 +1,92 @@
+"""Tests unitaires pour le registre de clients HTTP poolés"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.integrations.http_pool import HTTPClientRegistry, PooledClientView
+
+
+class TestHTTPClientRegistry:
+    """Tests pour HTTPClientRegistry"""
+
+    @pytest.fixture
+    async def registry(self):
+        """Registre ouvert, fermé en fin de test"""
+        registry = HTTPClientRegistry()
+        registry.open()
+        yield registry
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_same_host_shares_client(self, registry):
+        """Un seul pool par hôte, quel que soit le chemin"""
+        first = registry.get_client("https://api.deepseek.com/v1/chat/completions")
+        second = registry.get_client("https://api.deepseek.com")
+        other = registry.get_client("https://api.tavily.com")
+
+        assert first is second
+        assert first is not other
+        assert registry.stats()["pools"] == [
+            "https://api.deepseek.com:443",
+            "https://api.tavily.com:443",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_client_context_does_not_close_pool(self, registry):
+        """Sortir du context manager ne ferme pas le client partagé"""
+        async with registry.client("https://api.openai.com", timeout=10) as client:
+            assert isinstance(client, PooledClientView)
+
+        assert registry.get_client("https://api.openai.com").is_closed is False
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_all_pools(self):
+        """aclose ferme tous les clients et désactive le registre"""
+        registry = HTTPClientRegistry()
+        registry.open()
+        client = registry.get_client("https://api.deepseek.com")
+
+        await registry.aclose()
+
+        assert client.is_closed is True
+        assert registry.is_active is False
+        assert registry.stats()["pools"] == []
+
+    @pytest.mark.asyncio
+    async def test_inactive_registry_falls_back_to_ephemeral_client(self):
+        """Sans lifespan, un client éphémère est créé (comportement historique)"""
+        registry = HTTPClientRegistry()
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_client.return_value.__aenter__.return_value = mock_instance
+
+            async with registry.client("https://api.tavily.com", timeout=30) as client:
+                assert client is mock_instance
+
+            mock_client.assert_called_once_with(timeout=30)
+        assert registry.stats()["pools"] == []
+
+
+class TestPooledClientView:
+    """Tests pour l'injection du timeout par appel"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_injected_on_requests(self):
+        """Le timeout de l'appelant est appliqué sans écraser un timeout explicite"""
+        underlying = MagicMock()
+        underlying.post = AsyncMock(return_value="ok")
+        view = PooledClientView(underlying, timeout=90)
+
+        await view.post("https://api.deepseek.com/v1/chat/completions", json={})
+        await view.post("https://api.deepseek.com/v1/chat/completions", json={}, timeout=5)
+
+        assert underlying.post.call_args_list[0].kwargs["timeout"] == 90
+        assert underlying.post.call_args_list[1].kwargs["timeout"] == 5
+
+    def test_other_attributes_delegated(self):
+        """Les attributs hors requêtes sont délégués tels quels"""
+        underlying = MagicMock(is_closed=False)
+        view = PooledClientView(underlying, timeout=10)
+
+        assert view.is_closed is False
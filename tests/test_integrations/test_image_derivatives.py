@@ -0,0 +1,67 @@
+"""
+Tests ImageDerivativePipeline - dérivés WebP multi-largeurs + placeholder
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from app.core.integrations.image_derivatives import PIL_AVAILABLE, ImageDerivativePipeline, render_derivatives
+from app.core.integrations.image_store import ImageStore, LocalImageBackend
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageStore(LocalImageBackend(str(tmp_path / "images"), "/static/images"))
+
+
+class TestImageDerivativePipeline:
+    """Rendu dans le pool de processus et publication dans l'image store"""
+
+    async def test_disabled_pipeline_returns_none(self, store, tmp_path):
+        pipeline = ImageDerivativePipeline(enabled=False)
+
+        assert await pipeline.process(str(tmp_path / "hero.png"), store) is None
+
+    @pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow non installé")
+    async def test_webp_variants_and_placeholder(self, store, tmp_path):
+        from PIL import Image
+
+        source = tmp_path / "hero.png"
+        Image.new("RGB", (1792, 1024), (200, 120, 40)).save(source)
+        pipeline = ImageDerivativePipeline(widths=[480, 960, 4000], formats=["webp"], max_workers=1, enabled=True)
+        try:
+            image_set = await pipeline.process(str(source), store)
+        finally:
+            pipeline.shutdown()
+
+        assert image_set["width"] == 1792 and image_set["height"] == 1024
+        assert image_set["placeholder"].startswith("data:image/webp;base64,")
+        [webp] = image_set["sources"]
+        assert webp["type"] == "image/webp"
+        widths = [entry.rsplit(" ", 1)[1] for entry in webp["srcset"].split(", ")]
+        assert widths == ["480w", "960w", "1792w"]
+
+        stored = sorted(os.listdir(tmp_path / "images"))
+        assert len(stored) == 3 and all(name.endswith(".webp") for name in stored)
+        for name in stored:
+            data = (tmp_path / "images" / name).read_bytes()
+            assert name == f"{hashlib.sha256(data).hexdigest()}.webp"
+        assert source.exists()  # l'original est publié ensuite par l'appelant
+
+    @pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow non installé")
+    def test_failed_render_removes_written_variants(self, tmp_path):
+        """Échec en cours de rendu: aucun fichier `.derivative.*.part` ne reste"""
+        from PIL import Image
+
+        source = tmp_path / "hero.png"
+        Image.new("RGB", (1024, 1024), (200, 120, 40)).save(source)
+        staging = tmp_path / "staging"
+        staging.mkdir()
+
+        # WebP rendu et écrit, puis format inconnu de Pillow
+        with pytest.raises(KeyError):
+            render_derivatives(str(source), str(staging), [480], ["webp", "unknown"], 80, 16)
+
+        assert os.listdir(staging) == []
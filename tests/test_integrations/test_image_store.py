@@ -0,0 +1,227 @@
+"""
+Tests ImageStore - blobs adressés par SHA-256, backends local et S3, GC
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.integrations.image_store import (
+    ImageStore,
+    LocalImageBackend,
+    S3ImageBackend,
+    referenced_digests,
+)
+from app.core.integrations.redis_fs import RedisVirtualFileSystem
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"hero" * 100
+DIGEST = hashlib.sha256(PNG).hexdigest()
+
+
+class FakeRedis:
+    """Hash des compteurs de références"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = values.get(field, 0) + amount
+        return values[field]
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def delete(self, key):
+        self.ops.append(lambda: self.redis.hashes.pop(key, None))
+
+    def hset(self, key, mapping):
+        self.ops.append(lambda: self.redis.hashes.setdefault(key, {}).update(mapping))
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+class NoSuchKey(Exception):
+    def __init__(self):
+        super().__init__("Not Found")
+        self.response = {"Error": {"Code": "404"}}
+
+
+class FakeS3Client:
+    """Stand-in en mémoire d'un bucket S3 (même interface que boto3)"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise NoSuchKey()
+        return {"ContentType": self.objects[(Bucket, Key)]["ContentType"]}
+
+    def upload_file(self, path, bucket, key, ExtraArgs=None):
+        with open(path, "rb") as f:
+            self.objects[(bucket, key)] = {
+                "Body": f.read(),
+                "LastModified": datetime.now(timezone.utc),
+                **(ExtraArgs or {})
+            }
+
+    def copy_object(self, Bucket, Key, CopySource, MetadataDirective, **kwargs):
+        assert MetadataDirective == "REPLACE"
+        source = self.objects[(CopySource["Bucket"], CopySource["Key"])]
+        self.objects[(Bucket, Key)] = {**source, **kwargs, "LastModified": datetime.now(timezone.utc)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {"Contents": [
+                    {"Key": key, "LastModified": item["LastModified"]}
+                    for (bucket, key), item in client.objects.items()
+                    if bucket == Bucket and key.startswith(Prefix)
+                ]}
+
+        return Paginator()
+
+
+async def _documents(*documents):
+    for document in documents:
+        yield document
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageStore(LocalImageBackend(str(tmp_path), "/static/images"), redis_client=FakeRedis())
+
+
+class TestImageStore:
+    """Déduplication, références, sweep"""
+
+    async def test_identical_bytes_stored_once(self, store, tmp_path):
+        first = await store.put_bytes(PNG)
+        second = await store.put_bytes(PNG)
+
+        assert first == second == f"/static/images/{DIGEST}.png"
+        assert os.listdir(tmp_path) == [f"{DIGEST}.png"]
+        assert await store.reference_count(DIGEST) == 2
+
+    async def test_gc_deletes_unreferenced_blobs_only(self, store, tmp_path):
+        live_url = await store.put_bytes(PNG)
+        dead_url = await store.put_bytes(b"orphan image")
+        old = time.time() - 3600
+        for name in os.listdir(tmp_path):
+            os.utime(tmp_path / name, (old, old))
+
+        site = {"pages": [{"sections": [{"type": "hero", "content": {"image": live_url}}]}]}
+        stats = await store.collect_garbage(_documents(site), grace_seconds=60)
+
+        assert stats == {"blobs": 2, "referenced": 1, "deleted": 1}
+        assert os.listdir(tmp_path) == [f"{DIGEST}.png"]
+        assert not os.path.exists(tmp_path / dead_url.rsplit("/", 1)[1])
+        assert await store.reference_count(DIGEST) == 1
+
+    async def test_gc_leaves_legacy_files_alone(self, store, tmp_path):
+        """Les images historiques (non adressées par contenu) ne sont jamais balayées"""
+        legacy = "image_agent_5d41402abc4b2a76b9719d911017c592_1a2b3c4d.png"
+        (tmp_path / legacy).write_bytes(PNG)
+        old = time.time() - 3600
+        os.utime(tmp_path / legacy, (old, old))
+
+        site = {"hero": f"/static/images/{legacy}"}
+        stats = await store.collect_garbage(_documents(site), grace_seconds=0)
+
+        assert stats == {"blobs": 0, "referenced": 0, "deleted": 0}
+        assert os.listdir(tmp_path) == [legacy]
+
+    async def test_gc_keeps_recent_blobs(self, store, tmp_path):
+        """Une image générée mais pas encore écrite dans un site survit au sweep"""
+        await store.put_bytes(PNG)
+
+        stats = await store.collect_garbage(_documents(), grace_seconds=60)
+
+        assert stats["deleted"] == 0
+        assert os.listdir(tmp_path) == [f"{DIGEST}.png"]
+
+    async def test_gc_dry_run(self, store, tmp_path):
+        await store.put_bytes(PNG)
+
+        stats = await store.collect_garbage(_documents(), grace_seconds=0, dry_run=True)
+
+        assert stats["deleted"] == 1
+        assert os.listdir(tmp_path) == [f"{DIGEST}.png"]
+
+    async def test_gc_aborts_when_a_site_cannot_be_decoded(self, store, tmp_path):
+        """Marquage incomplet (valeur compressée sans zstandard): rien n'est supprimé"""
+        url = await store.put_bytes(PNG)
+        old = time.time() - 3600
+        os.utime(tmp_path / f"{DIGEST}.png", (old, old))
+
+        mock_redis = AsyncMock()
+
+        async def scan_iter(match, count):
+            for key in (b"site:a", b"site:b"):
+                yield key
+        mock_redis.scan_iter = scan_iter
+        mock_redis.get.side_effect = [json.dumps({"id": "a"}), b"\x28\xb5\x2f\xfd compressed"]
+        with patch("app.core.integrations.redis_fs.redis.from_url", return_value=mock_redis):
+            redis_fs = RedisVirtualFileSystem()
+
+        with patch.object(redis_fs.codec, "decode", side_effect=[{"id": "a"}, RuntimeError("zstandard is required")]):
+            with pytest.raises(RuntimeError):
+                await store.collect_garbage(redis_fs.iter_documents("site:*"), grace_seconds=0)
+
+        assert os.listdir(tmp_path) == [url.rsplit("/", 1)[1]]
+        assert await store.reference_count(DIGEST) == 1
+
+    def test_referenced_digests_from_urls(self):
+        site = {"hero": f"https://cdn.example.com/images/{DIGEST}.png", "logo": "https://example.com/logo.png"}
+
+        assert referenced_digests(site) == [DIGEST]
+
+
+class TestS3ImageBackend:
+    """Backend S3-compatible sur un stand-in en mémoire"""
+
+    async def test_put_dedup_and_gc(self):
+        s3 = FakeS3Client()
+        backend = S3ImageBackend(bucket="genesis", prefix="images/", public_url="https://cdn.example.com/images", client=s3)
+        store = ImageStore(backend, redis_client=FakeRedis())
+
+        url = await store.put_bytes(PNG)
+        await store.put_bytes(PNG)
+        orphan = await store.put_bytes(b"orphan image", content_type="image/webp")
+
+        assert url == f"https://cdn.example.com/images/{DIGEST}.png"
+        assert orphan.endswith(".webp")
+        assert s3.objects[("genesis", f"images/{DIGEST}.png")]["ContentType"] == "image/png"
+        assert len(s3.objects) == 2
+
+        stats = await store.collect_garbage(_documents({"image": url}), grace_seconds=0)
+
+        assert stats["deleted"] == 1
+        assert list(s3.objects) == [("genesis", f"images/{DIGEST}.png")]
+
+    def test_default_url_for_custom_endpoint(self):
+        backend = S3ImageBackend(bucket="genesis", prefix="images/", endpoint_url="http://minio:9000", client=FakeS3Client())
+
+        assert backend.url("abc.png") == "http://minio:9000/genesis/images/abc.png"
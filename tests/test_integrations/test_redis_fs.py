@@ -3,7 +3,38 @@
 import pytest
 import json
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.core.integrations.redis_fs import RedisVirtualFileSystem
+from app.core.integrations.redis_fs import (
+    RedisVirtualFileSystem,
+    WRITE_SESSION_SCRIPT,
+    DELETE_SESSION_SCRIPT,
+    EXTEND_SESSION_SCRIPT,
+    UPDATE_HASH_FIELDS_SCRIPT,
+    WRITE_SITE_SCRIPT,
+)
+from redis.exceptions import ResponseError
+
+class FakePipeline:
+    """Pipeline Redis enregistrant les commandes, réponses programmées"""
+
+    def __init__(self, responses):
+        self.commands = []
+        self.responses = responses
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def exists(self, key):
+        self.commands.append(("exists", key))
+
+    def hmget(self, key, fields):
+        self.commands.append(("hmget", key))
+
+    async def execute(self):
+        return self.responses
+
 
 @pytest.fixture
 def mock_redis():
@@ -49,14 +80,17 @@ class TestRedisVirtualFileSystem:
         test_data = {"user_id": user_id, "brief_id": brief_id, "results": {}}
         ttl = 3600
         
-        mock_redis.set.return_value = True
+        mock_redis.eval.return_value = 1
         
         result = await redis_fs.write_session(user_id, brief_id, test_data, ttl)
         
         assert result is True
         expected_key = f"{redis_fs.session_prefix}:{user_id}:{brief_id}"
-        expected_data = json.dumps(test_data, default=str)
-        mock_redis.set.assert_called_once_with(expected_key, expected_data, ex=ttl)
+        args = mock_redis.eval.call_args.args
+        # Session + index utilisateur mis à jour dans le même script
+        assert args[:4] == (WRITE_SESSION_SCRIPT, 2, expected_key, f"{redis_fs.user_prefix}:{user_id}:sessions")
+        assert redis_fs.codec.decode(args[4]) == test_data
+        assert args[5:7] == (ttl, brief_id)
     
     @pytest.mark.asyncio
     async def test_write_session_failure(self, redis_fs, mock_redis):
@@ -65,7 +99,7 @@ class TestRedisVirtualFileSystem:
         brief_id = "brief_123"
         test_data = {"user_id": user_id, "brief_id": brief_id}
         
-        mock_redis.set.side_effect = Exception("Redis error")
+        mock_redis.eval.side_effect = Exception("Redis error")
         
         result = await redis_fs.write_session(user_id, brief_id, test_data)
         
@@ -116,13 +150,15 @@ class TestRedisVirtualFileSystem:
         user_id = 1
         brief_id = "brief_123"
         
-        mock_redis.delete.return_value = 1  # 1 clé supprimée
+        mock_redis.eval.return_value = 1  # 1 clé supprimée
         
         result = await redis_fs.delete_session(user_id, brief_id)
         
         assert result is True
         expected_key = f"{redis_fs.session_prefix}:{user_id}:{brief_id}"
-        mock_redis.delete.assert_called_once_with(expected_key)
+        mock_redis.eval.assert_called_once_with(
+            DELETE_SESSION_SCRIPT, 2, expected_key, f"{redis_fs.user_prefix}:{user_id}:sessions", brief_id
+        )
     
     @pytest.mark.asyncio
     async def test_delete_session_not_found(self, redis_fs, mock_redis):
@@ -130,7 +166,7 @@ class TestRedisVirtualFileSystem:
         user_id = 1
         brief_id = "nonexistent_brief"
         
-        mock_redis.delete.return_value = 0  # 0 clé supprimée
+        mock_redis.eval.return_value = 0  # 0 clé supprimée
         
         result = await redis_fs.delete_session(user_id, brief_id)
         
@@ -143,13 +179,15 @@ class TestRedisVirtualFileSystem:
         brief_id = "brief_123"
         ttl = 7200
         
-        mock_redis.expire.return_value = True
+        mock_redis.eval.return_value = 1
         
         result = await redis_fs.extend_session_ttl(user_id, brief_id, ttl)
         
         assert result is True
         expected_key = f"{redis_fs.session_prefix}:{user_id}:{brief_id}"
-        mock_redis.expire.assert_called_once_with(expected_key, ttl)
+        mock_redis.eval.assert_called_once_with(
+            EXTEND_SESSION_SCRIPT, 2, expected_key, f"{redis_fs.user_prefix}:{user_id}:sessions", ttl
+        )
     
     @pytest.mark.asyncio
     async def test_write_user_state_success(self, redis_fs, mock_redis):
@@ -164,8 +202,10 @@ class TestRedisVirtualFileSystem:
         
         assert result is True
         expected_key = f"{redis_fs.user_prefix}:{user_id}"
-        expected_data = json.dumps(state_data, default=str)
-        mock_redis.set.assert_called_once_with(expected_key, expected_data, ex=ttl)
+        key, payload = mock_redis.set.call_args.args
+        assert key == expected_key
+        assert redis_fs.codec.decode(payload) == state_data
+        assert mock_redis.set.call_args.kwargs == {"ex": ttl}
     
     @pytest.mark.asyncio
     async def test_read_user_state_success(self, redis_fs, mock_redis):
@@ -181,36 +221,191 @@ class TestRedisVirtualFileSystem:
         expected_key = f"{redis_fs.user_prefix}:{user_id}"
         mock_redis.get.assert_called_once_with(expected_key)
     
-    @pytest.mark.skip(reason="Mock complexe pour scan_iter - fonctionnalité secondaire")
     @pytest.mark.asyncio
     async def test_list_user_sessions_success(self, redis_fs, mock_redis):
-        """Test liste sessions utilisateur réussie"""
+        """Test liste sessions utilisateur via l'index (pages successives)"""
         user_id = 123
-        session_keys = [
-            f"{redis_fs.session_prefix}:session1".encode(),
-            f"{redis_fs.session_prefix}:session2".encode(),
-            f"{redis_fs.session_prefix}:session3".encode()
+        mock_redis.eval.side_effect = [
+            [[b"brief_3", b"brief_2"], 100],  # page pleine (une entrée expirée retirée)
+            [[b"brief_1"], 1],
         ]
         
-        # Mock scan_iter avec AsyncMock configuré
-        mock_redis.scan_iter = AsyncMock()
-        mock_redis.scan_iter.__aiter__ = AsyncMock(return_value=iter(session_keys))
+        result = await redis_fs.list_user_sessions(user_id)
+        
+        assert result == ["brief_3", "brief_2", "brief_1"]
+        first_call, second_call = mock_redis.eval.call_args_list
+        assert first_call.args[2:5] == (f"{redis_fs.user_prefix}:{user_id}:sessions", 0, 100)
+        # Offset suivant = sessions vivantes retournées (l'index a été compacté)
+        assert second_call.args[3] == 2
+    
+    @pytest.mark.asyncio
+    async def test_update_session_fields_only_writes_changed_fields(self, redis_fs, mock_redis):
+        """Une étape coaching n'écrit que current_step (HSET + EXPIRE atomiques)"""
+        mock_redis.eval.return_value = 1
         
-        # Mock read_session pour retourner des données avec le bon user_id
-        async def mock_read_session(session_id):
-            if session_id in ["session1", "session2"]:
-                return {"user_id": user_id}
-            else:
-                return {"user_id": 456}  # Autre utilisateur
+        result = await redis_fs.update_session_fields("session:abc", {"current_step": "mission"}, ttl=7200)
         
-        redis_fs.read_session = mock_read_session
+        assert result is True
+        args = mock_redis.eval.call_args.args
+        assert args[:5] == (UPDATE_HASH_FIELDS_SCRIPT, 1, "session:abc", 7200, "current_step")
+        assert redis_fs.codec.decode(args[5]) == "mission"
+        assert len(args) == 6
+    
+    @pytest.mark.asyncio
+    async def test_update_session_fields_missing_session(self, redis_fs, mock_redis):
+        """Session expirée: aucun hash partiel créé"""
+        mock_redis.eval.return_value = 0
         
-        result = await redis_fs.list_user_sessions(user_id)
+        assert await redis_fs.update_session_fields("session:abc", {"status": "coaching_complete"}) is False
+    
+    @pytest.mark.asyncio
+    async def test_read_session_fields_per_field(self, redis_fs, mock_redis):
+        """Lecture champ par champ (HMGET), champs absents ignorés"""
+        mock_redis.hmget.return_value = [
+            redis_fs.codec.encode(7),
+            None,
+            redis_fs.codec.encode({"business_name": "Chez Awa"}),
+        ]
+        
+        result = await redis_fs.read_session_fields("session:abc", ["user_id", "status", "onboarding"])
+        
+        assert result == {"user_id": 7, "onboarding": {"business_name": "Chez Awa"}}
+        mock_redis.hmget.assert_called_once_with("session:abc", ["user_id", "status", "onboarding"])
+    
+    @pytest.mark.asyncio
+    async def test_read_session_fields_legacy_json_session(self, redis_fs, mock_redis):
+        """Ancienne session JSON (string): lue via GET"""
+        mock_redis.hmget.side_effect = ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        mock_redis.get.return_value = json.dumps({"user_id": 7, "current_step": "vision", "id": 1})
+        
+        result = await redis_fs.read_session_fields("session:abc", ["user_id", "current_step"])
+        
+        assert result == {"user_id": 7, "current_step": "vision"}
+    
+    @pytest.mark.asyncio
+    async def test_write_site_stores_summary(self, redis_fs, mock_redis):
+        """Le résumé (thème, image hero) est écrit avec le site"""
+        site = {"theme": {"slug": "savor"}, "metadata": {"ogImage": "/img/hero.webp"}, "pages": []}
+        
+        assert await redis_fs.write_site("abc", site, ttl=600) is True
+        
+        args = mock_redis.eval.call_args.args
+        assert args[:4] == (WRITE_SITE_SCRIPT, 2, "site:abc", "site:abc:summary")
+        assert redis_fs.codec.decode(args[4]) == site
+        summary = dict(zip(args[6::2], args[7::2]))
+        assert args[5] == 600
+        assert summary["theme_slug"] == "savor"
+        assert summary["hero_image"] == "/img/hero.webp"
+        assert "updated_at" in summary
+    
+    @pytest.mark.asyncio
+    async def test_read_site_summaries_single_round_trip(self, redis_fs, mock_redis):
+        """EXISTS + HMGET de tous les sites dans un seul pipeline"""
+        pipeline = FakePipeline([
+            1, [b"savor", b"/img/a.webp", b"2025-01-15T10:30:00+00:00"],
+            0, [None, None, None],
+        ])
+        mock_redis.pipeline = MagicMock(return_value=pipeline)
+        
+        summaries = await redis_fs.read_site_summaries(["a", "b"])
+        
+        assert summaries == {
+            "a": {"theme_slug": "savor", "hero_image": "/img/a.webp", "updated_at": "2025-01-15T10:30:00+00:00"},
+            "b": None,
+        }
+        assert pipeline.commands == [
+            ("exists", "site:a"), ("hmget", "site:a:summary"),
+            ("exists", "site:b"), ("hmget", "site:b:summary"),
+        ]
+        mock_redis.get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_read_site_summaries_backfills_legacy_site(self, redis_fs, mock_redis):
+        """Site écrit avant le résumé: lu une fois, résumé créé"""
+        mock_redis.pipeline = MagicMock(return_value=FakePipeline([1, [None, None, None]]))
+        mock_redis.get.return_value = json.dumps({"theme": {"slug": "savor"}, "metadata": {}})
+        mock_redis.ttl.return_value = 3600
         
-        assert len(result) == 2
-        assert "session1" in result
-        assert "session2" in result
-        assert "session3" not in result
+        summaries = await redis_fs.read_site_summaries(["a"])
+        
+        assert summaries == {"a": {"theme_slug": "savor"}}
+        mock_redis.hset.assert_awaited_once_with("site:a:summary", mapping={"theme_slug": "savor"})
+        mock_redis.expire.assert_awaited_once_with("site:a:summary", 3600)
+    
+    @pytest.mark.asyncio
+    async def test_iter_documents_skips_summaries(self, redis_fs, mock_redis):
+        """Sweep de maintenance: documents décodés, résumés ignorés"""
+        async def scan_iter(match, count):
+            for key in (b"site:a", b"site:a:summary", b"site:b"):
+                yield key
+        mock_redis.scan_iter = scan_iter
+        mock_redis.get.side_effect = [json.dumps({"id": "a"}), None]
+        
+        documents = [document async for document in redis_fs.iter_documents("site:*")]
+        
+        assert documents == [{"id": "a"}]
+        assert mock_redis.get.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_iter_documents_propagates_read_errors(self, redis_fs, mock_redis):
+        """Racines du GC: un document illisible interrompt le parcours"""
+        async def scan_iter(match, count):
+            for key in (b"site:a", b"site:b"):
+                yield key
+        mock_redis.scan_iter = scan_iter
+        mock_redis.get.side_effect = [json.dumps({"id": "a"}), TimeoutError("read timeout")]
+        
+        with pytest.raises(TimeoutError):
+            [document async for document in redis_fs.iter_documents("site:*")]
+    
+    @pytest.mark.asyncio
+    async def test_purge_documents_skips_unreadable_documents(self, redis_fs, mock_redis):
+        """Purge de maintenance: un document illisible est ignoré"""
+        async def scan_iter(match, count):
+            for key in (b"cache/image_agent:1.json", b"cache/image_agent:2.json"):
+                yield key
+        mock_redis.scan_iter = scan_iter
+        mock_redis.get.side_effect = [TimeoutError("read timeout"), json.dumps({"owner": 7})]
+        
+        count = await redis_fs.purge_documents("cache/image_agent:*", lambda doc: doc["owner"] == 7)
+        
+        assert count == 1
+        mock_redis.unlink.assert_awaited_once_with("cache/image_agent:2.json")
+    
+    @pytest.mark.asyncio
+    async def test_purge_documents_deletes_matching_keys(self, redis_fs, mock_redis):
+        """Purge: seuls les documents retenus par le prédicat sont supprimés"""
+        async def scan_iter(match, count):
+            for key in (b"cache/image_agent:1.json", b"cache/image_agent:2.json"):
+                yield key
+        mock_redis.scan_iter = scan_iter
+        mock_redis.get.side_effect = [json.dumps({"owner": 7}), json.dumps({"owner": 8})]
+        
+        count = await redis_fs.purge_documents("cache/image_agent:*", lambda doc: doc["owner"] == 7)
+        
+        assert count == 1
+        mock_redis.unlink.assert_awaited_once_with("cache/image_agent:1.json")
+    
+    @pytest.mark.asyncio
+    async def test_purge_user_sessions(self, redis_fs, mock_redis):
+        """Suppression de compte: sessions indexées, sessions coaching, sites, index"""
+        mock_redis.zrange.return_value = [b"brief_1", b"brief_2"]
+        mock_redis.unlink.return_value = 6
+        
+        with patch("app.core.integrations.redis_fs.session_cache.invalidate", new=AsyncMock()) as invalidate:
+            stats = await redis_fs.purge_user_sessions(42, ["s1"])
+        
+        assert stats == {"sessions": 2, "sites": 1, "keys": 6}
+        mock_redis.zrange.assert_awaited_once_with("genesis:user:42:sessions", 0, -1)
+        mock_redis.unlink.assert_awaited_once_with(
+            "genesis:session:42:brief_1",
+            "genesis:session:42:brief_2",
+            "session:s1",
+            "site:s1",
+            "site:s1:summary",
+            "genesis:user:42:sessions"
+        )
+        assert invalidate.await_count == 4
     
     @pytest.mark.asyncio
     async def test_close_connection(self, redis_fs, mock_redis):
@@ -0,0 +1,66 @@
+"""Tests unitaires pour le pool Redis partagé"""
+
+import pytest
+from unittest.mock import patch
+
+from app.config.redis import RedisPoolManager
+from app.config.settings import settings
+
+
+class TestRedisPoolManager:
+    """Tests pour RedisPoolManager"""
+
+    @pytest.fixture
+    async def pools(self):
+        """Gestionnaire ouvert, fermé en fin de test"""
+        manager = RedisPoolManager()
+        manager.open()
+        yield manager
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_clients_share_pool(self, pools):
+        """Tous les clients d'un même mode partagent un unique pool"""
+        first = pools.get_client()
+        second = pools.get_client()
+
+        assert first.connection_pool is second.connection_pool
+
+    @pytest.mark.asyncio
+    async def test_text_and_binary_pools_are_distinct(self, pools):
+        """Un pool par mode de décodage"""
+        binary = pools.get_client()
+        text = pools.get_client(decode_responses=True)
+
+        assert binary.connection_pool is not text.connection_pool
+        assert text.connection_pool.connection_kwargs["decode_responses"] is True
+
+    @pytest.mark.asyncio
+    async def test_pool_uses_settings(self, pools):
+        """Limites, health check et keepalive proviennent des settings"""
+        pool = pools.get_client().connection_pool
+
+        assert pool.max_connections == settings.REDIS_MAX_CONNECTIONS
+        assert pool.connection_kwargs["health_check_interval"] == settings.REDIS_HEALTH_CHECK_INTERVAL
+        assert pool.connection_kwargs["socket_keepalive"] == settings.REDIS_SOCKET_KEEPALIVE
+
+    @pytest.mark.asyncio
+    async def test_inactive_manager_falls_back_to_standalone_client(self):
+        """Sans lifespan, un client autonome est créé (comportement historique)"""
+        manager = RedisPoolManager()
+
+        with patch("app.config.redis.redis.from_url") as mock_from_url:
+            manager.get_client(decode_responses=True)
+
+        mock_from_url.assert_called_once_with(settings.REDIS_URL, decode_responses=True)
+
+    @pytest.mark.asyncio
+    async def test_vfs_uses_shared_pool(self, pools):
+        """RedisVirtualFileSystem s'appuie sur le pool partagé"""
+        from app.core.integrations import redis_fs
+
+        with patch.object(redis_fs, "redis_pools", pools):
+            first = redis_fs.RedisVirtualFileSystem()
+            second = redis_fs.RedisVirtualFileSystem()
+
+        assert first.redis.connection_pool is second.redis.connection_pool
@@ -0,0 +1,125 @@
+"""
+Tests SessionCache - L1 in-process des sessions/sites avec invalidation pub/sub
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.integrations.session_cache import SessionCache
+
+
+class FakePubSub:
+    """Abonnement pub/sub en mémoire"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.broker.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        for queues in self.broker.subscribers.values():
+            if self.queue in queues:
+                queues.remove(self.queue)
+
+
+class FakeRedis:
+    """Broker pub/sub minimal partagé entre plusieurs workers"""
+
+    def __init__(self):
+        self.subscribers = {}
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(queues)
+
+
+async def _started(cache):
+    await cache.start()
+    for _ in range(10):
+        if cache.is_active:
+            return cache
+        await asyncio.sleep(0)
+    raise AssertionError("listener not subscribed")
+
+
+@pytest.fixture
+async def workers():
+    """Deux workers uvicorn partageant le même Redis"""
+    broker = FakeRedis()
+    first = await _started(SessionCache(redis_client=broker, ttl=30, max_entries=100, enabled=True))
+    second = await _started(SessionCache(redis_client=broker, ttl=30, max_entries=100, enabled=True))
+    yield first, second
+    await first.stop()
+    await second.stop()
+
+
+class TestSessionCache:
+    """Hits L1, copies indépendantes, invalidation entre workers"""
+
+    async def test_second_read_served_from_l1(self, workers):
+        cache, _ = workers
+        loader = AsyncMock(return_value={"user_id": 7, "current_step": "vision"})
+
+        first = await cache.get_or_load("session:abc", loader)
+        first["current_step"] = "modifié par l'appelant"
+        second = await cache.get_or_load("session:abc", loader)
+
+        assert second == {"user_id": 7, "current_step": "vision"}
+        loader.assert_awaited_once()
+
+    async def test_write_on_one_worker_invalidates_the_other(self, workers):
+        writer, reader = workers
+        await reader.get_or_load("session:abc", AsyncMock(return_value={"current_step": "vision"}))
+
+        await writer.invalidate("session:abc", fields={"current_step": "mission"})
+        await asyncio.sleep(0)
+
+        loader = AsyncMock(return_value={"current_step": "mission"})
+        assert await reader.get_or_load("session:abc", loader) == {"current_step": "mission"}
+        loader.assert_awaited_once()
+
+    async def test_writer_keeps_merged_copy(self, workers):
+        cache, _ = workers
+        await cache.get_or_load("session:abc", AsyncMock(return_value={"user_id": 7, "current_step": "vision"}))
+
+        await cache.invalidate("session:abc", fields={"current_step": "mission"})
+        await asyncio.sleep(0)  # son propre message est ignoré
+
+        loader = AsyncMock()
+        assert await cache.get_or_load("session:abc", loader) == {"user_id": 7, "current_step": "mission"}
+        loader.assert_not_awaited()
+
+    async def test_invalidation_during_load_is_not_cached(self, workers):
+        """Une lecture Redis concurrente d'une écriture ne reste pas en L1"""
+        cache, _ = workers
+
+        async def slow_loader():
+            await cache.invalidate("session:abc")
+            return {"current_step": "vision"}
+
+        await cache.get_or_load("session:abc", slow_loader)
+        loader = AsyncMock(return_value={"current_step": "mission"})
+
+        assert await cache.get_or_load("session:abc", loader) == {"current_step": "mission"}
+
+    async def test_bypassed_until_subscribed(self):
+        cache = SessionCache(redis_client=FakeRedis(), ttl=30, enabled=True)
+        loader = AsyncMock(return_value={"current_step": "vision"})
+
+        await cache.get_or_load("session:abc", loader)
+        await cache.get_or_load("session:abc", loader)
+
+        assert loader.await_count == 2
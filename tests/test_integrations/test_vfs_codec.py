@@ -0,0 +1,59 @@
+"""Tests du codec binaire Redis VFS (sérialisation, compression, compatibilité JSON)"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core.integrations.vfs_codec import HEADER_FLAG, VFSCodec, ZSTD_AVAILABLE
+
+
+DOCUMENT = {
+    "user_id": 1,
+    "brief_id": "brief_123",
+    "created_at": datetime(2025, 1, 15, 10, 30),
+    "content": {"fr": {"homepage": {"title": "Teranga Digital " * 200}}},
+    "market_research": {"competitors": [{"name": f"Concurrent {i}"} for i in range(20)]},
+}
+
+
+class TestVFSCodec:
+    """Encodage/décodage et lecture des anciennes clés"""
+
+    @pytest.mark.parametrize("serializer", ["orjson", "msgpack"])
+    def test_roundtrip_matches_legacy_json(self, serializer):
+        """Le décodage redonne exactement ce que json.loads(json.dumps(default=str)) donnait"""
+        codec = VFSCodec(serializer=serializer, compression="none")
+
+        decoded = codec.decode(codec.encode(DOCUMENT))
+
+        assert decoded == json.loads(json.dumps(DOCUMENT, default=str))
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard non installé")
+    def test_compression_above_threshold_only(self):
+        codec = VFSCodec(serializer="orjson", compression="zstd", compression_threshold=512)
+
+        small = codec.encode({"status": "ok"})
+        large = codec.encode(DOCUMENT)
+
+        assert small[0] == HEADER_FLAG | 1  # orjson, non compressé
+        assert large[0] == HEADER_FLAG | (1 << 3) | 1  # orjson + zstd
+        assert len(large) < len(json.dumps(DOCUMENT, default=str)) / 5
+        assert codec.decode(large)["content"] == DOCUMENT["content"]
+
+    def test_legacy_json_values_still_read(self):
+        codec = VFSCodec(serializer="msgpack", compression="zstd")
+        legacy = json.dumps({"user_id": 1, "status": "done"})
+
+        assert codec.decode(legacy) == {"user_id": 1, "status": "done"}
+        assert codec.decode(legacy.encode()) == {"user_id": 1, "status": "done"}
+
+    def test_json_serializer_keeps_legacy_format(self):
+        """Le sérialiseur "json" permet de revenir au format texte historique"""
+        codec = VFSCodec(serializer="json", compression="zstd")
+
+        assert codec.encode({"a": 1}) == json.dumps({"a": 1}, default=str)
+
+    def test_unknown_serializer_rejected(self):
+        with pytest.raises(ValueError):
+            VFSCodec(serializer="pickle")